@@ -1,2 +1,2 @@
 """Core functionality (license, state, stealth, resume)"""
-__all__ = ['license', 'state', 'stealth', 'resume']
+__all__ = ["license", "state", "stealth", "resume", "host_result"]
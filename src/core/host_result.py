@@ -0,0 +1,136 @@
+"""대규모 스캔용 압축 호스트 결과 모델.
+
+워크플로우 결과 딕셔너리는 호스트마다 같은 키 문자열과 중첩 딕셔너리를 만들고,
+"OpenSSH 8.2p1 Ubuntu" 같은 서비스/OS 문자열을 수천 번 복제한다. `HostResult`는
+IP를 정수로, 포트를 `array('H')`로 저장하고 서비스/OS/점검 이름을 intern 하며,
+호스트 간에 같은 이름/값 목록은 튜플 하나를 공유한다 (공유 표는 크기 제한).
+리포트와 저장소에는 `to_dict`로 기존 딕셔너리 형식을 그대로 넘긴다.
+"""
+
+import ipaddress
+import sys
+from array import array
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+__all__ = ["HostResult"]
+
+# 공유 튜플 표의 최대 크기. 호스트마다 다른 값 목록(예: 서비스 버전 조합)이 계속
+# 들어와도 표가 스캔 내내 자라지 않도록, 최근에 쓴 목록만 남긴다.
+SHARED_TUPLES_MAX = 4096
+
+
+def _intern(value: Any) -> Any:
+    # str 하위 클래스(ServiceLabel 등)는 intern 할 수 없으므로 일반 문자열로 바꾼다
+    return sys.intern(str(value)) if isinstance(value, str) else value
+
+
+@lru_cache(maxsize=SHARED_TUPLES_MAX)
+def _shared_tuple(key: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """같은 값 목록이면 처음 만든 튜플을 돌려줍니다 (최근 사용 순으로 제한)."""
+    return key
+
+
+def _shared(values) -> Tuple[Any, ...]:
+    """문자열은 intern 하고, 같은 값 목록이면 이전에 만든 튜플을 돌려줍니다."""
+    key = tuple(_intern(value) for value in values)
+    try:
+        return _shared_tuple(key)
+    except TypeError:  # 리스트 등 해시할 수 없는 점검 결과는 공유하지 않는다
+        return key
+
+
+def _ports(ports=()) -> array:
+    return array("H", ports or ())
+
+
+@dataclass(slots=True)
+class HostResult:
+    """한 호스트의 스캔 결과.
+
+    Attributes:
+        ip: IP 주소의 정수 값
+        version: IP 버전 (4 또는 6)
+        open_ports: 열린 포트
+        service_ports: 서비스 정보가 있는 포트 (`service_names`와 같은 순서)
+        service_names: 포트별 서비스 설명 (intern 된 문자열의 공유 튜플)
+        os: OS 정보 (intern 된 문자열)
+        check_names: 점검 항목 이름 (호스트 간 공유 튜플)
+        check_values: 점검 결과 (`check_names`와 같은 순서, 가능하면 공유 튜플)
+        partial: 시간 초과로 결과가 부분적인 단계
+        skip_reason: 회로 차단 사유 (건너뛴 단계가 없으면 None)
+        skipped_stages: 회로 차단으로 건너뛴 단계
+        technique: 호스트를 찾아낸 탐색 기법 (intern 된 문자열)
+    """
+
+    ip: int
+    version: int = 4
+    open_ports: array = field(default_factory=_ports)
+    service_ports: array = field(default_factory=_ports)
+    service_names: Tuple[str, ...] = ()
+    os: Optional[str] = None
+    check_names: Tuple[str, ...] = ()
+    check_values: Tuple[Any, ...] = ()
+    partial: Tuple[str, ...] = ()
+    skip_reason: Optional[str] = None
+    skipped_stages: Tuple[str, ...] = ()
+    technique: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, result: Dict[str, Any]) -> "HostResult":
+        """워크플로우 결과 딕셔너리를 압축 모델로 바꿉니다.
+
+        Raises:
+            ValueError: 유효하지 않은 IP 주소
+        """
+        address = ipaddress.ip_address(result["ip"])
+        services = result.get("services") or {}
+        checks = result.get("checks") or {}
+        skipped = result.get("skipped")
+        return cls(
+            ip=int(address),
+            version=address.version,
+            open_ports=_ports(result.get("open_ports")),
+            service_ports=_ports([int(port) for port in services]),
+            service_names=_shared(services.values()),
+            os=_intern(result.get("os")),
+            check_names=_shared(checks),
+            check_values=_shared(checks.values()),
+            partial=_shared(result.get("partial") or ()),
+            skip_reason=_intern(skipped["reason"]) if skipped else None,
+            skipped_stages=_shared(skipped["stages"]) if skipped else (),
+            technique=_intern(result.get("technique")),
+        )
+
+    @property
+    def address(self) -> str:
+        """IP 주소 문자열."""
+        if self.version == 4:
+            return str(ipaddress.IPv4Address(self.ip))
+        return str(ipaddress.IPv6Address(self.ip))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """워크플로우 결과 딕셔너리 형식으로 되돌립니다.
+
+        `ExcelWriter`, 출력기, 결과 저장소가 받는 것과 같은 키 순서와 값 형식입니다.
+        """
+        result: Dict[str, Any] = {
+            "ip": self.address,
+            "open_ports": self.open_ports.tolist(),
+            "services": dict(
+                zip(self.service_ports.tolist(), self.service_names),
+            ),
+            "os": self.os,
+            "checks": dict(zip(self.check_names, self.check_values)),
+        }
+        if self.partial:
+            result["partial"] = list(self.partial)
+        if self.skip_reason is not None:
+            result["skipped"] = {
+                "reason": self.skip_reason,
+                "stages": list(self.skipped_stages),
+            }
+        if self.technique is not None:
+            result["technique"] = self.technique
+        return result
@@ -1,23 +1,136 @@
 """스캔 재개 기능을 담당하는 모듈."""
 
 import logging
-from typing import List
+from typing import Any, Dict, List, Optional, Set
 from .state import StateManager
 
+# 저널의 단계 이름 → 스캔 결과 딕셔너리 키 (결과 키 순서 유지)
+STAGE_KEYS = {
+    "ports": "open_ports",
+    "services": "services",
+    "os": "os",
+    "checks": "checks",
+    "partial": "partial",
+    "skipped": "skipped",
+}
+
 
 class ResumeManager:
-    """스캔 재개 관리 클래스."""
+    """스캔 재개 관리 클래스.
+
+    상태(스냅샷 + 저널 재생)는 `load`로 한 번만 읽고, 나머지 메서드는
+    그 상태 딕셔너리를 받아 필요한 항목만 꺼낸다.
+    """
 
     logger = logging.getLogger(__name__)
 
     @staticmethod
-    def should_resume() -> bool:
-        """스캔을 재개해야 하는지 확인한다."""
-        state = StateManager.load_state()
-        return bool(state and state.get("pending_ips"))
+    def load() -> Optional[Dict[str, Any]]:
+        """저장된 스캔 상태를 읽는다 (없으면 None)."""
+        return StateManager.load_state()
+
+    @staticmethod
+    def should_resume(state: Optional[Dict[str, Any]]) -> bool:
+        """스캔을 재개해야 하는지 확인한다.
+
+        대기 중인 호스트가 있거나, 호스트 탐색이 끝나기 전에 중단된 경우 재개한다.
+        """
+        if not state:
+            return False
+        if state.get("pending_ips"):
+            return True
+        return ResumeManager._discovery_interrupted(state)
 
     @staticmethod
-    def get_pending_ips() -> List[str]:
+    def discovery_complete(state: Optional[Dict[str, Any]]) -> bool:
+        """중단 전에 호스트 탐색이 끝까지 진행됐는지 확인한다.
+
+        탐색 기록이 없는 (이전 형식의) 상태는 완료된 것으로 본다.
+        """
+        return not state or state.get("discovery_complete", True)
+
+    @staticmethod
+    def get_pending_ips(state: Optional[Dict[str, Any]]) -> List[str]:
         """대기 중인 IP 목록을 반환한다."""
-        state = StateManager.load_state()
         return state.get("pending_ips", []) if state else []
+
+    @staticmethod
+    def get_known_ips(state: Optional[Dict[str, Any]]) -> Set[str]:
+        """중단 전에 이미 발견된 (대기 중이거나 단계 결과가 있는) IP 집합."""
+        if not state:
+            return set()
+        return set(state.get("pending_ips", [])) | set(state.get("hosts", {}))
+
+    @staticmethod
+    def get_host_progress(
+        state: Optional[Dict[str, Any]],
+    ) -> Dict[str, Dict[str, Any]]:
+        """대기 중인 호스트별로 이미 끝난 단계의 중간 결과를 반환한다.
+
+        Returns:
+            IP → {"open_ports": ..., "services": ..., "os": ...} 중 완료된 항목
+        """
+        if not state:
+            return {}
+        hosts = state.get("hosts", {})
+        progress = {}
+        for ip in state.get("pending_ips", []):
+            # 탐색 기법만 기록된 호스트는 아직 끝난 단계가 없다
+            fields = ResumeManager._to_result_fields(hosts.get(ip, {}))
+            if fields:
+                progress[ip] = fields
+        return progress
+
+    @staticmethod
+    def get_completed_results(
+        state: Optional[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """중단 전에 모든 단계를 마친 호스트의 결과를 완료 순서대로 반환한다.
+
+        열린 포트가 없어 결과에서 제외된 호스트는 포함하지 않는다 (회로 차단으로
+        건너뛴 호스트는 포함).
+        """
+        if not state:
+            return []
+        pending = set(state.get("pending_ips", []))
+        results = []
+        for ip, stages in state.get("hosts", {}).items():
+            if ip in pending:
+                continue
+            if not (stages.get("ports") or stages.get("skipped")):
+                continue
+            result = {"ip": ip, **ResumeManager._to_result_fields(stages)}
+            if stages.get("technique"):
+                result["technique"] = stages["technique"]
+            results.append(result)
+        return results
+
+    @staticmethod
+    def get_techniques(state: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """탐색 때 기록한 호스트별 탐색 기법 (IP → 기법 이름)."""
+        if not state:
+            return {}
+        return {
+            ip: stages["technique"]
+            for ip, stages in state.get("hosts", {}).items()
+            if stages.get("technique")
+        }
+
+    @staticmethod
+    def _discovery_interrupted(state: Dict[str, Any]) -> bool:
+        return not ResumeManager.discovery_complete(state) and bool(
+            state.get("hosts"),
+        )
+
+    @staticmethod
+    def _to_result_fields(stages: Dict[str, Any]) -> Dict[str, Any]:
+        fields = {}
+        for stage, key in STAGE_KEYS.items():
+            if stage in stages:
+                fields[key] = stages[stage]
+        if isinstance(fields.get("services"), dict):
+            # JSON 객체 키는 문자열이므로 포트 번호로 되돌린다
+            fields["services"] = {
+                int(port): desc for port, desc in fields["services"].items()
+            }
+        return fields
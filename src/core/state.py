@@ -2,25 +2,40 @@
 # 상단 import 유지
 import json
 import logging
+import os
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional
 
 from ..utils.exceptions import StateError, StateCorruptedError
 
-__all__ = ['StateManager']
+__all__ = ["StateManager", "StateJournal"]
 
 INTERNAL_PATH_DEFAULT = "scan_state.json"
+JOURNAL_SUFFIX = ".journal"
 
 
 class StateManager:
-    """상태 관리 클래스."""
+    """상태 관리 클래스.
+
+    상태는 JSON 스냅샷(`scan_state.json`)과 그 뒤에 덧붙는 저널
+    (`scan_state.json.journal`)로 구성된다. `load_state`는 스냅샷 위에 저널을
+    재생한 현재 상태를 돌려주고, `save_state`는 새 스냅샷을 쓰면서 저널을 비운다.
+    """
 
     logger = logging.getLogger(__name__)  # 클래스‑레벨 로거
 
+    @staticmethod
+    def journal_path(path: Optional[str | Path] = None) -> Path:
+        """상태 파일에 대응하는 저널 파일 경로."""
+        path = Path(path if path is not None else INTERNAL_PATH_DEFAULT)
+        return path.with_name(path.name + JOURNAL_SUFFIX)
+
     @staticmethod
     def save_state(data: Dict[str, Any],
                    path: Optional[str | Path] = None) -> None:
-        """상태 데이터를 원자적으로 저장."""
+        """상태 데이터를 원자적으로 저장 (저널은 스냅샷에 흡수되므로 삭제)."""
         if path is None:
             path = INTERNAL_PATH_DEFAULT
         path = Path(path)
@@ -30,6 +45,7 @@ class StateManager:
             with open(temp_path, "w", encoding="utf-8") as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
             temp_path.replace(path)  # 원자적 교체
+            StateManager.journal_path(path).unlink(missing_ok=True)
             StateManager.logger.debug("State saved to %s", path)
         except (OSError, IOError) as exc:
             StateManager.logger.error("Save failed: %s", exc)
@@ -41,12 +57,21 @@ class StateManager:
         if path is None:
             path = INTERNAL_PATH_DEFAULT
         path = Path(path)
-        if not path.exists():
+        journal = StateManager.journal_path(path)
+        if not path.exists() and not journal.exists():
             StateManager.logger.debug("State file not found: %s", path)
             return None
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data: Dict[str, Any] = {}
+            if path.exists():
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            if journal.exists():
+                with open(journal, "r", encoding="utf-8") as f:
+                    count = StateJournal.replay(data, f)
+                StateManager.logger.debug(
+                    "Replayed %d journal record(s) from %s", count, journal
+                )
             StateManager.logger.debug("State loaded from %s", path)
             return data
         except json.JSONDecodeError as exc:
@@ -56,3 +81,182 @@ class StateManager:
             StateManager.logger.error("Read failed: %s", exc)
             raise StateError(f"Failed to read state: {exc}") from exc
 
+
+class StateJournal:
+    """호스트·단계 완료마다 한 줄씩 덧붙이는 추가 전용(append-only) 상태 저널.
+
+    레코드는 한 줄짜리 JSON(JSONL)이며 종류는 다음과 같다.
+
+    - ``{"op": "target", "ip": ...}``: 스캔 대상 추가 (pending)
+    - ``{"op": "stage", "ip": ..., "stage": ..., "data": ...}``: 단계 결과
+    - ``{"op": "done", "ip": ...}``: 호스트 완료 (pending에서 제거)
+    - ``{"op": "discovery", "complete": ...}``: 호스트 탐색 시작(false)/완료(true)
+
+    기록 비용은 호스트·단계당 한 줄로 일정하며, fsync는 `sync_every`개 또는
+    `sync_interval`초마다 묶어서 수행한다. `compact_every`개가 쌓이면 현재 상태를
+    스냅샷으로 다시 쓰고 저널을 비운다.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        sync_every: int = 32,
+        sync_interval: float = 1.0,
+        compact_every: int = 2000,
+    ) -> None:
+        """
+        Args:
+            path: 상태 스냅샷 경로 (저널은 `<path>.journal`)
+            sync_every: fsync 전에 모을 최대 레코드 수
+            sync_interval: fsync 사이 최대 간격(초)
+            compact_every: 압축(스냅샷 재작성) 주기 (레코드 수)
+
+        Raises:
+            ValueError: 1 미만의 주기 값
+        """
+        if sync_every < 1 or compact_every < 1:
+            raise ValueError(
+                f"Invalid journal interval: sync_every={sync_every}, "
+                f"compact_every={compact_every}"
+            )
+        self.path = Path(path if path is not None else INTERNAL_PATH_DEFAULT)
+        self.journal = StateManager.journal_path(self.path)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._file = None
+        self._unsynced = 0
+        self._since_compact = 0
+        self._last_sync = time.monotonic()
+
+    def __enter__(self) -> "StateJournal":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------ #
+    # 기록
+    # ------------------------------------------------------------------ #
+    def add_target(self, ip: str) -> None:
+        """스캔 대상(pending) 호스트를 기록한다."""
+        self.append({"op": "target", "ip": ip})
+
+    def record_stage(self, ip: str, stage: str, data: Any) -> None:
+        """호스트의 단계 결과를 기록한다."""
+        self.append({"op": "stage", "ip": ip, "stage": stage, "data": data})
+
+    def complete(self, ip: str) -> None:
+        """호스트 스캔 완료를 기록한다."""
+        self.append({"op": "done", "ip": ip})
+
+    def record_discovery(self, complete: bool) -> None:
+        """호스트 탐색 시작(False) 또는 완료(True)를 기록한다.
+
+        완료 표시가 없는 상태에서 재개하면 탐색이 도중에 끊긴 것이므로 다시 탐색한다.
+        """
+        self.append({"op": "discovery", "complete": complete})
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """레코드 한 줄을 덧붙인다 (스레드 안전)."""
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        line += "\n"
+        with self._lock:
+            try:
+                if self._file is None:
+                    self._file = open(self.journal, "a", encoding="utf-8")
+                self._file.write(line)
+                self._file.flush()
+                self._unsynced += 1
+                self._since_compact += 1
+                if (
+                    self._unsynced >= self.sync_every
+                    or time.monotonic() - self._last_sync >= self.sync_interval
+                ):
+                    self._sync()
+                if self._since_compact >= self.compact_every:
+                    self._compact()
+            except OSError as exc:
+                self.logger.error("Journal append failed: %s", exc)
+                raise StateError(f"Failed to append journal: {exc}") from exc
+
+    def compact(self) -> None:
+        """스냅샷에 저널을 흡수하고 저널을 비운다."""
+        with self._lock:
+            self._compact()
+
+    def close(self) -> None:
+        """남은 레코드를 디스크에 반영하고 파일을 닫는다."""
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    # ------------------------------------------------------------------ #
+    # 재생
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def replay(cls, state: Dict[str, Any], lines: Iterable[str]) -> int:
+        """저널 레코드를 상태 딕셔너리에 적용하고 적용한 레코드 수를 반환한다.
+
+        충돌(crash)로 잘린 마지막 줄은 경고만 남기고 무시하며,
+        중간 줄이 손상된 경우에는 json.JSONDecodeError가 발생한다.
+        """
+        pending = dict.fromkeys(state.get("pending_ips", []))
+        hosts: Dict[str, Dict[str, Any]] = state.get("hosts", {})
+        discovery = state.get("discovery_complete")
+        count = 0
+        broken: Optional[json.JSONDecodeError] = None
+        for line in lines:
+            if not line.strip():
+                continue
+            if broken is not None:  # 손상된 줄 뒤에 레코드가 더 있음
+                raise broken
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                broken = exc
+                continue
+            op = record.get("op")
+            ip = record.get("ip")
+            if op == "target":
+                pending.setdefault(ip)
+            elif op == "stage":
+                hosts.setdefault(ip, {})[record["stage"]] = record.get("data")
+            elif op == "done":
+                pending.pop(ip, None)
+            elif op == "discovery":
+                discovery = bool(record.get("complete"))
+            count += 1
+        if broken is not None:
+            cls.logger.warning("Ignoring truncated journal record: %s", broken)
+
+        state["pending_ips"] = list(pending)
+        if hosts:
+            state["hosts"] = hosts
+        if discovery is not None:
+            state["discovery_complete"] = discovery
+        return count
+
+    # ------------------------------------------------------------------ #
+    # internal (잠금 보유 상태에서 호출)
+    # ------------------------------------------------------------------ #
+    def _sync(self) -> None:
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _compact(self) -> None:
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+        state = StateManager.load_state(self.path) or {}
+        StateManager.save_state(state, self.path)
+        self._since_compact = 0
+        self.logger.debug("Journal compacted into %s", self.path)
@@ -1,2 +1,10 @@
 """Output handlers sub‑package"""
-__all__ = ['excel_writer', 'log_handler', 'report_generator']
+__all__ = [
+    "excel_writer",
+    "exporters",
+    "log_handler",
+    "report_generator",
+    "port_matrix",
+    "result_store",
+    "summary",
+]
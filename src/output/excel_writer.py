@@ -1,75 +1,230 @@
-"""Excel 출력을 담당하는 모듈."""
+"""Excel 출력을 담당하는 모듈.
+
+openpyxl write-only 모드로 호스트가 끝날 때마다 행을 덧붙이므로, 호스트 수가
+늘어도 메모리 사용량이 일정하다. 리포트는 Hosts(호스트당 1행), Ports(열린 포트당
+1행), Checks(점검 항목당 1행) 시트로 나뉘어 Excel에서 바로 필터링할 수 있고,
+저장할 때 집계한 Summary 시트가 맨 앞에 붙는다.
+"""
 
 import json
 import logging
-from typing import List, Dict, Any
+import threading
+from typing import Iterable, List, Dict, Any, Optional
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from .exporters import ResultExporter, result_status
+from .summary import ReportSummary
+from ..scanner.detailed_checks import DetailedChecks
 from ..utils.exceptions import OutputError
 
 __all__ = ['ExcelWriter']
 
-class ExcelWriter:
-    """Excel 출력 클래스."""
-    
-    HEADERS = [
-        "IP",
-        "Open Ports",
-        "Services",
-        "OS",
-        "SMBv1",
-        "HTTP Methods",
-        "FTP Anonymous"
-    ]
-    
+
+class ExcelWriter(ResultExporter):
+    """Excel 출력 클래스.
+
+    한 번에 쓰려면 `write`를, 스캔 중에 스트리밍하려면 `open` → `write_host`(반복)
+    → `close`를 사용한다. `write_host`는 여러 스레드에서 동시에 호출해도 된다.
+    """
+
+    # Hosts 시트 열: 기본 열 + 등록된 점검 항목(`DetailedChecks.CHECKS`)마다 한 열 + Status
+    BASE_HEADERS = ["IP", "Open Ports", "Services", "OS", "Discovery"]
+    STATUS_HEADER = "Status"
+    PORT_HEADERS = ["IP", "Port", "Service"]
+    CHECK_HEADERS = ["IP", "Check", "Result"]
+
+    # 시트 이름 (Hosts는 열었을 때의 활성 시트)
+    SUMMARY_SHEET = "Summary"
+    HOSTS_SHEET = "Hosts"
+    PORTS_SHEET = "Ports"
+    CHECKS_SHEET = "Checks"
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-    
-    def write(self, results: List[Dict[str, Any]], filepath: str) -> None:
+        self.filepath: Optional[str] = None
+        self.hosts = 0  # 지금까지 쓴 호스트 수
+        self._workbook: Optional[Workbook] = None
+        self._sheets: Dict[str, Any] = {}
+        self._check_keys: List[str] = []  # 워크북을 만들 때 고정한 점검 열
+        self._summary = ReportSummary()
+        # write_host마다 요약에 더할지 (미리 집계한 요약이면 False)
+        self._summarize = True
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def check_keys() -> List[str]:
+        """Hosts 시트에 열로 넣을 점검 항목 키 (등록 순서)."""
+        return [check.key for check in DetailedChecks.CHECKS]
+
+    def headers(self) -> List[str]:
+        """Hosts 시트 헤더 (리포트가 열려 있으면 그 리포트의 점검 열 기준)."""
+        if self._workbook is not None:
+            keys = self._check_keys
+        else:
+            keys = self.check_keys()
+        return self.BASE_HEADERS + keys + [self.STATUS_HEADER]
+
+    def write(
+        self,
+        results: Iterable[Dict[str, Any]],
+        filepath: str,
+        summary: Optional[ReportSummary] = None,
+    ) -> None:
         """스캔 결과를 Excel 파일로 저장합니다.
-        
+
         Args:
-            results: 스캔 결과 목록
+            results: 스캔 결과 목록 (한 번 순회하므로 제너레이터도 가능)
             filepath: 저장할 파일 경로
-            
+            summary: 미리 집계한 Summary 시트 요약 (없으면 쓰는 결과로 집계)
+
         Raises:
             OutputError: 파일 저장 실패
         """
+        self.open(filepath, summary)
         try:
-            # 워크북 생성
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Scan Results"
-            
-            # 헤더 작성
-            for col, header in enumerate(self.HEADERS, 1):
-                ws.cell(row=1, column=col, value=header)
-            
-            # 데이터 작성
-            for row, result in enumerate(results, 2):
-                ws.cell(row=row, column=1, value=result["ip"])
-                ws.cell(row=row, column=2, value=str(result["open_ports"]))
-                ws.cell(row=row, column=3, value=json.dumps(result["services"]))
-                ws.cell(row=row, column=4, value=result["os"])
-                ws.cell(row=row, column=5, value=str(result["checks"].get("smbv1", False)))
-                ws.cell(row=row, column=6, value=str(result["checks"].get("http_methods", [])))
-                ws.cell(row=row, column=7, value=str(result["checks"].get("ftp_anonymous", False)))
-            
-            # 파일 저장
-            wb.save(filepath)
-            self.logger.info(f"Results saved to {filepath}")
-            
+            self.write_scan_results(results)
         except Exception as e:
             self.logger.error(f"Failed to save results to {filepath}: {e}")
+            self._discard()
             raise OutputError(f"Failed to save results: {e}") from e
-    
-    def write_scan_results(self, results: List[Dict]):
-        # IMPLEMENT: 스캔 결과를 Excel로 출력
-        pass
-    
+        self.close()
+
+    def open(
+        self, filepath: str, summary: Optional[ReportSummary] = None
+    ) -> "ExcelWriter":
+        """스트리밍 리포트를 시작합니다 (파일은 `close`에서 저장).
+
+        Args:
+            filepath: 저장할 파일 경로
+            summary: 미리 집계한 Summary 시트 요약 (예: `ResultStore.summary`).
+                주면 `write_host`가 요약에 다시 더하지 않는다.
+        """
+        self.filepath = filepath
+        self.hosts = 0
+        self._workbook = None
+        self._sheets = {}
+        self._summarize = summary is None
+        self._summary = ReportSummary() if summary is None else summary
+        return self
+
+    def close(self) -> None:
+        """지금까지 쓴 행을 파일로 저장합니다 (열려 있지 않으면 아무것도 하지 않음).
+
+        Raises:
+            OutputError: 파일 저장 실패
+        """
+        if self.filepath is None:
+            return
+        with self._lock:
+            try:
+                self._sheet(self.HOSTS_SHEET)  # 결과가 없어도 헤더가 있는 파일을 만든다
+                self._write_summary()
+                self._workbook.save(self.filepath)
+            except Exception as e:
+                self.logger.error(
+                    f"Failed to save results to {self.filepath}: {e}",
+                )
+                self._discard()
+                self.filepath = None
+                raise OutputError(f"Failed to save results: {e}") from e
+            self._workbook = None
+            self._sheets = {}
+            filepath, self.filepath = self.filepath, None
+        self.logger.info(f"Results saved to {filepath} ({self.hosts} host(s))")
+
+    def write_host(self, result: Dict[str, Any]) -> None:
+        """호스트 결과 하나를 모든 시트에 덧붙입니다."""
+        with self._lock:
+            self.write_host_info(result)
+            self.write_service_info(result)
+            self.write_check_info(result)
+            if self._summarize:
+                self._summary.add(result)
+            self.hosts += 1
+
+    @staticmethod
+    def status(result: Dict[str, Any]) -> str:
+        """부분 결과/회로 차단으로 건너뛴 단계를 한 줄로 요약합니다 (완전하면 빈 문자열)."""
+        return result_status(result)
+
+    def write_scan_results(self, results: Iterable[Dict]):
+        """스캔 결과 목록을 순서대로 덧붙입니다."""
+        for result in results:
+            self.write_host(result)
+
     def write_host_info(self, host_info: Dict):
-        # IMPLEMENT: 호스트 정보를 Excel로 출력
-        pass
-    
+        """Hosts 시트에 호스트 요약 행을 덧붙입니다."""
+        checks = host_info["checks"]
+        sheet = self._sheet(self.HOSTS_SHEET)
+        sheet.append(
+            [
+                host_info["ip"],
+                str(host_info["open_ports"]),
+                json.dumps(host_info["services"]),
+                host_info["os"],
+                host_info.get("technique"),
+                *(str(checks.get(key, False)) for key in self._check_keys),
+                self.status(host_info),
+            ]
+        )
+
     def write_service_info(self, service_info: Dict):
-        # IMPLEMENT: 서비스 정보를 Excel로 출력
-        pass 
\ No newline at end of file
+        """Ports 시트에 열린 포트마다 (IP, 포트, 서비스) 행을 덧붙입니다."""
+        sheet = self._sheet(self.PORTS_SHEET)
+        services = service_info.get("services") or {}
+        ip = service_info["ip"]
+        for port in sorted(set(service_info["open_ports"]) | set(services)):
+            sheet.append([ip, port, services.get(port)])
+
+    def write_check_info(self, check_info: Dict):
+        """Checks 시트에 점검 항목마다 (IP, 항목, 결과) 행을 덧붙입니다."""
+        sheet = self._sheet(self.CHECKS_SHEET)
+        for name, value in (check_info.get("checks") or {}).items():
+            if not isinstance(value, (bool, int, float, str)):
+                value = str(value)
+            sheet.append([check_info["ip"], name, value])
+
+    def _write_summary(self) -> None:
+        """집계표를 맨 앞 Summary 시트에 섹션별로 쓰고, Hosts를 활성 시트로 둡니다."""
+        sheet = self._workbook.create_sheet(self.SUMMARY_SHEET, 0)
+        bold = Font(bold=True)
+        for title, table in self._summary.tables().items():
+            heading = WriteOnlyCell(sheet, value=title)
+            heading.font = bold
+            sheet.append([heading])
+            sheet.append(list(table.columns))
+            for row in table.itertuples(index=False, name=None):
+                sheet.append(list(row))
+            sheet.append([])
+        self._workbook.active = self._workbook.sheetnames.index(
+            self.HOSTS_SHEET,
+        )
+
+    def _discard(self) -> None:
+        """저장하지 않은 시트의 임시 파일을 정리합니다."""
+        sheets = self._workbook.worksheets if self._workbook else ()
+        for sheet in sheets:
+            try:
+                sheet.close()
+            except Exception:  # 이미 닫혔거나 쓰다 만 시트
+                pass
+        self._workbook = None
+        self._sheets = {}
+
+    def _sheet(self, title: str):
+        """시트를 반환합니다 (첫 호출 시 모든 시트를 헤더와 함께 생성)."""
+        if self.filepath is None:
+            raise OutputError("Excel report is not open")
+        if self._workbook is None:
+            self._workbook = Workbook(write_only=True)
+            self._check_keys = self.check_keys()
+            for name, headers in (
+                (self.HOSTS_SHEET, self.headers()),
+                (self.PORTS_SHEET, self.PORT_HEADERS),
+                (self.CHECKS_SHEET, self.CHECK_HEADERS),
+            ):
+                sheet = self._workbook.create_sheet(name)
+                sheet.append(headers)
+                self._sheets[name] = sheet
+        return self._sheets[title]
@@ -0,0 +1,147 @@
+"""스캔 결과를 호스트 단위로 바로 내보내는 스트리밍 출력기 모듈.
+
+워크플로우는 호스트가 끝날 때마다 등록된 모든 출력기의 `write_host`를 호출한다.
+JSONL/CSV 출력기는 행을 쓸 때마다 flush하므로, 다른 프로세스가 파일을 tail 하며
+스캔이 끝나기 전부터 결과를 처리할 수 있다.
+"""
+
+import csv
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+from ..utils.exceptions import OutputError
+
+__all__ = ["ResultExporter", "JsonlExporter", "CsvExporter", "result_status"]
+
+
+def result_status(result: Dict[str, Any]) -> str:
+    """부분 결과/회로 차단으로 건너뛴 단계를 한 줄로 요약합니다 (완전하면 빈 문자열)."""
+    parts = []
+    if result.get("partial"):
+        parts.append(f"partial: {', '.join(result['partial'])}")
+    skipped = result.get("skipped")
+    if skipped:
+        parts.append(
+            f"skipped ({skipped['reason']}): {', '.join(skipped['stages'])}",
+        )
+    return "; ".join(parts)
+
+
+class ResultExporter(ABC):
+    """호스트 결과 스트리밍 출력기 인터페이스.
+
+    `write_host`는 여러 스레드에서 동시에 호출될 수 있고, `close`는 여러 번
+    호출해도 안전해야 한다.
+    """
+
+    @abstractmethod
+    def write_host(self, result: Dict[str, Any]) -> None:
+        """호스트 결과 하나를 내보냅니다."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """남은 출력을 마무리하고 자원을 해제합니다."""
+
+    def __enter__(self) -> "ResultExporter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class _FileExporter(ResultExporter):
+    """텍스트 파일에 한 호스트씩 쓰고 바로 flush하는 출력기 공통 부분."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Args:
+            path: 출력 파일 경로 (있으면 덮어씀)
+
+        Raises:
+            OutputError: 파일을 열 수 없는 경우
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = Path(path)
+        self.hosts = 0
+        self._lock = threading.Lock()
+        try:
+            self._file = open(self.path, "w", encoding="utf-8", newline="")
+        except OSError as e:
+            self.logger.error(f"Failed to open {self.path}: {e}")
+            raise OutputError(f"Failed to open {self.path}: {e}") from e
+
+    def write_host(self, result: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._file is None:
+                raise OutputError(f"{self.path} is already closed")
+            try:
+                self._write(result)
+                self._file.flush()
+            except (OSError, TypeError, ValueError) as e:
+                self.logger.error(
+                    f"Failed to export {result.get('ip')} to {self.path}: {e}"
+                )
+                raise OutputError(f"Failed to export result: {e}") from e
+            self.hosts += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+        self.logger.info(
+            f"Results exported to {self.path} ({self.hosts} host(s))",
+        )
+
+    @abstractmethod
+    def _write(self, result: Dict[str, Any]) -> None:
+        """결과 하나를 파일에 씁니다 (호출자가 잠금 보유)."""
+
+
+class JsonlExporter(_FileExporter):
+    """호스트마다 결과 딕셔너리를 JSON 한 줄로 쓰는 출력기.
+
+    서비스 딕셔너리의 포트 키는 JSON 규칙에 따라 문자열이 된다.
+    """
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+class CsvExporter(_FileExporter):
+    """호스트마다 한 행을 쓰는 CSV 출력기.
+
+    열린 포트는 공백으로 구분하고, 서비스와 점검 결과는 JSON 문자열로 쓴다.
+    """
+
+    FIELDS: List[str] = [
+        "ip",
+        "open_ports",
+        "services",
+        "os",
+        "checks",
+        "status",
+    ]
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        super().__init__(path)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.FIELDS)
+        self._file.flush()
+
+    def _write(self, result: Dict[str, Any]) -> None:
+        self._writer.writerow(
+            [
+                result["ip"],
+                " ".join(str(port) for port in result["open_ports"]),
+                json.dumps(result.get("services") or {}, ensure_ascii=False),
+                result.get("os") or "",
+                json.dumps(result.get("checks") or {}, ensure_ascii=False),
+                result_status(result),
+            ]
+        )
@@ -0,0 +1,329 @@
+"""호스트 × 포트 비트 행렬로 열린 포트를 색인하는 모듈.
+
+"3389가 열린 호스트는?", "지난주 대비 열린 포트가 어떻게 바뀌었나?" 같은 질문을
+중첩된 결과 리스트를 훑지 않고 NumPy 벡터 연산으로 답한다. 행렬은 호스트 축으로
+8개씩 비트를 묶어 (호스트 바이트 수, 포트 수) 모양의 uint8 배열에 포트(열)별로
+연속 저장하므로, /16(65,536개 호스트)에서도 포트 하나의 열은 8KB이고 조회가
+마이크로초 단위로 끝난다.
+"""
+
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+__all__ = ["PortMatrix", "PortDiff"]
+
+
+@dataclass
+class PortDiff:
+    """두 스캔 사이의 열린 포트 변화.
+
+    한쪽 스캔에만 있는 호스트는 다른 쪽에서 모든 포트가 닫힌 것으로 보므로,
+    새 호스트의 열린 포트는 `opened`에, 사라진 호스트의 포트는 `closed`에도 나온다.
+
+    Attributes:
+        opened: 호스트 → 새로 열린 포트 (변화가 있는 호스트만)
+        closed: 호스트 → 닫힌 포트 (변화가 있는 호스트만)
+        added_hosts: 새 스캔에만 있는 호스트
+        removed_hosts: 이전 스캔에만 있는 호스트
+    """
+
+    opened: Dict[str, List[int]] = field(default_factory=dict)
+    closed: Dict[str, List[int]] = field(default_factory=dict)
+    added_hosts: List[str] = field(default_factory=list)
+    removed_hosts: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        hosts = self.added_hosts or self.removed_hosts
+        return bool(self.opened or self.closed or hosts)
+
+
+class PortMatrix:
+    """호스트 × 포트 열린 포트 비트 행렬.
+
+    행은 호스트(추가 순서), 열은 포트(오름차순)이다. 열을 따로 주지 않으면
+    한 번이라도 열린 포트들이 열이 된다. 만든 뒤에는 바꾸지 않는다.
+    """
+
+    # 동시 출현 행렬을 계산할 때 한 번에 펼칠 호스트 바이트 수 (8,192개 호스트)
+    CHUNK_BYTES = 1024
+
+    def __init__(
+        self, hosts: Sequence[str], ports: Iterable[int], bits: np.ndarray
+    ) -> None:
+        """
+        Args:
+            hosts: 행 호스트 IP (중복 불가)
+            ports: 열 포트 번호 (오름차순, 중복 불가)
+            bits: `(ceil(len(hosts) / 8), len(ports))` 모양의 uint8 배열.
+                호스트 i의 비트는 `bits[i >> 3, 열] >> (i & 7) & 1`
+
+        Raises:
+            ValueError: 호스트/포트 중복, 정렬되지 않은 포트, 모양이 맞지 않는 비트 배열
+        """
+        self._hosts = np.array(list(hosts), dtype=object)
+        self._rows = {ip: row for row, ip in enumerate(self._hosts.tolist())}
+        self.ports = np.asarray(list(ports), dtype=np.int64)
+        if len(self._rows) != len(self._hosts):
+            raise ValueError("Duplicate hosts in port matrix")
+        if np.any(np.diff(self.ports) <= 0):
+            raise ValueError("Port matrix columns must be unique and sorted")
+        shape = ((len(self._hosts) + 7) // 8, len(self.ports))
+        if bits.shape != shape or bits.dtype != np.uint8:
+            raise ValueError(
+                f"Port matrix bits must be uint8 {shape}, got "
+                f"{bits.dtype} {bits.shape}"
+            )
+        ports = self.ports.tolist()
+        self._columns = {port: col for col, port in enumerate(ports)}
+        self._bits = np.asfortranarray(bits)  # 포트 열마다 연속 메모리
+
+    # ------------------------------------------------------------------ #
+    # 생성
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def from_pairs(
+        cls,
+        ips: Iterable[str],
+        ports: Iterable[int],
+        hosts: Optional[Iterable[str]] = None,
+        columns: Optional[Iterable[int]] = None,
+    ) -> "PortMatrix":
+        """(IP, 열린 포트) 쌍 목록으로 행렬을 만듭니다.
+
+        Args:
+            ips: 쌍의 IP 목록
+            ports: 쌍의 포트 목록 (`ips`와 같은 길이)
+            hosts: 행 호스트 (열린 포트가 없는 호스트 포함, 없으면 쌍에 나온 순서)
+            columns: 열 포트 (스캔한 포트 목록, 없으면 쌍에 나온 포트)
+
+        Raises:
+            ValueError: `hosts`/`columns`에 없는 IP나 포트가 쌍에 있는 경우
+        """
+        ips = list(ips)
+        pair_ports = np.fromiter(ports, dtype=np.int64)
+        if len(ips) != len(pair_ports):
+            raise ValueError("ips and ports must have the same length")
+        host_list = list(dict.fromkeys(ips if hosts is None else hosts))
+        port_cols = np.unique(
+            (
+                pair_ports
+                if columns is None
+                else np.fromiter(
+                    columns,
+                    dtype=np.int64,
+                )
+            ),
+        )
+
+        index = {ip: row for row, ip in enumerate(host_list)}
+        try:
+            rows = np.fromiter(
+                (index[ip] for ip in ips), dtype=np.int64, count=len(ips)
+            )
+        except KeyError as e:
+            raise ValueError(
+                f"Host {e.args[0]} is not a row of the port matrix",
+            ) from e
+        cols = np.searchsorted(port_cols, pair_ports)
+        known = cols < len(port_cols)
+        known[known] = port_cols[cols[known]] == pair_ports[known]
+        if not known.all():
+            raise ValueError(
+                f"Port {int(pair_ports[np.argmin(known)])} "
+                "is not a column of the port matrix"
+            )
+
+        bits = np.zeros(
+            ((len(host_list) + 7) // 8, len(port_cols)),
+            dtype=np.uint8,
+            order="F",
+        )
+        np.bitwise_or.at(
+            bits,
+            (rows >> 3, cols),
+            (1 << (rows & 7)).astype(np.uint8),
+        )
+        return cls(host_list, port_cols, bits)
+
+    @classmethod
+    def from_port_map(
+        cls,
+        port_map: Mapping[str, Iterable[int]],
+        columns: Optional[Iterable[int]] = None,
+    ) -> "PortMatrix":
+        """`PortScanner.scan_many` 결과(IP → 열린 포트)로 행렬을 만듭니다."""
+        ips: List[str] = []
+        ports: List[int] = []
+        for ip, open_ports in port_map.items():
+            open_ports = list(open_ports)
+            ips.extend([ip] * len(open_ports))
+            ports.extend(open_ports)
+        return cls.from_pairs(ips, ports, hosts=port_map, columns=columns)
+
+    @classmethod
+    def from_results(
+        cls,
+        results: Iterable[Dict[str, Any]],
+        columns: Optional[Iterable[int]] = None,
+    ) -> "PortMatrix":
+        """워크플로우 결과 목록의 `open_ports`로 행렬을 만듭니다."""
+        return cls.from_port_map(
+            {r["ip"]: r["open_ports"] for r in results},
+            columns,
+        )
+
+    # ------------------------------------------------------------------ #
+    # 조회
+    # ------------------------------------------------------------------ #
+    @property
+    def hosts(self) -> List[str]:
+        """행 호스트 IP 목록."""
+        return self._hosts.tolist()
+
+    @property
+    def shape(self) -> tuple:
+        """(호스트 수, 포트 수)."""
+        return len(self._hosts), len(self.ports)
+
+    def is_open(self, ip: str, port: int) -> bool:
+        """호스트의 포트가 열려 있었는지 (행렬에 없는 호스트/포트는 False)."""
+        row, col = self._rows.get(ip), self._columns.get(port)
+        if row is None or col is None:
+            return False
+        return bool(self._bits[row >> 3, col] >> (row & 7) & 1)
+
+    def hosts_with_port(self, port: int) -> List[str]:
+        """포트가 열린 호스트 IP 목록 (행 순서)."""
+        col = self._columns.get(port)
+        if col is None:
+            return []
+        return self._hosts[self._column_rows(col)].tolist()
+
+    def ports_of(self, ip: str) -> List[int]:
+        """호스트의 열린 포트 목록 (오름차순)."""
+        row = self._rows.get(ip)
+        if row is None:
+            return []
+        row_bits = (self._bits[row >> 3] >> (row & 7)) & 1
+        return self.ports[row_bits != 0].tolist()
+
+    def prevalence(self) -> np.ndarray:
+        """포트(열)별로 열린 호스트 수 (`ports`와 같은 순서)."""
+        return np.bitwise_count(self._bits).sum(axis=0, dtype=np.int64)
+
+    def co_occurrence(
+        self,
+        ports: Optional[Iterable[int]] = None,
+    ) -> np.ndarray:
+        """포트 쌍마다 두 포트가 모두 열린 호스트 수.
+
+        Args:
+            ports: 대상 포트 (없으면 모든 열). 행렬에 없는 포트의 행/열은 0
+
+        Returns:
+            `[i, j]`가 ports[i]와 ports[j]가 함께 열린 호스트 수인 k × k 배열
+            (대각선은 포트별 열린 호스트 수)
+        """
+        ports = self.ports.tolist() if ports is None else list(ports)
+        cols = np.array(
+            [self._columns.get(port, -1) for port in ports],
+            dtype=np.int64,
+        )
+        known = np.flatnonzero(cols >= 0)
+        counts = np.zeros((len(known), len(known)), dtype=np.int64)
+        selected = self._bits[:, cols[known]]
+        for start in range(0, len(selected), self.CHUNK_BYTES):
+            # 청크마다 (호스트, 포트) 0/1 행렬로 펼쳐 행렬 곱으로 센다 (float32는 2^24까지 정확)
+            end = start + self.CHUNK_BYTES
+            dense = np.unpackbits(
+                selected[start:end], axis=0, bitorder="little"
+            ).astype(np.float32)
+            counts += np.rint(dense.T @ dense).astype(np.int64)
+        result = np.zeros((len(cols), len(cols)), dtype=np.int64)
+        result[np.ix_(known, known)] = counts
+        return result
+
+    def diff(self, previous: "PortMatrix") -> PortDiff:
+        """이전 스캔 행렬과 비교한 열린 포트 변화.
+
+        두 행렬에서 켜진 비트만 (호스트, 포트) 키로 뽑아 집합 차를 구하므로,
+        행렬 크기가 아니라 열린 포트 수에 비례하는 시간과 메모리가 든다.
+        """
+        added = [ip for ip in self._rows if ip not in previous._rows]
+        removed = [ip for ip in previous._rows if ip not in self._rows]
+        hosts = self.hosts + removed  # 호스트 합집합 (현재 행 순서 뒤에 사라진 호스트)
+        union = {ip: row for row, ip in enumerate(hosts)}
+        to_union = np.fromiter(
+            (union[ip] for ip in previous._rows),
+            dtype=np.int64,
+            count=len(previous._hosts),
+        )
+        new, old = self._keys(), previous._keys(to_union)
+        return PortDiff(
+            opened=self._group(
+                hosts,
+                np.setdiff1d(new, old, assume_unique=True),
+            ),
+            closed=self._group(
+                hosts,
+                np.setdiff1d(old, new, assume_unique=True),
+            ),
+            added_hosts=added,
+            removed_hosts=removed,
+        )
+
+    # ------------------------------------------------------------------ #
+    # internal
+    # ------------------------------------------------------------------ #
+    @staticmethod
+    def _set_bits(
+        packed: np.ndarray, rows: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """0이 아닌 바이트만 펼쳐 켜진 비트의 (바이트 위치 번호, 행 번호)를 구합니다.
+
+        Args:
+            packed: 0이 아닌 바이트 값
+            rows: 각 바이트의 호스트 바이트 위치 (행 번호 // 8)
+        """
+        index, bit = np.nonzero(
+            np.unpackbits(packed[:, None], axis=1, bitorder="little")
+        )
+        return index, rows[index] * 8 + bit
+
+    def _column_rows(self, col: int) -> np.ndarray:
+        """열의 비트가 켜진 행 번호 (오름차순)."""
+        column = self._bits[:, col]
+        nonzero = np.flatnonzero(column)
+        return self._set_bits(column[nonzero], nonzero)[1]
+
+    def _keys(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """켜진 비트마다 `행 << 16 | 포트` 키 (정렬됨, `rows`로 행 번호를 바꿀 수 있음)."""
+        byte_rows, cols = np.nonzero(self._bits)
+        index, host_rows = self._set_bits(
+            self._bits[byte_rows, cols],
+            byte_rows,
+        )
+        if rows is not None:
+            host_rows = rows[host_rows]
+        return np.unique(host_rows << 16 | self.ports[cols[index]])
+
+    @staticmethod
+    def _group(hosts: Sequence[str], keys: np.ndarray) -> Dict[str, List[int]]:
+        """정렬된 키를 호스트 → 포트 목록으로 묶습니다."""
+        rows, ports = keys >> 16, keys & 0xFFFF
+        starts = np.flatnonzero(np.diff(rows, prepend=-1))
+        return {
+            hosts[rows[start]]: chunk.tolist()
+            for start, chunk in zip(starts, np.split(ports, starts[1:]))
+        }
@@ -0,0 +1,525 @@
+"""스캔 결과를 SQLite에 저장하고 조회하는 모듈."""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from .port_matrix import PortMatrix
+from .summary import ReportSummary
+from ..utils.exceptions import OutputError
+
+__all__ = ["ResultStore"]
+
+DEFAULT_DB_PATH = "scan_results.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    cidr        TEXT NOT NULL,
+    started_at  TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE TABLE IF NOT EXISTS hosts (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    scan_id     INTEGER NOT NULL REFERENCES scans(id),
+    ip          TEXT NOT NULL,
+    scanned_at  TEXT,
+    partial     TEXT,
+    skipped     TEXT,
+    seq         INTEGER,
+    technique   TEXT,
+    UNIQUE (scan_id, ip)
+);
+CREATE TABLE IF NOT EXISTS ports (
+    scan_id     INTEGER NOT NULL,
+    ip          TEXT NOT NULL,
+    port        INTEGER NOT NULL,
+    PRIMARY KEY (scan_id, ip, port)
+);
+CREATE TABLE IF NOT EXISTS services (
+    scan_id     INTEGER NOT NULL,
+    ip          TEXT NOT NULL,
+    port        INTEGER NOT NULL,
+    name        TEXT NOT NULL,
+    PRIMARY KEY (scan_id, ip, port)
+);
+CREATE TABLE IF NOT EXISTS os (
+    scan_id     INTEGER NOT NULL,
+    ip          TEXT NOT NULL,
+    name        TEXT,
+    PRIMARY KEY (scan_id, ip)
+);
+CREATE TABLE IF NOT EXISTS checks (
+    scan_id     INTEGER NOT NULL,
+    ip          TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    PRIMARY KEY (scan_id, ip, name)
+);
+CREATE INDEX IF NOT EXISTS idx_hosts_ip ON hosts (ip);
+CREATE INDEX IF NOT EXISTS idx_ports_port ON ports (port, scan_id);
+CREATE INDEX IF NOT EXISTS idx_ports_ip ON ports (ip);
+CREATE INDEX IF NOT EXISTS idx_services_name_nocase
+    ON services (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_services_ip ON services (ip);
+CREATE INDEX IF NOT EXISTS idx_checks_name ON checks (name, scan_id);
+"""
+
+# seq 열이 없던 DB에서는 열을 추가한 뒤에 만들어야 하므로 `_migrate`에서 만든다
+_SEQ_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_hosts_seq ON hosts (scan_id, seq, id)
+"""
+
+_HOST_TABLES = ("ports", "services", "os", "checks")
+
+
+class ResultStore:
+    """SQLite 기반 스캔 결과 저장소.
+
+    스캔(scan)마다 id를 발급하고, 호스트가 끝날 때마다 `add_host`로 한 건씩
+    기록한다. 포트/서비스/OS/점검 결과는 각각 별도 테이블에 두고 IP·포트·서비스
+    이름·스캔 id로 색인하므로, 과거 스캔을 포함한 조회도 재스캔 없이 빠르다.
+    점검 결과 값은 형식이 다양하므로 JSON 문자열로 저장한다.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_DB_PATH) -> None:
+        """
+        Args:
+            path: 데이터베이스 파일 경로 (":memory:"이면 메모리 DB)
+
+        Raises:
+            OutputError: 데이터베이스 열기 실패
+        """
+        self.logger = logging.getLogger(__name__)
+        self.path = str(path)
+        self._lock = threading.Lock()
+        try:
+            # 워크플로우의 작업 스레드에서도 쓰므로 연결 하나를 잠금으로 보호해 공유
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            # 점검 결과(JSON 문자열)가 참인지 SQL 집계에서 판단 (ReportSummary와 같은 기준)
+            self._conn.create_function(
+                "json_truthy",
+                1,
+                lambda value: bool(json.loads(value)),
+                deterministic=True,
+            )
+            self._conn.executescript(_SCHEMA)
+            self._migrate()
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to open result store {self.path}: {e}")
+            raise OutputError(f"Failed to open result store: {e}") from e
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """데이터베이스 연결을 닫습니다."""
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------ #
+    # 기록
+    # ------------------------------------------------------------------ #
+    def start_scan(self, cidr: str) -> int:
+        """새 스캔을 등록하고 스캔 id를 반환합니다."""
+        cur = self._execute(
+            "INSERT INTO scans (cidr, started_at) VALUES (?, ?)",
+            (cidr, self._now()),
+        )
+        self.logger.debug(f"Started scan {cur.lastrowid} for {cidr}")
+        return cur.lastrowid
+
+    def finish_scan(self, scan_id: int) -> None:
+        """스캔 종료 시각을 기록합니다."""
+        self._execute(
+            "UPDATE scans SET finished_at = ? WHERE id = ?",
+            (self._now(), scan_id),
+        )
+
+    def add_host(
+        self,
+        scan_id: int,
+        result: Dict[str, Any],
+        scanned_at: Optional[str] = None,
+        seq: Optional[int] = None,
+    ) -> None:
+        """호스트 하나의 스캔 결과를 한 트랜잭션으로 기록합니다 (같은 IP는 교체).
+
+        Args:
+            scan_id: `start_scan`이 반환한 스캔 id
+            result: 워크플로우 결과 딕셔너리 (ip, open_ports, services, os, checks)
+            scanned_at: 상세 스캔이 실제로 수행된 시각 (ISO 8601, 기본 현재 시각).
+                이전 스캔 결과를 이어받을 때 원래 시각을 유지하는 데 쓴다.
+            seq: 스캔 안에서 호스트의 순번 (조회 결과의 순서). 병렬 스캔처럼 완료
+                순서가 대상 순서와 다를 때 지정한다. 없으면 같은 IP의 기존 순번을
+                유지하고, 새 호스트는 맨 뒤에 둔다.
+
+        Raises:
+            OutputError: 기록 실패
+        """
+        ip = result["ip"]
+        key = (scan_id, ip)
+        scanned_at = scanned_at or self._now()
+        with self._lock:
+            try:
+                with self._conn:  # 트랜잭션
+                    self._write_host(key, result, scanned_at, seq)
+            except sqlite3.Error as e:
+                msg = f"Failed to store result for {ip}: {e}"
+                self.logger.error(msg)
+                raise OutputError(msg) from e
+
+    def _write_host(
+        self,
+        key: Tuple[int, str],
+        result: Dict[str, Any],
+        scanned_at: str,
+        seq: Optional[int],
+    ) -> None:
+        """`add_host`의 트랜잭션 본문 (잠금과 트랜잭션은 호출자가 잡는다)."""
+        if seq is None:
+            seq = self._conn.execute(
+                "SELECT COALESCE("
+                "(SELECT seq FROM hosts WHERE scan_id = ? AND ip = ?), "
+                "(SELECT COALESCE(MAX(seq) + 1, 0) FROM hosts "
+                "WHERE scan_id = ?))",
+                (*key, key[0]),
+            ).fetchone()[0]
+        partial = ",".join(result.get("partial") or []) or None
+        skipped = result.get("skipped")
+        skipped = json.dumps(skipped) if skipped else None
+        for table in _HOST_TABLES:
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE scan_id = ? AND ip = ?",
+                key,
+            )
+        self._conn.execute(
+            "INSERT INTO hosts (scan_id, ip, scanned_at, partial, skipped, "
+            "seq, technique) VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (scan_id, ip) DO UPDATE SET "
+            "scanned_at = excluded.scanned_at, partial = excluded.partial, "
+            "skipped = excluded.skipped, seq = excluded.seq, "
+            "technique = excluded.technique",
+            (*key, scanned_at, partial, skipped, seq, result.get("technique")),
+        )
+        self._conn.executemany(
+            "INSERT INTO ports VALUES (?, ?, ?)",
+            [(*key, int(port)) for port in result.get("open_ports", [])],
+        )
+        self._conn.executemany(
+            "INSERT INTO services VALUES (?, ?, ?, ?)",
+            [
+                (*key, int(port), str(name))
+                for port, name in (result.get("services") or {}).items()
+            ],
+        )
+        self._conn.execute(
+            "INSERT INTO os VALUES (?, ?, ?)",
+            (*key, result.get("os")),
+        )
+        self._conn.executemany(
+            "INSERT INTO checks VALUES (?, ?, ?, ?)",
+            [
+                (*key, name, json.dumps(value))
+                for name, value in (result.get("checks") or {}).items()
+            ],
+        )
+
+    # ------------------------------------------------------------------ #
+    # 조회
+    # ------------------------------------------------------------------ #
+    def results(self, scan_id: int) -> List[Dict[str, Any]]:
+        """스캔 결과를 워크플로우 결과 형식(호스트 순번 순서)으로 복원합니다.
+
+        시간 초과로 일부 단계가 부분 결과인 호스트는 `partial` 키에 단계 목록을,
+        회로 차단으로 단계를 건너뛴 호스트는 `skipped` 키에 사유와 단계 목록을,
+        찾아낸 탐색 기법이 기록된 호스트는 `technique` 키에 기법 이름을 담습니다.
+        """
+        return list(self.iter_results(scan_id))
+
+    def iter_results(
+        self, scan_id: int, batch_size: int = 500
+    ) -> Iterator[Dict[str, Any]]:
+        """`results`와 같은 결과를 `batch_size`개 호스트씩 읽어 하나씩 생성합니다.
+
+        한 번에 한 묶음만 메모리에 두므로 큰 스캔의 리포트도 일정한 메모리로 만든다.
+        """
+        last = (-1, 0)  # 마지막으로 읽은 (순번, id)
+        while True:
+            hosts = self._query(
+                "SELECT id, ip, partial, skipped, seq, technique FROM hosts "
+                "WHERE scan_id = ? AND (seq, id) > (?, ?) "
+                "ORDER BY seq, id LIMIT ?",
+                (scan_id, *last, batch_size),
+            )
+            if not hosts:
+                return
+            last = (hosts[-1][4], hosts[-1][0])
+            yield from self._load_hosts(scan_id, hosts)
+
+    def _load_hosts(
+        self,
+        scan_id: int,
+        hosts: List[tuple],
+    ) -> List[Dict[str, Any]]:
+        """hosts 행 묶음의 포트/서비스/OS/점검 결과를 채워 결과 딕셔너리로 만듭니다."""
+        results = {
+            ip: {
+                "ip": ip,
+                "open_ports": [],
+                "services": {},
+                "os": None,
+                "checks": {},
+            }
+            for _, ip, *_ in hosts
+        }
+        where = f"WHERE scan_id = ? AND ip IN ({','.join('?' * len(results))})"
+        params = (scan_id, *results)
+        for ip, port in self._query(
+            f"SELECT ip, port FROM ports {where} ORDER BY ip, port", params
+        ):
+            results[ip]["open_ports"].append(port)
+        for ip, port, name in self._query(
+            f"SELECT ip, port, name FROM services {where} ORDER BY ip, port",
+            params,
+        ):
+            results[ip]["services"][port] = name
+        for ip, name in self._query(
+            f"SELECT ip, name FROM os {where}",
+            params,
+        ):
+            results[ip]["os"] = name
+        for ip, name, value in self._query(
+            f"SELECT ip, name, value FROM checks {where} ORDER BY rowid",
+            params,
+        ):
+            results[ip]["checks"][name] = json.loads(value)
+        for _, ip, partial, skipped, _, technique in hosts:
+            if partial:
+                results[ip]["partial"] = partial.split(",")
+            if skipped:
+                results[ip]["skipped"] = json.loads(skipped)
+            if technique:
+                results[ip]["technique"] = technique
+        return list(results.values())
+
+    def latest_hosts(
+        self, cidr: str
+    ) -> Dict[str, Tuple[Dict[str, Any], Optional[str]]]:
+        """대역의 가장 최근 완료 스캔에서 호스트별 (결과, 상세 스캔 시각)을 반환합니다.
+
+        증분 스캔에서 이전 결과와 비교하거나 이어받을 때 사용합니다.
+        """
+        scan_id = self.latest_scan_id(cidr)
+        if scan_id is None:
+            return {}
+        scanned = dict(
+            self._query(
+                "SELECT ip, scanned_at FROM hosts WHERE scan_id = ?",
+                (scan_id,),
+            )
+        )
+        return {
+            result["ip"]: (result, scanned.get(result["ip"]))
+            for result in self.results(scan_id)
+        }
+
+    def hosts_with_port(
+        self,
+        port: int,
+        scan_id: Optional[int] = None,
+    ) -> List[str]:
+        """포트가 열려 있던 호스트 IP 목록 (scan_id가 없으면 전체 스캔 대상)."""
+        if scan_id is None:
+            rows = self._query(
+                "SELECT DISTINCT ip FROM ports WHERE port = ?",
+                (port,),
+            )
+        else:
+            rows = self._query(
+                "SELECT ip FROM ports WHERE port = ? AND scan_id = ?",
+                (port, scan_id),
+            )
+        return sorted(ip for (ip,) in rows)
+
+    def port_matrix(self, scan_id: int) -> PortMatrix:
+        """스캔의 열린 포트를 호스트 × 포트 비트 행렬로 불러옵니다.
+
+        두 스캔의 변화는 `store.port_matrix(new).diff(store.port_matrix(old))`로 구합니다.
+        """
+        hosts = self._query(
+            "SELECT ip FROM hosts WHERE scan_id = ? ORDER BY seq, id",
+            (scan_id,),
+        )
+        pairs = self._query(
+            "SELECT ip, port FROM ports WHERE scan_id = ?",
+            (scan_id,),
+        )
+        return PortMatrix.from_pairs(
+            [ip for ip, _ in pairs],
+            [port for _, port in pairs],
+            hosts=[ip for (ip,) in hosts],
+        )
+
+    def summary(
+        self,
+        scan_id: int,
+        batch_size: int = 5000,
+        previous: Optional[int] = None,
+    ) -> ReportSummary:
+        """스캔의 리포트 요약을 호스트 `batch_size`개씩 DataFrame으로 집계합니다.
+
+        `ReportSummary.from_results(store.results(scan_id))`와 같은 집계표를 만들되,
+        결과 딕셔너리를 만들지 않고 한 번에 한 묶음의 행만 메모리에 둔다.
+        `previous`(이전 스캔 id)를 주면 두 스캔의 포트 행렬을 비교한 열린 포트
+        변화를 `changes`에 담는다.
+        """
+        summary = ReportSummary()
+        if previous is not None:
+            matrix = self.port_matrix(scan_id)
+            summary.changes = matrix.diff(self.port_matrix(previous))
+        last_id = 0
+        while True:
+            hosts = self._query(
+                "SELECT h.id, h.ip, o.name, h.partial IS NOT NULL, "
+                "h.skipped IS NOT NULL FROM hosts h "
+                "LEFT JOIN os o ON o.scan_id = h.scan_id AND o.ip = h.ip "
+                "WHERE h.scan_id = ? AND h.id > ? ORDER BY h.id LIMIT ?",
+                (scan_id, last_id, batch_size),
+            )
+            if not hosts:
+                return summary
+            last_id = hosts[-1][0]
+            params = (scan_id, *(host[1] for host in hosts))
+            marks = ",".join("?" * len(hosts))
+            where = f"WHERE scan_id = ? AND ip IN ({marks})"
+            # 열린 포트와 서비스만 확인된 포트의 합집합 (호스트, 포트)
+            pairs = self._query(
+                "SELECT p.ip, p.port, s.name FROM ("
+                f"SELECT ip, port FROM ports {where} "
+                f"UNION SELECT ip, port FROM services {where}) p "
+                "LEFT JOIN services s "
+                "ON s.scan_id = ? AND s.ip = p.ip AND s.port = p.port",
+                (*params, *params, scan_id),
+            )
+            checks = self._query(
+                f"SELECT ip, name, json_truthy(value) FROM checks {where}",
+                params,
+            )
+            summary.add_frames(
+                pd.DataFrame(
+                    hosts,
+                    columns=("id", *ReportSummary.HOST_COLUMNS),
+                ),
+                pd.DataFrame(pairs, columns=ReportSummary.PAIR_COLUMNS),
+                pd.DataFrame(checks, columns=ReportSummary.CHECK_COLUMNS),
+            )
+
+    def hosts_with_service(
+        self,
+        name: str,
+        scan_id: Optional[int] = None,
+    ) -> List[str]:
+        """서비스 이름(접두사 일치, 대소문자 무시)으로 호스트 IP 목록을 조회합니다.
+
+        접두사 `LIKE`만 `idx_services_name_nocase` 인덱스 범위 검색을 탈 수
+        있으므로 부분 문자열은 찾지 않으며, 입력의 `%`/`_`는 문자 그대로
+        비교합니다.
+        """
+        escaped = name.replace("\\", "\\\\")
+        escaped = escaped.replace("%", "\\%").replace("_", "\\_")
+        sql = "SELECT DISTINCT ip FROM services WHERE name LIKE ? ESCAPE '\\'"
+        params: tuple = (f"{escaped}%",)
+        if scan_id is not None:
+            sql += " AND scan_id = ?"
+            params += (scan_id,)
+        return sorted(ip for (ip,) in self._query(sql, params))
+
+    def scans(self) -> List[Dict[str, Any]]:
+        """저장된 스캔 목록 (최근 순)."""
+        rows = self._query(
+            "SELECT s.id, s.cidr, s.started_at, s.finished_at, COUNT(h.ip) "
+            "FROM scans s LEFT JOIN hosts h ON h.scan_id = s.id "
+            "GROUP BY s.id ORDER BY s.id DESC"
+        )
+        return [
+            {
+                "id": sid,
+                "cidr": cidr,
+                "started_at": started,
+                "finished_at": finished,
+                "hosts": count,
+            }
+            for sid, cidr, started, finished, count in rows
+        ]
+
+    def latest_scan_id(
+        self, cidr: Optional[str] = None, finished: bool = True
+    ) -> Optional[int]:
+        """가장 최근 스캔 id (cidr 지정 시 해당 대역, 기본은 완료된 스캔만)."""
+        sql = "SELECT MAX(id) FROM scans WHERE 1 = 1"
+        params: tuple = ()
+        if cidr is not None:
+            sql += " AND cidr = ?"
+            params += (cidr,)
+        if finished:
+            sql += " AND finished_at IS NOT NULL"
+        return self._query(sql, params)[0][0]
+
+    # ------------------------------------------------------------------ #
+    # internal
+    # ------------------------------------------------------------------ #
+    def _migrate(self) -> None:
+        """이전 버전 스키마에 없는 열을 추가합니다."""
+        info = self._conn.execute("PRAGMA table_info(hosts)")
+        columns = {row[1] for row in info}
+        for column, kind in (
+            ("scanned_at", "TEXT"),
+            ("partial", "TEXT"),
+            ("skipped", "TEXT"),
+            ("seq", "INTEGER"),
+            ("technique", "TEXT"),
+        ):
+            if column not in columns:
+                self._conn.execute(
+                    f"ALTER TABLE hosts ADD COLUMN {column} {kind}",
+                )
+        if "seq" not in columns:  # 순번이 없던 행은 기록 순서를 유지
+            self._conn.execute("UPDATE hosts SET seq = id")
+        self._conn.execute(_SEQ_INDEX)
+        # 대소문자 구분 인덱스는 LIKE 조회에 쓰이지 않으므로 NOCASE 인덱스로 교체
+        self._conn.execute("DROP INDEX IF EXISTS idx_services_name")
+        self._conn.commit()
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            try:
+                with self._conn:
+                    return self._conn.execute(sql, params)
+            except sqlite3.Error as e:
+                self.logger.error(f"Result store write failed: {e}")
+                raise OutputError(f"Result store write failed: {e}") from e
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            try:
+                return self._conn.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                self.logger.error(f"Result store query failed: {e}")
+                raise OutputError(f"Result store query failed: {e}") from e
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).isoformat(timespec="seconds")
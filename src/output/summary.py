@@ -0,0 +1,248 @@
+"""리포트 요약(대시보드) 집계를 담당하는 모듈.
+
+호스트 결과는 (호스트, 포트)·점검 단위의 행으로 펼쳐 `CHUNK_SIZE`개 호스트씩
+pandas DataFrame으로 만들고, `value_counts`로 한 묶음을 한 번에 집계해 OS/포트/
+서비스/점검별 개수 Series에 더한다. 결과 자체는 보관하지 않으므로 메모리는 한
+묶음의 행과 서로 다른 OS·포트·서비스·점검 이름 수만큼만 쓴다. 포트별 열린
+호스트 수는 묶음마다 `PortMatrix` 비트 행렬을 만들어 열별 비트 수로 센다. 결과
+저장소가 있으면 `ResultStore.summary`가 저장소의 행을 같은 묶음 단위로 읽어
+집계하고, 이전 스캔과 비교한 열린 포트 변화(`PortDiff`)도 붙인다.
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from .port_matrix import PortDiff, PortMatrix
+
+__all__ = ["ReportSummary"]
+
+
+class ReportSummary:
+    """호스트 결과를 묶음 단위 DataFrame으로 집계해 대시보드 집계표를 만드는 클래스.
+
+    점검 결과는 값이 참(True 또는 비어 있지 않은 값)이면 실패(취약)로 센다.
+    `add`로 받은 결과는 묶음이 찰 때까지 행으로만 쌓아 두고, `tables`를 부르면
+    남은 묶음까지 집계한다.
+
+    Attributes:
+        hosts: 지금까지 집계한 호스트 수
+        os_counts: OS별 호스트 수 (식별하지 못한 OS는 `UNKNOWN_OS`)
+        port_counts: 포트별 열린 호스트 수 (서비스만 확인된 포트 포함)
+        service_counts: 서비스 버전 문자열별 (호스트, 포트) 수
+            (식별하지 못한 서비스는 `UNKNOWN_SERVICE`)
+        failed_checks: 점검 항목별 실패 호스트 수
+        totals: Overview 수치 (with_ports, pairs, identified, partial, skipped,
+            failed_hosts)
+        changes: 이전 스캔 대비 열린 포트 변화 (있으면 Port changes 섹션을 만든다)
+    """
+
+    UNKNOWN_OS = "Unknown"
+    UNKNOWN_SERVICE = "(unidentified)"
+    # `add_frames`가 받는 DataFrame의 열
+    HOST_COLUMNS = ("host", "os", "partial", "skipped")
+    PAIR_COLUMNS = ("host", "port", "service")
+    CHECK_COLUMNS = ("host", "name", "failed")
+    # `add`로 받은 결과를 이 수만큼 모았다가 한 번에 집계한다
+    CHUNK_SIZE = 5000
+
+    def __init__(self) -> None:
+        self.hosts = 0
+        self.os_counts = pd.Series(dtype="int64")
+        self.port_counts = pd.Series(dtype="int64")
+        self.service_counts = pd.Series(dtype="int64")
+        self.failed_checks = pd.Series(dtype="int64")
+        self.totals: Counter = Counter()
+        self.changes: Optional[PortDiff] = None
+        # 아직 집계하지 않은 호스트/(호스트, 포트)/점검 행
+        self._rows: Tuple[List[tuple], List[tuple], List[tuple]] = ([], [], [])
+
+    @classmethod
+    def from_results(
+        cls,
+        results: Iterable[Dict[str, Any]],
+    ) -> "ReportSummary":
+        """결과 목록 전체로 요약을 만듭니다."""
+        summary = cls()
+        for result in results:
+            summary.add(result)
+        return summary
+
+    def add(self, result: Dict[str, Any]) -> None:
+        """호스트 결과 하나를 행으로 펼쳐 쌓습니다 (호출자가 동기화).
+
+        쌓인 호스트가 `CHUNK_SIZE`에 닿으면 한 묶음으로 집계한다.
+        """
+        services = result.get("services") or {}
+        checks = result.get("checks") or {}
+        host_rows, pair_rows, check_rows = self._rows
+        host = len(host_rows)  # 묶음 안의 호스트 키 (같은 IP가 다시 와도 따로 센다)
+        host_rows.append(
+            (
+                host,
+                result.get("os"),
+                bool(result.get("partial")),
+                bool(result.get("skipped")),
+            )
+        )
+        pair_rows.extend(
+            (host, port, services.get(port))
+            for port in set(result["open_ports"]) | set(services)
+        )
+        for name, value in checks.items():
+            check_rows.append((host, name, bool(value)))
+        if len(host_rows) >= self.CHUNK_SIZE:
+            self._flush()
+
+    def add_frames(
+        self,
+        hosts: pd.DataFrame,
+        pairs: pd.DataFrame,
+        checks: pd.DataFrame,
+    ) -> None:
+        """호스트 한 묶음의 행을 벡터 연산으로 집계해 누적합니다.
+
+        `host` 열은 묶음 안에서 호스트마다 고유한 키(예: IP)이며, 한 호스트의
+        (호스트, 포트)·점검 행은 모두 같은 묶음에 있어야 한다 (포트가 열린 호스트나
+        점검에 실패한 호스트 수는 묶음 안에서 키의 중복을 제거해 센다).
+
+        Args:
+            hosts: 호스트별 한 행 (`HOST_COLUMNS`: host, os, partial, skipped)
+            pairs: 열린 포트와 서비스만 확인된 포트의 (호스트, 포트)별 한 행
+                (`PAIR_COLUMNS`: host, port, service; 미식별 서비스는 None)
+            checks: 점검 항목별 한 행 (`CHECK_COLUMNS`: host, name, failed)
+        """
+        services = pairs["service"]
+        failed = checks[checks["failed"].astype(bool)]
+        matrix = PortMatrix.from_pairs(
+            pairs["host"], pairs["port"], hosts=hosts["host"]
+        )
+        prevalence = pd.Series(matrix.prevalence(), index=matrix.ports)
+        self.hosts += len(hosts)
+        self.os_counts = self._merged(
+            self.os_counts,
+            hosts["os"].fillna(self.UNKNOWN_OS).value_counts(),
+        )
+        self.port_counts = self._merged(self.port_counts, prevalence)
+        self.service_counts = self._merged(
+            self.service_counts,
+            services.fillna(self.UNKNOWN_SERVICE).value_counts(),
+        )
+        self.failed_checks = self._merged(
+            self.failed_checks, failed["name"].value_counts()
+        )
+        self.totals.update(
+            {
+                "with_ports": pairs["host"].nunique(),
+                "pairs": len(pairs),
+                "identified": int(services.notna().sum()),
+                "partial": int(hosts["partial"].sum()),
+                "skipped": int(hosts["skipped"].sum()),
+                "failed_hosts": failed["host"].nunique(),
+            }
+        )
+
+    def tables(self) -> Dict[str, pd.DataFrame]:
+        """섹션 제목 → 집계표 (Summary 시트에 쓰는 순서).
+
+        - Overview: 호스트/포트/서비스/점검 전체 수치
+        - Hosts by OS: OS별 호스트 수
+        - Open ports: 포트별 열린 호스트 수
+        - Service versions: 서비스 버전 문자열별 (호스트, 포트) 수
+        - Failed checks: 점검 항목별 실패 호스트 수
+        - Port changes: 이전 스캔 대비 열린 포트가 바뀐 호스트 (`changes`가 있을 때만)
+        """
+        self._flush()
+        totals = self.totals
+        overview = pd.DataFrame(
+            {
+                "Metric": [
+                    "Hosts",
+                    "Hosts with open ports",
+                    "Open ports (host-port pairs)",
+                    "Distinct open ports",
+                    "Identified services",
+                    "Partial hosts",
+                    "Skipped hosts",
+                    "Failed checks",
+                    "Hosts with failed checks",
+                ],
+                "Value": [
+                    self.hosts,
+                    totals["with_ports"],
+                    totals["pairs"],
+                    len(self.port_counts),
+                    totals["identified"],
+                    totals["partial"],
+                    totals["skipped"],
+                    int(self.failed_checks.sum()),
+                    totals["failed_hosts"],
+                ],
+            }
+        )
+        tables = {
+            "Overview": overview,
+            "Hosts by OS": self._ranked(self.os_counts, "OS", "Hosts"),
+            "Open ports": self._ranked(self.port_counts, "Port", "Hosts"),
+            "Service versions": self._ranked(
+                self.service_counts,
+                "Service",
+                "Ports",
+            ),
+            "Failed checks": self._ranked(
+                self.failed_checks,
+                "Check",
+                "Hosts",
+            ),
+        }
+        if self.changes is not None:
+            tables["Port changes"] = self._changes_table(self.changes)
+        return tables
+
+    def _flush(self) -> None:
+        """쌓아 둔 행을 DataFrame으로 만들어 집계하고 비웁니다."""
+        hosts, pairs, checks = self._rows
+        if not hosts:
+            return
+        self._rows = ([], [], [])
+        self.add_frames(
+            pd.DataFrame(hosts, columns=self.HOST_COLUMNS),
+            pd.DataFrame(pairs, columns=self.PAIR_COLUMNS),
+            pd.DataFrame(checks, columns=self.CHECK_COLUMNS),
+        )
+
+    @staticmethod
+    def _merged(counts: pd.Series, added: pd.Series) -> pd.Series:
+        """누적 개수 Series에 한 묶음의 값별 개수(`added`)를 더한 Series."""
+        return counts.add(added, fill_value=0).astype("int64")
+
+    @staticmethod
+    def _changes_table(changes: PortDiff) -> pd.DataFrame:
+        """바뀐 호스트마다 (IP, 호스트 변화, 새로 열린 포트, 닫힌 포트) 한 행."""
+        hosts = dict.fromkeys(changes.added_hosts, "New")
+        hosts.update(dict.fromkeys(changes.removed_hosts, "Removed"))
+        ips = list(dict.fromkeys([*changes.opened, *changes.closed, *hosts]))
+
+        def joined(ports: Dict[str, List[int]]) -> List[str]:
+            return [", ".join(map(str, ports.get(ip, []))) for ip in ips]
+
+        return pd.DataFrame(
+            {
+                "IP": ips,
+                "Host": [hosts.get(ip, "") for ip in ips],
+                "Opened": joined(changes.opened),
+                "Closed": joined(changes.closed),
+            }
+        )
+
+    @staticmethod
+    def _ranked(counts: pd.Series, label: str, count: str) -> pd.DataFrame:
+        """값별 개수를 많은 순(같으면 값 순)으로 정렬한 2열 표."""
+        table = counts.rename_axis(label).reset_index(name=count)
+        return table.sort_values(
+            [count, label],
+            ascending=[False, True],
+            kind="stable",
+            ignore_index=True,
+        )
@@ -1,9 +1,16 @@
 """Scanner sub‑package"""
 __all__ = [
-    'nmap_runner',
-    'host_discovery',
-    'port_scanner',
-    'service_detector',
-    'os_fingerprint',
-    'detailed_checks',
+    "nmap_runner",
+    "host_discovery",
+    "port_scanner",
+    "service_detector",
+    "os_fingerprint",
+    "detailed_checks",
+    "combined_scan",
+    "pipeline",
+    "probe_cache",
+    "timeouts",
+    "circuit_breaker",
+    "rate_governor",
+    "resource_governor",
 ]
@@ -0,0 +1,121 @@
+"""응답하지 않거나 필터링된 호스트/서브넷의 남은 단계를 끊는 회로 차단기 모듈.
+
+모든 패킷을 버리거나 리셋하는 대상은 서비스 탐지, OS 탐지, NSE 점검마다
+제한 시간까지 기다리게 만든다. 단계 결과를 호스트와 서브넷(기본 /24) 단위로
+누적해, 연속 실패가 임계값에 닿으면 해당 범위의 남은 단계를 건너뛴다.
+
+서브넷은 시간 초과만 실패로 센다. 탐색에 응답했지만 모든 포트가 필터링된
+호스트는 방화벽 뒤의 정상 호스트일 수 있으므로 그 호스트만 끊고, 같은 서브넷의
+다른 호스트까지 건너뛰게 하지는 않는다.
+"""
+
+import ipaddress
+import logging
+import threading
+from typing import Dict, Optional
+
+__all__ = ["CircuitBreaker", "OK", "TIMEOUT", "FILTERED"]
+
+# 단계 결과 분류
+OK = "ok"
+TIMEOUT = "timeout"  # 제한 시간 또는 호스트 예산 초과
+# 응답 없음 — 호스트가 down이거나 스캔한 포트가 모두 filtered/no-response
+# (닫힌 포트, OS 미식별, 빈 서비스/점검 결과는 응답한 것이므로 OK)
+FILTERED = "filtered"
+
+
+class CircuitBreaker:
+    """호스트별·서브넷별 연속 실패 횟수를 세는 회로 차단기.
+
+    호스트는 시간 초과와 무응답(`FILTERED`)을, 서브넷은 시간 초과(`TIMEOUT`)만
+    실패로 센다. 성공한 단계가 나오면 해당 호스트와 서브넷의 카운터는 0으로
+    돌아가고, 무응답 단계는 서브넷 카운터를 바꾸지 않는다.
+    한 번 열린(trip) 범위는 이번 실행이 끝날 때까지 열린 상태를 유지한다.
+    """
+
+    def __init__(
+        self,
+        host_threshold: Optional[int] = 2,
+        subnet_threshold: Optional[int] = 8,
+        prefix: int = 24,
+    ) -> None:
+        """
+        Args:
+            host_threshold: 호스트의 남은 단계를 건너뛸 연속 실패 단계 수 (None이면 사용 안 함)
+            subnet_threshold: 서브넷의 남은 호스트/단계를 건너뛸 연속 시간 초과 단계
+                수 (None이면 사용 안 함)
+            prefix: 서브넷 범위로 묶을 IPv4 접두사 길이 (IPv6는 /64 고정)
+
+        Raises:
+            ValueError: 1 미만의 임계값 또는 잘못된 접두사 길이
+        """
+        for name, value in (
+            ("host_threshold", host_threshold),
+            ("subnet_threshold", subnet_threshold),
+        ):
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be >= 1: {value}")
+        if not 0 <= prefix <= 32:
+            raise ValueError(f"Invalid subnet prefix: {prefix}")
+        self.logger = logging.getLogger(__name__)
+        self.host_threshold = host_threshold
+        self.subnet_threshold = subnet_threshold
+        self.prefix = prefix
+        self._host_failures: Dict[str, int] = {}
+        self._subnet_failures: Dict[str, int] = {}
+        self._open: Dict[str, str] = {}  # 열린 범위(IP 또는 서브넷) → 사유
+        self._lock = threading.Lock()
+
+    def subnet(self, ip: str) -> str:
+        """IP가 속한 서브넷 (CIDR 표기)."""
+        address = ipaddress.ip_address(ip)
+        prefix = self.prefix if address.version == 4 else 64
+        return str(ipaddress.ip_network(f"{ip}/{prefix}", strict=False))
+
+    def record(self, ip: str, stage: str, outcome: str) -> None:
+        """단계 결과를 기록하고, 임계값에 닿은 범위를 연다."""
+        subnet = self.subnet(ip)
+        with self._lock:
+            if outcome == OK:
+                self._host_failures[ip] = 0
+                self._subnet_failures[subnet] = 0
+                return
+            hosts = self._host_failures.get(ip, 0) + 1
+            subnets = self._subnet_failures.get(subnet, 0)
+            if outcome == TIMEOUT:
+                subnets += 1
+            self._host_failures[ip] = hosts
+            self._subnet_failures[subnet] = subnets
+            if (
+                self.host_threshold is not None
+                and hosts >= self.host_threshold
+                and ip not in self._open
+            ):
+                self._open[ip] = (
+                    f"host unresponsive ({hosts} failed stages, "
+                    f"last {stage} {outcome})"
+                )
+                self.logger.warning(f"Circuit open for {ip}: {self._open[ip]}")
+            if (
+                self.subnet_threshold is not None
+                and subnets >= self.subnet_threshold
+                and subnet not in self._open
+            ):
+                self._open[subnet] = (
+                    f"subnet {subnet} unresponsive "
+                    f"({subnets} consecutive timed-out stages)"
+                )
+                self.logger.warning(
+                    f"Circuit open for {subnet}: {self._open[subnet]}",
+                )
+
+    def reason(self, ip: str) -> Optional[str]:
+        """호스트 또는 그 서브넷의 회로가 열려 있으면 사유, 아니면 None."""
+        subnet = self.subnet(ip)
+        with self._lock:
+            return self._open.get(ip) or self._open.get(subnet)
+
+    def open_scopes(self) -> Dict[str, str]:
+        """열린 범위(IP 또는 서브넷) → 사유."""
+        with self._lock:
+            return dict(self._open)
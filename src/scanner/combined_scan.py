@@ -0,0 +1,131 @@
+"""포트/서비스/OS 탐지를 한 번의 nmap 실행으로 수행하는 모듈."""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from .nmap_runner import NmapRunner
+from .nmap_xml import NmapHost
+from .port_scanner import OpenPorts, ScanTimeout
+from ..utils.network import NetworkUtils
+
+__all__ = ["CombinedScanner"]
+
+
+class CombinedScanner:
+    """`--top-ports` + `-sV` + `-O`를 한 번에 수행하는 단일 패스 스캐너.
+
+    호스트마다 세 번 반복되던 프로브 준비(타이밍 템플릿, 호스트 설정)를
+    한 번으로 줄이며, 결과는 워크플로우 결과 형식
+    (`open_ports`, `services`, `os`)으로 반환한다.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    @classmethod
+    def scan(cls, ip: str, top_ports: int = 100) -> Dict[str, Any]:
+        """단일 호스트의 열린 포트·서비스·OS 정보를 한 번에 탐지합니다.
+
+        Args:
+            ip: 스캔할 IP 주소
+            top_ports: 스캔할 상위 포트 수 (기본값: 100)
+
+        Returns:
+            {"open_ports": [...], "services": {...}, "os": str | None}
+
+        Raises:
+            ValueError: nmap 옵션으로 해석될 수 있는 대상
+            ScanTimeout: 스캔 시간 초과 (`partial`에 이 호스트의 부분 결과)
+        """
+        try:
+            return cls.scan_many([ip], top_ports)[ip]
+        except ScanTimeout as e:
+            partial = e.partial.get(ip)
+            raise ScanTimeout(str(e), partial=partial, hosts=[ip]) from e
+
+    @classmethod
+    def scan_many(
+        cls, ips: Iterable[str], top_ports: int = 100, chunk_size: int = 16
+    ) -> Dict[str, Dict[str, Any]]:
+        """여러 호스트를 청크 단위로 묶어 단일 패스로 스캔합니다.
+
+        Returns:
+            IP → {"open_ports", "services", "os"} (입력한 모든 IP 포함,
+            `open_ports.answered`에 응답 여부)
+
+        Raises:
+            ValueError: nmap 옵션으로 해석될 수 있는 대상 또는 유효하지 않은
+                chunk_size
+            ScanTimeout: 일부 청크의 시간 초과 (`partial`에 전체 결과,
+                `hosts`에 시간 초과된 청크의 IP)
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Invalid chunk size: {chunk_size}")
+
+        targets = list(dict.fromkeys(ips))
+        for ip in targets:
+            if not NetworkUtils.is_safe_target(ip):
+                cls.logger.error(f"Invalid scan target: {ip!r}")
+                raise ValueError(f"Invalid scan target: {ip!r}")
+
+        results = {ip: cls._empty(answered=False) for ip in targets}
+        timed_out: List[str] = []
+        for start in range(0, len(targets), chunk_size):
+            end = start + chunk_size
+            chunk = targets[start:end]
+            cmd = [
+                "nmap",
+                "-T1",
+                "--top-ports",
+                str(top_ports),
+                "-sV",
+                "--version-intensity",
+                "2",
+                "-O",
+                "-oX",
+                "-",
+                *chunk,
+            ]
+
+            result = NmapRunner.execute(cmd, "combined", chunk, top_ports)
+            if result.timed_out:
+                cls.logger.error(
+                    f"Combined scan timeout for {chunk[0]} … {chunk[-1]} "
+                    f"after {result.timeout:.0f}s, keeping partial output"
+                )
+                timed_out.extend(chunk)
+            elif result.returncode != 0:
+                cls.logger.warning(f"Combined scan failed: {result.stderr}")
+                results.update((ip, cls._empty()) for ip in chunk)
+                continue
+
+            for host in result.iter_hosts():
+                if host.ip in results:
+                    results[host.ip] = cls._to_result(host)
+
+        if timed_out:
+            raise ScanTimeout(
+                f"Combined scan timeout for {len(timed_out)} host(s)",
+                partial=results,
+                hosts=timed_out,
+            )
+        return results
+
+    @staticmethod
+    def _empty(answered: bool = True) -> Dict[str, Any]:
+        return {
+            "open_ports": OpenPorts(answered=answered),
+            "services": {},
+            "os": None,
+        }
+
+    @staticmethod
+    def _to_result(host: NmapHost) -> Dict[str, Any]:
+        """NmapHost를 워크플로우 결과 형식으로 변환합니다."""
+        open_ports = OpenPorts(host.open_ports(), host.answered)
+        services: Dict[int, str] = {
+            port.portid: port.service.label()
+            for port in host.ports
+            if port.is_open and port.service is not None
+        }
+        os_info: Optional[str] = host.os_guess()
+        return {"open_ports": open_ports, "services": services, "os": os_info}
@@ -1,80 +1,352 @@
 """상세 보안 점검을 담당하는 모듈."""
 
 import logging
-import subprocess
-from typing import Dict
-import ipaddress
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .nmap_runner import NmapRunner
+from .nmap_xml import NmapHost
+from ..utils.exceptions import ScanTimeout
+from ..utils.network import NetworkUtils
+
+__all__ = ["DetailedChecks", "SecurityCheck", "TLS_PORTS"]
+
+# 서비스 정보가 없어도 TLS로 간주할 잘 알려진 포트
+TLS_PORTS = frozenset(
+    {
+        443,
+        465,
+        563,
+        636,
+        853,
+        989,
+        990,
+        992,
+        993,
+        994,
+        995,
+        2376,
+        3269,
+        5061,
+        5986,
+        6697,
+        8443,
+        9443,
+    }
+)
+# run_many 입력: IP → (열린 포트, 포트별 서비스)
+_HostPorts = Tuple[Optional[Iterable[int]], Optional[Dict[int, str]]]
+
+
+@dataclass(frozen=True)
+class SecurityCheck:
+    """점검 항목 정의.
+
+    Attributes:
+        key: 결과 딕셔너리 키 (예: 'smbv1')
+        script: 실행할 NSE 스크립트
+        ports: 점검이 필요한 포트 — 이 중 하나라도 열려 있어야 실행
+        matcher: 스크립트 출력으로 취약 여부를 판정하는 함수
+        tls: True이면 발견된 모든 TLS 포트에도 적용
+    """
+
+    key: str
+    script: str
+    ports: Tuple[int, ...]
+    matcher: Callable[[str], bool]
+    tls: bool = False
+
+    @property
+    def script_arg(self) -> str:
+        # TLS 점검은 비표준 포트에서도 portrule과 무관하게 실행되도록 '+' 접두사 사용
+        return f"+{self.script}" if self.tls else self.script
 
-__all__ = ['DetailedChecks']
 
 class DetailedChecks:
-    """상세 보안 점검 클래스."""
-    
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
-    
-    def run(self, ip: str) -> Dict[str, bool]:
+    """상세 보안 점검 클래스.
+
+    점검 항목은 `CHECKS` 레지스트리에 등록되며, 각 항목이 선언한 포트/서비스가
+    열려 있을 때만 실행된다. 같은 포트 집합을 쓰는 스크립트는 nmap 한 번으로 묶는다.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    CHECKS: List[SecurityCheck] = [
+        SecurityCheck(
+            "smbv1",
+            "smb-protocols",
+            (445,),
+            lambda out: "SMBv1 enabled" in out,
+        ),
+        SecurityCheck(
+            "anonymous_share",
+            "smb-enum-shares",
+            (445,),
+            lambda out: "Anonymous login" in out,
+        ),
+        SecurityCheck(
+            "weak_tls",
+            "ssl-enum-ciphers",
+            (443,),
+            lambda out: "TLSv1.0" in out or "SSLv3" in out,
+            tls=True,
+        ),
+    ]
+
+    @classmethod
+    def register(cls, check: SecurityCheck) -> None:
+        """점검 항목을 레지스트리에 추가합니다 (같은 key는 교체)."""
+        cls.CHECKS = [c for c in cls.CHECKS if c.key != check.key] + [check]
+
+    @classmethod
+    def run(
+        cls,
+        ip: str,
+        open_ports: Optional[Iterable[int]] = None,
+        services: Optional[Dict[int, str]] = None,
+    ) -> Dict[str, bool]:
         """IP 주소에 대한 상세 보안 점검을 수행합니다.
-        
+
         Args:
             ip: 점검할 IP 주소
-            
+            open_ports: 포트 스캔에서 확인된 열린 포트. None이면 각 점검의
+                기본 포트가 열려 있다고 보고 모든 점검을 실행합니다.
+            services: 포트별 서비스 정보 (`ServiceLabel`이면 TLS 포트 판별에 사용)
+
         Returns:
-            각 보안 항목의 점검 결과를 담은 딕셔너리
-            
+            각 보안 항목의 점검 결과를 담은 딕셔너리 (실행되지 않은 항목은 False)
+
         Raises:
-            ValueError: 유효하지 않은 IP 주소
+            ValueError: nmap 옵션으로 해석될 수 있는 대상
+            ScanTimeout: 일부 점검의 시간 초과. 나머지 점검은 끝까지 실행하며,
+                `partial`에 위 형식의 전체 결과가 담깁니다.
         """
-        try:
-            ipaddress.ip_address(ip)
-        except ValueError as e:
-            self.logger.error(f"Invalid IP address: {ip}")
-            raise ValueError(f"Invalid IP address: {ip}") from e
-        
-        results = {
-            'smbv1': False,
-            'anonymous_share': False,
-            'weak_tls': False
-        }
-        
-        # SMBv1 프로토콜 점검
-        cmd = ["nmap", "--script", "smb-protocols", "-p", "445", ip]
-        self.logger.debug(f"Running SMBv1 check: {' '.join(cmd)}")
-        result = self._run_nmap_script(cmd)
-        if result and "SMBv1 enabled" in result:
-            results['smbv1'] = True
-        
-        # 익명 공유 점검
-        cmd = ["nmap", "--script", "smb-enum-shares", "-p", "445", ip]
-        self.logger.debug(f"Running anonymous share check: {' '.join(cmd)}")
-        result = self._run_nmap_script(cmd)
-        if result and "Anonymous login" in result:
-            results['anonymous_share'] = True
-        
-        # 취약한 TLS 점검
-        cmd = ["nmap", "--script", "ssl-enum-ciphers", "-p", "443", ip]
-        self.logger.debug(f"Running weak TLS check: {' '.join(cmd)}")
-        result = self._run_nmap_script(cmd)
-        if result and ("TLSv1.0" in result or "SSLv3" in result):
-            results['weak_tls'] = True
-        
-        self.logger.debug(f"Detailed checks results for {ip}: {results}")
+        if not NetworkUtils.is_safe_target(ip):
+            cls.logger.error(f"Invalid scan target: {ip!r}")
+            raise ValueError(f"Invalid scan target: {ip!r}")
+
+        results = {check.key: False for check in cls.CHECKS}
+
+        plan = cls._plan(open_ports, services)
+        if not plan:
+            cls.logger.debug(f"No applicable checks for {ip}")
+            return results
+
+        timed_out = False
+        for ports, checks in plan.items():
+            scripts = ",".join(check.script_arg for check in checks)
+            port_arg = ",".join(str(p) for p in ports)
+            cmd = ["nmap", "--script", scripts, "-p", port_arg, "-oX", "-", ip]
+            cls.logger.debug(
+                f"Running checks {[c.key for c in checks]}: {' '.join(cmd)}"
+            )
+            try:
+                outputs = cls._run_nmap_script(
+                    cmd,
+                    [ip],
+                    len(ports) * len(checks),
+                )
+            except ScanTimeout as e:  # 호스트 예산 초과(partial 없음) 포함
+                timed_out = True
+                outputs = e.partial or {}
+            host_outputs = outputs.get(ip, {})
+            for check in checks:
+                output = host_outputs.get(check.script, "")
+                if output and check.matcher(output):
+                    results[check.key] = True
+
+        cls.logger.debug(f"Detailed checks results for {ip}: {results}")
+        if timed_out:
+            raise ScanTimeout(
+                f"Detailed checks timeout for {ip}",
+                partial=results,
+                hosts=[ip],
+            )
         return results
-    
-    def _run_nmap_script(self, cmd: list) -> str:
-        """Nmap 스크립트를 실행하고 결과를 반환합니다."""
-        try:
-            result = subprocess.run(
-                cmd,
-                timeout=300,
-                capture_output=True,
-                text=True,
-                shell=False
+
+    @classmethod
+    def run_many(
+        cls, hosts: Dict[str, _HostPorts], chunk_size: int = 64
+    ) -> Dict[str, Dict[str, bool]]:
+        """여러 호스트의 상세 점검을 (스크립트, 포트) 단위로 묶어 수행합니다.
+
+        같은 스크립트를 같은 포트에서 실행해야 하는 호스트들은 nmap 한 번으로
+        처리하고, 대상 호스트 집합이 같은 스크립트는 다시 하나의 호출로 합칩니다.
+
+        Args:
+            hosts: IP → (열린 포트, 포트별 서비스 정보)
+            chunk_size: nmap 한 번에 넣을 최대 호스트 수
+
+        Returns:
+            IP → `run`과 같은 형식의 점검 결과 딕셔너리
+
+        Raises:
+            ValueError: nmap 옵션으로 해석될 수 있는 대상 또는 유효하지 않은
+                chunk_size
+            ScanTimeout: 일부 청크의 시간 초과. 나머지 청크는 끝까지 실행하며,
+                `partial`에 전체 결과, `hosts`에 시간 초과된 청크의 IP가 담깁니다.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Invalid chunk size: {chunk_size}")
+        for ip in hosts:
+            if not NetworkUtils.is_safe_target(ip):
+                cls.logger.error(f"Invalid scan target: {ip!r}")
+                raise ValueError(f"Invalid scan target: {ip!r}")
+
+        blank = {check.key: False for check in cls.CHECKS}
+        results = {ip: dict(blank) for ip in hosts}
+        timed_out: Set[str] = set()
+
+        # (점검, 포트) → 대상 호스트
+        targets: Dict[Tuple[str, int], List[str]] = {}
+        checks_by_key = {check.key: check for check in cls.CHECKS}
+        for ip, (open_ports, services) in hosts.items():
+            if open_ports is not None:
+                open_ports = list(open_ports)
+            for check in cls.CHECKS:
+                for port in sorted(
+                    cls.applicable_ports(check, open_ports, services),
+                ):
+                    targets.setdefault((check.key, port), []).append(ip)
+
+        # (포트, 호스트 집합) → 점검 목록: 대상이 같으면 스크립트를 합쳐 한 번에 실행
+        groups: Dict[Tuple[int, Tuple[str, ...]], List[SecurityCheck]] = {}
+        for (key, port), ips in targets.items():
+            groups.setdefault((port, tuple(ips)), []).append(
+                checks_by_key[key],
             )
-            if result.returncode == 0:
-                return result.stdout
-            self.logger.warning(f"Script execution failed: {result.stderr}")
-            return ""
-        except subprocess.TimeoutExpired as e:
-            self.logger.error(f"Script execution timeout: {e}")
-            return ""
+
+        cls.logger.debug(
+            f"Batched checks: {len(hosts)} host(s) in {len(groups)} group(s)"
+        )
+        for (port, ips), checks in groups.items():
+            scripts = ",".join(check.script_arg for check in checks)
+            for start in range(0, len(ips), chunk_size):
+                end = start + chunk_size
+                chunk = list(ips[start:end])
+                cmd = [
+                    "nmap",
+                    "--script",
+                    scripts,
+                    "-p",
+                    str(port),
+                    "-oX",
+                    "-",
+                    *chunk,
+                ]
+                cls.logger.debug(
+                    f"Running {scripts} on port {port}: {len(chunk)} host(s)"
+                )
+                try:
+                    outputs = cls._run_nmap_script(cmd, chunk, len(checks))
+                except ScanTimeout as e:
+                    timed_out.update(chunk)
+                    outputs = e.partial or {}
+                for ip in chunk:
+                    host_outputs = outputs.get(ip, {})
+                    for check in checks:
+                        output = host_outputs.get(check.script, "")
+                        if output and check.matcher(output):
+                            results[ip][check.key] = True
+
+        if timed_out:
+            hosts_timed_out = [ip for ip in hosts if ip in timed_out]
+            raise ScanTimeout(
+                f"Detailed checks timeout for {len(hosts_timed_out)} host(s)",
+                partial=results,
+                hosts=hosts_timed_out,
+            )
+        return results
+
+    @classmethod
+    def applicable_ports(
+        cls,
+        check: SecurityCheck,
+        open_ports: Optional[Iterable[int]],
+        services: Optional[Dict[int, str]] = None,
+    ) -> Set[int]:
+        """열린 포트/서비스 정보로 점검이 실행될 포트 집합을 구합니다."""
+        if open_ports is None:
+            return set(check.ports)
+        open_set = set(open_ports)
+        ports = open_set & set(check.ports)
+        if check.tls:
+            ports |= cls.tls_ports(open_set, services)
+        return ports
+
+    @staticmethod
+    def tls_ports(
+        open_ports: Iterable[int], services: Optional[Dict[int, str]] = None
+    ) -> Set[int]:
+        """열린 포트 중 TLS를 사용하는 포트를 반환합니다.
+
+        잘 알려진 TLS 포트이거나, 서비스 탐지가 TLS로 식별한 포트
+        (`ServiceLabel.tls`)이다. 서비스 문자열의 단어로는 판단하지 않는다
+        ("OpenSSL"이 들어간 평문 HTTP 배너 등).
+        """
+        services = services or {}
+        return {
+            port
+            for port in open_ports
+            if port in TLS_PORTS or getattr(services.get(port), "tls", False)
+        }
+
+    @classmethod
+    def _plan(
+        cls,
+        open_ports: Optional[Iterable[int]],
+        services: Optional[Dict[int, str]],
+    ) -> Dict[Tuple[int, ...], List[SecurityCheck]]:
+        """실행할 점검을 포트 집합별로 묶습니다 (같은 포트 집합 = nmap 1회)."""
+        if open_ports is not None:
+            open_ports = list(open_ports)
+        plan: Dict[Tuple[int, ...], List[SecurityCheck]] = {}
+        for check in cls.CHECKS:
+            ports = cls.applicable_ports(check, open_ports, services)
+            if ports:
+                plan.setdefault(tuple(sorted(ports)), []).append(check)
+        return plan
+
+    @classmethod
+    def _run_nmap_script(
+        cls, cmd: list, ips: List[str], probes: int
+    ) -> Dict[str, Dict[str, str]]:
+        """Nmap 스크립트를 실행하고 호스트별·스크립트별 출력을 반환합니다.
+
+        제한 시간은 대상 호스트와 (스크립트 × 포트) 수로 추정합니다.
+
+        Raises:
+            ScanTimeout: 실행 시간 초과 (`partial`에 그때까지 완료된 스크립트 출력)
+        """
+        result = NmapRunner.execute(cmd, "checks", ips, probes)
+        if result.timed_out:
+            cls.logger.error(
+                f"Script execution timeout after {result.timeout:.0f}s",
+            )
+            raise ScanTimeout(
+                "Script execution timeout",
+                partial=cls._parse_nmap_output(result.iter_hosts()),
+                hosts=ips,
+            )
+        if result.returncode == 0:
+            return cls._parse_nmap_output(result.iter_hosts())
+        cls.logger.warning(f"Script execution failed: {result.stderr}")
+        return {}
+
+    @staticmethod
+    def _parse_nmap_output(
+        hosts: Iterable[NmapHost],
+    ) -> Dict[str, Dict[str, str]]:
+        """nmap 호스트 결과에서 IP → 스크립트 ID → 출력 텍스트를 추출합니다.
+
+        같은 스크립트가 여러 포트에서 실행되면 출력을 줄바꿈으로 이어 붙입니다.
+        """
+        outputs: Dict[str, Dict[str, str]] = {}
+        for host in hosts:
+            scripts = outputs.setdefault(host.ip, {})
+            for script in host.script_outputs():
+                if script.id in scripts:
+                    scripts[script.id] += "\n" + script.output
+                else:
+                    scripts[script.id] = script.output
+        return outputs
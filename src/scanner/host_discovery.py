@@ -1,25 +1,271 @@
-"""Host discovery (temporary stub)."""
+"""활성 호스트 탐색을 담당하는 모듈."""
 
-__all__ = ["HostDiscovery"]
+import ipaddress
+import logging
+import queue
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .nmap_runner import NmapRunner
+from .port_scanner import ScanTimeout
+from .timeouts import AdaptiveTimeout
+
+__all__ = ["HostDiscovery", "AliveHost"]
+
+
+@dataclass
+class AliveHost:
+    """발견된 활성 호스트와 이를 찾아낸 탐색 기법 (같은 세그먼트면 MAC 주소 포함)."""
+
+    ip: str
+    technique: str
+    mac: Optional[str] = None
 
 
 class HostDiscovery:
     """
     Discover alive hosts in a network.
 
-    ⚠️  실제 구현 전까지는 테스트 통과용 더미(dirty stub)입니다.
-        ARP → ICMP → `-Pn` 조건부 스캔 로직으로 교체해야 합니다
-        (체크리스트 1.1 반영).
+    대상 대역을 `BLOCK_PREFIX` 크기의 하위 블록으로 나누고, 블록마다
+    ARP → ICMP → TCP SYN/ACK ping 순서의 조건부 스캔을 제한된 병렬도로 수행한다
+    (체크리스트 1.1 반영). 발견된 호스트는 nmap이 보고하는 즉시 생성된다.
+
+    기본(residual) 모드에서는 다음 기법이 아직 응답하지 않은 주소에만 적용되고,
+    `residual=False`이면 이전 기법이 아무것도 찾지 못했을 때만 블록 전체에 적용된다.
+
+    `-Pn`은 nmap이 모든 대상을 살아있다고 보고하게 만들어 응답 없는 주소마다
+    이후 단계의 포트 스캔을 일으키므로, `assume_up=True`로 명시한 경우에만
+    마지막 기법으로 쓴다.
     """
 
-    @staticmethod
-    def host_discovery(cidr: str) -> list[str]:
+    logger = logging.getLogger(__name__)
+
+    # (이름, nmap 옵션) — 비용이 낮은 순서, 모두 실제 응답이 있어야 살아있다고 본다
+    TECHNIQUES = (
+        ("arp", "-PR"),
+        ("icmp", "-PE"),
+        ("tcp-syn", "-PS21,22,25,80,135,443,445,3389,8080"),
+        ("tcp-ack", "-PA80,443"),
+    )
+    # 응답 없이도 살아있다고 간주 (assume_up=True일 때만)
+    ASSUME_UP = ("pn", "-Pn")
+    BLOCK_PREFIX = 24
+    MAX_PARALLEL = 4
+    BLOCK_TIMEOUT = 300  # 스윕 한 번의 최대 제한 시간 (실제 값은 대상 수로 추정)
+    RESIDUAL_CHUNK = 256  # 잔여 주소를 명시적으로 넘길 때 nmap 한 번에 넣을 최대 개수
+
+    @classmethod
+    def host_discovery(
+        cls,
+        cidr: str,
+        block_prefix: int = BLOCK_PREFIX,
+        max_parallel: int = MAX_PARALLEL,
+        residual: bool = True,
+        assume_up: bool = False,
+    ) -> Iterator[str]:
         """
         Args:
             cidr: '192.168.1.0/24' 형식의 네트워크 대역
+            block_prefix: 한 번의 nmap 스윕에 넣을 하위 블록 크기 (기본 /24)
+            max_parallel: 동시에 스윕할 블록 수 (기본 4)
+            residual: 다음 기법을 미응답 주소에만 적용할지 여부 (기본 True)
+            assume_up: 어떤 기법에도 응답하지 않은 주소를 `-Pn`으로 살아있다고
+                간주할지 여부 (기본 False)
+
+        Yields:
+            살아있는 IP 주소 — 발견되는 순서대로 (중복 없음)
+
+        Raises:
+            ValueError: 유효하지 않은 CIDR 형식 또는 병렬도
+        """
+        for host in cls.discover(
+            cidr,
+            block_prefix,
+            max_parallel,
+            residual,
+            assume_up,
+        ):
+            yield host.ip
+
+    @classmethod
+    def discover(
+        cls,
+        cidr: str,
+        block_prefix: int = BLOCK_PREFIX,
+        max_parallel: int = MAX_PARALLEL,
+        residual: bool = True,
+        assume_up: bool = False,
+    ) -> Iterator[AliveHost]:
+        """`host_discovery`와 같지만 호스트를 찾아낸 기법까지 함께 생성한다."""
+        if max_parallel < 1:
+            raise ValueError(f"Invalid parallelism: {max_parallel}")
+        blocks = cls.split_blocks(cidr, block_prefix)
+        cls.logger.info(
+            "Host discovery for %s: %d block(s), parallel %d",
+            cidr,
+            len(blocks),
+            max_parallel,
+        )
+
+        # 큐에는 발견한 호스트와, 스윕이 끝난 블록의 Future가 들어온다
+        found: "queue.Queue[object]" = queue.Queue()
+        techniques = cls.TECHNIQUES + ((cls.ASSUME_UP,) if assume_up else ())
+        stop = threading.Event()
+        pool = ThreadPoolExecutor(
+            max_workers=max_parallel, thread_name_prefix="discovery"
+        )
+        try:
+            for block in blocks:
+                future = pool.submit(
+                    cls._sweep_block, block, found, residual, stop, techniques
+                )
+                future.add_done_callback(found.put)
+
+            remaining = len(blocks)
+            while remaining:
+                item = found.get()
+                if isinstance(item, Future):
+                    remaining -= 1
+                    item.result()  # 블록 스윕의 예기치 않은 오류는 호출자에게 전달
+                else:
+                    yield item
+        finally:
+            # 소비자가 중간에 멈추거나 오류가 나면 시작하지 않은 블록은 취소하고,
+            # 실행 중인 스윕은 다음 결과에서 nmap을 종료하도록 알린 뒤 기다리지 않는다
+            stop.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def split_blocks(
+        cls,
+        cidr: str,
+        block_prefix: int = BLOCK_PREFIX,
+    ) -> List[str]:
+        """CIDR 대역을 block_prefix 크기의 하위 블록 목록으로 나눈다."""
+        try:
+            network = ipaddress.ip_network(cidr)
+        except ValueError as e:
+            cls.logger.error(f"Invalid CIDR format: {cidr}")
+            raise ValueError(f"Invalid CIDR format: {cidr}") from e
+
+        if network.prefixlen >= block_prefix:
+            return [str(network)]
+        blocks = network.subnets(new_prefix=block_prefix)
+        return [str(block) for block in blocks]
+
+    @classmethod
+    def _sweep_block(
+        cls,
+        block: str,
+        found: "queue.Queue[object]",
+        residual: bool = True,
+        stop: Optional[threading.Event] = None,
+        techniques: Optional[Sequence[Tuple[str, str]]] = None,
+    ) -> None:
+        """하위 블록 하나를 스윕하며 발견한 호스트를 큐에 넣는다.
+
+        블록 단위 시간 초과나 nmap 실행 오류(OSError)는 해당 블록에만 영향을 주며,
+        시간 초과 전에 보고된 호스트는 그대로 유지된다. 그 밖의 예외는 Future를
+        통해 `discover` 호출자에게 전달된다. `stop`이 설정되면 스윕을 멈춘다.
+        `techniques`가 없으면 `TECHNIQUES`를 순서대로 쓴다.
+        """
+        stop = stop or threading.Event()
+        alive: Dict[str, str] = {}  # ip → technique
+        pending: Optional[List[str]] = None  # None = 블록 전체
+        try:
+            for name, flag in techniques or cls.TECHNIQUES:
+                if stop.is_set():
+                    break
+                if pending is None:
+                    target_groups = [[block]]
+                    scope = "whole block"
+                else:
+                    target_groups = []
+                    for start in range(0, len(pending), cls.RESIDUAL_CHUNK):
+                        end = start + cls.RESIDUAL_CHUNK
+                        target_groups.append(pending[start:end])
+                    scope = f"{len(pending)} residual"
+                cls.logger.debug(
+                    "Starting %s sweep for %s (%s)",
+                    name,
+                    block,
+                    scope,
+                )
+                for targets in target_groups:
+                    cls._run_technique(name, flag, targets, alive, found, stop)
+
+                if not residual:
+                    if alive:
+                        break
+                    continue
+                pending = [
+                    str(ip)
+                    for ip in ipaddress.ip_network(block).hosts()
+                    if str(ip) not in alive
+                ]
+                if not pending:
+                    break
+        except OSError as exc:
+            cls.logger.error("Host discovery failed for %s: %s", block, exc)
+        finally:
+            cls.logger.debug(
+                "Block %s done: %s",
+                block,
+                dict(Counter(alive.values())),
+            )
+
+    @classmethod
+    def _run_technique(
+        cls,
+        name: str,
+        flag: str,
+        targets: List[str],
+        alive: Dict[str, str],
+        found: "queue.Queue[object]",
+        stop: Optional[threading.Event] = None,
+    ) -> None:
+        """기법 하나로 대상 주소를 스윕하고 새로 발견한 호스트를 기록한다.
 
-        Returns:
-            살아있는 IP 주소 목록 — 현재는 더미 구현으로 빈 리스트 반환
+        nmap이 보고한 RTT는 이후 단계의 제한 시간 추정에 쓰인다. `stop`이 설정되면
+        스트림을 닫아 실행 중인 nmap 프로세스 그룹을 종료한다.
         """
-        # TODO: 실제 ARP/ICMP/Nmap 기반 구현으로 교체
-        return []
+        addresses = sum(
+            ipaddress.ip_network(target, strict=False).num_addresses
+            for target in targets
+        )
+        timeout = min(
+            cls.BLOCK_TIMEOUT,
+            AdaptiveTimeout.timeout("discovery", hosts=addresses),
+        )
+        try:
+            with closing(
+                NmapRunner().stream_hosts(
+                    ["-sn", flag, *targets],
+                    timeout=timeout,
+                ),
+            ) as hosts:
+                for host in hosts:
+                    if stop is not None and stop.is_set():
+                        break  # 스트림을 닫으면서 nmap을 종료한다
+                    if host.srtt:
+                        AdaptiveTimeout.observe_rtt(host.ip, host.srtt)
+                    if host.is_up and host.ip not in alive:
+                        alive[host.ip] = name
+                        found.put(
+                            AliveHost(
+                                ip=host.ip,
+                                technique=name,
+                                mac=host.mac,
+                            ),
+                        )
+        except ScanTimeout:
+            cls.logger.warning(
+                "%s sweep timed out for %s … (%d host(s) kept)",
+                name,
+                targets[0],
+                len(alive),
+            )
@@ -1,23 +1,325 @@
-"""Nmap 실행을 관리하는 모듈."""
+"""Nmap 실행을 관리하는 모듈.
+
+모든 스캐너 모듈은 `NmapRunner.execute`/`stream_hosts`를 통해 nmap을 실행한다.
+실행 계층은 동시 자식 프로세스 수를 제한하고, 시간 초과 시 프로세스 그룹 전체를
+종료하며, 실행마다 경과 시간·CPU 시간·최대 RSS·종료 코드·출력 크기를 기록한다.
+"""
 
 import logging
-import re
+import os
+import signal
 import subprocess
-from typing import List, Dict
-from .host_discovery import HostDiscovery
-from .port_scanner import PortScanner
-from .service_detector import ServiceDetector
-from .os_fingerprint import OSFingerprint
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from .nmap_xml import NmapHost, NmapProgress, NmapXmlStream, iter_hosts
+from .rate_governor import RateGovernor
+from .timeouts import AdaptiveTimeout
+from ..utils.exceptions import ScanTimeout
 import ipaddress
 
-__all__ = ['NmapRunner']
+__all__ = ["NmapRunner", "NmapResult", "NmapInvocation"]
+
+# getrusage의 ru_maxrss 단위 (Linux는 KB, macOS는 바이트)
+_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+@dataclass
+class NmapResult:
+    """nmap 한 번의 실행 결과.
+
+    시간 초과 시에도 예외 대신 `timed_out=True`와 종료 전까지의 출력을 담아 반환한다.
+    `hosts`는 실행 중 stdout 바이트를 그대로 파싱해 둔 호스트 목록이다.
+    """
+
+    cmd: List[str]
+    returncode: Optional[int]
+    stdout: str = ""
+    stderr: str = ""
+    timed_out: bool = False
+    timeout: Optional[float] = None
+    hosts: Optional[List[NmapHost]] = None
+
+    def iter_hosts(self) -> Iterator[NmapHost]:
+        """파싱해 둔 호스트, 없으면 stdout XML에서 파싱한 호스트를 생성한다."""
+        if self.hosts is not None:
+            return iter(self.hosts)
+        return iter_hosts(self.stdout)
+
+
+@dataclass
+class NmapInvocation:
+    """nmap 실행 한 번의 비용 기록."""
+
+    kind: str
+    cmd: List[str]
+    wall_seconds: float
+    cpu_seconds: float
+    peak_rss: int  # 바이트
+    returncode: Optional[int]
+    output_bytes: int
+    timed_out: bool = False
+
 
 class NmapRunner:
     """Nmap 실행을 관리하는 클래스."""
-    
+
+    logger = logging.getLogger(__name__)
+
+    MAX_CHILDREN = 16  # 동시에 실행할 수 있는 nmap 프로세스 수
+    HISTORY = 10000  # 보관할 최근 실행 기록 수
+
+    _pool = threading.BoundedSemaphore(MAX_CHILDREN)
+    _ledger: Deque[NmapInvocation] = deque(maxlen=HISTORY)
+    _ledger_lock = threading.Lock()
+
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-    
+
+    # ------------------------------------------------------------------ #
+    # 실행 계층
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def set_max_children(cls, count: int) -> None:
+        """동시 nmap 프로세스 수 상한을 바꿉니다 (이후 실행부터 적용).
+
+        Raises:
+            ValueError: 1 미만의 값
+        """
+        if count < 1:
+            raise ValueError(f"Invalid child process limit: {count}")
+        cls.MAX_CHILDREN = count
+        cls._pool = threading.BoundedSemaphore(count)
+
+    @classmethod
+    def execute(
+        cls,
+        cmd: Sequence[str],
+        kind: str = "nmap",
+        ips: Sequence[str] = (),
+        ports: int = 1,
+        timeout: Optional[float] = None,
+    ) -> NmapResult:
+        """nmap을 실행하고 종료까지 기다려 결과를 반환합니다.
+
+        자식 프로세스 자리를 얻은 뒤 속도 조절기에서 속도를 할당받고, 제한 시간은
+        지정하지 않으면 `AdaptiveTimeout`으로 추정합니다.
+
+        Args:
+            cmd: 실행할 명령 (`nmap` 포함)
+            kind: 단계 종류 (제한 시간 추정과 비용 집계 단위)
+            ips: 대상 IP (RTT 기반 제한 시간 추정용)
+            ports: 호스트당 대상 포트(또는 스크립트×포트) 수
+            timeout: 제한 시간(초), None이면 추정치
+
+        Raises:
+            DeadlineExceeded: 호스트 시간 예산이 남아 있지 않은 경우
+        """
+        with cls._child_slot(), RateGovernor.governed(cmd) as run:
+            if timeout is None:
+                timeout = AdaptiveTimeout.timeout(
+                    kind, ips, ports, run.template, rate=run.rate
+                )
+            cls.logger.debug(f"Running nmap {kind}: {' '.join(run.cmd)}")
+            return cls._spawn(run.cmd, kind, timeout)
+
+    @classmethod
+    def _spawn(cls, cmd: List[str], kind: str, timeout: float) -> NmapResult:
+        started = time.monotonic()
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            shell=False,
+            start_new_session=True,  # 시간 초과 시 nmap이 띄운 하위 프로세스까지 종료
+        )
+        stdout: List[bytes] = []
+        stderr: List[bytes] = []
+        hosts: List[NmapHost] = []
+
+        def read_stdout() -> None:
+            # 출력이 나오는 대로 파싱해 종료 후 문자열을 다시 파싱하지 않는다
+            parser = NmapXmlStream()
+            for line in proc.stdout:
+                stdout.append(line)
+                hosts.extend(cls._dispatch(parser.feed(line), None))
+            hosts.extend(cls._dispatch(parser.close(), None))
+
+        readers = [
+            threading.Thread(target=read_stdout, daemon=True),
+            threading.Thread(
+                target=lambda: stderr.append(proc.stderr.read()), daemon=True
+            ),
+        ]
+        for reader in readers:
+            reader.start()
+        timed_out = threading.Event()
+        timer = threading.Timer(
+            timeout,
+            cls._kill_group,
+            args=(proc, timed_out),
+        )
+        timer.daemon = True
+        timer.start()
+        try:
+            cpu_seconds, peak_rss = cls._reap(proc)
+        finally:
+            timer.cancel()
+            for reader in readers:
+                reader.join(timeout=5)
+            proc.stdout.close()
+            proc.stderr.close()
+
+        output = b"".join(stdout)
+        result = NmapResult(
+            cmd=cmd,
+            returncode=proc.returncode,
+            stdout=output.decode("utf-8", errors="replace"),
+            stderr=b"".join(stderr).decode("utf-8", errors="replace"),
+            timed_out=timed_out.is_set(),
+            timeout=timeout,
+            hosts=list(hosts),
+        )
+        cls._account(
+            NmapInvocation(
+                kind=kind,
+                cmd=cmd,
+                wall_seconds=time.monotonic() - started,
+                cpu_seconds=cpu_seconds,
+                peak_rss=peak_rss,
+                returncode=result.returncode,
+                output_bytes=len(output),
+                timed_out=result.timed_out,
+            )
+        )
+        if result.timed_out:
+            cls.logger.error(
+                f"nmap {kind} timeout after {timeout:.0f}s: {' '.join(cmd)}"
+            )
+        return result
+
+    @staticmethod
+    def _kill_group(
+        proc: subprocess.Popen, timed_out: Optional[threading.Event] = None
+    ) -> None:
+        """프로세스 그룹 전체를 종료합니다."""
+        if timed_out is not None:
+            timed_out.set()
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except (ProcessLookupError, PermissionError):  # 이미 종료됨
+            pass
+
+    @staticmethod
+    def _reap(proc: subprocess.Popen) -> Tuple[float, int]:
+        """프로세스 종료를 기다리고 (CPU 초, 최대 RSS 바이트)를 반환합니다."""
+        if not hasattr(os, "wait4"):
+            proc.wait()
+            return 0.0, 0
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        return usage.ru_utime + usage.ru_stime, usage.ru_maxrss * _RSS_UNIT
+
+    @classmethod
+    @contextmanager
+    def _child_slot(cls) -> Iterator[None]:
+        pool = cls._pool  # 실행 중 상한이 바뀌어도 같은 세마포어에 반납
+        pool.acquire()
+        try:
+            yield
+        finally:
+            pool.release()
+
+    # ------------------------------------------------------------------ #
+    # 비용 집계
+    # ------------------------------------------------------------------ #
+    @classmethod
+    def _account(cls, invocation: NmapInvocation) -> None:
+        with cls._ledger_lock:
+            cls._ledger.append(invocation)
+        cls.logger.debug(
+            f"nmap {invocation.kind}: exit={invocation.returncode} "
+            f"wall={invocation.wall_seconds:.1f}s "
+            f"cpu={invocation.cpu_seconds:.2f}s "
+            f"rss={invocation.peak_rss / 2**20:.1f}MB "
+            f"out={invocation.output_bytes}B",
+        )
+
+    @classmethod
+    def invocations(cls) -> List[NmapInvocation]:
+        """보관 중인 최근 실행 기록 (오래된 순)."""
+        with cls._ledger_lock:
+            return list(cls._ledger)
+
+    @classmethod
+    def reset_accounting(cls) -> None:
+        """실행 기록을 비웁니다."""
+        with cls._ledger_lock:
+            cls._ledger.clear()
+
+    @classmethod
+    def summary(cls) -> Dict[str, Dict[str, Any]]:
+        """단계 종류별 실행 횟수, 경과/CPU 시간 합계, 최대 RSS, 출력 크기, 시간 초과/실패 수."""
+        totals: Dict[str, Dict[str, Any]] = {}
+        for item in cls.invocations():
+            total = totals.setdefault(
+                item.kind,
+                {
+                    "runs": 0,
+                    "wall_seconds": 0.0,
+                    "cpu_seconds": 0.0,
+                    "peak_rss": 0,
+                    "output_bytes": 0,
+                    "timeouts": 0,
+                    "failures": 0,
+                },
+            )
+            total["runs"] += 1
+            total["wall_seconds"] += item.wall_seconds
+            total["cpu_seconds"] += item.cpu_seconds
+            total["peak_rss"] = max(total["peak_rss"], item.peak_rss)
+            total["output_bytes"] += item.output_bytes
+            total["timeouts"] += item.timed_out
+            total["failures"] += not item.timed_out and item.returncode != 0
+        return totals
+
+    @classmethod
+    def log_summary(cls) -> None:
+        """단계 종류별 비용을 경과 시간이 긴 순서로 로그에 남깁니다."""
+        totals = cls.summary()
+        for kind, total in sorted(
+            totals.items(), key=lambda kv: -kv[1]["wall_seconds"]
+        ):
+            cls.logger.info(
+                f"nmap {kind}: {total['runs']} run(s), wall "
+                f"{total['wall_seconds']:.1f}s, "
+                f"cpu {total['cpu_seconds']:.1f}s, peak rss "
+                f"{total['peak_rss'] / 2**20:.1f}MB, "
+                f"output {total['output_bytes'] / 1024:.0f}KB, "
+                f"{total['timeouts']} timeout(s), "
+                f"{total['failures']} failure(s)",
+            )
+
+    # ------------------------------------------------------------------ #
+    # 기존 인터페이스
+    # ------------------------------------------------------------------ #
     def host_discovery(self, cidr: str) -> List[str]:
         """CIDR 범위 내 활성 호스트를 발견합니다.
         
@@ -35,69 +337,142 @@ class NmapRunner:
         except ValueError as e:
             self.logger.error(f"Invalid CIDR format: {cidr}")
             raise ValueError(f"Invalid CIDR format: {cidr}") from e
-        
-        ips = set()
-        
-        # ARP 스캔
-        self.logger.debug(f"Starting ARP scan for {cidr}")
-        result = subprocess.run(
-            ["nmap", "-sn", "-PR", cidr],
-            timeout=300,
-            capture_output=True,
-            text=True,
+
+        # 하위 블록 단위 병렬 스윕은 HostDiscovery가 담당 (순환 import 방지용 지연 import)
+        from .host_discovery import HostDiscovery
+
+        return sorted(
+            HostDiscovery.host_discovery(cidr),
+            key=ipaddress.ip_address,
+        )
+
+    def stream_hosts(
+        self,
+        args: Sequence[str],
+        timeout: Optional[float] = 300,
+        on_progress: Optional[Callable[[NmapProgress], None]] = None,
+        stats_every: str = "10s",
+    ) -> Iterator[NmapHost]:
+        """nmap을 실행하면서 호스트 결과가 나오는 즉시 하나씩 생성합니다.
+
+        `subprocess.run`과 달리 프로세스 종료를 기다리지 않고 stdout XML을
+        줄 단위로 파싱하므로, 호출 측은 앞선 호스트의 후속 단계를 바로 시작할 수 있습니다.
+        `execute`와 같이 자식 프로세스 자리와 속도를 할당받고, 실행 비용은
+        "discovery" 종류로 기록됩니다.
+
+        Args:
+            args: nmap 인수 (`nmap`, `-oX -` 제외)
+            timeout: 전체 실행 제한 시간(초), None이면 무제한
+            on_progress: `--stats-every` 진행 상황 콜백
+            stats_every: 진행 상황 출력 주기 (on_progress 지정 시에만 사용)
+
+        Yields:
+            완료된 호스트마다 NmapHost
+
+        Raises:
+            ScanTimeout: 제한 시간 초과 (이미 생성된 호스트 결과는 유효)
+        """
+        cmd = ["nmap", *args, "-oX", "-"]
+        if on_progress is not None:
+            cmd += ["--stats-every", stats_every]
+        with self._child_slot(), RateGovernor.governed(cmd) as run:
+            yield from self._stream(run.cmd, timeout, on_progress)
+
+    def _stream(
+        self,
+        cmd: List[str],
+        timeout: Optional[float],
+        on_progress: Optional[Callable[[NmapProgress], None]],
+    ) -> Iterator[NmapHost]:
+        self.logger.debug(f"Streaming nmap command: {' '.join(cmd)}")
+
+        started = time.monotonic()
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             shell=False,
-            check=False
+            start_new_session=True,
         )
-        if result.returncode == 0:
-            ips.update(self._parse_nmap_output(result.stdout))
-        
-        # ICMP 스캔 (ARP 실패 시)
-        if not ips:
-            self.logger.debug(f"Starting ICMP scan for {cidr}")
-            result = subprocess.run(
-                ["nmap", "-sn", "-PE", cidr],
-                timeout=300,
-                capture_output=True,
-                text=True,
-                shell=False,
-                check=False
+        timed_out = threading.Event()
+        timer = (
+            threading.Timer(timeout, self._kill_group, args=(proc, timed_out))
+            if timeout
+            else None
+        )
+        stderr_chunks: List[bytes] = []
+        stderr_reader = threading.Thread(
+            target=lambda: stderr_chunks.append(proc.stderr.read()),
+            daemon=True,
+        )
+        stderr_reader.start()
+        if timer is not None:
+            timer.daemon = True
+            timer.start()
+
+        parser = NmapXmlStream()
+        output_bytes = 0
+        finished = False
+        try:
+            for line in proc.stdout:
+                output_bytes += len(line)
+                yield from self._dispatch(parser.feed(line), on_progress)
+            yield from self._dispatch(parser.close(), on_progress)
+            finished = True
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if not finished:  # 소비자가 중간에 멈춘 경우
+                self._kill_group(proc)
+            cpu_seconds, peak_rss = self._reap(proc)
+            proc.stdout.close()
+            stderr_reader.join(timeout=1)
+            self._account(
+                NmapInvocation(
+                    kind="discovery",
+                    cmd=cmd,
+                    wall_seconds=time.monotonic() - started,
+                    cpu_seconds=cpu_seconds,
+                    peak_rss=peak_rss,
+                    returncode=proc.returncode,
+                    output_bytes=output_bytes,
+                    timed_out=timed_out.is_set(),
+                )
             )
-            if result.returncode == 0:
-                ips.update(self._parse_nmap_output(result.stdout))
-        
-        # TCP Ping (ARP, ICMP 실패 시)
-        if not ips:
-            self.logger.debug(f"Starting TCP ping scan for {cidr}")
-            result = subprocess.run(
-                ["nmap", "-sn", "-Pn", cidr],
-                timeout=300,
-                capture_output=True,
-                text=True,
-                shell=False,
-                check=False
+
+        if timed_out.is_set():
+            self.logger.error(
+                f"nmap streaming timeout after {timeout}s: {' '.join(cmd)}"
             )
-            if result.returncode == 0:
-                ips.update(self._parse_nmap_output(result.stdout))
-        
-        return sorted(list(ips))
-    
-    def _parse_nmap_output(self, output: str) -> set:
-        """Nmap 출력에서 IP 주소를 추출합니다."""
-        pattern = r"Nmap scan report for (\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"
-        return set(re.findall(pattern, output))
-    
+            raise ScanTimeout(f"nmap timeout after {timeout}s")
+        if proc.returncode != 0:
+            stderr = b"".join(stderr_chunks).decode(errors="replace")
+            self.logger.warning(
+                f"nmap exited with {proc.returncode}: {stderr}",
+            )
+
+    @staticmethod
+    def _dispatch(records, on_progress) -> Iterator[NmapHost]:
+        """파서 레코드 중 호스트는 생성하고 진행 상황은 콜백으로 전달합니다."""
+        for record in records:
+            if isinstance(record, NmapProgress):
+                if on_progress is not None:
+                    on_progress(record)
+            else:
+                yield record
+
     def port_scan(self, ip: str) -> List[int]:
         # IMPLEMENT: 포트 스캔
         pass
-    
+
     def service_scan(self, ip: str) -> Dict[int, str]:
         # IMPLEMENT: 서비스 스캔
         pass
-    
+
     def os_fingerprint(self, ip: str) -> str:
         # IMPLEMENT: OS 핑거프린팅
         pass
-    
+
     def detailed_checks(self, ip: str) -> Dict[str, str]:
         # IMPLEMENT: 상세 점검
-        pass 
\ No newline at end of file
+        pass 
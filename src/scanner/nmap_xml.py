@@ -0,0 +1,371 @@
+"""Nmap XML(-oX) 출력을 스트리밍 방식으로 파싱하는 모듈.
+
+`xml.etree.ElementTree.iterparse`로 `<host>` 요소가 끝날 때마다 레코드를 만들고
+즉시 요소를 비우므로, 호스트 수가 많은 출력도 일정한 메모리로 처리한다.
+실행 중인 프로세스의 출력은 `NmapXmlStream`에 조금씩 넣어(feed) 파싱한다.
+"""
+
+import io
+import logging
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, Iterator, List, Optional, Union
+
+__all__ = [
+    "NmapScript",
+    "NmapService",
+    "ServiceLabel",
+    "NmapPort",
+    "NmapOSMatch",
+    "NmapHost",
+    "NmapProgress",
+    "NmapXmlStream",
+    "iter_hosts",
+    "parse_hosts",
+]
+
+logger = logging.getLogger(__name__)
+
+XmlSource = Union[str, bytes, BinaryIO]
+
+
+@dataclass
+class NmapScript:
+    """NSE 스크립트 실행 결과."""
+
+    id: str
+    output: str
+
+
+class ServiceLabel(str):
+    """보고서용 서비스 문자열 + nmap이 판별한 서비스 이름과 터널.
+
+    결과의 `services`(포트 → 문자열) 형식은 그대로 두면서, 상세 점검이 TLS 포트를
+    보고서 문자열의 단어가 아니라 nmap의 `name`/`tunnel`로 판별할 수 있게 한다.
+    JSON(프로브 캐시, 재개 저널)이나 저장소를 거치면 일반 문자열이 된다.
+    """
+
+    # nmap이 TLS 위에서 식별한 서비스 이름 (`ssl/<서비스>` 포함)
+    TLS_NAMES = ("ssl", "https")
+
+    def __new__(cls, text: str, name: str = "", tunnel: str = ""):
+        label = super().__new__(cls, text)
+        label.name = name
+        label.tunnel = tunnel
+        return label
+
+    @property
+    def tls(self) -> bool:
+        """nmap이 TLS 서비스로 식별했는지 (`tunnel="ssl"` 또는 ssl/https 이름)."""
+        return (
+            self.tunnel == "ssl"
+            or self.name in self.TLS_NAMES
+            or self.name.startswith("ssl/")
+        )
+
+
+@dataclass
+class NmapService:
+    """`-sV` 서비스 탐지 결과."""
+
+    name: str = ""
+    product: str = ""
+    version: str = ""
+    extrainfo: str = ""
+    tunnel: str = ""
+
+    def describe(self) -> str:
+        """보고서용 서비스 문자열 (예: 'OpenSSH 8.2p1 (protocol 2.0)')."""
+        text = " ".join(part for part in (self.product, self.version) if part)
+        if not text:
+            return self.name
+        if self.extrainfo:
+            text += f" ({self.extrainfo})"
+        return text
+
+    def label(self) -> ServiceLabel:
+        """`describe` 문자열에 서비스 이름과 터널을 붙인 결과 값."""
+        return ServiceLabel(self.describe(), self.name, self.tunnel)
+
+
+@dataclass
+class NmapPort:
+    """포트 하나의 상태와 서비스/스크립트 정보."""
+
+    portid: int
+    protocol: str = "tcp"
+    state: str = ""
+    service: Optional[NmapService] = None
+    scripts: List[NmapScript] = field(default_factory=list)
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == "open"
+
+
+@dataclass
+class NmapOSMatch:
+    """`-O` OS 탐지 후보."""
+
+    name: str
+    accuracy: int = 0
+
+
+@dataclass
+class NmapHost:
+    """호스트 하나에 대한 스캔 결과."""
+
+    ip: str
+    status: str = ""
+    mac: Optional[str] = None
+    hostnames: List[str] = field(default_factory=list)
+    ports: List[NmapPort] = field(default_factory=list)
+    os_matches: List[NmapOSMatch] = field(default_factory=list)
+    os_classes: List[str] = field(default_factory=list)
+    scripts: List[NmapScript] = field(default_factory=list)
+    srtt: Optional[float] = None  # 평활 RTT(초), `<times srtt>` (마이크로초) 기준
+    extraports: Dict[str, int] = field(default_factory=dict)  # 생략된 포트 상태 → 개수
+
+    # 대상이 응답하지 않았음을 뜻하는 포트 상태
+    SILENT_STATES = frozenset({"filtered", "no-response"})
+
+    @property
+    def is_up(self) -> bool:
+        return self.status == "up"
+
+    @property
+    def answered(self) -> bool:
+        """호스트가 스캔에 응답했는지 (열리거나 닫힌 포트가 하나라도 있는지).
+
+        호스트가 down이거나, 스캔한 포트가 모두 filtered/no-response면 False.
+        """
+        if not self.is_up:
+            return False
+        states = [port.state for port in self.ports] + list(self.extraports)
+        return any(state not in self.SILENT_STATES for state in states)
+
+    def open_ports(self) -> List[int]:
+        """열린 포트 번호 목록 (정렬됨)."""
+        return sorted(port.portid for port in self.ports if port.is_open)
+
+    def os_guess(self) -> Optional[str]:
+        """가장 정확도가 높은 OS 이름, 없으면 osclass 기반 이름."""
+        if self.os_matches:
+            return max(self.os_matches, key=lambda match: match.accuracy).name
+        if self.os_classes:
+            return ", ".join(self.os_classes)
+        return None
+
+    def script_outputs(self) -> List[NmapScript]:
+        """호스트 스크립트와 포트 스크립트 결과를 모두 반환한다."""
+        outputs = list(self.scripts)
+        for port in self.ports:
+            outputs.extend(port.scripts)
+        return outputs
+
+
+@dataclass
+class NmapProgress:
+    """`--stats-every`로 출력되는 진행 상황 (`<taskprogress>`)."""
+
+    task: str
+    percent: float = 0.0
+    remaining: int = 0
+    etc: int = 0
+
+
+class NmapXmlStream:
+    """조각난 XML 입력을 받아 완성된 레코드를 돌려주는 증분 파서.
+
+    `Popen` stdout에서 한 줄씩 읽어 `feed`에 넘기면, 그 시점까지
+    완성된 `NmapHost`/`NmapProgress` 레코드를 반환한다.
+    """
+
+    def __init__(self) -> None:
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root: Optional[ET.Element] = None
+
+    def feed(
+        self,
+        data: Union[str, bytes],
+    ) -> List[Union[NmapHost, NmapProgress]]:
+        """데이터를 추가하고 새로 완성된 레코드 목록을 반환한다."""
+        self._parser.feed(data)
+        return self._drain()
+
+    def close(self) -> List[Union[NmapHost, NmapProgress]]:
+        """입력 종료를 알리고 남은 레코드를 반환한다. 끊긴 XML은 경고만 남긴다."""
+        try:
+            self._parser.close()
+        except ET.ParseError as exc:
+            logger.warning("Incomplete nmap XML output: %s", exc)
+        return self._drain()
+
+    def _drain(self) -> List[Union[NmapHost, NmapProgress]]:
+        records: List[Union[NmapHost, NmapProgress]] = []
+        try:
+            for event, elem in self._parser.read_events():
+                if event == "start":
+                    if self._root is None:
+                        self._root = elem
+                    continue
+                record = _handle_end(elem)
+                if record is not None:
+                    records.append(record)
+                if elem.tag in ("host", "taskprogress"):
+                    self._root.clear()
+        except ET.ParseError as exc:
+            logger.warning("Invalid nmap XML output: %s", exc)
+        return records
+
+
+def iter_hosts(source: XmlSource) -> Iterator[NmapHost]:
+    """Nmap XML 스트림에서 호스트 레코드를 하나씩 생성한다.
+
+    Args:
+        source: XML 문자열/바이트 또는 바이너리 파일 객체 (예: Popen stdout)
+
+    Yields:
+        `<host>` 요소마다 하나의 NmapHost
+
+    출력이 중간에 끊긴 경우(타임아웃 등) 그때까지 완성된 호스트만 생성한다.
+    """
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    root = None
+    try:
+        for event, elem in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                continue
+            if elem.tag == "host":
+                host = _parse_host(elem)
+                if host is not None:
+                    yield host
+            if elem.tag in ("host", "taskprogress"):
+                # 처리한 요소를 루트에서 떼어 메모리를 일정하게 유지
+                root.clear()
+    except ET.ParseError as exc:
+        logger.warning("Incomplete nmap XML output: %s", exc)
+
+
+def parse_hosts(source: XmlSource) -> List[NmapHost]:
+    """`iter_hosts`의 리스트 버전 (작은 단일 호스트 출력용)."""
+    return list(iter_hosts(source))
+
+
+# ---------------------------------------------------------------------- #
+# element → record 변환
+# ---------------------------------------------------------------------- #
+def _handle_end(elem: ET.Element) -> Optional[Union[NmapHost, NmapProgress]]:
+    if elem.tag == "host":
+        return _parse_host(elem)
+    if elem.tag == "taskprogress":
+        return NmapProgress(
+            task=elem.get("task", ""),
+            percent=_to_float(elem.get("percent")),
+            remaining=_to_int(elem.get("remaining")),
+            etc=_to_int(elem.get("etc")),
+        )
+    return None
+
+
+def _parse_host(elem: ET.Element) -> Optional[NmapHost]:
+    ip = None
+    mac = None
+    for address in elem.iter("address"):
+        addrtype = address.get("addrtype")
+        if addrtype in ("ipv4", "ipv6") and ip is None:
+            ip = address.get("addr")
+        elif addrtype == "mac":
+            mac = address.get("addr")
+    if ip is None:
+        return None
+
+    status = elem.find("status")
+    names = elem.iterfind("hostnames/hostname")
+    host = NmapHost(
+        ip=ip,
+        status=status.get("state", "") if status is not None else "",
+        mac=mac,
+        hostnames=[h.get("name", "") for h in names],
+        ports=[_parse_port(port) for port in elem.iterfind("ports/port")],
+        scripts=[_parse_script(s) for s in elem.iterfind("hostscript/script")],
+    )
+
+    for extra in elem.iterfind("ports/extraports"):
+        state = extra.get("state", "")
+        host.extraports[state] = host.extraports.get(state, 0) + _to_int(
+            extra.get("count")
+        )
+
+    times = elem.find("times")
+    if times is not None and times.get("srtt"):
+        host.srtt = _to_int(times.get("srtt")) / 1_000_000
+
+    os_elem = elem.find("os")
+    if os_elem is not None:
+        for match in os_elem.iterfind("osmatch"):
+            host.os_matches.append(
+                NmapOSMatch(
+                    name=match.get("name", ""),
+                    accuracy=_to_int(match.get("accuracy")),
+                )
+            )
+        for osclass in os_elem.iter("osclass"):
+            label = " ".join(
+                part
+                for part in (
+                    osclass.get("vendor"),
+                    osclass.get("osfamily"),
+                    osclass.get("osgen"),
+                )
+                if part
+            )
+            if label and label not in host.os_classes:
+                host.os_classes.append(label)
+    return host
+
+
+def _parse_port(elem: ET.Element) -> NmapPort:
+    state = elem.find("state")
+    service = elem.find("service")
+    return NmapPort(
+        portid=_to_int(elem.get("portid")),
+        protocol=elem.get("protocol", "tcp"),
+        state=state.get("state", "") if state is not None else "",
+        service=(
+            None
+            if service is None
+            else NmapService(
+                name=service.get("name", ""),
+                product=service.get("product", ""),
+                version=service.get("version", ""),
+                extrainfo=service.get("extrainfo", ""),
+                tunnel=service.get("tunnel", ""),
+            )
+        ),
+        scripts=[_parse_script(script) for script in elem.iterfind("script")],
+    )
+
+
+def _parse_script(elem: ET.Element) -> NmapScript:
+    return NmapScript(id=elem.get("id", ""), output=elem.get("output", ""))
+
+
+def _to_int(value: Optional[str]) -> int:
+    try:
+        return int(value) if value is not None else 0
+    except ValueError:
+        return 0
+
+
+def _to_float(value: Optional[str]) -> float:
+    try:
+        return float(value) if value is not None else 0.0
+    except ValueError:
+        return 0.0
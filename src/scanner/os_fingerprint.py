@@ -1,75 +1,88 @@
 """OS 핑거프린팅을 담당하는 모듈."""
 
 import logging
-import re
-import subprocess
-from typing import Optional
-import ipaddress
+from typing import Iterable, Optional
+
+from .nmap_runner import NmapRunner
+from .nmap_xml import NmapHost
+from .probe_cache import MISS, ProbeCache
+from ..utils.exceptions import ScanTimeout
+from ..utils.network import NetworkUtils
 
 __all__ = ['OSFingerprint']
 
+
 class OSFingerprint:
-    """OS 핑거프린팅 클래스."""
-    
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
-    
-    def fingerprint(self, ip: str) -> Optional[str]:
+    """OS 핑거프린팅 클래스.
+
+    `cache`가 설정되어 있으면 IP 단위로 결과를 재사용한다.
+    """
+
+    logger = logging.getLogger(__name__)
+    cache: Optional[ProbeCache] = None
+
+    @classmethod
+    def fingerprint(cls, ip: str) -> Optional[str]:
         """IP 주소의 운영체제 정보를 탐지합니다.
-        
+
         Args:
             ip: 탐지할 IP 주소
-            
+
         Returns:
             운영체제 정보 문자열 또는 None
-            
+
         Raises:
-            ValueError: 유효하지 않은 IP 주소
+            ValueError: nmap 옵션으로 해석될 수 있는 대상
+            ScanTimeout: 탐지 시간 초과 (`partial`에 그때까지 얻은 OS 정보 또는 None)
         """
-        try:
-            ipaddress.ip_address(ip)
-        except ValueError as e:
-            self.logger.error(f"Invalid IP address: {ip}")
-            raise ValueError(f"Invalid IP address: {ip}") from e
-        
-        cmd = ["nmap", "-O", "-T1", ip, "-oG", "-"]
-        self.logger.debug(f"Running OS fingerprint command: {' '.join(cmd)}")
-        
-        try:
-            result = subprocess.run(
-                cmd,
-                timeout=300,
-                capture_output=True,
-                text=True,
-                shell=False
+        if not NetworkUtils.is_safe_target(ip):
+            cls.logger.error(f"Invalid scan target: {ip!r}")
+            raise ValueError(f"Invalid scan target: {ip!r}")
+
+        cache = cls.cache
+        if cache is not None:
+            cached = cache.get("os", ip)
+            if cached is not MISS:
+                return cached
+
+        cmd = ["nmap", "-O", "-T1", ip, "-oX", "-"]
+
+        result = NmapRunner.execute(cmd, "os", [ip], 0)
+        if result.timed_out:
+            cls.logger.error(
+                f"OS fingerprint timeout for {ip} after {result.timeout:.0f}s"
             )
-        except subprocess.TimeoutExpired as e:
-            self.logger.error(f"OS fingerprint timeout for {ip}")
-            return None
-        
+            raise ScanTimeout(
+                f"OS fingerprint timeout for {ip}",
+                partial=cls._parse_nmap_output(result.iter_hosts()),
+                hosts=[ip],
+            )
+
         if result.returncode != 0:
-            self.logger.warning(f"OS fingerprint failed for {ip}: {result.stderr}")
+            cls.logger.warning(
+                f"OS fingerprint failed for {ip}: {result.stderr}",
+            )
             return None
-        
-        os_info = self._parse_nmap_output(result.stdout)
+
+        os_info = cls._parse_nmap_output(result.iter_hosts())
+        if cache is not None:  # 실패/시간 초과 결과는 캐시하지 않음
+            cache.put("os", ip, os_info)
         if os_info:
-            self.logger.debug(f"Found OS info for {ip}: {os_info}")
+            cls.logger.debug(f"Found OS info for {ip}: {os_info}")
         else:
-            self.logger.debug(f"No OS info found for {ip}")
+            cls.logger.debug(f"No OS info found for {ip}")
         return os_info
-    
-    def _parse_nmap_output(self, output: str) -> Optional[str]:
-        """Nmap 출력에서 OS 정보를 추출합니다."""
-        # OS details 패턴
-        pattern = r"OS details: (.*?)(?:\n|$)"
-        match = re.search(pattern, output)
-        if match:
-            return match.group(1).strip()
-        
-        # Running 패턴 (OS details가 없을 때)
-        pattern = r"Running: (.*?)(?:\n|$)"
-        match = re.search(pattern, output)
-        if match:
-            return match.group(1).strip()
-        
+
+    @staticmethod
+    def _parse_nmap_output(hosts: Iterable[NmapHost]) -> Optional[str]:
+        """nmap 호스트 결과에서 OS 정보를 추출합니다.
+
+        정확도가 가장 높은 osmatch(OS details)를 우선하고,
+        없으면 osclass(Running) 정보를 사용합니다.
+        """
+        for host in hosts:
+            os_info = host.os_guess()
+            if os_info:
+                return os_info
+
         return None
@@ -0,0 +1,259 @@
+"""단계(stage) 간 병렬 처리를 위한 생산자/소비자 파이프라인 모듈.
+
+각 단계는 자체 작업 스레드 수를 가지며, 단계 사이는 크기가 제한된 큐로
+연결된다. 뒤 단계가 느리면 큐가 가득 차 앞 단계가 대기하므로(backpressure)
+대역이 커져도 메모리 사용량이 일정하게 유지된다.
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+__all__ = ["Stage", "StageStats", "StagedPipeline", "parse_stage_workers"]
+
+_STOP = object()  # 단계 종료 표시
+
+
+@dataclass
+class Stage:
+    """파이프라인 단계 정의.
+
+    `func`가 None을 반환하면 해당 항목은 이후 단계로 전달되지 않는다.
+    """
+
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+
+
+@dataclass
+class StageStats:
+    """단계별 실행 통계 스냅샷."""
+
+    name: str
+    workers: int
+    queue_depth: int
+    peak_queue_depth: int
+    processed: int
+    dropped: int
+    busy_seconds: float
+    utilisation: float
+
+
+class _StageRuntime:
+    """실행 중인 단계의 큐/스레드/통계를 보관한다."""
+
+    def __init__(self, stage: Stage, queue_size: int) -> None:
+        self.stage = stage
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.alive_workers = stage.workers
+        self.peak_depth = 0
+        self.processed = 0
+        self.dropped = 0
+        self.busy_seconds = 0.0
+
+    def put(self, item: Any) -> None:
+        self.queue.put(item)  # 큐가 가득 차면 여기서 대기 (backpressure)
+        depth = self.queue.qsize()
+        with self.lock:
+            self.peak_depth = max(self.peak_depth, depth)
+
+
+class StagedPipeline:
+    """단계별 동시성 제한과 제한 큐를 갖는 파이프라인."""
+
+    def __init__(self, stages: List[Stage], queue_size: int = 8) -> None:
+        """
+        Args:
+            stages: 순서대로 실행할 단계 목록
+            queue_size: 각 단계 입력 큐의 최대 길이
+
+        Raises:
+            ValueError: 단계가 없거나 작업 수/큐 크기가 1 미만
+        """
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        for stage in stages:
+            if stage.workers < 1:
+                raise ValueError(
+                    f"Stage {stage.name} needs at least one worker",
+                )
+        if queue_size < 1:
+            raise ValueError(f"Invalid queue size: {queue_size}")
+
+        self.logger = logging.getLogger(__name__)
+        self.stages = stages
+        self.queue_size = queue_size
+        self._runtimes: List[_StageRuntime] = []
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    # ------------------------------------------------------------------ #
+    # public
+    # ------------------------------------------------------------------ #
+    def run(self, source: Iterable[Any]) -> List[Any]:
+        """source의 각 항목을 모든 단계에 통과시키고 결과를 입력 순서대로 반환한다.
+
+        Raises:
+            단계 함수에서 발생한 첫 번째 예외 (모든 항목 처리 후 다시 발생)
+        """
+        self._runtimes = [
+            _StageRuntime(stage, self.queue_size) for stage in self.stages
+        ]
+        self._started_at = time.monotonic()
+        self._finished_at = None
+        results: Dict[int, Any] = {}
+        errors: List[BaseException] = []
+
+        threads = []
+        for index, runtime in enumerate(self._runtimes):
+            for n in range(runtime.stage.workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index, results, errors),
+                    name=f"{runtime.stage.name}-{n}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        first = self._runtimes[0]
+        try:
+            for seq, item in enumerate(source):
+                first.put((seq, item))
+        except BaseException as exc:  # 입력(탐색) 단계 오류도 동일하게 처리
+            errors.append(exc)
+        finally:
+            for _ in range(first.stage.workers):
+                first.queue.put(_STOP)
+
+        for thread in threads:
+            thread.join()
+        self._finished_at = time.monotonic()
+
+        self._log_summary()
+        if errors:
+            raise errors[0]
+        return [results[seq] for seq in sorted(results)]
+
+    def stats(self) -> List[StageStats]:
+        """단계별 큐 깊이와 사용률 스냅샷을 반환한다 (실행 중 호출 가능)."""
+        if self._started_at is None:
+            return []
+        end = self._finished_at
+        if end is None:
+            end = time.monotonic()
+        elapsed = max(end - self._started_at, 1e-9)
+
+        snapshot = []
+        for runtime in self._runtimes:
+            with runtime.lock:
+                busy = runtime.busy_seconds
+                snapshot.append(
+                    StageStats(
+                        name=runtime.stage.name,
+                        workers=runtime.stage.workers,
+                        queue_depth=runtime.queue.qsize(),
+                        peak_queue_depth=runtime.peak_depth,
+                        processed=runtime.processed,
+                        dropped=runtime.dropped,
+                        busy_seconds=busy,
+                        utilisation=min(
+                            1.0,
+                            busy / (elapsed * runtime.stage.workers),
+                        ),
+                    )
+                )
+        return snapshot
+
+    # ------------------------------------------------------------------ #
+    # internal
+    # ------------------------------------------------------------------ #
+    def _worker(
+        self, index: int, results: Dict[int, Any], errors: List[BaseException]
+    ) -> None:
+        runtime = self._runtimes[index]
+        downstream = None
+        if index + 1 < len(self._runtimes):
+            downstream = self._runtimes[index + 1]
+
+        while True:
+            entry = runtime.queue.get()
+            if entry is _STOP:
+                break
+            seq, item = entry
+            started = time.monotonic()
+            try:
+                # 앞서 오류가 났으면 순차 실행처럼 나머지 항목은 건너뛴다
+                output = runtime.stage.func(item) if not errors else None
+            except Exception as exc:  # 한 항목의 실패가 다른 항목을 막지 않도록
+                self.logger.error(
+                    "Stage %s failed: %s",
+                    runtime.stage.name,
+                    exc,
+                )
+                errors.append(exc)
+                output = None
+            with runtime.lock:
+                runtime.busy_seconds += time.monotonic() - started
+                runtime.processed += 1
+                if output is None:
+                    runtime.dropped += 1
+
+            if output is None:
+                continue
+            if downstream is None:
+                results[seq] = output
+            else:
+                downstream.put((seq, output))
+
+        # 마지막으로 끝나는 작업 스레드가 다음 단계에 종료를 알린다
+        with runtime.lock:
+            runtime.alive_workers -= 1
+            last = runtime.alive_workers == 0
+        if last and downstream is not None:
+            for _ in range(downstream.stage.workers):
+                downstream.queue.put(_STOP)
+
+    def _log_summary(self) -> None:
+        stats = self.stats()
+        for item in stats:
+            self.logger.info(
+                "Stage %-10s workers=%d processed=%d dropped=%d peak_queue=%d "
+                "util=%.0f%%",
+                item.name,
+                item.workers,
+                item.processed,
+                item.dropped,
+                item.peak_queue_depth,
+                item.utilisation * 100,
+            )
+        if stats:
+            bottleneck = max(stats, key=lambda item: item.utilisation)
+            self.logger.info(
+                "Bottleneck stage: %s (%.0f%% busy)",
+                bottleneck.name,
+                bottleneck.utilisation * 100,
+            )
+
+
+def parse_stage_workers(spec: str) -> Dict[str, int]:
+    """'ports=4,os=1' 형식의 문자열을 단계별 작업 수 딕셔너리로 변환한다.
+
+    Raises:
+        ValueError: 형식 오류 또는 1 미만의 작업 수
+    """
+    limits: Dict[str, int] = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, sep, value = part.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"Invalid stage spec: {part}")
+        workers = int(value)
+        if workers < 1:
+            raise ValueError(f"Stage {name} needs at least one worker")
+        limits[name.strip()] = workers
+    return limits
@@ -1,79 +1,169 @@
 """포트 스캐닝을 담당하는 모듈."""
 
 import logging
-import re
-import subprocess
-from typing import List
-import ipaddress
+from typing import Dict, Iterable, List
 
-__all__ = ['PortScanner', 'ScanTimeout']
+from .nmap_runner import NmapRunner
+from .nmap_xml import NmapHost
+from ..utils.exceptions import ScanTimeout
+from ..utils.network import NetworkUtils
+
+__all__ = ["OpenPorts", "PortScanner", "ScanTimeout"]
+
+
+class OpenPorts(list):
+    """열린 포트 번호 목록 + 호스트가 스캔에 응답했는지 여부.
+
+    열린 포트가 없어도 닫힌 포트로 응답한 호스트(`answered=True`)와, down이거나
+    모든 포트가 필터링된 호스트(`answered=False`)를 회로 차단기가 구분할 수 있게 한다.
+    nmap 실행 자체가 실패한 경우에는 응답 여부를 알 수 없으므로 True로 둔다.
+    """
+
+    __slots__ = ("answered",)
+
+    def __init__(
+        self,
+        ports: Iterable[int] = (),
+        answered: bool = True,
+    ) -> None:
+        super().__init__(ports)
+        self.answered = answered
 
-class ScanTimeout(Exception):
-    """스캔 시간 초과 예외."""
-    pass
 
 class PortScanner:
     """포트 스캐너 클래스."""
-    
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
-    
-    def scan(self, ip: str, top_ports: int = 100) -> List[int]:
+
+    logger = logging.getLogger(__name__)
+
+    @classmethod
+    def scan(cls, ip: str, top_ports: int = 100) -> OpenPorts:
         """IP 주소의 열린 포트를 스캔합니다.
-        
+
         Args:
             ip: 스캔할 IP 주소
             top_ports: 스캔할 상위 포트 수 (기본값: 100)
-            
+
         Returns:
-            발견된 열린 포트 번호 리스트 (정렬됨)
-            
+            발견된 열린 포트 번호 리스트 (정렬됨, `answered`에 응답 여부)
+
         Raises:
-            ValueError: 유효하지 않은 IP 주소
-            ScanTimeout: 스캔 시간 초과
+            ValueError: nmap 옵션으로 해석될 수 있는 대상
+            ScanTimeout: 스캔 시간 초과 (`partial`에 그때까지 발견한 열린 포트)
         """
-        try:
-            ipaddress.ip_address(ip)
-        except ValueError as e:
-            self.logger.error(f"Invalid IP address: {ip}")
-            raise ValueError(f"Invalid IP address: {ip}") from e
-        
-        cmd = ["nmap", "-T1", "--top-ports", str(top_ports), "-oG", "-", ip]
-        self.logger.debug(f"Running port scan command: {' '.join(cmd)}")
-        
-        try:
-            result = subprocess.run(
-                cmd,
-                timeout=300,
-                capture_output=True,
-                text=True,
-                shell=False
+        if not NetworkUtils.is_safe_target(ip):
+            cls.logger.error(f"Invalid scan target: {ip!r}")
+            raise ValueError(f"Invalid scan target: {ip!r}")
+
+        cmd = ["nmap", "-T1", "--top-ports", str(top_ports), "-oX", "-", ip]
+
+        result = NmapRunner.execute(cmd, "ports", [ip], top_ports)
+        parsed = cls._parse_nmap_output(result.iter_hosts())
+        if result.timed_out:
+            partial = cls._ports_for(parsed, ip)
+            cls.logger.error(
+                f"Port scan timeout for {ip} after {result.timeout:.0f}s "
+                f"({len(partial)} open port(s) so far)"
             )
-        except subprocess.TimeoutExpired as e:
-            self.logger.error(f"Port scan timeout for {ip}")
-            raise ScanTimeout(f"Port scan timeout for {ip}") from e
-        
+            raise ScanTimeout(
+                f"Port scan timeout for {ip}", partial=partial, hosts=[ip]
+            )
+
         if result.returncode != 0:
-            self.logger.warning(f"Port scan failed for {ip}: {result.stderr}")
-            return []
-        
-        open_ports = self._parse_nmap_output(result.stdout)
-        self.logger.debug(f"Found {len(open_ports)} open ports for {ip}")
-        return sorted(open_ports)
-    
-    def _parse_nmap_output(self, output: str) -> List[int]:
-        """Nmap 출력에서 열린 포트 번호를 추출합니다."""
-        pattern = r"Ports: (.*?)\t"
-        match = re.search(pattern, output)
-        if not match:
-            return []
-        
-        ports_str = match.group(1)
-        open_ports = []
-        
-        for port_info in ports_str.split(", "):
-            if "/open" in port_info:
-                port = int(port_info.split("/")[0])
-                open_ports.append(port)
-        
+            cls.logger.warning(f"Port scan failed for {ip}: {result.stderr}")
+            return OpenPorts()
+
+        open_ports = cls._ports_for(parsed, ip)
+        cls.logger.debug(f"Found {len(open_ports)} open ports for {ip}")
         return open_ports
+
+    @classmethod
+    def scan_many(
+        cls, ips: Iterable[str], top_ports: int = 100, chunk_size: int = 64
+    ) -> Dict[str, OpenPorts]:
+        """여러 IP 주소를 청크 단위로 묶어 한 번의 nmap 실행으로 스캔합니다.
+
+        Args:
+            ips: 스캔할 IP 주소 목록
+            top_ports: 스캔할 상위 포트 수 (기본값: 100)
+            chunk_size: nmap 프로세스 하나에 전달할 최대 호스트 수 (기본값: 64)
+
+        Returns:
+            IP 주소를 키로, 열린 포트 리스트(정렬됨)를 값으로 하는 딕셔너리.
+            입력한 모든 IP가 키로 포함되며, 열린 포트가 없으면 빈 리스트입니다
+            (출력에 없는 호스트는 `answered=False`).
+
+        Raises:
+            ValueError: nmap 옵션으로 해석될 수 있는 대상 또는 유효하지 않은
+                chunk_size
+            ScanTimeout: 일부 청크의 시간 초과. 나머지 청크는 끝까지 스캔하며,
+                `partial`에 전체 결과, `hosts`에 시간 초과된 청크의 IP가 담깁니다.
+        """
+        if chunk_size < 1:
+            raise ValueError(f"Invalid chunk size: {chunk_size}")
+
+        targets = list(dict.fromkeys(ips))  # 순서 유지 중복 제거
+        for ip in targets:
+            if not NetworkUtils.is_safe_target(ip):
+                cls.logger.error(f"Invalid scan target: {ip!r}")
+                raise ValueError(f"Invalid scan target: {ip!r}")
+
+        results = {ip: OpenPorts(answered=False) for ip in targets}
+        timed_out: List[str] = []
+        for start in range(0, len(targets), chunk_size):
+            end = start + chunk_size
+            chunk = targets[start:end]
+            cmd = [
+                "nmap",
+                "-T1",
+                "--top-ports",
+                str(top_ports),
+                "-oX",
+                "-",
+                *chunk,
+            ]
+            cls.logger.debug(
+                f"Running batch port scan for {len(chunk)} host(s)",
+            )
+
+            result = NmapRunner.execute(cmd, "ports", chunk, top_ports)
+            if result.timed_out:
+                cls.logger.error(
+                    f"Batch port scan timeout for {chunk[0]} … {chunk[-1]} "
+                    f"after {result.timeout:.0f}s, keeping partial output"
+                )
+                timed_out.extend(chunk)
+            elif result.returncode != 0:
+                cls.logger.warning(f"Batch port scan failed: {result.stderr}")
+                results.update((ip, OpenPorts()) for ip in chunk)
+                continue
+
+            parsed = cls._parse_nmap_output(result.iter_hosts())
+            for ip, open_ports in parsed.items():
+                if ip in results:
+                    results[ip] = open_ports
+
+        cls.logger.debug(
+            f"Batch port scan finished: {len(targets)} host(s), "
+            f"{sum(1 for ports in results.values() if ports)} with open ports"
+        )
+        if timed_out:
+            raise ScanTimeout(
+                f"Port scan timeout for {len(timed_out)} host(s)",
+                partial=results,
+                hosts=timed_out,
+            )
+        return results
+
+    @staticmethod
+    def _parse_nmap_output(hosts: Iterable[NmapHost]) -> Dict[str, OpenPorts]:
+        """nmap 호스트 결과에서 호스트별 열린 포트 번호와 응답 여부를 추출합니다."""
+        parsed: Dict[str, OpenPorts] = {}
+        for host in hosts:
+            parsed[host.ip] = OpenPorts(host.open_ports(), host.answered)
+        return parsed
+
+    @staticmethod
+    def _ports_for(parsed: Dict[str, OpenPorts], ip: str) -> OpenPorts:
+        """파싱 결과에서 한 호스트의 포트를 꺼낸다 (출력에 없으면 무응답)."""
+        ports = parsed.get(ip)
+        return ports if ports is not None else OpenPorts(answered=False)
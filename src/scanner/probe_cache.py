@@ -0,0 +1,189 @@
+"""서비스/OS 탐지 결과를 디스크에 캐시하는 모듈."""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from ..utils.exceptions import StateError
+
+__all__ = ["ProbeCache", "MISS"]
+
+DEFAULT_CACHE_PATH = "probe_cache.db"
+
+MISS = object()  # 캐시에 없음 (None 결과도 캐시되므로 별도 표시 사용)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS probes (
+    key      TEXT PRIMARY KEY,
+    value    TEXT NOT NULL,
+    created  REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_probes_accessed ON probes (accessed);
+"""
+
+
+class ProbeCache:
+    """TTL과 크기 제한(LRU 제거)이 있는 SQLite 기반 프로브 결과 캐시.
+
+    키는 (탐지 종류, IP, 포트 집합, MAC)이며 값은 JSON으로 저장한다.
+    파일을 공유하면 중단 후 재실행이나 같은 현장의 다른 작업자 실행에서도
+    TTL 안의 동일한 nmap 호출을 건너뛸 수 있다.
+
+    호출자가 MAC을 넘기지 않으면 `remember_mac`으로 기억해 둔 그 IP의 MAC을
+    키에 넣으므로, 같은 세그먼트에서 IP가 다른 장비에 다시 할당되면 miss가 된다.
+    MAC을 알 수 없는 (라우터 너머의) 호스트는 TTL로만 오래된 결과를 거른다.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = DEFAULT_CACHE_PATH,
+        ttl: float = 4 * 3600,
+        max_entries: int = 10000,
+    ) -> None:
+        """
+        Args:
+            path: 캐시 파일 경로 (":memory:"이면 메모리)
+            ttl: 항목 유효 시간(초)
+            max_entries: 최대 항목 수, 넘으면 가장 오래 쓰이지 않은 항목부터 제거
+
+        Raises:
+            ValueError: 0 이하의 ttl 또는 max_entries
+            StateError: 캐시 파일 열기 실패
+        """
+        if ttl <= 0 or max_entries < 1:
+            limits = f"ttl={ttl}, max_entries={max_entries}"
+            raise ValueError(f"Invalid probe cache limits: {limits}")
+        self.logger = logging.getLogger(__name__)
+        self.path = str(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._macs: Dict[str, str] = {}  # IP → 탐색 때 본 MAC
+        try:
+            self._conn = sqlite3.connect(
+                self.path,
+                timeout=10,
+                check_same_thread=False,
+            )
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to open probe cache {self.path}: {e}")
+            raise StateError(f"Failed to open probe cache: {e}") from e
+
+    def __enter__(self) -> "ProbeCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """캐시 파일을 닫습니다."""
+        with self._lock:
+            self._conn.close()
+
+    def get(
+        self,
+        kind: str,
+        ip: str,
+        ports: Iterable[int] = (),
+        mac: Optional[str] = None,
+    ) -> Any:
+        """캐시된 결과를 반환합니다. 없거나 만료되었으면 `MISS`."""
+        key = self._key(kind, ip, ports, mac or self._macs.get(ip))
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value, created FROM probes WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] > self.ttl:
+                    with self._conn:
+                        self._conn.execute(
+                            "DELETE FROM probes WHERE key = ?",
+                            (key,),
+                        )
+                    row = None
+                if row is not None:
+                    with self._conn:
+                        self._conn.execute(
+                            "UPDATE probes SET accessed = ? WHERE key = ?",
+                            (now, key),
+                        )
+            except sqlite3.Error as e:  # 캐시 오류로 스캔이 멈추지 않도록 miss 처리
+                self.logger.warning(f"Probe cache read failed: {e}")
+                row = None
+            self._count(kind, "hits" if row is not None else "misses")
+        if row is None:
+            return MISS
+        self.logger.debug(f"Probe cache hit: {key}")
+        return json.loads(row[0])
+
+    def put(
+        self,
+        kind: str,
+        ip: str,
+        value: Any,
+        ports: Iterable[int] = (),
+        mac: Optional[str] = None,
+    ) -> None:
+        """결과를 저장하고 크기 제한을 넘으면 오래 쓰이지 않은 항목을 제거합니다."""
+        key = self._key(kind, ip, ports, mac or self._macs.get(ip))
+        now = time.time()
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO probes "
+                        "(key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                        (key, json.dumps(value), now, now),
+                    )
+                    cur = self._conn.execute("SELECT COUNT(*) FROM probes")
+                    size = cur.fetchone()[0]
+                    if size > self.max_entries:
+                        self._conn.execute(
+                            "DELETE FROM probes WHERE key IN (SELECT key "
+                            "FROM probes ORDER BY accessed LIMIT ?)",
+                            (size - self.max_entries,),
+                        )
+            except sqlite3.Error as e:
+                self.logger.warning(f"Probe cache write failed: {e}")
+
+    def remember_mac(self, ip: str, mac: str) -> None:
+        """탐색에서 본 IP의 MAC을 기억해 이후 그 IP의 캐시 키에 넣습니다."""
+        with self._lock:
+            self._macs[ip] = mac
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """탐지 종류별 hit/miss 횟수."""
+        with self._lock:
+            return {kind: dict(c) for kind, c in self._counters.items()}
+
+    def log_stats(self) -> None:
+        """hit/miss 횟수를 로그로 남깁니다."""
+        for kind, counts in sorted(self.stats().items()):
+            self.logger.info(
+                f"Probe cache {kind}: {counts['hits']} hit(s), "
+                f"{counts['misses']} miss(es)"
+            )
+
+    def _count(self, kind: str, outcome: str) -> None:
+        counts = self._counters.setdefault(kind, {"hits": 0, "misses": 0})
+        counts[outcome] += 1
+
+    @staticmethod
+    def _key(
+        kind: str,
+        ip: str,
+        ports: Iterable[int],
+        mac: Optional[str],
+    ) -> str:
+        port_part = ",".join(str(p) for p in sorted(set(ports)))
+        return f"{kind}|{ip}|{port_part}|{(mac or '').lower()}"
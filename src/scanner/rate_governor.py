@@ -0,0 +1,201 @@
+"""동시에 실행되는 모든 nmap 프로세스의 전송 속도를 한도 안으로 묶는 모듈.
+
+배포 환경의 네트워크 부하 상한(설계 목표 1 Mbps 미만)을 지키기 위해, 전체
+패킷/초 예산을 실행 중인 nmap 프로세스들에 나눠 주고 각 프로세스에는
+`--max-rate`로 몫을 전달한다. 실행 중인 nmap의 속도는 바꿀 수 없으므로, 끝난
+프로세스의 몫은 다음에 시작하는 프로세스들에 다시 분배된다.
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence
+
+__all__ = ["RateGovernor", "RateLease", "DEFAULT_TEMPLATE"]
+
+DEFAULT_TEMPLATE = 3  # nmap 기본 타이밍 템플릿 (-T 미지정 시)
+_TEMPLATE = re.compile(r"-T([0-5])$")
+
+
+@dataclass
+class RateLease:
+    """nmap 한 번의 실행 허가.
+
+    Attributes:
+        cmd: 속도 제한 옵션이 반영된 명령
+        template: 실제로 적용될 타이밍 템플릿 (제한 시간 추정용)
+        rate: 할당된 최대 패킷/초 (조절기가 없으면 None)
+    """
+
+    cmd: List[str]
+    template: int
+    rate: Optional[float] = None
+
+
+def template_of(cmd: Sequence[str]) -> int:
+    """명령의 `-T<n>` 타이밍 템플릿 (없으면 nmap 기본값)."""
+    for arg in cmd:
+        match = _TEMPLATE.match(arg)
+        if match:
+            return int(match.group(1))
+    return DEFAULT_TEMPLATE
+
+
+class RateGovernor:
+    """프로세스별 `--max-rate` 할당으로 전체 전송 속도를 제한하는 조절기.
+
+    전체 예산을 예상 동시 실행 수(`slots`)로 나눈 몫을 기본 단위로 하되, 비어 있는
+    슬롯 몫만 남겨 두고 나머지 여유분은 새로 시작하는 프로세스에 준다. 할당 합계가
+    상한을 넘지 않도록, 여유분이 `min_rate`보다 작으면 다른 프로세스가 끝날 때까지
+    기다린다. 워크플로우 실행 중에는 `active`에 설치되어 모든 스캐너가 공유한다.
+    """
+
+    logger = logging.getLogger(__name__)
+    active: Optional["RateGovernor"] = None  # 실행 중인 워크플로우가 설치한 조절기
+
+    # 대역폭 예산을 패킷/초로 바꿀 때 쓰는 평균 패킷 크기 (헤더 포함 프로브 기준)
+    PACKET_BYTES = 64
+
+    def __init__(
+        self,
+        max_rate: Optional[float] = None,
+        max_bandwidth: Optional[float] = None,
+        slots: int = 1,
+        min_rate: float = 1.0,
+        template: int = DEFAULT_TEMPLATE,
+    ) -> None:
+        """
+        Args:
+            max_rate: 전체 상한 (패킷/초)
+            max_bandwidth: 전체 상한 (비트/초) — `max_rate`와 함께 주면 더 작은 쪽 사용
+            slots: 예상 동시 nmap 실행 수 (`expect`로 실행 중 변경 가능)
+            min_rate: 프로세스 하나에 줄 최소 속도 — 여유분이 이보다 작으면 대기
+            template: 속도 제한이 걸린 명령의 `-T0`/`-T1`을 바꿀 타이밍 템플릿.
+                느린 템플릿의 scan delay가 할당 속도보다 먼저 처리량을 막지 않게 한다
+
+        Raises:
+            ValueError: 상한이 없거나 0 이하, 또는 잘못된 slots/min_rate/template
+        """
+        limits = [max_rate] if max_rate is not None else []
+        if max_bandwidth:
+            limits.append(max_bandwidth / (self.PACKET_BYTES * 8))
+        if not limits or min(limits) <= 0:
+            raise ValueError(
+                f"Invalid rate limit: max_rate={max_rate}, "
+                f"max_bandwidth={max_bandwidth}"
+            )
+        if slots < 1 or min_rate <= 0 or not 0 <= template <= 5:
+            raise ValueError(
+                f"Invalid governor settings: slots={slots}, "
+                f"min_rate={min_rate}, template={template}"
+            )
+        self.max_rate = min(limits)
+        self.min_rate = min(min_rate, self.max_rate)
+        self.slots = slots
+        self.template = template
+        self._leases: Dict[int, float] = {}
+        self._next_id = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            "processes": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "peak_rate": 0.0,
+        }
+
+    # ------------------------------------------------------------------ #
+    # 할당
+    # ------------------------------------------------------------------ #
+    def expect(self, slots: int) -> None:
+        """예상 동시 실행 수를 바꿉니다 (이후 할당부터 적용)."""
+        with self._cond:
+            self.slots = max(slots, 1)
+            self._cond.notify_all()
+        self.logger.debug(
+            f"Rate governor: {self.max_rate:g} pps over {self.slots} slot(s)"
+        )
+
+    def allocated(self) -> float:
+        """현재 실행 중인 프로세스에 할당된 속도 합계 (패킷/초)."""
+        with self._cond:
+            return sum(self._leases.values())
+
+    @contextmanager
+    def lease(self) -> Iterator[float]:
+        """속도를 할당받아 실행 동안 보유하고, 끝나면 반납합니다."""
+        with self._cond:
+            started = time.monotonic()
+            rate = self._grant()
+            if rate < self.min_rate:
+                self._stats["waits"] += 1
+                while rate < self.min_rate:
+                    self._cond.wait()
+                    rate = self._grant()
+                self._stats["wait_seconds"] += time.monotonic() - started
+            lease_id = self._next_id
+            self._next_id += 1
+            self._leases[lease_id] = rate
+            self._stats["processes"] += 1
+            self._stats["peak_rate"] = max(
+                self._stats["peak_rate"], sum(self._leases.values())
+            )
+        try:
+            yield rate
+        finally:
+            with self._cond:
+                del self._leases[lease_id]
+                self._cond.notify_all()
+
+    def _grant(self) -> float:
+        """지금 시작하는 프로세스에 줄 수 있는 속도 (호출자가 잠금 보유)."""
+        available = self.max_rate - sum(self._leases.values())
+        idle = max(self.slots - len(self._leases) - 1, 0)
+        rate = max(available - idle * self.max_rate / self.slots, 0.0)
+        # `--max-rate` 표기에서 반올림으로 넘지 않도록
+        return math.floor(rate * 100) / 100
+
+    # ------------------------------------------------------------------ #
+    # 명령 변환
+    # ------------------------------------------------------------------ #
+    def rewrite(self, cmd: Sequence[str], rate: float) -> List[str]:
+        """`--max-rate`를 넣고, 느린 타이밍 템플릿은 `template`으로 바꾼 명령."""
+        args = []
+        for arg in cmd[1:]:
+            if _TEMPLATE.match(arg) and int(arg[2:]) < self.template:
+                arg = f"-T{self.template}"
+            args.append(arg)
+        return [cmd[0], "--max-rate", f"{rate:.2f}", *args]
+
+    @classmethod
+    @contextmanager
+    def governed(cls, cmd: Sequence[str]) -> Iterator[RateLease]:
+        """설치된 조절기가 있으면 속도를 할당받은 명령으로, 없으면 그대로 실행하게 합니다."""
+        governor = cls.active
+        if governor is None:
+            yield RateLease(list(cmd), template_of(cmd))
+            return
+        with governor.lease() as rate:
+            governed = governor.rewrite(cmd, rate)
+            yield RateLease(governed, template_of(governed), rate)
+
+    # ------------------------------------------------------------------ #
+    # 통계
+    # ------------------------------------------------------------------ #
+    def stats(self) -> Dict[str, float]:
+        """실행한 프로세스 수, 대기 횟수/시간, 최대 동시 할당 속도."""
+        with self._cond:
+            return dict(self._stats)
+
+    def log_stats(self) -> None:
+        """할당 통계를 로그로 남깁니다."""
+        stats = self.stats()
+        self.logger.info(
+            f"Rate governor: {stats['processes']} nmap run(s), peak "
+            f"{stats['peak_rate']:.1f}"
+            f"/{self.max_rate:g} pps, {stats['waits']} wait(s) "
+            f"({stats['wait_seconds']:.1f}s)",
+        )
@@ -0,0 +1,324 @@
+"""스캐너 PC의 CPU/메모리 사용량에 맞춰 동시 스캔 수를 조절하는 모듈.
+
+제품 목표(스캐너 PC CPU·RAM 5% 미만)를 지키기 위해, 자기 프로세스와 nmap 자식
+프로세스의 사용량을 주기적으로 측정해 동시에 실행할 수 있는 스캔 단계 수를
+줄이거나 늘린다. 모든 조절 결정은 로그와 `decisions()`에 남겨 사후에 검토할 수 있다.
+
+`resource` 모듈과 procfs는 POSIX 전용이다. 둘 다 없는 플랫폼(Windows)에서는
+자기 프로세스의 CPU 시간(`time.process_time`)만 측정하고 메모리는 0으로 본다.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+__all__ = ["ResourceGovernor", "ResourceSample", "GovernorDecision"]
+
+
+@dataclass
+class ResourceSample:
+    """한 번의 측정값.
+
+    Attributes:
+        cpu_percent: 직전 측정 이후 자기 프로세스+자식 프로세스의 CPU 사용률
+            (전체 코어 대비 %)
+        mem_percent: 자기 프로세스+실행 중인 자식 프로세스의 RSS (전체 메모리 대비 %)
+        children: 실행 중인 자식 프로세스 수
+    """
+
+    cpu_percent: float
+    mem_percent: float
+    children: int = 0
+
+
+@dataclass
+class GovernorDecision:
+    """동시 실행 수 조절 결정 기록."""
+
+    at: str
+    action: str  # "shrink" | "grow"
+    workers_from: int
+    workers_to: int
+    cpu_percent: float
+    mem_percent: float
+    reason: str
+
+
+class ResourceGovernor:
+    """CPU/메모리 상한에 맞춰 동시 스캔 수를 조절하는 조절기.
+
+    상한을 넘으면 초과 비율만큼 동시 실행 수를 줄이고, 두 사용률이 모두
+    상한 × `headroom` 아래이면서 대기 중인 스캔이 있으면 하나씩 늘린다.
+    줄여도 이미 실행 중인 스캔은 끝까지 실행되고, 새 스캔만 자리가 날 때까지 기다린다.
+    """
+
+    def __init__(
+        self,
+        cpu_limit: float = 5.0,
+        mem_limit: float = 5.0,
+        interval: float = 2.0,
+        min_workers: int = 1,
+        headroom: float = 0.8,
+        proc_root: str = "/proc",
+    ) -> None:
+        """
+        Args:
+            cpu_limit: CPU 사용률 상한 (전체 코어 대비 %)
+            mem_limit: 메모리 사용률 상한 (전체 메모리 대비 %)
+            interval: 측정 주기(초)
+            min_workers: 줄일 수 있는 최소 동시 실행 수
+            headroom: 늘리기 전에 요구하는 여유 비율 (상한 × headroom 미만일 때만 증가)
+            proc_root: procfs 경로 (없으면 `resource.getrusage`, 그것도 없으면
+                자기 프로세스 CPU 시간만으로 대체 측정)
+
+        Raises:
+            ValueError: 0 이하의 상한/주기 또는 잘못된 min_workers/headroom
+        """
+        if cpu_limit <= 0 or mem_limit <= 0 or interval <= 0:
+            raise ValueError(
+                f"Invalid resource limits: cpu={cpu_limit}, mem={mem_limit}, "
+                f"interval={interval}"
+            )
+        if min_workers < 1 or not 0 < headroom <= 1:
+            raise ValueError(
+                f"Invalid governor settings: min_workers={min_workers}, "
+                f"headroom={headroom}"
+            )
+        self.logger = logging.getLogger(__name__)
+        self.cpu_limit = cpu_limit
+        self.mem_limit = mem_limit
+        self.interval = interval
+        self.min_workers = min_workers
+        self.headroom = headroom
+        self.proc = Path(proc_root)
+        self.max_workers = min_workers
+        self._limit = min_workers
+        self._active = 0
+        self._waiting = 0
+        self._cond = threading.Condition()
+        self._decisions: List[GovernorDecision] = []
+        self._last: Optional[Tuple[float, float]] = None  # (측정 시각, 누적 CPU 초)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------ #
+    # 동시 실행 제한
+    # ------------------------------------------------------------------ #
+    @property
+    def limit(self) -> int:
+        """현재 허용된 동시 실행 수."""
+        with self._cond:
+            return self._limit
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """동시 실행 자리를 얻을 때까지 기다렸다가 실행 동안 보유합니다."""
+        with self._cond:
+            self._waiting += 1
+            try:
+                while self._active >= self._limit:
+                    self._cond.wait()
+            finally:
+                self._waiting -= 1
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    # ------------------------------------------------------------------ #
+    # 측정 / 조절
+    # ------------------------------------------------------------------ #
+    def start(self, max_workers: int) -> None:
+        """최대 동시 실행 수를 정하고 주기적 측정을 시작합니다."""
+        with self._cond:
+            self.max_workers = max(max_workers, self.min_workers)
+            self._limit = self.max_workers
+            self._cond.notify_all()
+        self._last = None
+        self.sample()  # CPU 사용률 기준점
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="resource-governor", daemon=True
+        )
+        self._thread.start()
+        self.logger.info(
+            f"Resource governor: cpu<{self.cpu_limit:g}% "
+            f"mem<{self.mem_limit:g}%, "
+            f"{self.max_workers} worker(s), sampling every {self.interval:g}s",
+        )
+        if resource is None and not self.proc.is_dir():
+            self.logger.warning(
+                "Resource governor: no procfs or getrusage on this platform, "
+                "measuring own CPU time only"
+            )
+
+    def stop(self) -> None:
+        """측정을 멈추고 조절 결과를 요약해 로그로 남깁니다."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+        shrinks = sum(1 for d in self._decisions if d.action == "shrink")
+        grows = len(self._decisions) - shrinks
+        self.logger.info(
+            f"Resource governor: {shrinks} shrink(s), {grows} grow(s), "
+            f"final {self.limit} worker(s)",
+        )
+
+    def decisions(self) -> List[GovernorDecision]:
+        """지금까지의 조절 결정 목록."""
+        with self._cond:
+            return list(self._decisions)
+
+    def adjust(self, sample: ResourceSample) -> Optional[GovernorDecision]:
+        """측정값에 따라 동시 실행 수를 조절하고, 바꿨으면 결정을 기록합니다."""
+        with self._cond:
+            current = self._limit
+            over = max(
+                sample.cpu_percent / self.cpu_limit,
+                sample.mem_percent / self.mem_limit,
+            )
+            growable = current < self.max_workers and self._waiting
+            if over > 1 and current > self.min_workers:
+                target = max(
+                    self.min_workers,
+                    min(current - 1, int(current / over)),
+                )
+                action = "shrink"
+                reason = (
+                    "usage over limit (cpu "
+                    f"{sample.cpu_percent:.1f}%/{self.cpu_limit:g}%, "
+                    f"mem {sample.mem_percent:.1f}%/{self.mem_limit:g}%)"
+                )
+            elif over < self.headroom and growable:
+                target = current + 1
+                action = "grow"
+                reason = (
+                    f"{self._waiting} scan(s) waiting with usage below "
+                    f"{self.headroom:.0%} of limit"
+                )
+            else:
+                return None
+            self._limit = target
+            decision = GovernorDecision(
+                at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                action=action,
+                workers_from=current,
+                workers_to=target,
+                cpu_percent=sample.cpu_percent,
+                mem_percent=sample.mem_percent,
+                reason=reason,
+            )
+            self._decisions.append(decision)
+            self._cond.notify_all()
+        self.logger.info(
+            f"Resource governor {action}: {current} -> {target}, {reason}",
+        )
+        return decision
+
+    def sample(self) -> ResourceSample:
+        """자기 프로세스와 nmap 자식 프로세스의 CPU/메모리 사용률을 측정합니다.
+
+        CPU는 직전 측정 이후 사용한 CPU 시간(자기 + 종료된 자식 + 실행 중인 자식)을
+        경과 시간과 코어 수로 나눈 값이며, 첫 측정은 0입니다.
+        """
+        now = time.monotonic()
+        children = self._children()
+        cpu_seconds = self._own_cpu() + sum(cpu for cpu, _ in children)
+
+        cpu_percent = 0.0
+        if self._last is not None:
+            elapsed = now - self._last[0]
+            if elapsed > 0:
+                cpu_percent = (
+                    max(cpu_seconds - self._last[1], 0.0)
+                    / elapsed
+                    / (os.cpu_count() or 1)
+                    * 100
+                )
+        self._last = (now, cpu_seconds)
+
+        rss = self._own_rss() + sum(rss for _, rss in children)
+        total = self._total_memory()
+        mem_percent = rss / total * 100 if total else 0.0
+        return ResourceSample(cpu_percent, mem_percent, len(children))
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.adjust(self.sample())
+            except OSError as exc:  # 측정 실패로 스캔이 멈추지 않도록
+                self.logger.warning(f"Resource sampling failed: {exc}")
+
+    # ------------------------------------------------------------------ #
+    # procfs 읽기
+    # ------------------------------------------------------------------ #
+    def _children(self) -> List[Tuple[float, int]]:
+        """실행 중인 직계 자식 프로세스별 (누적 CPU 초, RSS 바이트)."""
+        if not self.proc.is_dir():
+            return []
+        ticks = os.sysconf("SC_CLK_TCK")
+        page = os.sysconf("SC_PAGE_SIZE")
+        parent = os.getpid()
+        children = []
+        for entry in self.proc.iterdir():
+            if not entry.name.isdigit():
+                continue
+            try:
+                # comm에 공백/괄호가 있을 수 있으므로 마지막 ')' 뒤부터 필드를 센다
+                fields = (entry / "stat").read_text().rsplit(")", 1)[1].split()
+                if int(fields[1]) != parent:
+                    continue
+                # utime, stime
+                cpu = (int(fields[11]) + int(fields[12])) / ticks
+                rss = int(fields[21]) * page
+            except (OSError, IndexError, ValueError):  # 그 사이 종료된 프로세스
+                continue
+            children.append((cpu, rss))
+        return children
+
+    @staticmethod
+    def _own_cpu() -> float:
+        """자기 프로세스와 종료된 자식 프로세스의 누적 CPU 초."""
+        if resource is None:
+            return time.process_time()  # 종료된 자식의 CPU 시간은 알 수 없음
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        reaped = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return own.ru_utime + own.ru_stime + reaped.ru_utime + reaped.ru_stime
+
+    def _own_rss(self) -> int:
+        try:
+            return int(
+                (self.proc / "self" / "statm").read_text().split()[1]
+            ) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, IndexError, ValueError, AttributeError):
+            # procfs가 없으면 최대 RSS(Linux는 KB 단위)로 대신한다
+            if resource is None:
+                return 0
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def _total_memory(self) -> int:
+        try:
+            for line in (self.proc / "meminfo").read_text().splitlines():
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) * 1024
+        except (OSError, IndexError, ValueError):
+            pass
+        try:
+            return os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, AttributeError):  # Windows에는 sysconf가 없음
+            return 0
@@ -1,17 +1,46 @@
 """스캔 워크플로우를 관리하는 모듈."""
 
 import logging
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, nullcontext
+from datetime import datetime, timedelta, timezone
+from itertools import chain
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import (
+    Callable,
+    List,
+    Dict,
+    Any,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+    Union,
+)
 
-from .host_discovery import HostDiscovery
+from .host_discovery import AliveHost, HostDiscovery
 from .port_scanner import PortScanner
 from .service_detector import ServiceDetector
 from .os_fingerprint import OSFingerprint
 from .detailed_checks import DetailedChecks
+from .combined_scan import CombinedScanner
+from .nmap_runner import NmapRunner
+from .pipeline import Stage, StageStats, StagedPipeline
+from .probe_cache import ProbeCache
+from .rate_governor import RateGovernor
+from .resource_governor import ResourceGovernor
+from .circuit_breaker import FILTERED, OK, TIMEOUT, CircuitBreaker
+from .timeouts import HostBudget
+from ..utils.exceptions import ScanTimeout
+from ..core.host_result import HostResult
 from ..core.resume import ResumeManager
-from ..core.state import StateManager
+from ..core.state import StateJournal, StateManager
 from ..output.excel_writer import ExcelWriter  # Excel 리포트 모듈
+from ..output.exporters import ResultExporter
+from ..output.result_store import ResultStore
+from ..utils.network import NetworkUtils
 
 __all__ = ["ScanWorkflow"]
 
@@ -19,67 +48,851 @@ __all__ = ["ScanWorkflow"]
 class ScanWorkflow:
     """호스트 → 포트 → 서비스 → OS → 상세 점검을 순차로 수행하는 워크플로우."""
 
-    def __init__(self, network_cidr: str, top_ports: int = 100) -> None:
+    STAGES = ("ports", "services", "os", "checks")
+    # -O 와 NSE 스크립트는 포트 스윕보다 훨씬 무거우므로 동시 실행 수를 낮게 둔다
+    DEFAULT_STAGE_WORKERS = {"ports": 4, "services": 2, "os": 1, "checks": 1}
+    # 호스트 하나가 모든 단계에서 쓸 수 있는 기본 시간 예산(초)
+    DEFAULT_HOST_TIMEOUT = 3600.0
+    # Excel 리포트 경로 (현재 작업 디렉터리 기준)
+    REPORT_PATH = Path("scan_results.xlsx")
+
+    def __init__(
+        self,
+        network_cidr: str,
+        top_ports: int = 100,
+        workers: int = 1,
+        port_chunk_size: int = 1,
+        stage_workers: Optional[Dict[str, int]] = None,
+        queue_size: int = 8,
+        check_chunk_size: int = 1,
+        combined: bool = False,
+        checkpoint: bool = True,
+        store: Optional[ResultStore] = None,
+        incremental: bool = False,
+        max_age: timedelta = timedelta(days=30),
+        probe_cache: Optional[ProbeCache] = None,
+        host_timeout: Optional[float] = DEFAULT_HOST_TIMEOUT,
+        breaker_threshold: Optional[int] = 2,
+        subnet_breaker_threshold: Optional[int] = 8,
+        rate_governor: Optional[RateGovernor] = None,
+        resource_governor: Optional[ResourceGovernor] = None,
+        exporters: Iterable[ResultExporter] = (),
+    ) -> None:
         """
         Args:
             network_cidr: 스캔할 네트워크(CIDR 표기)
             top_ports: 스캔할 상위 포트 수 (기본 100)
+            workers: 동시에 스캔할 호스트 수 (기본 1 = 순차 실행)
+            port_chunk_size: nmap 한 번에 포트 스캔할 호스트 수
+                (기본 1 = 호스트별 개별 실행)
+            stage_workers: 단계별 동시 실행 수 (예: {"ports": 4, "os": 1}).
+                지정하면 단계 파이프라인 모드로 실행하며, 빠진 단계는 기본값을 쓴다.
+            queue_size: 파이프라인 단계 사이 큐의 최대 길이
+            check_chunk_size: 1보다 크면 상세 점검을 호스트별로 하지 않고
+                다른 단계가 끝난 뒤 (스크립트, 포트) 단위로 묶어 일괄 실행
+            combined: True이면 포트·서비스·OS를 nmap 한 번(단일 패스)으로 탐지
+            checkpoint: True이면 호스트·단계가 끝날 때마다 상태 저널에 기록해
+                중단 시 정확히 이어서 재개할 수 있게 한다
+            store: 지정하면 호스트가 끝날 때마다 결과를 SQLite 저장소에 기록한다
+            incremental: True이면 같은 대역의 이전 스캔과 포트(및 서비스) 구성이
+                같은 호스트는 서비스/OS/점검 단계를 건너뛰고 이전 결과를 이어받는다
+                (`store` 필요)
+            max_age: 이어받을 수 있는 이전 상세 스캔 결과의 최대 경과 시간
+            probe_cache: 지정하면 실행 중 서비스/OS 탐지 결과를 이 캐시로 재사용하고
+                종료 시 hit/miss 횟수를 기록한다. 탐색에서 MAC이 보고된 호스트는
+                MAC까지 캐시 키에 넣는다
+            host_timeout: 호스트별 전체 시간 예산(초). 각 단계의 nmap 제한 시간은
+                추정치와 남은 예산 중 작은 값이며, 초과한 단계는 결과의
+                `partial` 목록에 기록된다. None이면 예산 없이 추정치만 사용
+            breaker_threshold: 한 호스트에서 연속으로 시간 초과되거나 응답이 없는
+                단계가 이 수에 닿으면 그 호스트의 남은 단계를 건너뛴다 (None이면 사용 안 함)
+            subnet_breaker_threshold: 같은 /24에서 연속으로 시간 초과된 단계가 이 수에
+                닿으면 그 서브넷의 남은 호스트와 단계를 건너뛴다 (None이면 사용 안 함).
+                모든 포트가 필터링된 호스트는 세지 않는다. 건너뛴 단계는 결과의 `skipped`에 사유와 함께 기록된다
+            rate_governor: 지정하면 실행 중 모든 nmap 호출이 이 조절기에서 속도를
+                할당받아 `--max-rate`로 실행된다 (전체 전송 속도 상한)
+            resource_governor: 지정하면 스캐너 PC의 CPU/메모리 사용량에 맞춰 동시에
+                실행되는 호스트 단계 수를 줄이거나 늘린다
+            exporters: Excel 리포트와 함께 결과를 받을 스트리밍 출력기 (예: JSONL, CSV).
+                호스트가 끝날 때마다 결과를 받으며, `run`이 끝나면 닫힌다
         """
+        if workers < 1:
+            raise ValueError(f"workers must be >= 1: {workers}")
+        if port_chunk_size < 1:
+            raise ValueError(
+                f"port_chunk_size must be >= 1: {port_chunk_size}",
+            )
+        if check_chunk_size < 1:
+            raise ValueError(
+                f"check_chunk_size must be >= 1: {check_chunk_size}",
+            )
+        if incremental and store is None:
+            raise ValueError("incremental mode requires a result store")
+        if host_timeout is not None and host_timeout <= 0:
+            raise ValueError(f"host_timeout must be > 0: {host_timeout}")
+        self._breaker_args = (breaker_threshold, subnet_breaker_threshold)
+        CircuitBreaker(*self._breaker_args)  # 임계값 검증
+        if stage_workers is not None:
+            unknown = set(stage_workers) - set(self.STAGES)
+            if unknown:
+                raise ValueError(
+                    f"Unknown stage(s): {', '.join(sorted(unknown))}",
+                )
+            stage_workers = {**self.DEFAULT_STAGE_WORKERS, **stage_workers}
+            if min(stage_workers.values()) < 1:
+                raise ValueError(
+                    f"stage workers must be >= 1: {stage_workers}",
+                )
         self.logger = logging.getLogger(__name__)
         self.network_cidr = network_cidr
         self.top_ports = top_ports
+        self.workers = workers
+        self.port_chunk_size = port_chunk_size
+        self.stage_workers = stage_workers
+        self.queue_size = queue_size
+        self.check_chunk_size = check_chunk_size
+        self.combined = combined
+        self.checkpoint = checkpoint
+        self.store = store
+        self.scan_id: Optional[int] = None
+        self.incremental = incremental
+        self.max_age = max_age
+        # 증분 모드: IP → (이전 결과, 상세 스캔 시각)
+        self._baseline: Dict[str, Any] = {}
+        self._carried: Dict[str, Optional[str]] = {}  # 이전 결과를 이어받은 IP → 시각
+        self.probe_cache = probe_cache
+        self.host_timeout = host_timeout
+        self.rate_governor = rate_governor
+        self.resource_governor = resource_governor
+        self.exporters: List[ResultExporter] = list(exporters)
+        self._budgets: Dict[str, HostBudget] = {}
+        self._budgets_lock = threading.Lock()
+        self._prefetch_overruns: set = set()  # 일괄 포트 스캔에서 시간 초과된 IP
+        self.breaker: Optional[CircuitBreaker] = None
+        self._skipped: Dict[str, Dict[str, Any]] = {}  # IP → 회로 차단으로 건너뛴 단계
+        self._pipeline: Optional[StagedPipeline] = None
+        self._journal: Optional[StateJournal] = None
+        self._report: Optional[ExcelWriter] = None
+        # 병렬 실행에서도 출력 순서를 대상 순서로 맞추기 위한 순번과 보류 버퍼
+        self._order: Dict[str, int] = {}  # IP → 대상 순번
+        self._held: Dict[int, Optional[Dict[str, Any]]] = {}  # 순번 → 완료 결과
+        self._next_export = 0  # 다음에 내보낼 순번
+        self._export_lock = threading.Lock()
+        self._progress: Dict[str, Dict[str, Any]] = {}  # 재개 시 호스트별 완료 단계
+        self._techniques: Dict[str, str] = {}  # IP → 호스트를 찾아낸 탐색 기법
 
     # ------------------------------------------------------------------ #
     # public
     # ------------------------------------------------------------------ #
+    def stage_stats(self) -> List[StageStats]:
+        """파이프라인 모드의 단계별 큐 깊이/사용률 (실행 중에도 조회 가능)."""
+        return self._pipeline.stats() if self._pipeline is not None else []
+
     def run(self) -> List[Dict[str, Any]]:
         """전체 스캔 워크플로우를 실행한다.
 
         Returns:
-            각 호스트별 스캔 결과(dict) 리스트
+            각 호스트별 스캔 결과(dict) 리스트 (스캔 중에는 `HostResult`로 압축해 보관)
         """
-        results: List[Dict[str, Any]] = []
-
         # ── 재개 여부 확인 ------------------------------------------------ #
-        if ResumeManager.should_resume():
+        previous: List[Dict[str, Any]] = []
+        self._progress = {}
+        self._techniques = {}
+        NmapRunner.reset_accounting()  # 실행 비용 요약은 이번 실행분만
+        discovering = 0  # 탐색 블록 스윕의 동시 nmap 실행 수 (탐색을 다시 돌릴 때만)
+        resumed = False
+        state = ResumeManager.load()  # 스냅샷 + 저널 재생은 한 번만
+        if ResumeManager.should_resume(state):
+            resumed = True
             self.logger.info("Resuming previous scan…")
-            targets = ResumeManager.get_pending_ips()
+            targets = ResumeManager.get_pending_ips(state)
+            # 끝난 단계는 건너뛰고, 이미 완료된 호스트 결과는 리포트에 합친다
+            self._progress = ResumeManager.get_host_progress(state)
+            self._techniques = ResumeManager.get_techniques(state)
+            previous = ResumeManager.get_completed_results(state)
+            self.logger.info(
+                "Resume: %d pending host(s) (%d partially scanned), "
+                "%d completed result(s) kept",
+                len(targets),
+                len(self._progress),
+                len(previous),
+            )
+            if not ResumeManager.discovery_complete(state):
+                # 탐색 도중 중단: 대기 호스트 뒤에 탐색을 다시 돌려 나머지 호스트를 잇는다
+                self.logger.info(
+                    "Host discovery was interrupted; rediscovering %s",
+                    self.network_cidr,
+                )
+                targets = self._continue_discovery(
+                    targets, ResumeManager.get_known_ips(state)
+                )
+                discovering = HostDiscovery.MAX_PARALLEL
         else:
             self.logger.info("Starting new scan for %s", self.network_cidr)
-            targets = HostDiscovery.host_discovery(self.network_cidr)
+            targets = self._alive(HostDiscovery.discover(self.network_cidr))
+            discovering = HostDiscovery.MAX_PARALLEL
+        del state  # 재생한 전체 상태를 스캔 내내 붙잡지 않는다
 
-        # ── 대상 IP별 스캔 ------------------------------------------------ #
-        for ip in targets:
-            self.logger.info("Scanning %s …", ip)
+        # ── 대상 IP별 스캔 (호스트·단계별 체크포인트) --------------------- #
+        self._journal = StateJournal() if self.checkpoint else None
+        if self._journal is not None and not resumed:
+            self._journal.record_discovery(False)
+        self.breaker = CircuitBreaker(*self._breaker_args)
+        self._skipped = {}
+        self._order = {r["ip"]: seq for seq, r in enumerate(previous)}
+        self._held = {}
+        self._next_export = 0
+        if self.store is not None:
+            if self.incremental:
+                self._baseline = self.store.latest_hosts(self.network_cidr)
+                self._carried = {}
+                self.logger.info(
+                    "Incremental scan: %d host(s) in previous scan",
+                    len(self._baseline),
+                )
+            self.scan_id = self.store.start_scan(self.network_cidr)
+            for result in previous:
+                self.store.add_host(
+                    self.scan_id,
+                    result,
+                    seq=self._order[result["ip"]],
+                )
+        # 저장소가 없으면 리포트 행을 호스트가 끝날 때마다 덧붙인다 (재개 시 이미 완료된
+        # 결과부터). 저장소가 있으면 리포트는 스캔 뒤 저장소에 기록된 결과로 만든다.
+        self._report = None
+        if self.store is None:
+            self._report = ExcelWriter().open(str(self.REPORT_PATH))
+        for result in previous:
+            self._release(result["ip"], result)
+        if self.probe_cache is not None:
+            # 작업 스레드에서도 보이도록 클래스 속성으로 설치 (contextvar는 스레드에 전파되지 않음)
+            ServiceDetector.cache = OSFingerprint.cache = self.probe_cache
+        if self.rate_governor is not None:
+            RateGovernor.active = self.rate_governor
+            # 탐색 중에는 블록 스윕도 동시에 실행되므로 그만큼 몫을 나눠 둔다
+            self.rate_governor.expect(discovering + self._nmap_concurrency())
+        if self.resource_governor is not None:
+            self.resource_governor.start(self._nmap_concurrency())
+        try:
+            results = self._compact(previous)
+            results += self._scan_targets(self._track_targets(targets))
+        finally:
+            if self.probe_cache is not None:
+                ServiceDetector.cache = OSFingerprint.cache = None
+                self.probe_cache.log_stats()
+            if self.rate_governor is not None:
+                RateGovernor.active = None
+                self.rate_governor.log_stats()
+            if self.resource_governor is not None:
+                self.resource_governor.stop()
+            NmapRunner.log_summary()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            self._progress = {}
+            self._baseline = {}
+            self._techniques = {}
+            self._flush_held()
+            report, self._report = self._report, None
+            # 리포트 저장이 실패해도 내보내기 파일은 모두 닫는다
+            with ExitStack() as outputs:
+                for exporter in self.exporters:
+                    outputs.callback(exporter.close)
+                reported = self._save_report(report)
+
+        # ── 상태 초기화 --------------------------------------------------- #
+        StateManager.save_state({"pending_ips": []})
+        self.logger.info("Scan finished: %d host(s) processed", len(results))
+        for scope, reason in self.breaker.open_scopes().items():
+            self.logger.info("Circuit open for %s: %s", scope, reason)
+
+        if self.store is not None:
+            self.store.finish_scan(self.scan_id)
+        if reported:
+            self.logger.info(
+                "Excel report saved to %s",
+                self.REPORT_PATH.resolve(),
+            )
+
+        # 제자리에서 바꿔 압축 결과와 딕셔너리를 동시에 모두 들고 있지 않는다
+        for index, result in enumerate(results):
+            results[index] = result.to_dict()
+        return results
+
+    # ------------------------------------------------------------------ #
+    # internal
+    # ------------------------------------------------------------------ #
+    def _scan_targets(self, targets: Iterable[str]) -> List[HostResult]:
+        """대상 호스트들을 순차 또는 병렬로 스캔한다.
+
+        병렬 모드에서도 결과 순서는 `targets` 순서를 그대로 따른다.
+        `port_chunk_size` > 1 이면 포트 스캔을 먼저 청크 단위로 일괄 수행한다.
+        """
+        prefetched: Optional[Dict[str, Dict[str, Any]]] = None
+        if self.port_chunk_size > 1:
+            targets = list(targets)
+            prefetched = self._prefetch_ports(
+                [
+                    ip
+                    for ip in targets
+                    if "open_ports" not in self._progress.get(ip, {})
+                ],
+            )
+
+        def scan_one(ip: str) -> Optional[Dict[str, Any]]:
+            return self._scan_host(ip, self._prefetched_for(prefetched, ip))
+
+        if self.stage_workers is not None:
+            results = self._run_pipeline(targets, prefetched)
+        elif self.workers == 1:
+            results = [scan_one(ip) for ip in targets]
+        else:
+            self.logger.info(
+                "Scanning with %d concurrent workers",
+                self.workers,
+            )
+            with ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="scan"
+            ) as pool:
+                results = list(pool.map(scan_one, targets))
 
-            open_ports = PortScanner.scan(ip, self.top_ports)
-            if not open_ports:
-                self.logger.info("No open ports on %s", ip)
+        results = [result for result in results if result is not None]
+        if self._batch_checks:
+            self._run_batch_checks(results)
+            self._compact(results)
+        return results
+
+    @staticmethod
+    def _compact(results: List[Dict[str, Any]]) -> List[HostResult]:
+        """결과 딕셔너리를 제자리에서 `HostResult`로 바꾼다 (목록을 복사하지 않음)."""
+        for index, result in enumerate(results):
+            results[index] = HostResult.from_dict(result)
+        return results
+
+    def _track_targets(self, targets: Iterable[str]) -> Iterator[str]:
+        """대상이 생성될 때마다 검증하고 저널에 pending으로 기록한다.
+
+        IP 주소가 아닌 대상은 경고를 남기고 건너뛴다 (이후 단계는 검증된 대상만 받는다).
+        대상이 모두 생성되면 탐색 완료를 저널에 남기고, 속도 조절기의 예상 동시 실행
+        수를 스캔 단계 몫으로 줄인다.
+        """
+        for ip in targets:
+            if not NetworkUtils.is_valid_ip(ip):
+                self.logger.warning("Skipping invalid target %r", ip)
                 continue
+            if self._journal is not None:
+                self._journal.add_target(ip)
+            self._order.setdefault(ip, len(self._order))
+            yield ip
+        if self._journal is not None:
+            self._journal.record_discovery(True)
+        if self.rate_governor is not None:
+            self.rate_governor.expect(self._nmap_concurrency())
+
+    def _continue_discovery(
+        self,
+        pending: List[str],
+        known: Set[str],
+    ) -> Iterator[str]:
+        """대기 호스트를 먼저 내보낸 뒤, 탐색을 다시 돌려 아직 모르는 호스트를 잇는다."""
+        yield from pending
+        for ip in self._alive(HostDiscovery.discover(self.network_cidr)):
+            if ip not in known:
+                known.add(ip)
+                yield ip
+
+    def _alive(self, hosts: Iterable[AliveHost]) -> Iterator[str]:
+        """발견된 호스트의 IP를 생성하면서, 찾아낸 기법을 기억하고 저널에 남긴다.
+
+        MAC 주소가 보고된 호스트는 프로브 캐시 키에 MAC이 들어가도록 캐시에 알린다.
+        """
+        for host in hosts:
+            self._techniques[host.ip] = host.technique
+            self._record(host.ip, "technique", host.technique)
+            if host.mac and self.probe_cache is not None:
+                self.probe_cache.remember_mac(host.ip, host.mac)
+            yield host.ip
+
+    def _nmap_concurrency(self) -> int:
+        """스캔 단계에서 동시에 실행될 수 있는 nmap 프로세스 수."""
+        if self.stage_workers is not None:
+            return sum(self.stage_workers.values())
+        return self.workers
+
+    def _record(self, ip: str, stage: str, data: Any) -> None:
+        if self._journal is not None:
+            self._journal.record_stage(ip, stage, data)
+
+    def _complete(
+        self,
+        ip: str,
+        result: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """호스트 완료를 저널에 기록하고, 결과가 있으면 저장소와 리포트에 바로 쓴다.
+
+        시간 예산을 넘긴 단계가 있으면 결과의 `partial`에 단계 이름을, 회로 차단으로
+        건너뛴 단계가 있으면 `skipped`에 사유와 단계 이름을 남긴다.
+        """
+        with self._budgets_lock:
+            budget = self._budgets.pop(ip, None)
+        with self._budgets_lock:
+            skipped = self._skipped.pop(ip, None)
+        if result is not None and budget is not None and budget.overruns:
+            result["partial"] = list(budget.overruns)
+            self._record(ip, "partial", result["partial"])
+        if result is not None and skipped is not None:
+            result["skipped"] = skipped
+            self._record(ip, "skipped", skipped)
+        if result is not None and self.store is not None:
+            self.store.add_host(
+                self.scan_id,
+                result,
+                self._carried.get(ip),
+                self._order.get(ip),
+            )
+        self._release(ip, result)
+        if self._journal is not None:
+            self._journal.complete(ip)
+
+    def _save_report(self, report: Optional[ExcelWriter]) -> int:
+        """Excel 리포트를 저장하고 쓴 호스트 수를 반환한다.
+
+        결과가 있을 때만 저장한다 (중단돼도 끝난 호스트까지는 남긴다). 저장소가 있으면
+        이번 스캔에 기록된 결과를 저장소에서 읽어 리포트를 만들고, Summary 시트도
+        저장소에서 집계한다. 같은 대역의 이전 완료 스캔이 있으면 그 스캔 대비 열린
+        포트 변화도 Summary 시트에 넣는다.
+        """
+        if self.store is not None:
+            report = ExcelWriter()
+            rows = self.store.iter_results(self.scan_id)
+            first = next(rows, None)
+            if first is None:
+                return 0
+            previous = self.store.latest_scan_id(self.network_cidr)
+            report.write(
+                chain([first], rows),
+                str(self.REPORT_PATH),
+                summary=self.store.summary(self.scan_id, previous=previous),
+            )
+        elif report.hosts:
+            report.close()
+        return report.hosts
+
+    def _release(self, ip: str, result: Optional[Dict[str, Any]]) -> None:
+        """완료된 호스트를 대상 순서대로 내보낸다.
+
+        앞선 대상이 아직 끝나지 않았으면 결과를 보류했다가, 그 대상이 끝나는 즉시
+        이어진 결과까지 한꺼번에 내보낸다. 결과가 없는 호스트(열린 포트 없음)도
+        순번을 넘기기 위해 호출한다.
+        """
+        with self._export_lock:
+            seq = self._order.get(ip)
+            if seq is None:  # 순번이 없는 호스트는 보류하지 않는다
+                if result is not None:
+                    self._export(result)
+                return
+            self._held[seq] = result
+            while self._next_export in self._held:
+                ready = self._held.pop(self._next_export)
+                self._next_export += 1
+                if ready is not None:
+                    self._export(ready)
+
+    def _flush_held(self) -> None:
+        """스캔이 중단돼 보류 중인 결과를 순번 순서대로 모두 내보낸다."""
+        with self._export_lock:
+            for seq in sorted(self._held):
+                ready = self._held.pop(seq)
+                if ready is not None:
+                    self._export(ready)
 
-            services = ServiceDetector.detect(ip, open_ports)
-            os_info = OSFingerprint.fingerprint(ip)
-            checks = DetailedChecks.run(ip)
+    def _export(self, result: Dict[str, Any]) -> None:
+        """완료된 호스트 결과를 Excel 리포트와 모든 출력기에 내보낸다."""
+        if self._report is not None:
+            self._report.write_host(result)
+        for exporter in self.exporters:
+            exporter.write_host(result)
 
-            results.append(
+    def _budget(self, ip: str) -> HostBudget:
+        """호스트의 시간 예산 (첫 단계에서 생성)."""
+        with self._budgets_lock:
+            budget = self._budgets.get(ip)
+            if budget is None:
+                seconds = self.host_timeout
+                if seconds is None:
+                    seconds = math.inf
+                budget = self._budgets[ip] = HostBudget(ip, seconds)
+            return budget
+
+    def _budgeted(
+        self, ip: str, stage: str, call: Callable[[], Any], default: Any
+    ) -> Any:
+        """호스트 예산 안에서 단계를 실행하고 결과를 회로 차단기에 알린다.
+
+        시간 초과 시에는 부분 결과(없으면 `default`)를 쓰고, 회로가 열려 있으면
+        실행하지 않고 `default`를 반환한다.
+        """
+        if self._skip_if_open(ip, stage):
+            return default
+        budget = self._budget(ip)
+        # 자리를 기다리는 시간은 호스트 예산에서 빼지 않도록 예산보다 먼저 얻는다
+        slot = nullcontext()
+        if self.resource_governor:
+            slot = self.resource_governor.slot()
+        try:
+            with slot, budget.spend(stage):
+                value = call()
+        except ScanTimeout as exc:
+            budget.record_overrun(stage)
+            self.logger.warning(
+                "%s stage over time for %s, keeping partial result: %s",
+                stage,
+                ip,
+                exc,
+            )
+            value = exc.partial or default
+        self._observe(
+            ip,
+            stage,
+            stage in budget.overruns,
+            self._answered(stage, value),
+        )
+        return value
+
+    def _observe(
+        self,
+        ip: str,
+        stage: str,
+        timed_out: bool,
+        answered: bool,
+    ) -> None:
+        outcome = TIMEOUT if timed_out else OK if answered else FILTERED
+        self.breaker.record(ip, stage, outcome)
+
+    @staticmethod
+    def _answered(stage: str, value: Any) -> bool:
+        """단계 결과가 대상의 응답을 보여 주는지.
+
+        무응답(down 또는 모든 포트 filtered)은 포트 단계에서만 판별한다. 닫힌 포트만
+        있는 호스트, OS 미식별, 빈 `-sV`/점검 결과는 대상이 응답한 것이므로 실패가 아니다.
+        """
+        if stage != "ports":
+            return True
+        # 단일 패스 결과(dict)는 열린 포트 목록의 응답 표시를 본다
+        ports = value["open_ports"] if isinstance(value, dict) else value
+        return getattr(ports, "answered", True)
+
+    def _skip_if_open(self, ip: str, stage: str) -> bool:
+        """호스트/서브넷 회로가 열려 있으면 단계를 건너뛴 것으로 기록하고 True."""
+        reason = self.breaker.reason(ip) if self.breaker is not None else None
+        if reason is None:
+            return False
+        with self._budgets_lock:
+            skipped = self._skipped.setdefault(
+                ip,
+                {"reason": reason, "stages": []},
+            )
+            skipped["stages"].append(stage)
+        self.logger.info("Skipping %s stage for %s: %s", stage, ip, reason)
+        return True
+
+    def _prefetch_ports(self, targets: List[str]) -> Dict[str, Dict[str, Any]]:
+        """포트 단계(단일 패스 모드에서는 서비스/OS 포함)를 청크 단위로 일괄 수행한다.
+
+        시간 초과된 청크는 부분 결과를 쓰고, 해당 호스트를 포트 단계 초과로 표시한다.
+        """
+        self._prefetch_overruns = set()
+        if not targets:
+            return {}
+        self.logger.info(
+            "Batch %s scan: %d host(s), chunk size %d",
+            "combined" if self.combined else "port",
+            len(targets),
+            self.port_chunk_size,
+        )
+        try:
+            if self.combined:
+                return CombinedScanner.scan_many(
+                    targets, self.top_ports, self.port_chunk_size
+                )
+            port_map = PortScanner.scan_many(
+                targets, self.top_ports, self.port_chunk_size
+            )
+        except ScanTimeout as exc:
+            self.logger.warning(
+                "Batch scan over time for %d host(s), keeping partial results",
+                len(exc.hosts),
+            )
+            self._prefetch_overruns = set(exc.hosts)
+            if self.combined:
+                return exc.partial
+            port_map = exc.partial
+        return {ip: {"open_ports": ports} for ip, ports in port_map.items()}
+
+    def _prefetched_for(
+        self, prefetched: Optional[Dict[str, Dict[str, Any]]], ip: str
+    ) -> Optional[Dict[str, Any]]:
+        """이미 얻은 단계 결과 — 재개 진행 상황이 일괄 스캔 결과보다 우선한다."""
+        progress = self._progress.get(ip)
+        if progress and "open_ports" in progress:
+            self.logger.info(
+                "Resuming %s after stage(s): %s",
+                ip,
+                ", ".join(progress),
+            )
+            return dict(progress)
+        if prefetched is None:
+            return None
+        return prefetched.get(ip, {"open_ports": []})
+
+    @property
+    def _batch_checks(self) -> bool:
+        return self.check_chunk_size > 1
+
+    def _run_batch_checks(self, results: List[Dict[str, Any]]) -> None:
+        """모든 호스트의 상세 점검을 (스크립트, 포트) 단위로 묶어 실행하고 결과에 채운다."""
+        if not results:
+            return
+        for result in results:  # 회로가 열린 호스트는 점검하지 않는다
+            if "checks" not in result and self._skip_if_open(
+                result["ip"],
+                "checks",
+            ):
+                result["checks"] = {}
+        pending = [r for r in results if "checks" not in r]  # 이어받은 결과는 제외
+        self.logger.info(
+            "Batched detailed checks for %d host(s)",
+            len(pending),
+        )
+        jobs = {r["ip"]: (r["open_ports"], r.get("services")) for r in pending}
+        checks: Dict[str, Dict[str, Any]] = {}
+        if pending:
+            try:
+                checks = DetailedChecks.run_many(
+                    jobs,
+                    self.check_chunk_size,
+                )
+            except ScanTimeout as exc:
+                self.logger.warning(
+                    "Batched checks over time for %d host(s), "
+                    "keeping partial results",
+                    len(exc.hosts),
+                )
+                checks = exc.partial
+                for ip in exc.hosts:
+                    self._budget(ip).record_overrun("checks")
+        for result in results:
+            if result["ip"] in checks:
+                result["checks"] = checks[result["ip"]]
+            self._record(result["ip"], "checks", result["checks"])
+            self._complete(result["ip"], result)
+            self.logger.info(
+                "Completed %s  (%d open ports)",
+                result["ip"],
+                len(result["open_ports"]),
+            )
+
+    def _run_pipeline(
+        self,
+        targets: Iterable[str],
+        prefetched: Optional[Dict[str, Dict[str, Any]]],
+    ) -> List[Union[HostResult, Dict[str, Any]]]:
+        """포트 → 서비스 → OS → 점검 단계를 제한 큐로 연결해 겹쳐 실행한다.
+
+        탐색 결과(targets)가 생성되는 대로 첫 단계 큐에 들어가며,
+        결과 순서는 순차 실행과 같다.
+        """
+
+        def ports(ip: str) -> Optional[Dict[str, Any]]:
+            return self._stage_ports(ip, self._prefetched_for(prefetched, ip))
+
+        funcs = {
+            "ports": ports,
+            "services": self._stage_services,
+            "os": self._stage_os,
+            "checks": self._stage_checks,
+        }
+        names = [
+            name
+            for name in self.STAGES
+            if not (name == "checks" and self._batch_checks)
+        ]
+        workers = self.stage_workers
+        stages = [Stage(name, funcs[name], workers[name]) for name in names]
+        self.logger.info(
+            "Staged pipeline: %s",
+            ", ".join(f"{s.name}={s.workers}" for s in stages),
+        )
+        self._pipeline = StagedPipeline(stages, queue_size=self.queue_size)
+        return self._pipeline.run(targets)
+
+    def _scan_host(
+        self, ip: str, prefetched: Optional[Dict[str, Any]] = None
+    ) -> Optional[Union[HostResult, Dict[str, Any]]]:
+        """단일 호스트에 대해 포트 → 서비스 → OS → 상세 점검을 순서대로 수행한다.
+
+        Args:
+            ip: 스캔할 IP 주소
+            prefetched: 일괄 스캔으로 이미 얻은 결과 (`open_ports` 등, None이면 직접 스캔)
+
+        Returns:
+            호스트 스캔 결과 (일괄 점검 모드에서는 점검 전 dict), 열린 포트가 없으면 None
+        """
+        result = self._stage_ports(ip, prefetched)
+        if result is None:
+            return None
+        result = self._stage_os(self._stage_services(result))
+        if not self._batch_checks:  # 일괄 점검 모드에서는 모든 호스트가 끝난 뒤 실행
+            result = self._stage_checks(result)
+        return result
+
+    # ── 단계별 처리 (순차/파이프라인 공용) -------------------------------- #
+    def _stage_ports(
+        self, ip: str, prefetched: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        self.logger.info("Scanning %s …", ip)
+
+        if prefetched is None and self._skip_if_open(ip, "ports"):
+            # 서브넷 회로가 열림: 남은 단계도 모두 건너뛰고 결과에는 표시를 남긴다
+            for stage in self.STAGES[1:]:
+                self._skip_if_open(ip, stage)
+            self._record(ip, "ports", [])
+            return self._discovered_by(
                 {
                     "ip": ip,
-                    "open_ports": open_ports,
-                    "services": services,
-                    "os": os_info,
-                    "checks": checks,
+                    "open_ports": [],
+                    "services": {},
+                    "os": None,
+                    "checks": {},
+                }
+            )
+        if prefetched is None:
+            if self.combined:
+                prefetched = self._budgeted(
+                    ip,
+                    "ports",
+                    lambda: CombinedScanner.scan(ip, self.top_ports),
+                    {"open_ports": []},
+                )
+            else:
+                prefetched = {
+                    "open_ports": self._budgeted(
+                        ip,
+                        "ports",
+                        lambda: PortScanner.scan(ip, self.top_ports),
+                        [],
+                    )
                 }
+        elif "open_ports" not in self._progress.get(ip, {}):  # 일괄 스캔 결과
+            if ip in self._prefetch_overruns:
+                self._budget(ip).record_overrun("ports")
+            self._observe(
+                ip,
+                "ports",
+                ip in self._prefetch_overruns,
+                self._answered("ports", prefetched),
             )
-            self.logger.info("Completed %s  (%d open ports)", ip, len(open_ports))
+        self._record(ip, "ports", prefetched["open_ports"])
+        if not prefetched["open_ports"]:
+            self.logger.info("No open ports on %s", ip)
+            self._complete(ip)
+            return None
+        return self._carry_over(self._discovered_by({"ip": ip, **prefetched}))
 
-        # ── 상태 초기화 --------------------------------------------------- #
-        StateManager.save_state({"pending_ips": []})
-        self.logger.info("Scan finished: %d host(s) processed", len(results))
+    def _discovered_by(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """호스트를 찾아낸 탐색 기법을 알면 결과의 `technique`에 남긴다."""
+        technique = self._techniques.get(result["ip"])
+        if technique is not None:
+            result["technique"] = technique
+        return result
 
-        # ── Excel 리포트 저장 -------------------------------------------- #
-        if results:  # 결과가 있을 때만 저장
-            report_path = Path("scan_results.xlsx")
-            ExcelWriter().write(results, str(report_path))   # ← 인스턴스화
-            self.logger.info("Excel report saved to %s", report_path.resolve())
+    def _carry_over(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """증분 모드에서 변경이 없는 호스트면 이전 서비스/OS/점검 결과를 채운다."""
+        ip = result["ip"]
+        if ip not in self._baseline:
+            return result
+        previous, scanned_at = self._baseline[ip]
+        if previous.get("partial") or previous.get("skipped"):
+            self.logger.info(
+                "Rescanning %s: previous results were incomplete",
+                ip,
+            )
+            return result
+        if set(previous["open_ports"]) != set(result["open_ports"]):
+            self.logger.info(
+                "Changed %s: open ports differ from previous scan",
+                ip,
+            )
+            return result
+        if "services" in result and result["services"] != previous["services"]:
+            self.logger.info(
+                "Changed %s: services differ from previous scan",
+                ip,
+            )
+            return result
+        if scanned_at is None or self._age(scanned_at) > self.max_age:
+            self.logger.info(
+                "Stale %s: previous results older than %s", ip, self.max_age
+            )
+            return result
+        self.logger.info(
+            "Unchanged %s: reusing results from %s",
+            ip,
+            scanned_at,
+        )
+        self._carried[ip] = scanned_at
+        return {
+            **previous,
+            **result,
+            "services": previous["services"],
+            "os": previous["os"],
+            "checks": previous["checks"],
+        }
 
-        return results
+    @staticmethod
+    def _age(timestamp: str) -> timedelta:
+        return datetime.now(timezone.utc) - datetime.fromisoformat(timestamp)
+
+    def _stage_services(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        if "services" not in result:  # 단일 패스 모드에서는 이미 채워져 있음
+            ip = result["ip"]
+            result["services"] = self._budgeted(
+                ip,
+                "services",
+                lambda: ServiceDetector.detect(ip, result["open_ports"]),
+                {},
+            )
+        self._record(result["ip"], "services", result["services"])
+        return result
+
+    def _stage_os(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        if "os" not in result:
+            ip = result["ip"]
+            result["os"] = self._budgeted(
+                ip, "os", lambda: OSFingerprint.fingerprint(ip), None
+            )
+        self._record(result["ip"], "os", result["os"])
+        return result
+
+    def _stage_checks(self, result: Dict[str, Any]) -> HostResult:
+        # 열린 포트/서비스 정보로 해당되는 점검만 실행 (이어받은 결과는 그대로 사용)
+        if "checks" not in result:
+            ip = result["ip"]
+            result["checks"] = self._budgeted(
+                ip,
+                "checks",
+                lambda: DetailedChecks.run(
+                    ip,
+                    open_ports=result["open_ports"],
+                    services=result.get("services"),
+                ),
+                {},
+            )
+        self._record(result["ip"], "checks", result["checks"])
+        self._complete(result["ip"], result)
+        self.logger.info(
+            "Completed %s  (%d open ports)",
+            result["ip"],
+            len(result["open_ports"]),
+        )
+        return HostResult.from_dict(result)  # 스캔이 끝날 때까지 압축해 보관
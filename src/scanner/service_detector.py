@@ -1,74 +1,100 @@
 """서비스 탐지를 담당하는 모듈."""
 
 import logging
-import re
-import subprocess
-from typing import Dict, List
-import ipaddress
+from typing import Dict, Iterable, List, Optional
+
+from .nmap_runner import NmapRunner
+from .nmap_xml import NmapHost
+from .probe_cache import MISS, ProbeCache
+from ..utils.exceptions import ScanTimeout
+from ..utils.network import NetworkUtils
 
 __all__ = ['ServiceDetector']
 
+
 class ServiceDetector:
-    """서비스 탐지 클래스."""
-    
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
-    
-    def detect(self, ip: str, ports: List[int]) -> Dict[int, str]:
+    """서비스 탐지 클래스.
+
+    `cache`가 설정되어 있으면 (IP, 포트 집합) 단위로 결과를 재사용한다.
+    """
+
+    logger = logging.getLogger(__name__)
+    cache: Optional[ProbeCache] = None
+
+    @classmethod
+    def detect(cls, ip: str, ports: List[int]) -> Dict[int, str]:
         """IP 주소의 특정 포트에서 실행 중인 서비스를 탐지합니다.
-        
+
         Args:
             ip: 탐지할 IP 주소
             ports: 탐지할 포트 번호 리스트
-            
+
         Returns:
             포트 번호를 키로, 서비스 정보를 값으로 하는 딕셔너리
-            
+
         Raises:
-            ValueError: 유효하지 않은 IP 주소
+            ValueError: nmap 옵션으로 해석될 수 있는 대상
+            ScanTimeout: 탐지 시간 초과 (`partial`에 그때까지 식별한 서비스)
         """
-        try:
-            ipaddress.ip_address(ip)
-        except ValueError as e:
-            self.logger.error(f"Invalid IP address: {ip}")
-            raise ValueError(f"Invalid IP address: {ip}") from e
-        
+        if not NetworkUtils.is_safe_target(ip):
+            cls.logger.error(f"Invalid scan target: {ip!r}")
+            raise ValueError(f"Invalid scan target: {ip!r}")
+
         if not ports:
-            self.logger.debug("No ports to scan")
+            cls.logger.debug("No ports to scan")
             return {}
-        
+
+        cache = cls.cache
+        if cache is not None:
+            cached = cache.get("services", ip, ports)
+            if cached is not MISS:
+                return {int(port): desc for port, desc in cached.items()}
+
         port_args = [f"{ip}:{p}" for p in ports]
-        cmd = ["nmap", "-sV", "--version-intensity", "2"] + port_args
-        self.logger.debug(f"Running service detection command: {' '.join(cmd)}")
-        
-        try:
-            result = subprocess.run(
-                cmd,
-                timeout=300,
-                capture_output=True,
-                text=True,
-                shell=False
+        cmd = [
+            "nmap",
+            "-sV",
+            "--version-intensity",
+            "2",
+            "-oX",
+            "-",
+            *port_args,
+        ]
+
+        result = NmapRunner.execute(cmd, "services", [ip], len(ports))
+        if result.timed_out:
+            # 그때까지 식별된 서비스는 부분 결과로 유지 (캐시하지 않음)
+            services = cls._parse_nmap_output(result.iter_hosts())
+            cls.logger.error(
+                f"Service detection timeout for {ip} after "
+                f"{result.timeout:.0f}s ({len(services)} service(s) so far)",
             )
-        except subprocess.TimeoutExpired as e:
-            self.logger.error(f"Service detection timeout for {ip}")
-            return {}
-        
+            raise ScanTimeout(
+                f"Service detection timeout for {ip}",
+                partial=services,
+                hosts=[ip],
+            )
+
         if result.returncode != 0:
-            self.logger.warning(f"Service detection failed for {ip}: {result.stderr}")
+            cls.logger.warning(
+                f"Service detection failed for {ip}: {result.stderr}",
+            )
             return {}
-        
-        services = self._parse_nmap_output(result.stdout)
-        self.logger.debug(f"Found {len(services)} services for {ip}")
+
+        services = cls._parse_nmap_output(result.iter_hosts())
+        cls.logger.debug(f"Found {len(services)} services for {ip}")
+        if cache is not None:  # 실패/시간 초과 결과는 캐시하지 않음
+            cache.put("services", ip, services, ports)
         return services
-    
-    def _parse_nmap_output(self, output: str) -> Dict[int, str]:
-        """Nmap 출력에서 서비스 정보를 추출합니다."""
-        pattern = r"(\d+)/tcp\s+open\s+\S+\s+(.*?)(?:\n|$)"
+
+    @staticmethod
+    def _parse_nmap_output(hosts: Iterable[NmapHost]) -> Dict[int, str]:
+        """nmap 호스트 결과에서 열린 포트의 서비스 정보를 추출합니다."""
         services = {}
-        
-        for match in re.finditer(pattern, output):
-            port = int(match.group(1))
-            service = match.group(2).strip()
-            services[port] = service
-        
+
+        for host in hosts:
+            for port in host.ports:
+                if port.is_open and port.service is not None:
+                    services[port.portid] = port.service.label()
+
         return services
@@ -0,0 +1,223 @@
+"""nmap 실행 시간 추정과 호스트별 시간 예산을 담당하는 모듈.
+
+고정 300초 대신 탐색 단계에서 관측한 RTT, 대상 포트 수, 타이밍 템플릿으로
+예상 실행 시간을 추정해 제한 시간을 정한다. 호스트마다 전체 예산
+(`HostBudget`)을 두고 각 단계는 남은 예산 안에서만 실행된다.
+"""
+
+import contextvars
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from ..utils.exceptions import DeadlineExceeded
+
+__all__ = ["AdaptiveTimeout", "HostBudget", "current_budget"]
+
+_current_budget: "contextvars.ContextVar[Optional[HostBudget]]" = (
+    contextvars.ContextVar("host_budget", default=None)
+)
+
+
+class HostBudget:
+    """호스트 하나가 모든 단계에서 나눠 쓰는 시간 예산.
+
+    파이프라인 모드에서 큐 대기 시간이 예산을 깎지 않도록, 실제로 단계가
+    실행된 시간만 누적한다.
+    """
+
+    def __init__(self, ip: str, seconds: float) -> None:
+        self.ip = ip
+        self.seconds = seconds
+        self.spent = 0.0
+        self.overruns: List[str] = []
+        self._stage_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        """남은 예산(초)."""
+        with self._lock:
+            running = 0.0
+            if self._stage_started is not None:
+                running = time.monotonic() - self._stage_started
+            return self.seconds - self.spent - running
+
+    def record_overrun(self, stage: str) -> None:
+        """시간 초과로 결과가 부분적인 단계를 기록한다."""
+        with self._lock:
+            if stage not in self.overruns:
+                self.overruns.append(stage)
+
+    @contextmanager
+    def spend(self, stage: str) -> Iterator["HostBudget"]:
+        """단계 실행 동안 예산을 현재 컨텍스트에 설치하고 사용 시간을 누적한다.
+
+        Raises:
+            DeadlineExceeded: 이미 예산을 모두 쓴 경우
+        """
+        if self.remaining() <= 0:
+            self.record_overrun(stage)
+            raise DeadlineExceeded(
+                f"Host deadline exceeded for {self.ip} before {stage}"
+            )
+        token = _current_budget.set(self)
+        with self._lock:
+            self._stage_started = time.monotonic()
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self.spent += time.monotonic() - self._stage_started
+                self._stage_started = None
+            _current_budget.reset(token)
+
+
+def current_budget() -> Optional[HostBudget]:
+    """현재 실행 중인 단계의 호스트 예산 (없으면 None)."""
+    return _current_budget.get()
+
+
+class AdaptiveTimeout:
+    """nmap 실행 제한 시간 추정기.
+
+    예상 시간 = 기본 오버헤드 + 프로브 수 × 프로브당 대기 × 호스트 그룹 수.
+    프로브당 대기는 타이밍 템플릿의 scan delay와 RTT × `RTT_MULTIPLIER` 중 큰 값이며,
+    제한 시간은 예상 시간 × `SAFETY`를 [`MIN_TIMEOUT`, `MAX_TIMEOUT`]으로 자른 뒤
+    현재 호스트의 남은 예산을 넘지 않게 한다. 직렬 템플릿(-T0/-T1)은 원래 느린
+    것이 정상이므로 `MAX_TIMEOUT`으로 자르지 않는다.
+    """
+
+    logger = logging.getLogger(__name__)
+
+    MIN_TIMEOUT = 30.0
+    MAX_TIMEOUT = 3600.0
+    OVERHEAD = 10.0
+    SAFETY = 2.0
+    DEFAULT_RTT = 0.5  # RTT를 모를 때 가정 (느린 WAN 기준)
+    RTT_MULTIPLIER = 4.0
+    HOST_PARALLELISM = 16  # -T2 이상에서 nmap이 동시에 다루는 호스트 수 (근사)
+
+    # 타이밍 템플릿별 프로브 간 최소 대기 (nmap scan_delay)
+    SCAN_DELAY = {0: 300.0, 1: 15.0, 2: 0.4, 3: 0.0, 4: 0.0, 5: 0.0}
+    # 단계별 프로브 수: 고정 + 포트당
+    FIXED_PROBES = {
+        "discovery": 2,
+        "ports": 0,
+        "services": 0,
+        "os": 16,
+        "checks": 0,
+        "combined": 16,
+    }
+    PROBES_PER_PORT = {
+        "discovery": 0,
+        "ports": 1,
+        "services": 3,
+        "os": 0,
+        "checks": 4,
+        "combined": 2,
+    }
+
+    _rtts: Dict[str, float] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def observe_rtt(cls, ip: str, srtt: float) -> None:
+        """탐색 단계에서 관측한 호스트 RTT(초)를 기록한다."""
+        if srtt and srtt > 0:
+            with cls._lock:
+                cls._rtts[ip] = srtt
+
+    @classmethod
+    def rtt(cls, ip: Optional[str]) -> float:
+        """호스트 RTT(초), 모르면 `DEFAULT_RTT`."""
+        with cls._lock:
+            return cls._rtts.get(ip, cls.DEFAULT_RTT)
+
+    @classmethod
+    def estimate(
+        cls,
+        kind: str,
+        ips: Sequence[str] = (),
+        ports: int = 1,
+        template: int = 3,
+        hosts: Optional[int] = None,
+        rate: Optional[float] = None,
+    ) -> float:
+        """nmap 한 번의 예상 실행 시간(초).
+
+        Args:
+            kind: 단계 종류 ("discovery", "ports", "services", "os", "checks",
+                "combined")
+            ips: 대상 IP (RTT 조회용)
+            ports: 호스트당 대상 포트(또는 스크립트×포트) 수
+            template: nmap 타이밍 템플릿 (-T)
+            hosts: 대상 호스트 수 (기본 len(ips))
+            rate: `--max-rate`로 제한된 패킷/초 — 모든 프로브를 보내는 데 걸리는
+                시간보다 짧게 추정하지 않는다
+        """
+        rtt = max((cls.rtt(ip) for ip in ips), default=cls.DEFAULT_RTT)
+        per_probe = max(
+            cls.SCAN_DELAY.get(template, 0.0),
+            rtt * cls.RTT_MULTIPLIER,
+        )
+        per_port = cls.PROBES_PER_PORT.get(kind, 1)
+        probes = cls.FIXED_PROBES.get(kind, 0) + per_port * max(ports, 0)
+        hosts = max(hosts if hosts is not None else len(ips), 1)
+        # -T0/-T1은 프로브를 직렬로 보내므로 호스트 수만큼, 그 외는 그룹 단위로 늘어남
+        if template <= 1:
+            groups = hosts
+        else:
+            groups = math.ceil(hosts / cls.HOST_PARALLELISM)
+        duration = probes * per_probe * groups
+        if rate:
+            duration = max(duration, probes * hosts / rate)
+        return cls.OVERHEAD + duration
+
+    @classmethod
+    def timeout(
+        cls,
+        kind: str,
+        ips: Sequence[str] = (),
+        ports: int = 1,
+        template: int = 3,
+        hosts: Optional[int] = None,
+        rate: Optional[float] = None,
+    ) -> float:
+        """nmap 한 번의 제한 시간(초) — 현재 호스트 예산이 있으면 그 안으로 줄인다.
+
+        Raises:
+            DeadlineExceeded: 현재 호스트 예산이 남아 있지 않은 경우
+        """
+        estimate = cls.estimate(kind, ips, ports, template, hosts, rate)
+        limit = max(estimate * cls.SAFETY, cls.MIN_TIMEOUT)
+        if template > 1 and limit > cls.MAX_TIMEOUT:
+            if estimate > cls.MAX_TIMEOUT:
+                cls.logger.warning(
+                    "Estimated %s run of %.0fs exceeds the %.0fs cap; "
+                    "nmap may be killed before it finishes",
+                    kind,
+                    estimate,
+                    cls.MAX_TIMEOUT,
+                )
+            limit = cls.MAX_TIMEOUT
+        budget = current_budget()
+        if budget is not None:
+            remaining = budget.remaining()
+            if remaining <= 0:
+                budget.record_overrun(kind)
+                raise DeadlineExceeded(
+                    f"Host deadline exceeded for {budget.ip} ({kind})"
+                )
+            limit = min(limit, remaining)
+        cls.logger.debug(
+            "Timeout for %s on %d host(s), %d port(s), -T%d: %.0fs",
+            kind,
+            hosts if hosts is not None else len(ips),
+            ports,
+            template,
+            limit,
+        )
+        return limit
@@ -4,13 +4,23 @@ from __future__ import annotations
 
 import argparse
 import logging
+import math
 import os
 import sys
+from contextlib import ExitStack
+from datetime import timedelta
 from pathlib import Path
 from typing import Optional
 
 # ── 절대 경로 임포트 ----------------------------------------------------
 from src.core.license import LicenseManager
+from src.scanner.nmap_runner import NmapRunner
+from src.scanner.pipeline import parse_stage_workers
+from src.scanner.probe_cache import ProbeCache
+from src.scanner.rate_governor import RateGovernor
+from src.scanner.resource_governor import ResourceGovernor
+from src.output.exporters import CsvExporter, JsonlExporter
+from src.output.result_store import ResultStore
 from src.scanner.scan_workflow import ScanWorkflow
 # -----------------------------------------------------------------------
 
@@ -37,6 +47,48 @@ def _get_license_key(args: argparse.Namespace) -> str:
     return input("Enter license key: ").strip()
 
 
+def _positive_int(value: str) -> int:
+    """1 이상의 정수만 허용하는 argparse 타입."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1: {value}")
+    return number
+
+
+def _non_negative_int(value: str) -> int:
+    """0 이상의 정수만 허용하는 argparse 타입."""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be >= 0: {value}")
+    return number
+
+
+def _stage_workers(value: str) -> dict[str, int]:
+    """'ports=4,os=1' 형식의 단계별 동시 실행 수 argparse 타입."""
+    try:
+        return parse_stage_workers(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+
+
+def _rate_governor(args: argparse.Namespace) -> RateGovernor | None:
+    """--max-bandwidth/--max-rate 옵션으로 속도 조절기를 만든다 (둘 다 없으면 None)."""
+    bandwidth = args.max_bandwidth * 1000 if args.max_bandwidth else None
+    if bandwidth is None and args.max_rate is None:
+        return None
+    return RateGovernor(max_rate=args.max_rate, max_bandwidth=bandwidth)
+
+
+def _resource_governor(args: argparse.Namespace) -> ResourceGovernor | None:
+    """--cpu-limit/--mem-limit 옵션으로 자원 조절기를 만든다 (둘 다 0이면 None)."""
+    if not args.cpu_limit and not args.mem_limit:
+        return None
+    return ResourceGovernor(
+        cpu_limit=args.cpu_limit or math.inf,
+        mem_limit=args.mem_limit or math.inf,
+    )
+
+
 def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(prog="netscanner", description="Unauthenticated network scanner")
     parser.add_argument("--cidr", required=True, help="Target network CIDR (e.g. 192.168.1.0/24)")
@@ -44,6 +96,152 @@ def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser.add_argument("-k", "--license", help="License key (optionally use env NETSCAN_LICENSE)")
     parser.add_argument("--log-level", choices=["DEBUG", "INFO"], default="INFO")
     parser.add_argument("--out", default="scan_results.xlsx", help="Excel output path")
+    parser.add_argument(
+        "--jsonl",
+        metavar="PATH",
+        help="Also stream each finished host as one JSON line to PATH",
+    )
+    parser.add_argument(
+        "--csv",
+        metavar="PATH",
+        help="Also stream each finished host as one CSV row to PATH",
+    )
+    parser.add_argument(
+        "--db",
+        default="scan_results.db",
+        help="SQLite result store path (default: scan_results.db)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse stored service/OS/check results for hosts whose open "
+        "ports and services are unchanged since the previous scan",
+    )
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=30.0,
+        metavar="DAYS",
+        help="Maximum age of reused results in incremental mode (default: 30)",
+    )
+    parser.add_argument(
+        "--probe-cache",
+        default="probe_cache.db",
+        help="On-disk service/OS probe cache path (default: probe_cache.db)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=4.0,
+        metavar="HOURS",
+        help="Probe cache entry lifetime, 0 disables the cache; entries are "
+        "also keyed by the MAC seen during discovery (default: 4)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=_positive_int,
+        default=10000,
+        help="Maximum probe cache entries (default: 10000)",
+    )
+    parser.add_argument(
+        "--host-timeout",
+        type=_positive_int,
+        default=int(ScanWorkflow.DEFAULT_HOST_TIMEOUT),
+        metavar="SECONDS",
+        help="Overall time budget per host across all stages (default: 3600)",
+    )
+    parser.add_argument(
+        "--breaker-threshold",
+        type=_non_negative_int,
+        default=2,
+        metavar="N",
+        help="Skip a host's remaining stages after N consecutive timed-out or "
+        "unanswered stages, 0 disables (default: 2)",
+    )
+    parser.add_argument(
+        "--subnet-breaker-threshold",
+        type=_non_negative_int,
+        default=8,
+        metavar="N",
+        help="Skip the rest of a /24 after N consecutive timed-out stages "
+        "(hosts with only filtered ports do not count), 0 disables "
+        "(default: 8)",
+    )
+    parser.add_argument(
+        "--max-bandwidth",
+        type=float,
+        default=None,
+        metavar="KBPS",
+        help="Network budget shared by all concurrent nmap runs in kbit/s "
+        "(e.g. 900). Each run gets its share as --max-rate, and -T0/-T1 "
+        "are raised to -T3 so the scan delay does not undercut it "
+        "(default: no limit)",
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=None,
+        metavar="PPS",
+        help="Packet budget shared by all concurrent nmap runs in packets/s; "
+        "same rewrite as --max-bandwidth, and the lower of the two applies "
+        "(default: no limit)",
+    )
+    parser.add_argument(
+        "--cpu-limit",
+        type=float,
+        default=5.0,
+        metavar="PCT",
+        help="CPU ceiling for the scanner and its nmap processes, as %% of "
+        "all cores; concurrency shrinks above it, 0 = no limit "
+        "(default: 5)",
+    )
+    parser.add_argument(
+        "--mem-limit",
+        type=float,
+        default=5.0,
+        metavar="PCT",
+        help="Memory ceiling for the scanner and its nmap processes, as %% of "
+        "RAM, 0 = no limit (default: 5); both 0 disables the governor",
+    )
+    parser.add_argument(
+        "--max-children",
+        type=_positive_int,
+        default=None,
+        metavar="N",
+        help="Maximum nmap processes running at once across all stages "
+        f"(default: {NmapRunner.MAX_CHILDREN})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=_positive_int,
+        default=1,
+        help="Number of hosts scanned concurrently (default: 1 = sequential)",
+    )
+    parser.add_argument(
+        "--port-chunk-size",
+        type=_positive_int,
+        default=1,
+        help="Hosts per batched port scan (default: 1 = one nmap per host)",
+    )
+    parser.add_argument(
+        "--stage-workers",
+        type=_stage_workers,
+        default=None,
+        help="Run as a staged pipeline with per-stage concurrency, "
+        "e.g. ports=4,services=2,os=1,checks=1",
+    )
+    parser.add_argument(
+        "--check-chunk-size",
+        type=_positive_int,
+        default=1,
+        help="Batch NSE checks across hosts, N hosts per nmap call "
+        "(default: 1 = per-host checks)",
+    )
+    parser.add_argument(
+        "--combined",
+        action="store_true",
+        help="Detect ports, service versions and OS in a single nmap pass",
+    )
     return parser.parse_args(argv)
 
 
@@ -69,9 +267,50 @@ def main(argv: list[str] | None = None) -> int:
         return 1
 
     # ── 워크플로우 실행 -------------------------------------------------
+    if args.max_children is not None:
+        NmapRunner.set_max_children(args.max_children)
     try:
-        ScanWorkflow(network_cidr=args.cidr, top_ports=args.top_ports).run()
+        with ExitStack() as resources:
+            store = resources.enter_context(ResultStore(args.db))
+            probe_cache = None
+            if args.cache_ttl > 0:
+                probe_cache = resources.enter_context(
+                    ProbeCache(
+                        args.probe_cache,
+                        ttl=args.cache_ttl * 3600,
+                        max_entries=args.cache_size,
+                    )
+                )
+            exporters = []
+            if args.jsonl:
+                exporters.append(
+                    resources.enter_context(JsonlExporter(args.jsonl)),
+                )
+            if args.csv:
+                exporters.append(
+                    resources.enter_context(CsvExporter(args.csv)),
+                )
+            ScanWorkflow(
+                network_cidr=args.cidr,
+                top_ports=args.top_ports,
+                workers=args.workers,
+                port_chunk_size=args.port_chunk_size,
+                stage_workers=args.stage_workers,
+                check_chunk_size=args.check_chunk_size,
+                combined=args.combined,
+                store=store,
+                incremental=args.incremental,
+                max_age=timedelta(days=args.max_age),
+                probe_cache=probe_cache,
+                host_timeout=args.host_timeout,
+                breaker_threshold=args.breaker_threshold or None,
+                subnet_breaker_threshold=args.subnet_breaker_threshold or None,
+                rate_governor=_rate_governor(args),
+                resource_governor=_resource_governor(args),
+                exporters=exporters,
+            ).run()
         logging.info("Excel report saved to %s", Path(args.out).resolve())
+        logging.info("Results stored in %s", Path(args.db).resolve())
     except Exception as exc:  # pragma: no cover  (표준 예외 통합)
         logging.exception("Scan failed: %s", exc)
         return 2
@@ -1,6 +1,14 @@
 """공통 예외 클래스들을 정의하는 모듈."""
 
-__all__ = ['NetworkError', 'ConfigError', 'OutputError', 'StateError', 'StateCorruptedError']
+__all__ = [
+    "NetworkError",
+    "ConfigError",
+    "OutputError",
+    "StateError",
+    "StateCorruptedError",
+    "ScanTimeout",
+    "DeadlineExceeded",
+]
 
 class NetworkError(Exception):
     """네트워크 관련 예외."""
@@ -20,4 +28,24 @@ class StateError(Exception):
 
 class StateCorruptedError(StateError):
     """상태 파일 손상 관련 예외."""
-    pass 
\ No newline at end of file
+    pass
+
+
+class ScanTimeout(Exception):
+    """스캔 시간 초과 예외.
+
+    Attributes:
+        partial: 시간 초과 전까지 얻은 부분 결과 (없으면 None)
+        hosts: 시간 초과의 영향을 받은 호스트 IP 목록
+    """
+
+    def __init__(self, message: str = "", partial=None, hosts=()):
+        super().__init__(message)
+        self.partial = partial
+        self.hosts = list(hosts)
+
+
+class DeadlineExceeded(ScanTimeout):
+    """호스트별 시간 예산을 모두 써서 단계를 시작할 수 없을 때의 예외."""
+
+    pass 
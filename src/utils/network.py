@@ -1,29 +1,54 @@
 """네트워크 관련 유틸리티를 제공하는 모듈."""
 
 from typing import List, Optional
+import ipaddress
 import socket
 
 __all__ = ['NetworkUtils']
 
 class NetworkUtils:
     """네트워크 유틸리티 클래스."""
-    
+
     @staticmethod
     def is_valid_ip(ip: str) -> bool:
-        # IMPLEMENT: IP 주소 유효성 검사
-        pass
-    
+        """IPv4/IPv6 주소 문자열인지 검사합니다."""
+        try:
+            ipaddress.ip_address(ip)
+        except ValueError:
+            return False
+        return True
+
     @staticmethod
     def is_valid_cidr(cidr: str) -> bool:
-        # IMPLEMENT: CIDR 표기법 유효성 검사
-        pass
-    
+        """CIDR 표기법(호스트 비트 허용) 또는 단일 주소인지 검사합니다."""
+        try:
+            ipaddress.ip_network(cidr, strict=False)
+        except ValueError:
+            return False
+        return True
+
+    @staticmethod
+    def is_safe_target(target: str) -> bool:
+        """nmap 인수로 넘겨도 옵션으로 해석되지 않는 대상인지 검사합니다.
+
+        주소를 파싱하지 않는 가벼운 검사로, 빈 문자열, `-`로 시작하는 문자열,
+        공백이나 제어 문자가 든 문자열을 거릅니다. 주소 형식은 대상이 워크플로우에
+        들어올 때 `is_valid_ip`로 한 번 검사합니다.
+        """
+        return (
+            isinstance(target, str)
+            and bool(target)
+            and not target.startswith("-")
+            and target.isprintable()
+            and " " not in target
+        )
+
     @staticmethod
     def get_local_ips() -> List[str]:
         # IMPLEMENT: 로컬 IP 주소 목록 조회
         pass
-    
+
     @staticmethod
     def resolve_hostname(ip: str) -> Optional[str]:
         # IMPLEMENT: IP 주소의 호스트명 조회
-        pass 
\ No newline at end of file
+        pass 
@@ -6,6 +6,14 @@ Adds the project root to sys.path so tests can `import src...` without installin
 import sys
 from pathlib import Path
 
+import pytest
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cwd(tmp_path, monkeypatch):
+    """상태 파일/저널/리포트가 저장소 루트에 남지 않도록 임시 디렉터리에서 실행."""
+    monkeypatch.chdir(tmp_path)
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import pytest
+
 from src.scanner_cli import main
 from src.core.license import LicenseManager
-
+from src.scanner.nmap_runner import NmapRunner
+from src.scanner.rate_governor import RateGovernor
+from src.scanner.scan_workflow import ScanWorkflow
 
 class TestScannerCLI:
     """Scanner CLI 동작 검증."""
@@ -21,6 +25,163 @@ class TestScannerCLI:
         exit_code = main(self.BASE_ARGS + ["--license", "OK"])
         assert exit_code == 0
 
+    def test_workers_option_passed(self, monkeypatch):
+        """--workers 값이 ScanWorkflow에 전달된다."""
+        monkeypatch.setattr(LicenseManager, "validate_key", lambda *_: True)
+        captured = {}
+
+        def fake_run(self):
+            captured["workers"] = self.workers
+            return []
+
+        monkeypatch.setattr(ScanWorkflow, "run", fake_run)
+
+        exit_code = main(
+            self.BASE_ARGS + ["--license", "OK", "--workers", "4"],
+        )
+        assert exit_code == 0
+        assert captured["workers"] == 4
+
+    def test_stage_workers_option_passed(self, monkeypatch):
+        """--stage-workers 값이 단계별 딕셔너리로 전달된다."""
+        monkeypatch.setattr(LicenseManager, "validate_key", lambda *_: True)
+        captured = {}
+
+        def fake_run(self):
+            captured["stage_workers"] = self.stage_workers
+            return []
+
+        monkeypatch.setattr(ScanWorkflow, "run", fake_run)
+
+        exit_code = main(
+            self.BASE_ARGS
+            + [
+                "--license",
+                "OK",
+                "--stage-workers",
+                "ports=8,os=2",
+            ],
+        )
+        assert exit_code == 0
+        assert captured["stage_workers"] == {
+            "ports": 8,
+            "services": 2,
+            "os": 2,
+            "checks": 1,
+        }
+
+    def test_db_option_opens_result_store(self, monkeypatch, tmp_path):
+        """--db 경로의 결과 저장소가 ScanWorkflow에 전달된다."""
+        monkeypatch.setattr(LicenseManager, "validate_key", lambda *_: True)
+        captured = {}
+
+        def fake_run(self):
+            captured["store"] = self.store.path
+            return []
+
+        monkeypatch.setattr(ScanWorkflow, "run", fake_run)
+        db_path = tmp_path / "results.db"
+
+        exit_code = main(
+            self.BASE_ARGS + ["--license", "OK", "--db", str(db_path)],
+        )
+        assert exit_code == 0
+        assert captured["store"] == str(db_path)
+        assert db_path.exists()
+
+    @pytest.mark.parametrize(
+        "extra, expected",
+        [
+            ([], None),
+            (
+                ["--max-bandwidth", "900"],
+                900_000 / (RateGovernor.PACKET_BYTES * 8),
+            ),
+            (["--max-rate", "200"], 200),
+            (["--max-bandwidth", "0"], None),
+        ],
+    )
+    def test_rate_governor_options(self, monkeypatch, extra, expected):
+        """--max-bandwidth/--max-rate로 속도 조절기가 만들어져 전달된다."""
+        monkeypatch.setattr(LicenseManager, "validate_key", lambda *_: True)
+        captured = {}
+
+        def fake_run(self):
+            governor = self.rate_governor
+            captured["max_rate"] = getattr(governor, "max_rate", None)
+            return []
+
+        monkeypatch.setattr(ScanWorkflow, "run", fake_run)
+
+        assert main(self.BASE_ARGS + ["--license", "OK", *extra]) == 0
+        assert captured["max_rate"] == expected
+
+    @pytest.mark.parametrize(
+        "extra, expected",
+        [
+            ([], (5.0, 5.0)),
+            (["--cpu-limit", "2", "--mem-limit", "0"], (2.0, float("inf"))),
+            (["--cpu-limit", "0", "--mem-limit", "0"], None),
+        ],
+    )
+    def test_resource_governor_options(self, monkeypatch, extra, expected):
+        """--cpu-limit/--mem-limit로 자원 조절기가 만들어져 전달된다."""
+        monkeypatch.setattr(LicenseManager, "validate_key", lambda *_: True)
+        captured = {}
+
+        def fake_run(self):
+            governor = self.resource_governor
+            captured["limits"] = (
+                (governor.cpu_limit, governor.mem_limit) if governor else None
+            )
+            return []
+
+        monkeypatch.setattr(ScanWorkflow, "run", fake_run)
+
+        assert main(self.BASE_ARGS + ["--license", "OK", *extra]) == 0
+        assert captured["limits"] == expected
+
+    def test_exporter_options(self, monkeypatch, tmp_path):
+        """--jsonl/--csv로 스트리밍 출력기가 만들어져 전달되고 실행 후 닫힌다."""
+        monkeypatch.setattr(LicenseManager, "validate_key", lambda *_: True)
+        captured = {}
+
+        def fake_run(self):
+            captured["exporters"] = [type(e).__name__ for e in self.exporters]
+            return []
+
+        monkeypatch.setattr(ScanWorkflow, "run", fake_run)
+        jsonl, csv_path = tmp_path / "feed.jsonl", tmp_path / "feed.csv"
+
+        assert (
+            main(
+                self.BASE_ARGS
+                + [
+                    "--license",
+                    "OK",
+                    "--jsonl",
+                    str(jsonl),
+                    "--csv",
+                    str(csv_path),
+                ],
+            )
+            == 0
+        )
+        assert captured["exporters"] == ["JsonlExporter", "CsvExporter"]
+        assert jsonl.exists() and csv_path.read_text().startswith("ip,")
+
+    def test_max_children_option(self, monkeypatch):
+        """--max-children으로 동시 nmap 프로세스 상한이 설정된다."""
+        monkeypatch.setattr(LicenseManager, "validate_key", lambda *_: True)
+        monkeypatch.setattr(ScanWorkflow, "run", lambda self: [])
+        limit = NmapRunner.MAX_CHILDREN
+        try:
+            args = self.BASE_ARGS + ["--license", "OK", "--max-children", "3"]
+            assert main(args) == 0
+            assert NmapRunner.MAX_CHILDREN == 3
+        finally:
+            NmapRunner.set_max_children(limit)
+
     # ──────────────────────────────────────────────────────────────
     # 실패 시나리오
     # ──────────────────────────────────────────────────────────────
@@ -30,3 +191,8 @@ class TestScannerCLI:
 
         exit_code = main(self.BASE_ARGS + ["--license", "BAD"])
         assert exit_code == 1
+
+    def test_invalid_workers_rejected(self):
+        """--workers 0 → argparse 오류."""
+        with pytest.raises(SystemExit):
+            main(self.BASE_ARGS + ["--license", "OK", "--workers", "0"])
@@ -0,0 +1,123 @@
+"""HostResult 테스트 모듈."""
+
+import gc
+import tracemalloc
+from array import array
+
+import pytest
+from src.core import host_result
+from src.core.host_result import HostResult
+
+
+def make_result(n: int = 1):
+    """호스트마다 새로 만든 문자열로 워크플로우 결과 딕셔너리를 만든다."""
+    fresh = "".join  # 같은 값이라도 별도 객체 (스캐너 파싱 결과처럼)
+    return {
+        "ip": f"10.0.{n // 256}.{n % 256}",
+        "open_ports": [22, 80, 443, 445, 3389],
+        "services": {
+            22: fresh(["OpenSSH 8.2p1 ", "Ubuntu 4ubuntu0.5"]),
+            80: fresh(["nginx 1.18.0 ", "(Ubuntu)"]),
+        },
+        "os": fresh(["Linux 4.15 ", "- 5.6"]),
+        "checks": {
+            fresh(["smb", "v1"]): False,
+            fresh(["ftp_", "anonymous"]): False,
+            fresh(["weak_", "tls"]): n % 2 == 0,
+        },
+    }
+
+
+class TestHostResult:
+    """HostResult 테스트 클래스."""
+
+    def test_round_trip(self):
+        """기존 결과 딕셔너리 형식(키 순서 포함)으로 그대로 되돌아오는지 테스트."""
+        result = make_result(3)
+        compact = HostResult.from_dict(result)
+        assert compact.ip == 0x0A000003
+        assert isinstance(compact.open_ports, array)
+        assert compact.open_ports.typecode == "H"
+        restored = compact.to_dict()
+        assert restored == result
+        assert list(restored) == [
+            "ip",
+            "open_ports",
+            "services",
+            "os",
+            "checks",
+        ]
+
+    def test_round_trip_partial_and_skipped(self):
+        """부분 결과/회로 차단 표시, 탐색 기법, 리스트 점검 결과도 보존되는지 테스트."""
+        result = {
+            "ip": "10.0.0.9",
+            "open_ports": [],
+            "services": {},
+            "os": None,
+            "checks": {"http_methods": ["GET", "TRACE"]},
+            "partial": ["os"],
+            "skipped": {
+                "reason": "subnet 10.0.0.0/24 silent",
+                "stages": ["checks"],
+            },
+            "technique": "tcp-syn",
+        }
+        assert HostResult.from_dict(result).to_dict() == result
+
+    def test_ipv6(self):
+        """IPv6 주소도 정수로 저장하고 문자열로 되돌리는지 테스트."""
+        compact = HostResult.from_dict({"ip": "fe80::1", "open_ports": [22]})
+        assert compact.version == 6
+        assert compact.address == "fe80::1"
+
+    def test_invalid_ip_raises(self):
+        """유효하지 않은 IP 주소는 ValueError."""
+        with pytest.raises(ValueError):
+            HostResult.from_dict({"ip": "not-an-ip", "open_ports": []})
+
+    def test_strings_and_name_lists_shared(self):
+        """서비스/OS 문자열은 intern 되고 같은 점검 이름/값 목록은 튜플 하나를 공유하는지 테스트."""
+        first = HostResult.from_dict(make_result(2))
+        second = HostResult.from_dict(make_result(4))
+        assert first.os is second.os
+        assert first.service_names is second.service_names
+        assert first.check_names is second.check_names
+        assert first.check_values is second.check_values
+        other = HostResult.from_dict(make_result(5))
+        assert other.check_values is not first.check_values
+
+    def test_shared_table_bounded(self):
+        """호스트마다 다른 값 목록이 들어와도 공유 표가 제한 크기를 넘지 않는지 테스트."""
+        for n in range(host_result.SHARED_TUPLES_MAX + 100):
+            HostResult.from_dict(
+                {
+                    "ip": "10.0.0.1",
+                    "open_ports": [],
+                    "services": {22: f"OpenSSH {n}"},
+                },
+            )
+        info = host_result._shared_tuple.cache_info()
+        assert info.currsize == host_result.SHARED_TUPLES_MAX
+
+    def test_slots(self):
+        """인스턴스 딕셔너리 없이 슬롯만 쓰는지 테스트."""
+        assert not hasattr(HostResult.from_dict(make_result()), "__dict__")
+
+    def test_memory_per_host_drops(self):
+        """대규모 스캔에서 호스트당 메모리가 결과 딕셔너리의 절반 미만인지 테스트."""
+
+        def traced(build):
+            gc.collect()
+            tracemalloc.start()
+            try:
+                kept = [build(n) for n in range(2000)]
+                return tracemalloc.get_traced_memory()[0], kept
+            finally:
+                tracemalloc.stop()
+
+        dict_bytes, _ = traced(make_result)
+        compact_bytes, _ = traced(
+            lambda n: HostResult.from_dict(make_result(n)),
+        )
+        assert compact_bytes * 2 < dict_bytes
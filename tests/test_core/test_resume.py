@@ -6,31 +6,182 @@ from src.core.state import StateManager
 
 class TestResumeManager:
     """ResumeManager 테스트 클래스."""
-    
+
     def setup_method(self):
         """테스트 메서드 실행 전 초기화."""
         self.manager = ResumeManager()
-    
+
     def test_no_state_returns_false(self, monkeypatch):
         """상태 파일이 없는 경우 False 반환 테스트."""
         def mock_load_state():
             return None
-        
+
         monkeypatch.setattr(StateManager, 'load_state', mock_load_state)
-        assert not self.manager.should_resume()
-    
+        assert not self.manager.should_resume(self.manager.load())
+
     def test_pending_ips_detected(self, monkeypatch):
         """대기 중인 IP가 있는 경우 True 반환 테스트."""
         def mock_load_state():
             return {"pending_ips": ["192.168.1.5"]}
-        
+
         monkeypatch.setattr(StateManager, 'load_state', mock_load_state)
-        assert self.manager.should_resume()
-    
+        assert self.manager.should_resume(self.manager.load())
+
     def test_get_pending_ips_returns_list(self, monkeypatch):
         """대기 중인 IP 목록 반환 테스트."""
         def mock_load_state():
             return {"pending_ips": ["192.168.1.5"]}
-        
+
         monkeypatch.setattr(StateManager, 'load_state', mock_load_state)
-        assert self.manager.get_pending_ips() == ["192.168.1.5"] 
\ No newline at end of file
+        assert self.manager.get_pending_ips(self.manager.load()) == [
+            "192.168.1.5",
+        ]
+
+    def test_host_progress_for_pending_hosts(self, monkeypatch):
+        """대기 중인 호스트의 완료 단계가 결과 키로 반환되는지 테스트."""
+
+        def mock_load_state():
+            return {
+                "pending_ips": ["192.168.1.6"],
+                "hosts": {
+                    "192.168.1.5": {
+                        "ports": [22],
+                        "services": {"22": "SSH"},
+                        "os": "Linux",
+                        "checks": {"smbv1": False},
+                    },
+                    "192.168.1.6": {"ports": [22], "services": {"22": "SSH"}},
+                },
+            }
+
+        monkeypatch.setattr(StateManager, "load_state", mock_load_state)
+        assert self.manager.get_host_progress(self.manager.load()) == {
+            "192.168.1.6": {"open_ports": [22], "services": {22: "SSH"}},
+        }
+
+    def test_completed_results(self, monkeypatch):
+        """모든 단계를 마친 호스트만 결과 형식으로 반환되는지 테스트."""
+
+        def mock_load_state():
+            return {
+                "pending_ips": ["192.168.1.6"],
+                "hosts": {
+                    "192.168.1.4": {"ports": []},
+                    "192.168.1.5": {
+                        "ports": [22],
+                        "services": {"22": "SSH"},
+                        "os": "Linux",
+                        "checks": {"smbv1": False},
+                    },
+                    "192.168.1.6": {"ports": [22]},
+                },
+            }
+
+        monkeypatch.setattr(StateManager, "load_state", mock_load_state)
+        results = self.manager.get_completed_results(self.manager.load())
+        assert results == [
+            {
+                "ip": "192.168.1.5",
+                "open_ports": [22],
+                "services": {22: "SSH"},
+                "os": "Linux",
+                "checks": {"smbv1": False},
+            }
+        ]
+        assert list(results[0]) == [
+            "ip",
+            "open_ports",
+            "services",
+            "os",
+            "checks",
+        ]
+
+    def test_discovery_techniques(self, monkeypatch):
+        """탐색 기법은 완료 결과에 남고, 기법만 기록된 호스트는 진행 중으로 보지 않는지 테스트."""
+
+        def mock_load_state():
+            return {
+                "pending_ips": ["192.168.1.6"],
+                "hosts": {
+                    "192.168.1.5": {
+                        "technique": "arp",
+                        "ports": [22],
+                        "services": {},
+                        "os": None,
+                        "checks": {},
+                    },
+                    "192.168.1.6": {"technique": "icmp"},
+                },
+            }
+
+        monkeypatch.setattr(StateManager, "load_state", mock_load_state)
+        state = self.manager.load()
+        assert self.manager.get_techniques(state) == {
+            "192.168.1.5": "arp",
+            "192.168.1.6": "icmp",
+        }
+        assert self.manager.get_host_progress(state) == {}
+        [result] = self.manager.get_completed_results(state)
+        assert result["technique"] == "arp"
+
+    def test_completed_results_keep_skipped_hosts(self, monkeypatch):
+        """회로 차단으로 건너뛴 호스트는 열린 포트가 없어도 결과에 남는지 테스트."""
+        skipped = {
+            "reason": "subnet 192.168.1.0/24 unresponsive",
+            "stages": ["ports", "services", "os", "checks"],
+        }
+
+        def mock_load_state():
+            return {
+                "pending_ips": [],
+                "hosts": {
+                    "192.168.1.7": {
+                        "ports": [],
+                        "services": {},
+                        "os": None,
+                        "checks": {},
+                        "skipped": skipped,
+                    },
+                },
+            }
+
+        monkeypatch.setattr(StateManager, "load_state", mock_load_state)
+        assert self.manager.get_completed_results(self.manager.load()) == [
+            {
+                "ip": "192.168.1.7",
+                "open_ports": [],
+                "services": {},
+                "os": None,
+                "checks": {},
+                "skipped": skipped,
+            }
+        ]
+
+    def test_interrupted_discovery_resumes(self, monkeypatch):
+        """대기 호스트가 없어도 탐색 도중 중단됐으면 재개하는지 테스트."""
+
+        def mock_load_state():
+            return {
+                "pending_ips": [],
+                "discovery_complete": False,
+                "hosts": {"192.168.1.5": {"ports": [22]}},
+            }
+
+        monkeypatch.setattr(StateManager, "load_state", mock_load_state)
+        state = self.manager.load()
+        assert self.manager.should_resume(state)
+        assert not self.manager.discovery_complete(state)
+        assert self.manager.get_known_ips(state) == {"192.168.1.5"}
+
+    def test_finished_discovery_without_pending_does_not_resume(self):
+        """탐색이 끝났고 대기 호스트가 없으면 (또는 탐색 기록이 없으면) 재개하지 않는지 테스트."""
+        hosts = {"192.168.1.5": {"ports": [22]}}
+        assert not self.manager.should_resume(
+            {"pending_ips": [], "discovery_complete": True, "hosts": hosts}
+        )
+        assert not self.manager.should_resume(
+            {"pending_ips": [], "hosts": hosts},
+        )
+        assert not self.manager.should_resume(
+            {"pending_ips": [], "discovery_complete": False}
+        )
@@ -5,24 +5,24 @@ import os
 import tempfile
 from pathlib import Path
 import pytest
-from src.core.state import StateManager, INTERNAL_PATH_DEFAULT
+from src.core.state import StateManager, StateJournal, INTERNAL_PATH_DEFAULT
 from src.utils.exceptions import StateError, StateCorruptedError
 
 class TestStateManager:
     """StateManager 테스트 클래스."""
-    
+
     def setup_method(self):
         """테스트 메서드 실행 전 초기화."""
         self.manager = StateManager()
         self.temp_dir = tempfile.mkdtemp()
         self.test_path = Path(self.temp_dir) / "test_state.json"
-    
+
     def teardown_method(self):
         """테스트 메서드 실행 후 정리."""
         if self.test_path.exists():
             self.test_path.unlink()
         os.rmdir(self.temp_dir)
-    
+
     def test_save_state_default_path(self, tmp_path):
         """기본 경로에 상태 저장 테스트."""
         data = {"test": "data"}
@@ -32,7 +32,7 @@ class TestStateManager:
             loaded = json.load(f)
         assert loaded == data
         Path(INTERNAL_PATH_DEFAULT).unlink()
-    
+
     def test_save_state_custom_path(self):
         """사용자 정의 경로에 상태 저장 테스트."""
         data = {"test": "data"}
@@ -41,45 +41,159 @@ class TestStateManager:
         with open(self.test_path, 'r', encoding='utf-8') as f:
             loaded = json.load(f)
         assert loaded == data
-    
+
     def test_save_state_atomic_write(self):
         """원자적 쓰기 테스트."""
         data = {"test": "data"}
         self.manager.save_state(data, self.test_path)
         assert not self.test_path.with_suffix('.tmp').exists()
-    
+
     def test_save_state_error(self):
         """저장 실패 시 예외 발생 테스트."""
         with pytest.raises(StateError):
             self.manager.save_state({}, "/invalid/path/state.json")
-    
+
     def test_load_state_default_path(self, tmp_path):
         """기본 경로에서 상태 로드 테스트."""
         data = {"test": "data"}
         with open(INTERNAL_PATH_DEFAULT, 'w', encoding='utf-8') as f:
             json.dump(data, f)
-        
+
         loaded = self.manager.load_state()
         assert loaded == data
         Path(INTERNAL_PATH_DEFAULT).unlink()
-    
+
     def test_load_state_custom_path(self):
         """사용자 정의 경로에서 상태 로드 테스트."""
         data = {"test": "data"}
         with open(self.test_path, 'w', encoding='utf-8') as f:
             json.dump(data, f)
-        
+
         loaded = self.manager.load_state(self.test_path)
         assert loaded == data
-    
+
     def test_load_state_not_found(self):
         """파일이 없는 경우 None 반환 테스트."""
         assert self.manager.load_state(self.test_path) is None
-    
+
     def test_load_state_corrupted(self):
         """손상된 파일 로드 시 예외 발생 테스트."""
         with open(self.test_path, 'w', encoding='utf-8') as f:
             f.write("invalid json")
-        
+
+        with pytest.raises(StateCorruptedError):
+            self.manager.load_state(self.test_path) 
+
+
+class TestStateJournal:
+    """StateJournal 테스트 클래스."""
+
+    def test_replay_rebuilds_pending_and_stages(self, tmp_path):
+        """저널 재생으로 pending 목록과 단계 결과가 복원되는지 테스트."""
+        path = tmp_path / "state.json"
+        with StateJournal(path) as journal:
+            journal.add_target("10.0.0.1")
+            journal.add_target("10.0.0.2")
+            journal.record_stage("10.0.0.1", "ports", [22])
+            journal.record_stage("10.0.0.1", "checks", {"smbv1": False})
+            journal.complete("10.0.0.1")
+            journal.record_stage("10.0.0.2", "ports", [80])
+
+        state = StateManager.load_state(path)
+
+        assert state["pending_ips"] == ["10.0.0.2"]
+        assert state["hosts"]["10.0.0.1"] == {
+            "ports": [22],
+            "checks": {"smbv1": False},
+        }
+        assert state["hosts"]["10.0.0.2"] == {"ports": [80]}
+
+    def test_replay_discovery_marker(self, tmp_path):
+        """탐색 시작/완료 기록이 discovery_complete로 재생되는지 테스트."""
+        path = tmp_path / "state.json"
+        with StateJournal(path) as journal:
+            journal.record_discovery(False)
+            journal.add_target("10.0.0.1")
+
+        assert StateManager.load_state(path)["discovery_complete"] is False
+
+        with StateJournal(path) as journal:
+            journal.record_discovery(True)
+
+        assert StateManager.load_state(path)["discovery_complete"] is True
+
+    def test_one_line_per_record(self, tmp_path):
+        """레코드마다 한 줄씩 덧붙는지 테스트 (스냅샷 재작성 없음)."""
+        path = tmp_path / "state.json"
+        with StateJournal(path) as journal:
+            for i in range(5):
+                journal.add_target(f"10.0.0.{i}")
+
+        text = StateManager.journal_path(path).read_text(encoding="utf-8")
+        lines = text.splitlines()
+        assert len(lines) == 5
+        assert json.loads(lines[0]) == {"op": "target", "ip": "10.0.0.0"}
+        assert not path.exists()
+
+    def test_replay_on_top_of_snapshot(self, tmp_path):
+        """기존 스냅샷 위에 저널이 적용되는지 테스트."""
+        path = tmp_path / "state.json"
+        StateManager.save_state(
+            {"pending_ips": ["10.0.0.1", "10.0.0.2"]},
+            path,
+        )
+        with StateJournal(path) as journal:
+            journal.complete("10.0.0.1")
+
+        assert StateManager.load_state(path)["pending_ips"] == ["10.0.0.2"]
+
+    def test_compaction_rewrites_snapshot(self, tmp_path):
+        """compact_every마다 스냅샷에 흡수되고 저널이 비워지는지 테스트."""
+        path = tmp_path / "state.json"
+        with StateJournal(path, compact_every=3) as journal:
+            for i in range(4):
+                journal.add_target(f"10.0.0.{i}")
+
+        snapshot = json.loads(path.read_text(encoding="utf-8"))
+        assert snapshot["pending_ips"] == ["10.0.0.0", "10.0.0.1", "10.0.0.2"]
+        assert (
+            len(
+                StateManager.journal_path(path)
+                .read_text(encoding="utf-8")
+                .splitlines(),
+            )
+            == 1
+        )
+        assert StateManager.load_state(path)["pending_ips"] == [
+            f"10.0.0.{i}" for i in range(4)
+        ]
+
+    def test_save_state_discards_journal(self, tmp_path):
+        """save_state가 저널을 스냅샷으로 대체하는지 테스트."""
+        path = tmp_path / "state.json"
+        with StateJournal(path) as journal:
+            journal.add_target("10.0.0.1")
+
+        StateManager.save_state({"pending_ips": []}, path)
+
+        assert not StateManager.journal_path(path).exists()
+        assert StateManager.load_state(path) == {"pending_ips": []}
+
+    def test_truncated_tail_is_ignored(self, tmp_path):
+        """충돌로 잘린 마지막 줄은 무시되는지 테스트."""
+        path = tmp_path / "state.json"
+        StateManager.journal_path(path).write_text(
+            '{"op":"target","ip":"10.0.0.1"}\n{"op":"tar', encoding="utf-8"
+        )
+
+        assert StateManager.load_state(path)["pending_ips"] == ["10.0.0.1"]
+
+    def test_corrupted_middle_record_raises(self, tmp_path):
+        """중간 레코드가 손상되면 StateCorruptedError 발생 테스트."""
+        path = tmp_path / "state.json"
+        StateManager.journal_path(path).write_text(
+            'garbage\n{"op":"target","ip":"10.0.0.1"}\n', encoding="utf-8"
+        )
+
         with pytest.raises(StateCorruptedError):
-            self.manager.load_state(self.test_path) 
\ No newline at end of file
+            StateManager.load_state(path)
@@ -7,66 +7,216 @@ from pathlib import Path
 import pytest
 from openpyxl import load_workbook
 from src.output.excel_writer import ExcelWriter
+from src.output.summary import ReportSummary
 from src.utils.exceptions import OutputError
 
 class TestExcelWriter:
     """ExcelWriter 테스트 클래스."""
-    
+
     def setup_method(self):
         """테스트 메서드 실행 전 초기화."""
         self.writer = ExcelWriter()
         self.temp_dir = tempfile.mkdtemp()
         self.test_file = Path(self.temp_dir) / "test_results.xlsx"
-        
+
         # 테스트용 결과 데이터
-        self.test_results = [{
-            "ip": "192.168.1.10",
-            "open_ports": [22, 80],
-            "services": {22: "SSH", 80: "HTTP"},
-            "os": "Linux",
-            "checks": {
-                "smbv1": False,
-                "http_methods": ["GET", "POST"],
-                "ftp_anonymous": True
+        self.test_results = [
+            {
+                "ip": "192.168.1.10",
+                "open_ports": [22, 80],
+                "services": {22: "SSH", 80: "HTTP"},
+                "os": "Linux",
+                "technique": "arp",
+                "checks": {
+                    "smbv1": False,
+                    "anonymous_share": True,
+                    "weak_tls": False,
+                },
             }
-        }]
-    
+        ]
+
     def teardown_method(self):
         """테스트 메서드 실행 후 정리."""
         if self.test_file.exists():
             self.test_file.unlink()
         os.rmdir(self.temp_dir)
-    
+
     def test_write_creates_file(self):
         """파일 생성 및 헤더 검증 테스트."""
         self.writer.write(self.test_results, str(self.test_file))
-        
+
         assert self.test_file.exists()
         wb = load_workbook(self.test_file)
         ws = wb.active
-        
+
         # 헤더 검증
         headers = [cell.value for cell in ws[1]]
-        assert headers == self.writer.HEADERS
-    
+        assert headers == [
+            "IP",
+            "Open Ports",
+            "Services",
+            "OS",
+            "Discovery",
+            "smbv1",
+            "anonymous_share",
+            "weak_tls",
+            "Status",
+        ]
+        assert headers == self.writer.headers()
+
     def test_write_row_content(self):
         """데이터 행 내용 검증 테스트."""
         self.writer.write(self.test_results, str(self.test_file))
-        
+
         wb = load_workbook(self.test_file)
         ws = wb.active
-        
+
         # 데이터 행 검증
         row = list(ws.iter_rows(min_row=2, max_row=2))[0]
         assert row[0].value == self.test_results[0]["ip"]
         assert row[1].value == str(self.test_results[0]["open_ports"])
         assert row[2].value == json.dumps(self.test_results[0]["services"])
         assert row[3].value == self.test_results[0]["os"]
-        assert row[4].value == str(self.test_results[0]["checks"]["smbv1"])
-        assert row[5].value == str(self.test_results[0]["checks"]["http_methods"])
-        assert row[6].value == str(self.test_results[0]["checks"]["ftp_anonymous"])
-    
+        assert row[4].value == self.test_results[0]["technique"]
+        assert row[5].value == str(self.test_results[0]["checks"]["smbv1"])
+        assert row[6].value == str(
+            self.test_results[0]["checks"]["anonymous_share"],
+        )
+        assert row[7].value == str(self.test_results[0]["checks"]["weak_tls"])
+
+    def test_status_column(self):
+        """부분 결과/건너뛴 단계가 Status 열에 표시되는지 테스트."""
+        result = dict(
+            self.test_results[0],
+            partial=["os"],
+            skipped={"reason": "host unresponsive", "stages": ["checks"]},
+        )
+        self.writer.write([result], str(self.test_file))
+
+        ws = load_workbook(self.test_file).active
+        assert (
+            ws.cell(row=2, column=9).value
+            == "partial: os; skipped (host unresponsive): checks"
+        )
+        assert ExcelWriter.status(self.test_results[0]) == ""
+
     def test_write_error(self):
         """저장 실패 시 예외 발생 테스트."""
         with pytest.raises(OutputError):
-            self.writer.write(self.test_results, "/invalid/path/results.xlsx") 
\ No newline at end of file
+            self.writer.write(self.test_results, "/invalid/path/results.xlsx") 
+
+    def test_normalized_sheets(self):
+        """Ports/Checks 시트에 포트·점검 항목마다 한 행씩 기록되는지 테스트."""
+        result = dict(
+            self.test_results[0],
+            open_ports=[22, 80, 8080],
+            checks={
+                "smbv1": False,
+                "http_methods": ["GET", "POST"],
+                "anonymous_share": True,
+            },
+        )
+        self.writer.write([result], str(self.test_file))
+
+        wb = load_workbook(self.test_file)
+        assert wb.sheetnames == ["Summary", "Hosts", "Ports", "Checks"]
+        assert [list(row) for row in wb["Ports"].values] == [
+            ["IP", "Port", "Service"],
+            ["192.168.1.10", 22, "SSH"],
+            ["192.168.1.10", 80, "HTTP"],
+            ["192.168.1.10", 8080, None],
+        ]
+        assert [list(row) for row in wb["Checks"].values] == [
+            ["IP", "Check", "Result"],
+            ["192.168.1.10", "smbv1", False],
+            ["192.168.1.10", "http_methods", "['GET', 'POST']"],
+            ["192.168.1.10", "anonymous_share", True],
+        ]
+
+    def test_streaming_rows(self):
+        """open → write_host → close 순서로 호스트를 하나씩 덧붙이는지 테스트."""
+        writer = ExcelWriter().open(str(self.test_file))
+        for n in range(3):
+            writer.write_host(dict(self.test_results[0], ip=f"192.168.1.{n}"))
+        assert not self.test_file.exists()  # 저장은 close에서
+        assert writer.hosts == 3
+        writer.close()
+
+        hosts = load_workbook(self.test_file)["Hosts"]
+        rows = hosts.iter_rows(min_row=2, values_only=True)
+        assert [row[0] for row in rows] == [
+            "192.168.1.0",
+            "192.168.1.1",
+            "192.168.1.2",
+        ]
+
+    def test_empty_report_has_headers(self):
+        """결과가 없어도 헤더가 있는 파일이 만들어지는지 테스트."""
+        self.writer.write([], str(self.test_file))
+
+        wb = load_workbook(self.test_file)
+        assert [cell.value for cell in wb["Hosts"][1]] == self.writer.headers()
+        assert wb["Checks"].max_row == 1
+
+    def test_write_host_requires_open(self):
+        """open 전에 write_host를 부르면 OutputError 발생 테스트."""
+        with pytest.raises(OutputError):
+            ExcelWriter().write_host(self.test_results[0])
+
+    def test_summary_sheet_first(self):
+        """Summary 시트가 맨 앞에 오고, 열면 Hosts 시트가 활성화되는지 테스트."""
+        self.writer.write(self.test_results * 2, str(self.test_file))
+
+        wb = load_workbook(self.test_file)
+        assert wb.sheetnames[0] == "Summary"
+        assert wb.active.title == "Hosts"
+        summary = [list(row) for row in wb["Summary"].values]
+        assert summary[:3] == [
+            ["Overview", None],
+            ["Metric", "Value"],
+            ["Hosts", 2],
+        ]
+        failed = summary.index(["Failed checks", None]) + 1
+        assert summary[failed:][:2] == [
+            ["Check", "Hosts"],
+            ["anonymous_share", 2],
+        ]
+
+    def test_precomputed_summary(self):
+        """미리 집계한 요약을 주면 쓰는 행을 다시 더하지 않고 그 요약을 쓰는지 테스트."""
+        summary = ReportSummary.from_results(self.test_results * 3)
+        self.writer.write(
+            self.test_results,
+            str(self.test_file),
+            summary=summary,
+        )
+
+        sheet = load_workbook(self.test_file)["Summary"]
+        rows = [list(row) for row in sheet.values]
+        assert rows[2] == ["Hosts", 3]
+        assert summary.hosts == 3
+
+    def test_registered_checks_become_columns(self, monkeypatch):
+        """점검 레지스트리에 추가된 항목이 Hosts 시트 열이 되는지 테스트."""
+        from src.scanner.detailed_checks import DetailedChecks, SecurityCheck
+
+        monkeypatch.setattr(
+            DetailedChecks,
+            "CHECKS",
+            list(DetailedChecks.CHECKS),
+        )
+        DetailedChecks.register(
+            SecurityCheck(
+                "ftp_anonymous",
+                "ftp-anon",
+                (21,),
+                lambda out: "allowed" in out,
+            )
+        )
+        result = dict(self.test_results[0], checks={"ftp_anonymous": True})
+        self.writer.write([result], str(self.test_file))
+
+        hosts = load_workbook(self.test_file)["Hosts"]
+        header, row = hosts.iter_rows(values_only=True)
+        assert header[-2:] == ("ftp_anonymous", "Status")
+        assert row[-2] == "True"
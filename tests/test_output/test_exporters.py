@@ -0,0 +1,118 @@
+"""스트리밍 출력기 테스트 모듈."""
+
+import csv
+import json
+import threading
+import pytest
+from src.output.exporters import CsvExporter, JsonlExporter, ResultExporter
+from src.utils.exceptions import OutputError
+
+RESULT = {
+    "ip": "192.168.1.10",
+    "open_ports": [22, 80],
+    "services": {22: "OpenSSH 8.2", 80: "nginx"},
+    "os": "Linux",
+    "checks": {"smbv1": False},
+}
+
+
+class TestJsonlExporter:
+    """JsonlExporter 테스트 클래스."""
+
+    def test_lines_visible_before_close(self, tmp_path):
+        """호스트를 쓰는 즉시 파일에 한 줄씩 보이는지 테스트."""
+        path = tmp_path / "results.jsonl"
+        exporter = JsonlExporter(path)
+
+        exporter.write_host(RESULT)
+        lines = path.read_text().splitlines()
+        exporter.write_host(dict(RESULT, ip="192.168.1.11", partial=["os"]))
+        exporter.close()
+
+        assert json.loads(lines[0]) == dict(
+            RESULT, services={"22": "OpenSSH 8.2", "80": "nginx"}
+        )
+        records = path.read_text().splitlines()
+        assert [json.loads(line)["ip"] for line in records] == [
+            "192.168.1.10",
+            "192.168.1.11",
+        ]
+
+    def test_concurrent_writes_keep_lines_whole(self, tmp_path):
+        """여러 스레드에서 동시에 써도 줄이 섞이지 않는지 테스트."""
+        path = tmp_path / "results.jsonl"
+        with JsonlExporter(path) as exporter:
+            threads = [
+                threading.Thread(
+                    target=lambda n=n: [
+                        exporter.write_host(dict(RESULT, ip=f"10.0.{n}.{i}"))
+                        for i in range(50)
+                    ]
+                )
+                for n in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(records) == 200 and exporter.hosts == 200
+
+    def test_closed_exporter(self, tmp_path):
+        """close는 여러 번 호출해도 되고, 닫힌 뒤 쓰면 OutputError 발생 테스트."""
+        exporter = JsonlExporter(tmp_path / "results.jsonl")
+        exporter.close()
+        exporter.close()
+        with pytest.raises(OutputError):
+            exporter.write_host(RESULT)
+
+    def test_unwritable_path(self, tmp_path):
+        """파일을 열 수 없으면 OutputError 발생 테스트."""
+        with pytest.raises(OutputError):
+            JsonlExporter(tmp_path / "missing" / "results.jsonl")
+
+
+class TestCsvExporter:
+    """CsvExporter 테스트 클래스."""
+
+    def test_rows(self, tmp_path):
+        """헤더와 호스트당 한 행이 기록되는지 테스트."""
+        path = tmp_path / "results.csv"
+        with CsvExporter(path) as exporter:
+            exporter.write_host(RESULT)
+            exporter.write_host(
+                dict(
+                    RESULT,
+                    ip="192.168.1.11",
+                    os=None,
+                    skipped={
+                        "reason": "host unresponsive",
+                        "stages": ["checks"],
+                    },
+                )
+            )
+
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == CsvExporter.FIELDS
+        assert rows[1] == [
+            "192.168.1.10",
+            "22 80",
+            '{"22": "OpenSSH 8.2", "80": "nginx"}',
+            "Linux",
+            '{"smbv1": false}',
+            "",
+        ]
+        assert rows[2][3] == ""
+        assert rows[2][5] == "skipped (host unresponsive): checks"
+
+    def test_is_result_exporter(self, tmp_path):
+        """CSV/JSONL 출력기가 공통 인터페이스를 따르는지 테스트."""
+        with CsvExporter(tmp_path / "a.csv") as a, JsonlExporter(
+            tmp_path / "b.jsonl"
+        ) as b:
+            assert isinstance(a, ResultExporter) and isinstance(
+                b,
+                ResultExporter,
+            )
@@ -0,0 +1,145 @@
+"""PortMatrix 테스트 모듈."""
+
+import time
+
+import numpy as np
+import pytest
+from src.output.port_matrix import PortDiff, PortMatrix
+
+PORT_MAP = {
+    "10.0.0.1": [22, 80],
+    "10.0.0.2": [22, 3389],
+    "10.0.0.3": [],
+    "10.0.0.4": [22, 80, 445, 3389],
+}
+
+
+class TestPortMatrix:
+    """PortMatrix 테스트 클래스."""
+
+    def setup_method(self):
+        """테스트 메서드 실행 전 초기화."""
+        self.matrix = PortMatrix.from_port_map(PORT_MAP)
+
+    def test_lookups(self):
+        """포트별 호스트, 호스트별 포트, 단건 조회 테스트."""
+        assert self.matrix.shape == (4, 4)
+        assert self.matrix.ports.tolist() == [22, 80, 445, 3389]
+        assert self.matrix.hosts_with_port(3389) == ["10.0.0.2", "10.0.0.4"]
+        assert self.matrix.hosts_with_port(8080) == []
+        assert self.matrix.ports_of("10.0.0.4") == [22, 80, 445, 3389]
+        assert self.matrix.ports_of("10.0.0.3") == []
+        assert self.matrix.ports_of("10.9.9.9") == []
+        assert self.matrix.is_open("10.0.0.1", 80)
+        assert not self.matrix.is_open("10.0.0.2", 80)
+
+    def test_scanned_port_columns(self):
+        """스캔한 포트 목록을 열로 주면 열리지 않은 포트도 열이 되는지 테스트."""
+        matrix = PortMatrix.from_port_map(
+            PORT_MAP,
+            columns=[3389, 22, 80, 443, 445],
+        )
+        assert matrix.ports.tolist() == [22, 80, 443, 445, 3389]
+        assert matrix.prevalence().tolist() == [3, 2, 0, 1, 2]
+        with pytest.raises(ValueError):
+            PortMatrix.from_port_map(PORT_MAP, columns=[22, 80])
+
+    def test_from_results(self):
+        """워크플로우 결과 목록으로 만든 행렬이 포트 맵과 같은지 테스트."""
+        results = [
+            {
+                "ip": ip,
+                "open_ports": ports,
+                "services": {},
+                "os": None,
+                "checks": {},
+            }
+            for ip, ports in PORT_MAP.items()
+        ]
+        matrix = PortMatrix.from_results(results)
+        assert matrix.hosts == list(PORT_MAP)
+        assert {ip: matrix.ports_of(ip) for ip in PORT_MAP} == PORT_MAP
+
+    def test_prevalence_and_co_occurrence(self):
+        """포트별 호스트 수와 포트 쌍 동시 출현 수 테스트."""
+        assert self.matrix.prevalence().tolist() == [3, 2, 1, 2]
+        assert self.matrix.co_occurrence().tolist() == [
+            [3, 2, 1, 2],
+            [2, 2, 1, 1],
+            [1, 1, 1, 1],
+            [2, 1, 1, 2],
+        ]
+        # 행렬에 없는 포트의 행/열은 0
+        assert self.matrix.co_occurrence([3389, 8080, 22]).tolist() == [
+            [2, 0, 2],
+            [0, 0, 0],
+            [2, 0, 3],
+        ]
+
+    def test_co_occurrence_across_chunks(self, monkeypatch):
+        """청크 경계를 넘는 호스트도 빠짐없이 세는지 테스트."""
+        monkeypatch.setattr(PortMatrix, "CHUNK_BYTES", 1)
+        port_map = {}
+        for n in range(30):
+            port_map[f"10.0.0.{n}"] = [22, 80] if n % 3 == 0 else [22]
+        matrix = PortMatrix.from_port_map(port_map)
+        assert matrix.co_occurrence().tolist() == [[30, 10], [10, 10]]
+
+    def test_diff(self):
+        """두 스캔 사이에 열리고 닫힌 포트, 추가/제거된 호스트 테스트."""
+        current = PortMatrix.from_port_map(
+            {
+                "10.0.0.1": [22],
+                "10.0.0.2": [22, 445, 3389],
+                "10.0.0.4": [22, 80, 445, 3389],
+                "10.0.0.5": [8080],
+            }
+        )
+        diff = current.diff(self.matrix)
+        assert diff == PortDiff(
+            opened={"10.0.0.2": [445], "10.0.0.5": [8080]},
+            closed={"10.0.0.1": [80]},
+            added_hosts=["10.0.0.5"],
+            removed_hosts=["10.0.0.3"],
+        )
+        assert not self.matrix.diff(PortMatrix.from_port_map(dict(PORT_MAP)))
+
+    def test_invalid_matrix(self):
+        """중복 호스트나 모양이 맞지 않는 비트 배열은 ValueError."""
+        with pytest.raises(ValueError):
+            PortMatrix(
+                ["10.0.0.1", "10.0.0.1"],
+                [22],
+                np.zeros((1, 1), dtype=np.uint8),
+            )
+        with pytest.raises(ValueError):
+            PortMatrix(
+                ["10.0.0.1"],
+                [80, 22],
+                np.zeros((1, 2), dtype=np.uint8),
+            )
+        with pytest.raises(ValueError):
+            PortMatrix(["10.0.0.1"], [22], np.zeros((2, 1), dtype=np.uint8))
+
+    def test_lookups_fast_at_slash_16(self):
+        """/16 규모(65,536개 호스트)에서도 포트/호스트 조회가 마이크로초 단위인지 테스트."""
+        rng = np.random.default_rng(0)
+        hosts = [f"10.1.{n // 256}.{n % 256}" for n in range(65536)]
+        ports = rng.integers(1, 1024, size=(len(hosts), 4))
+        ports[::100, 0] = 3389  # 약 1%의 호스트에 RDP
+        matrix = PortMatrix.from_pairs(
+            np.repeat(hosts, 4),
+            ports.ravel(),
+            hosts=hosts,
+        )
+
+        calls = 200
+        started = time.perf_counter()
+        for _ in range(calls):
+            exposed = matrix.hosts_with_port(3389)
+            matrix.ports_of(hosts[12345])
+        per_call = (time.perf_counter() - started) / calls
+
+        assert exposed[:2] == [hosts[0], hosts[100]]
+        assert len(exposed) >= 656
+        assert per_call < 0.002
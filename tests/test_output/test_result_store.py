@@ -0,0 +1,311 @@
+"""ResultStore 테스트 모듈."""
+
+import threading
+import time
+import pytest
+from src.output.result_store import ResultStore
+from src.output.summary import ReportSummary
+from src.utils.exceptions import OutputError
+
+
+def _result(ip, ports, os_name="Linux", smbv1=False):
+    return {
+        "ip": ip,
+        "open_ports": ports,
+        "services": {port: f"svc-{port}" for port in ports},
+        "os": os_name,
+        "checks": {"smbv1": smbv1, "http_methods": ["GET", "POST"]},
+    }
+
+
+class TestResultStore:
+    """ResultStore 테스트 클래스."""
+
+    def setup_method(self):
+        """테스트 메서드 실행 전 초기화."""
+        self.store = ResultStore(":memory:")
+
+    def teardown_method(self):
+        """테스트 메서드 실행 후 정리."""
+        self.store.close()
+
+    def test_results_round_trip(self):
+        """저장한 결과가 같은 형식·순서로 복원되는지 테스트."""
+        scan_id = self.store.start_scan("192.168.1.0/24")
+        rows = [
+            _result("192.168.1.20", [80, 22]),
+            _result("192.168.1.3", [445], smbv1=True),
+        ]
+        for row in rows:
+            self.store.add_host(scan_id, row)
+
+        restored = self.store.results(scan_id)
+
+        assert [r["ip"] for r in restored] == ["192.168.1.20", "192.168.1.3"]
+        assert restored[0]["open_ports"] == [22, 80]
+        assert restored[0]["services"] == {22: "svc-22", 80: "svc-80"}
+        assert restored[1]["checks"] == {
+            "smbv1": True,
+            "http_methods": ["GET", "POST"],
+        }
+        assert list(restored[0]) == [
+            "ip",
+            "open_ports",
+            "services",
+            "os",
+            "checks",
+        ]
+
+    def test_partial_and_skipped_round_trip(self):
+        """partial/skipped 표시와 탐색 기법이 저장 후 그대로 복원되는지 테스트."""
+        scan_id = self.store.start_scan("10.0.0.0/24")
+        row = dict(
+            _result("10.0.0.1", [22]),
+            partial=["services"],
+            skipped={
+                "reason": "host unresponsive",
+                "stages": ["os", "checks"],
+            },
+            technique="icmp",
+        )
+        self.store.add_host(scan_id, row)
+
+        assert self.store.results(scan_id) == [row]
+
+    def test_iter_results_in_batches(self):
+        """배치 경계를 넘어도 저장 순서대로 모든 호스트를 내놓는지 테스트."""
+        scan_id = self.store.start_scan("10.0.0.0/24")
+        rows = [_result(f"10.0.0.{n}", [22, 80 + n]) for n in range(7, 0, -1)]
+        for row in rows:
+            self.store.add_host(scan_id, row)
+
+        assert list(self.store.iter_results(scan_id, batch_size=3)) == rows
+        assert self.store.results(scan_id) == rows
+
+    def test_results_follow_host_sequence(self):
+        """완료 순서와 상관없이 지정한 순번 순서로 복원되는지 테스트."""
+        scan_id = self.store.start_scan("10.0.0.0/24")
+        rows = [_result(f"10.0.0.{n}", [22]) for n in range(1, 6)]
+        for seq in (3, 0, 4, 2, 1):
+            self.store.add_host(scan_id, rows[seq], seq=seq)
+        # 순번 없이 다시 기록하면 기존 자리를 유지한다
+        self.store.add_host(scan_id, rows[2])
+
+        assert list(self.store.iter_results(scan_id, batch_size=2)) == rows
+        ips = [row["ip"] for row in rows]
+        assert self.store.port_matrix(scan_id).hosts == ips
+
+    def test_migrates_store_without_sequence(self, tmp_path):
+        """순번/탐색 기법 열이 없던 DB에 열을 추가하고 기록 순서를 순번으로 잇는지 테스트."""
+        path = tmp_path / "old.db"
+        with ResultStore(path) as store:
+            scan_id = store.start_scan("10.0.0.0/24")
+            for n in (2, 1):
+                store.add_host(scan_id, _result(f"10.0.0.{n}", [22]))
+            store._conn.execute("DROP INDEX idx_hosts_seq")
+            store._conn.execute("ALTER TABLE hosts DROP COLUMN seq")
+            store._conn.execute("ALTER TABLE hosts DROP COLUMN technique")
+
+        with ResultStore(path) as store:
+            store.add_host(
+                scan_id,
+                dict(_result("10.0.0.3", [22]), technique="arp"),
+            )
+            results = store.results(scan_id)
+            assert [r["ip"] for r in results] == [
+                "10.0.0.2",
+                "10.0.0.1",
+                "10.0.0.3",
+            ]
+            assert [r.get("technique") for r in results] == [None, None, "arp"]
+
+    def test_summary_matches_results(self):
+        """SQL로 집계한 요약이 복원한 결과로 집계한 요약과 같은지 테스트."""
+        scan_id = self.store.start_scan("10.0.0.0/24")
+        rows = [
+            _result("10.0.0.1", [22, 80]),
+            dict(
+                _result("10.0.0.2", [445], os_name=None, smbv1=True),
+                partial=["os"],
+            ),
+            dict(_result("10.0.0.3", []), services={8080: "svc-8080"}),
+            {
+                "ip": "10.0.0.4",
+                "open_ports": [22],
+                "services": {},
+                "os": None,
+                "checks": {"smbv1": False, "http_methods": []},
+                "skipped": {
+                    "reason": "host unresponsive",
+                    "stages": ["checks"],
+                },
+            },
+        ]
+        for row in rows:
+            self.store.add_host(scan_id, row)
+
+        expected = ReportSummary.from_results(rows).tables()
+        for batch_size in (5000, 1):
+            tables = self.store.summary(scan_id, batch_size).tables()
+            assert list(tables) == list(expected)
+            for title, table in expected.items():
+                got = tables[title].values.tolist()
+                assert got == table.values.tolist(), title
+        assert self.store.summary(scan_id + 1).hosts == 0
+
+    def test_summary_of_large_scan_is_fast(self):
+        """5만 개의 호스트-포트 행을 저장소에서 1초 안에 집계하는지 테스트."""
+        scan_id = self.store.start_scan("10.0.0.0/16")
+        for n in range(10_000):
+            ip = f"10.0.{n // 256}.{n % 256}"
+            self.store.add_host(scan_id, _result(ip, [22, 80, 443, 445, 3389]))
+
+        started = time.perf_counter()
+        tables = self.store.summary(scan_id).tables()
+        elapsed = time.perf_counter() - started
+
+        overview = dict(tables["Overview"].values.tolist())
+        assert overview["Hosts"] == 10_000
+        assert overview["Open ports (host-port pairs)"] == 50_000
+        assert elapsed < 1.0
+
+    def test_add_host_replaces_existing(self):
+        """같은 스캔의 같은 IP는 교체되는지 테스트."""
+        scan_id = self.store.start_scan("10.0.0.0/24")
+        self.store.add_host(scan_id, _result("10.0.0.1", [22, 80]))
+        self.store.add_host(scan_id, _result("10.0.0.1", [443]))
+
+        assert self.store.results(scan_id) == [_result("10.0.0.1", [443])]
+
+    def test_queries_across_scans(self):
+        """포트/서비스 조회가 스캔 전체 또는 특정 스캔 기준으로 동작하는지 테스트."""
+        first = self.store.start_scan("10.0.0.0/24")
+        self.store.add_host(first, _result("10.0.0.1", [445]))
+        self.store.add_host(first, _result("10.0.0.2", [22]))
+        self.store.finish_scan(first)
+        second = self.store.start_scan("10.0.0.0/24")
+        self.store.add_host(second, _result("10.0.0.3", [445]))
+
+        assert self.store.hosts_with_port(445) == ["10.0.0.1", "10.0.0.3"]
+        assert self.store.hosts_with_port(445, scan_id=second) == ["10.0.0.3"]
+        assert self.store.hosts_with_service("SVC-22") == ["10.0.0.2"]
+        assert self.store.latest_scan_id("10.0.0.0/24") == first
+        latest = self.store.latest_scan_id("10.0.0.0/24", finished=False)
+        assert latest == second
+        assert [s["hosts"] for s in self.store.scans()] == [1, 2]
+
+    def test_hosts_with_service_matches_prefix(self):
+        """서비스 조회가 대소문자 무시 접두사 일치이고 와일드카드를 문자로 보는지 테스트."""
+        scan_id = self.store.start_scan("10.0.0.0/24")
+        for ip, service in (
+            ("10.0.0.1", "OpenSSH 8.2"),
+            ("10.0.0.2", "ssh"),
+            ("10.0.0.3", "ms_sql 2019"),
+            ("10.0.0.4", "msXsql"),
+        ):
+            host = dict(_result(ip, [22]), services={22: service})
+            self.store.add_host(scan_id, host)
+
+        assert self.store.hosts_with_service("openssh") == ["10.0.0.1"]
+        assert self.store.hosts_with_service("SSH") == ["10.0.0.2"]
+        assert self.store.hosts_with_service("ms_") == ["10.0.0.3"]
+        assert self.store.hosts_with_service("%") == []
+
+    def test_hosts_with_service_uses_name_index(self):
+        """서비스 조회가 NOCASE 이름 인덱스의 범위 검색을 쓰는지 테스트."""
+        sql = (
+            "EXPLAIN QUERY PLAN SELECT DISTINCT ip FROM services"
+            " WHERE name LIKE ? ESCAPE '\\'"
+        )
+        plan = self.store._conn.execute(sql, ("ssh%",)).fetchall()
+
+        assert any("idx_services_name_nocase" in row[-1] for row in plan)
+
+    def test_port_matrix_diff_between_scans(self):
+        """저장된 두 스캔의 포트 행렬로 열리고 닫힌 포트를 비교하는 테스트."""
+        first = self.store.start_scan("10.0.0.0/24")
+        self.store.add_host(first, _result("10.0.0.1", [22, 445]))
+        self.store.add_host(first, _result("10.0.0.2", []))
+        second = self.store.start_scan("10.0.0.0/24")
+        self.store.add_host(second, _result("10.0.0.1", [22, 3389]))
+        self.store.add_host(second, _result("10.0.0.2", []))
+
+        matrix = self.store.port_matrix(second)
+        diff = matrix.diff(self.store.port_matrix(first))
+
+        assert matrix.hosts == ["10.0.0.1", "10.0.0.2"]
+        assert matrix.hosts_with_port(3389) == ["10.0.0.1"]
+        assert (diff.opened, diff.closed) == (
+            {"10.0.0.1": [3389]},
+            {"10.0.0.1": [445]},
+        )
+        assert not diff.added_hosts and not diff.removed_hosts
+
+    def test_summary_lists_changes_since_previous_scan(self):
+        """이전 스캔 id를 주면 열린 포트 변화가 Port changes 섹션에 나오는지 테스트."""
+        first = self.store.start_scan("10.0.0.0/24")
+        self.store.add_host(first, _result("10.0.0.1", [22, 445]))
+        self.store.add_host(first, _result("10.0.0.2", [80]))
+        second = self.store.start_scan("10.0.0.0/24")
+        self.store.add_host(second, _result("10.0.0.1", [22, 3389]))
+        self.store.add_host(second, _result("10.0.0.3", [443]))
+
+        tables = self.store.summary(second, previous=first).tables()
+
+        assert tables["Port changes"].values.tolist() == [
+            ["10.0.0.1", "", "3389", "445"],
+            ["10.0.0.3", "New", "443", ""],
+            ["10.0.0.2", "Removed", "", "80"],
+        ]
+        assert "Port changes" not in self.store.summary(second).tables()
+
+    def test_latest_hosts_keeps_scanned_at(self):
+        """최근 완료 스캔의 결과와 원래 상세 스캔 시각이 반환되는지 테스트."""
+        first = self.store.start_scan("10.0.0.0/24")
+        self.store.add_host(
+            first, _result("10.0.0.1", [22]), "2026-01-01T00:00:00+00:00"
+        )
+        self.store.finish_scan(first)
+        self.store.start_scan("10.0.0.0/24")  # 진행 중인 스캔은 비교 대상이 아님
+
+        latest = self.store.latest_hosts("10.0.0.0/24")
+
+        assert latest == {
+            "10.0.0.1": (
+                _result("10.0.0.1", [22]),
+                "2026-01-01T00:00:00+00:00",
+            ),
+        }
+        assert self.store.latest_hosts("10.1.0.0/24") == {}
+
+    def test_concurrent_writes(self):
+        """여러 스레드에서 동시에 기록해도 모두 저장되는지 테스트."""
+        scan_id = self.store.start_scan("10.0.0.0/24")
+        threads = [
+            threading.Thread(
+                target=self.store.add_host,
+                args=(scan_id, _result(f"10.0.0.{i}", [22])),
+            )
+            for i in range(1, 21)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(self.store.results(scan_id)) == 20
+
+    def test_file_store_persists(self, tmp_path):
+        """파일 DB가 다시 열어도 유지되는지 테스트."""
+        path = tmp_path / "results.db"
+        with ResultStore(path) as store:
+            scan_id = store.start_scan("10.0.0.0/24")
+            store.add_host(scan_id, _result("10.0.0.1", [22]))
+
+        with ResultStore(path) as store:
+            assert store.hosts_with_port(22) == ["10.0.0.1"]
+
+    def test_open_error(self, tmp_path):
+        """열 수 없는 경로에서 OutputError 발생 테스트."""
+        with pytest.raises(OutputError):
+            ResultStore(tmp_path / "missing" / "results.db")
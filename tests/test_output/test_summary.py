@@ -0,0 +1,147 @@
+"""ReportSummary 테스트 모듈."""
+
+import time
+import tracemalloc
+from src.output.summary import ReportSummary
+
+RESULTS = [
+    {
+        "ip": "10.0.0.1",
+        "open_ports": [22, 80],
+        "services": {22: "OpenSSH 8.2", 80: "nginx"},
+        "os": "Linux",
+        "checks": {"smbv1": False, "weak_tls": True},
+    },
+    {
+        "ip": "10.0.0.2",
+        "open_ports": [22, 445],
+        "services": {22: "OpenSSH 8.2"},
+        "os": "Windows",
+        "checks": {"smbv1": True, "weak_tls": True},
+        "partial": ["os"],
+    },
+    {
+        "ip": "10.0.0.3",
+        "open_ports": [22],
+        "services": {},
+        "os": None,
+        "checks": {},
+        "skipped": {"reason": "host unresponsive", "stages": ["checks"]},
+    },
+]
+
+
+def rows(table):
+    return [list(row) for row in table.itertuples(index=False, name=None)]
+
+
+class TestReportSummary:
+    """ReportSummary 테스트 클래스."""
+
+    def test_aggregates(self):
+        """OS/포트/서비스/실패 점검별 집계가 많은 순으로 계산되는지 테스트."""
+        tables = ReportSummary.from_results(RESULTS).tables()
+
+        assert list(tables) == [
+            "Overview",
+            "Hosts by OS",
+            "Open ports",
+            "Service versions",
+            "Failed checks",
+        ]
+        overview = dict(rows(tables["Overview"]))
+        assert overview["Hosts"] == 3
+        assert overview["Open ports (host-port pairs)"] == 5
+        assert overview["Distinct open ports"] == 3
+        assert overview["Identified services"] == 3
+        assert overview["Partial hosts"] == 1
+        assert overview["Skipped hosts"] == 1
+        assert overview["Failed checks"] == 3
+        assert overview["Hosts with failed checks"] == 2
+        assert rows(tables["Hosts by OS"]) == [
+            ["Linux", 1],
+            ["Unknown", 1],
+            ["Windows", 1],
+        ]
+        assert rows(tables["Open ports"]) == [[22, 3], [80, 1], [445, 1]]
+        assert rows(tables["Service versions"]) == [
+            ["(unidentified)", 2],
+            ["OpenSSH 8.2", 2],
+            ["nginx", 1],
+        ]
+        assert rows(tables["Failed checks"]) == [["weak_tls", 2], ["smbv1", 1]]
+
+    def test_empty(self):
+        """결과가 없어도 빈 집계표가 만들어지는지 테스트."""
+        tables = ReportSummary().tables()
+
+        assert dict(rows(tables["Overview"]))["Hosts"] == 0
+        assert tables["Open ports"].empty and tables["Failed checks"].empty
+
+    def test_large_scan_is_fast(self):
+        """5만 개의 호스트-포트 행을 받아 집계표를 만들기까지 1초 안에 끝나는지 테스트."""
+        results = [
+            {
+                "ip": f"10.{n // 65536}.{n // 256 % 256}.{n % 256}",
+                "open_ports": [22, 80, 443, 445, 3389],
+                "services": {22: f"OpenSSH {n % 7}", 80: "nginx"},
+                "os": ("Linux", "Windows", None)[n % 3],
+                "checks": {"smbv1": n % 5 == 0, "weak_tls": n % 2 == 0},
+            }
+            for n in range(10_000)
+        ]
+
+        started = time.perf_counter()
+        tables = ReportSummary.from_results(results).tables()
+        elapsed = time.perf_counter() - started
+
+        overview = dict(rows(tables["Overview"]))
+        assert overview["Hosts"] == 10_000
+        assert overview["Open ports (host-port pairs)"] == 50_000
+        assert overview["Identified services"] == 20_000
+        assert rows(tables["Failed checks"]) == [
+            ["weak_tls", 5000],
+            ["smbv1", 2000],
+        ]
+        assert elapsed < 1.0
+
+    def test_chunks_match_single_pass(self):
+        """묶음 크기와 상관없이 같은 집계표가 만들어지는지 테스트."""
+        whole = ReportSummary.from_results(RESULTS * 3).tables()
+        chunked = ReportSummary()
+        chunked.CHUNK_SIZE = 2
+        for result in RESULTS * 3:
+            chunked.add(result)
+
+        for title, table in chunked.tables().items():
+            assert rows(table) == rows(whole[title]), title
+
+    def test_memory_bounded_by_chunk(self):
+        """호스트 수가 늘어도 요약의 메모리는 한 묶음 분량을 넘어 늘지 않는지 테스트."""
+
+        def grow(summary, start, count):
+            tracemalloc.start()
+            try:
+                for n in range(start, start + count):
+                    ip = f"10.{n // 65536}.{n // 256 % 256}.{n % 256}"
+                    summary.add(
+                        {
+                            "ip": ip,
+                            "open_ports": [22, 80],
+                            "services": {22: "OpenSSH"},
+                            "os": "Linux",
+                            "checks": {"smbv1": n % 2 == 0},
+                        }
+                    )
+                return tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+
+        summary = ReportSummary()
+        chunk = summary.CHUNK_SIZE
+        one = grow(summary, 0, chunk)
+        four = grow(summary, chunk, 4 * chunk)
+        # 남는 메모리와 최대 메모리 모두 호스트 수가 아니라 묶음 크기에 비례한다
+        assert four[0] < 2 * one[0]
+        assert four[1] < 2 * one[1]
+        assert summary.hosts == 5 * chunk
@@ -0,0 +1,62 @@
+"""CircuitBreaker 테스트 모듈."""
+
+import pytest
+from src.scanner.circuit_breaker import FILTERED, OK, TIMEOUT, CircuitBreaker
+
+
+class TestCircuitBreaker:
+    """CircuitBreaker 테스트 클래스."""
+
+    def test_host_trips_after_consecutive_failures(self):
+        """호스트 연속 실패가 임계값에 닿으면 그 호스트만 열리는지 테스트."""
+        breaker = CircuitBreaker(host_threshold=2, subnet_threshold=None)
+        breaker.record("10.0.0.1", "services", FILTERED)
+        assert breaker.reason("10.0.0.1") is None
+        breaker.record("10.0.0.1", "os", TIMEOUT)
+
+        assert "host unresponsive" in breaker.reason("10.0.0.1")
+        assert breaker.reason("10.0.0.2") is None
+
+    def test_success_resets_counters(self):
+        """성공한 단계가 있으면 연속 실패 횟수가 초기화되는지 테스트."""
+        breaker = CircuitBreaker(host_threshold=2, subnet_threshold=2)
+        breaker.record("10.0.0.1", "services", FILTERED)
+        breaker.record("10.0.0.1", "os", OK)
+        breaker.record("10.0.0.1", "checks", TIMEOUT)
+
+        assert breaker.open_scopes() == {}
+
+    def test_subnet_trips_across_hosts(self):
+        """같은 /24 호스트들의 연속 시간 초과로 서브넷 전체가 열리는지 테스트."""
+        breaker = CircuitBreaker(host_threshold=None, subnet_threshold=3)
+        for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.3"):
+            breaker.record(ip, "ports", TIMEOUT)
+
+        assert "subnet 10.0.0.0/24" in breaker.reason("10.0.0.200")
+        assert breaker.reason("10.0.1.1") is None
+        assert list(breaker.open_scopes()) == ["10.0.0.0/24"]
+
+    def test_filtered_hosts_do_not_trip_subnet(self):
+        """모든 포트가 필터링된 호스트는 그 호스트만 열고 서브넷에는 세지 않는지 테스트."""
+        breaker = CircuitBreaker(host_threshold=1, subnet_threshold=2)
+        breaker.record("10.0.0.1", "ports", TIMEOUT)
+        for ip in ("10.0.0.2", "10.0.0.3", "10.0.0.4"):
+            breaker.record(ip, "ports", FILTERED)
+
+        assert breaker.reason("10.0.0.5") is None
+        assert "host unresponsive" in breaker.reason("10.0.0.2")
+        breaker.record("10.0.0.5", "ports", TIMEOUT)
+        assert "subnet 10.0.0.0/24" in breaker.reason("10.0.0.6")
+
+    def test_ipv6_uses_64_prefix(self):
+        """IPv6 주소는 /64 단위로 묶이는지 테스트."""
+        assert CircuitBreaker().subnet("2001:db8::1") == "2001:db8::/64"
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"host_threshold": 0}, {"subnet_threshold": -1}, {"prefix": 33}],
+    )
+    def test_invalid_settings_raise(self, kwargs):
+        """잘못된 임계값/접두사이면 ValueError 발생 테스트."""
+        with pytest.raises(ValueError):
+            CircuitBreaker(**kwargs)
@@ -0,0 +1,102 @@
+"""단일 패스 스캐너 테스트 모듈."""
+
+import unittest
+from unittest.mock import patch
+from src.scanner.combined_scan import CombinedScanner
+from src.scanner.nmap_runner import NmapResult, NmapRunner
+from src.scanner.port_scanner import ScanTimeout
+
+__all__ = ["TestCombinedScanner"]
+
+XML_COMBINED = """<?xml version="1.0" encoding="UTF-8"?>
+<nmaprun scanner="nmap"
+ args="nmap -T1 --top-ports 100 -sV -O -oX - 10.0.0.1 10.0.0.2">
+<host><status state="up"/><address addr="10.0.0.1" addrtype="ipv4"/>
+<ports>
+<port protocol="tcp" portid="22"><state state="open"/>
+<service name="ssh" product="OpenSSH" version="8.2p1"
+ extrainfo="protocol 2.0"/></port>
+<port protocol="tcp" portid="80"><state state="open"/>
+<service name="http"/></port>
+<port protocol="tcp" portid="25"><state state="closed"/>
+<service name="smtp"/></port>
+</ports>
+<os><osmatch name="Linux 4.15 - 5.6" accuracy="95"/>
+<osmatch name="Linux 3.2" accuracy="88"/></os>
+</host>
+<host><status state="up"/><address addr="10.0.0.2" addrtype="ipv4"/>
+<ports><extraports state="closed" count="100"/></ports></host>
+<runstats><finished time="0"/><hosts up="2" down="0" total="2"/></runstats>
+</nmaprun>
+"""
+
+
+def _completed(stdout, returncode=0):
+    return NmapResult(["nmap"], returncode, stdout)
+
+
+class TestCombinedScanner(unittest.TestCase):
+    """단일 패스 스캐너 테스트 클래스."""
+
+    @patch.object(NmapRunner, "execute")
+    def test_scan_returns_workflow_schema(self, mock_run):
+        """포트·서비스·OS가 워크플로우 결과 형식으로 반환되는지 테스트."""
+        mock_run.return_value = _completed(XML_COMBINED)
+
+        result = CombinedScanner.scan("10.0.0.1")
+
+        self.assertEqual(
+            result,
+            {
+                "open_ports": [22, 80],
+                "services": {22: "OpenSSH 8.2p1 (protocol 2.0)", 80: "http"},
+                "os": "Linux 4.15 - 5.6",
+            },
+        )
+        cmd = mock_run.call_args[0][0]
+        for flag in ("-sV", "-O", "--top-ports"):
+            self.assertIn(flag, cmd)
+
+    @patch.object(NmapRunner, "execute")
+    def test_scan_many_chunks_and_fills_missing(self, mock_run):
+        """청크 단위 실행과 응답 없는 호스트의 빈 결과 테스트."""
+        mock_run.return_value = _completed(XML_COMBINED)
+
+        result = CombinedScanner.scan_many(
+            ["10.0.0.1", "10.0.0.2", "10.0.0.3"], chunk_size=2
+        )
+
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(
+            mock_run.call_args_list[0][0][0][-2:], ["10.0.0.1", "10.0.0.2"]
+        )
+        self.assertEqual(mock_run.call_args_list[1][0][0][-1:], ["10.0.0.3"])
+        self.assertEqual(
+            result["10.0.0.2"], {"open_ports": [], "services": {}, "os": None}
+        )
+        self.assertEqual(
+            result["10.0.0.3"], {"open_ports": [], "services": {}, "os": None}
+        )
+
+    @patch.object(NmapRunner, "execute")
+    def test_timeout_raises(self, mock_run):
+        """시간 초과 시 ScanTimeout 발생 테스트."""
+        mock_run.return_value = NmapResult(
+            ["nmap"],
+            -9,
+            timed_out=True,
+            timeout=300,
+        )
+        with self.assertRaises(ScanTimeout):
+            CombinedScanner.scan("10.0.0.1")
+
+    @patch.object(NmapRunner, "execute")
+    def test_option_like_target_raises(self, mock_run):
+        """nmap 옵션으로 해석될 수 있는 대상 테스트."""
+        with self.assertRaises(ValueError):
+            CombinedScanner.scan("-iL/etc/passwd")
+        mock_run.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,97 +1,294 @@
 """상세 보안 점검 테스트 모듈."""
 
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import pytest
 from src.scanner.detailed_checks import DetailedChecks
+from src.scanner.nmap_runner import NmapResult, NmapRunner
+from src.scanner.nmap_xml import ServiceLabel
+from src.utils.exceptions import ScanTimeout
 
 __all__ = ['TestDetailedChecks']
 
+
+def host_xml(outputs=None, ip="192.168.1.1"):
+    """NSE 스크립트 출력({script_id: output})을 담은 <host> 요소를 만든다."""
+    scripts = "".join(
+        f'<script id="{script_id}" output="{output}"/>'
+        for script_id, output in (outputs or {}).items()
+    )
+    return f"""<host><status state="up"/><address addr="{ip}" addrtype="ipv4"/>
+<ports><port protocol="tcp" portid="445"><state state="open"/>{scripts}</port>
+</ports>
+</host>
+"""
+
+
+def script_xml(outputs=None, ip="192.168.1.1", extra_hosts=""):
+    """NSE 스크립트 출력을 담은 최소한의 Nmap XML을 만든다."""
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<nmaprun scanner="nmap">
+{host_xml(outputs, ip)}{extra_hosts}</nmaprun>
+"""
+
+
+def mock_result(stdout):
+    return NmapResult(["nmap"], 0, stdout)
+
+
 class TestDetailedChecks(unittest.TestCase):
     """상세 보안 점검 테스트 클래스."""
-    
+
     def setUp(self):
         self.checker = DetailedChecks()
-    
-    @patch('subprocess.run')
+
+    @patch.object(NmapRunner, "execute")
     def test_all_false(self, mock_run):
         """모든 점검이 실패하는 경우 테스트."""
-        # Mock subprocess.run (3개의 빈 결과)
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = ""
-        mock_run.side_effect = [mock_result, mock_result, mock_result]
-        
+        # SMB 점검 2개는 445 포트 nmap 1회로 묶이고, TLS 점검이 1회
+        mock_run.side_effect = [
+            mock_result(script_xml()),
+            mock_result(script_xml()),
+        ]
+
         # Run test
         result = self.checker.run("192.168.1.1")
-        
+
         # Verify result
         self.assertEqual(result, {
             'smbv1': False,
             'anonymous_share': False,
             'weak_tls': False
         })
-        
+
         # Verify command calls
-        self.assertEqual(mock_run.call_count, 3)
-    
-    @patch('subprocess.run')
+        self.assertEqual(mock_run.call_count, 2)
+        smb_cmd = mock_run.call_args_list[0][0][0]
+        self.assertEqual(
+            smb_cmd[smb_cmd.index("--script") + 1],
+            "smb-protocols,smb-enum-shares",
+        )
+        self.assertEqual(smb_cmd[smb_cmd.index("-p") + 1], "445")
+
+    @patch.object(NmapRunner, "execute")
     def test_detect_smbv1(self, mock_run):
         """SMBv1만 감지되는 경우 테스트."""
-        # Mock subprocess.run
-        mock_result1 = MagicMock()
-        mock_result1.returncode = 0
-        mock_result1.stdout = "SMBv1 enabled"
-        
-        mock_result2 = MagicMock()
-        mock_result2.returncode = 0
-        mock_result2.stdout = ""
-        
-        mock_result3 = MagicMock()
-        mock_result3.returncode = 0
-        mock_result3.stdout = ""
-        
-        mock_run.side_effect = [mock_result1, mock_result2, mock_result3]
-        
+        mock_run.side_effect = [
+            mock_result(
+                script_xml(
+                    {"smb-protocols": "SMBv1 enabled", "smb-enum-shares": ""},
+                ),
+            ),
+            mock_result(script_xml()),
+        ]
+
         # Run test
         result = self.checker.run("192.168.1.1")
-        
+
         # Verify result
         self.assertEqual(result, {
             'smbv1': True,
             'anonymous_share': False,
             'weak_tls': False
         })
-    
-    @patch('subprocess.run')
+
+    @patch.object(NmapRunner, "execute")
     def test_detect_all(self, mock_run):
         """모든 취약점이 감지되는 경우 테스트."""
-        # Mock subprocess.run
-        mock_result1 = MagicMock()
-        mock_result1.returncode = 0
-        mock_result1.stdout = "SMBv1 enabled"
-        
-        mock_result2 = MagicMock()
-        mock_result2.returncode = 0
-        mock_result2.stdout = "Anonymous login"
-        
-        mock_result3 = MagicMock()
-        mock_result3.returncode = 0
-        mock_result3.stdout = "TLSv1.0"
-        
-        mock_run.side_effect = [mock_result1, mock_result2, mock_result3]
-        
+        mock_run.side_effect = [
+            mock_result(
+                script_xml(
+                    {
+                        "smb-protocols": "SMBv1 enabled",
+                        "smb-enum-shares": "Anonymous login",
+                    }
+                )
+            ),
+            mock_result(script_xml({"ssl-enum-ciphers": "TLSv1.0"})),
+        ]
+
         # Run test
         result = self.checker.run("192.168.1.1")
-        
+
         # Verify result
         self.assertEqual(result, {
             'smbv1': True,
             'anonymous_share': True,
             'weak_tls': True
         })
-    
-    def test_invalid_ip_raises(self):
-        """잘못된 IP 주소로 점검 시 ValueError 발생 테스트."""
+
+    @patch.object(NmapRunner, "execute")
+    def test_output_attributed_per_script(self, mock_run):
+        """묶어서 실행해도 다른 스크립트의 출력으로 판정하지 않는지 테스트."""
+        mock_run.side_effect = [
+            mock_result(script_xml({"smb-enum-shares": "SMBv1 enabled"})),
+            mock_result(script_xml()),
+        ]
+
+        result = self.checker.run("192.168.1.1")
+
+        self.assertFalse(result["smbv1"])
+
+    @patch.object(NmapRunner, "execute")
+    def test_closed_ports_skip_checks(self, mock_run):
+        """관련 포트가 닫혀 있으면 nmap을 실행하지 않는지 테스트."""
+        result = self.checker.run(
+            "192.168.1.1", open_ports=[22, 80], services={22: "OpenSSH"}
+        )
+
+        self.assertEqual(
+            result,
+            {"smbv1": False, "anonymous_share": False, "weak_tls": False},
+        )
+        mock_run.assert_not_called()
+
+    @patch.object(NmapRunner, "execute")
+    def test_tls_on_every_tls_port(self, mock_run):
+        """TLS 점검이 443 외의 TLS 포트에도 실행되고 SMB 점검은 생략되는지 테스트.
+
+        TLS 여부는 서비스 문자열의 단어가 아니라 nmap의 서비스 이름/터널로 판단한다.
+        """
+        mock_run.return_value = mock_result(
+            script_xml({"ssl-enum-ciphers": "SSLv3"}),
+        )
+
+        result = self.checker.run(
+            "192.168.1.1",
+            open_ports=[22, 993, 4443, 5000, 8080, 8443],
+            services={
+                22: "OpenSSH 8.2",
+                4443: ServiceLabel("nginx", "http", tunnel="ssl"),
+                5000: ServiceLabel("https", "https"),
+                8080: ServiceLabel("Apache httpd (OpenSSL/1.1.1)", "http"),
+                8443: "Apache Tomcat",
+            },
+        )
+
+        self.assertTrue(result["weak_tls"])
+        mock_run.assert_called_once()
+        cmd = mock_run.call_args[0][0]
+        self.assertEqual(cmd[cmd.index("--script") + 1], "+ssl-enum-ciphers")
+        self.assertEqual(cmd[cmd.index("-p") + 1], "993,4443,5000,8443")
+
+    @patch.object(NmapRunner, "execute")
+    def test_run_many_groups_by_script_and_port(self, mock_run):
+        """여러 호스트가 (스크립트, 포트) 단위 nmap 호출로 묶이고 결과가 분리되는지 테스트."""
+
+        def fake_run(cmd, *args):
+            port = cmd[cmd.index("-p") + 1]
+            if port == "445":
+                return mock_result(
+                    script_xml(
+                        {"smb-protocols": "SMBv1 enabled"},
+                        ip="10.0.0.1",
+                        extra_hosts=host_xml(
+                            {"smb-enum-shares": "Anonymous login"},
+                            ip="10.0.0.2",
+                        ),
+                    )
+                )
+            return mock_result(
+                script_xml({"ssl-enum-ciphers": "TLSv1.0"}, ip="10.0.0.3")
+            )
+
+        mock_run.side_effect = fake_run
+
+        result = self.checker.run_many(
+            {
+                "10.0.0.1": ([22, 445], {}),
+                "10.0.0.2": ([445], {}),
+                "10.0.0.3": ([443], {}),
+                "10.0.0.4": ([22], {}),
+            }
+        )
+
+        self.assertEqual(
+            result,
+            {
+                "10.0.0.1": {
+                    "smbv1": True,
+                    "anonymous_share": False,
+                    "weak_tls": False,
+                },
+                "10.0.0.2": {
+                    "smbv1": False,
+                    "anonymous_share": True,
+                    "weak_tls": False,
+                },
+                "10.0.0.3": {
+                    "smbv1": False,
+                    "anonymous_share": False,
+                    "weak_tls": True,
+                },
+                "10.0.0.4": {
+                    "smbv1": False,
+                    "anonymous_share": False,
+                    "weak_tls": False,
+                },
+            },
+        )
+        self.assertEqual(mock_run.call_count, 2)
+        smb_cmd = mock_run.call_args_list[0][0][0]
+        self.assertEqual(
+            smb_cmd[smb_cmd.index("--script") + 1],
+            "smb-protocols,smb-enum-shares",
+        )
+        self.assertEqual(smb_cmd[-2:], ["10.0.0.1", "10.0.0.2"])
+
+    @patch.object(NmapRunner, "execute")
+    def test_run_many_chunks_hosts(self, mock_run):
+        """chunk_size 단위로 호스트가 나뉘어 실행되는지 테스트."""
+        mock_run.return_value = mock_result(script_xml())
+        hosts = {f"10.0.0.{n}": ([445], {}) for n in range(1, 6)}
+
+        self.checker.run_many(hosts, chunk_size=2)
+
+        self.assertEqual(mock_run.call_count, 3)
+
+    @patch.object(NmapRunner, "execute")
+    def test_timeout_keeps_running_and_raises_partial(self, mock_run):
+        """한 점검이 시간 초과돼도 나머지 점검을 실행하고 전체 결과를 ScanTimeout으로 넘기는지 테스트."""
+        mock_run.side_effect = [
+            NmapResult(
+                ["nmap"],
+                -9,
+                script_xml({"smb-protocols": "SMBv1 enabled"}),
+                timed_out=True,
+                timeout=30,
+            ),
+            mock_result(script_xml({"ssl-enum-ciphers": "TLSv1.0"})),
+        ]
+
+        with pytest.raises(ScanTimeout) as ctx:
+            self.checker.run("192.168.1.1")
+
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(
+            ctx.value.partial,
+            {"smbv1": True, "anonymous_share": False, "weak_tls": True},
+        )
+        self.assertEqual(ctx.value.hosts, ["192.168.1.1"])
+
+    @patch.object(NmapRunner, "execute")
+    def test_run_many_reports_timed_out_hosts(self, mock_run):
+        """일괄 점검에서 시간 초과된 청크의 호스트만 ScanTimeout.hosts에 담기는지 테스트."""
+        mock_run.side_effect = [
+            NmapResult(["nmap"], -9, timed_out=True, timeout=30),
+            mock_result(script_xml(ip="10.0.0.3")),
+        ]
+        hosts = {f"10.0.0.{n}": ([445], {}) for n in range(1, 4)}
+
+        with pytest.raises(ScanTimeout) as ctx:
+            self.checker.run_many(hosts, chunk_size=2)
+
+        self.assertEqual(ctx.value.hosts, ["10.0.0.1", "10.0.0.2"])
+        self.assertEqual(set(ctx.value.partial), set(hosts))
+
+    @patch.object(NmapRunner, "execute")
+    def test_option_like_target_raises(self, mock_run):
+        """nmap 옵션으로 해석될 수 있는 대상으로 점검 시 ValueError 발생 테스트."""
+        with pytest.raises(ValueError):
+            self.checker.run("-oN/tmp/out", open_ports=[445])
         with pytest.raises(ValueError):
-            self.checker.run("invalid_ip") 
\ No newline at end of file
+            self.checker.run_many({"10.0.0.1\n-iL x": ([445], None)})
+        mock_run.assert_not_called()
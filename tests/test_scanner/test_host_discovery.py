@@ -0,0 +1,199 @@
+"""HostDiscovery 테스트 모듈."""
+
+import threading
+import time
+import pytest
+from src.scanner.host_discovery import HostDiscovery
+from src.scanner.nmap_runner import NmapRunner
+from src.scanner.nmap_xml import NmapHost
+from src.scanner.port_scanner import ScanTimeout
+
+
+class TestHostDiscovery:
+    """HostDiscovery 테스트 클래스."""
+
+    def test_split_blocks(self):
+        """큰 대역이 /24 하위 블록으로 나뉘는지 테스트."""
+        blocks = HostDiscovery.split_blocks("10.0.0.0/22")
+        assert blocks == [
+            "10.0.0.0/24",
+            "10.0.1.0/24",
+            "10.0.2.0/24",
+            "10.0.3.0/24",
+        ]
+        assert HostDiscovery.split_blocks("10.0.0.0/28") == ["10.0.0.0/28"]
+
+    def test_invalid_cidr_raises(self):
+        """잘못된 CIDR 형식이면 ValueError 발생 테스트."""
+        with pytest.raises(ValueError):
+            list(HostDiscovery.host_discovery("invalid_cidr"))
+
+    def test_blocks_swept_with_fallback(self, monkeypatch):
+        """residual=False: 블록별로 ARP 결과가 없을 때만 다음 기법으로 넘어가는지 테스트."""
+        calls = []
+
+        def fake_stream(self, args, timeout=None):
+            flag, block = args[1], args[2]
+            calls.append((flag, block))
+            if block == "10.0.0.0/24" and flag == "-PR":
+                yield NmapHost(ip="10.0.0.5", status="up")
+            if block == "10.0.1.0/24" and flag == "-PE":
+                yield NmapHost(ip="10.0.1.7", status="up")
+                yield NmapHost(ip="10.0.1.8", status="down")
+
+        monkeypatch.setattr(NmapRunner, "stream_hosts", fake_stream)
+
+        alive = sorted(
+            HostDiscovery.host_discovery("10.0.0.0/23", residual=False),
+        )
+
+        assert alive == ["10.0.0.5", "10.0.1.7"]
+        assert sorted(calls) == sorted(
+            [
+                ("-PR", "10.0.0.0/24"),
+                ("-PR", "10.0.1.0/24"),
+                ("-PE", "10.0.1.0/24"),
+            ]
+        )
+
+    def test_residual_escalation(self, monkeypatch):
+        """다음 기법은 미응답 주소에만 적용되고, 끝까지 응답이 없는 주소는 보고하지 않는지 테스트."""
+        calls = []
+        answers = {
+            "-PR": {"10.0.0.1"},
+            "-PE": {"10.0.0.1", "10.0.0.2"},
+            "-PS": {"10.0.0.5"},
+        }
+
+        def fake_stream(self, args, timeout=None):
+            flag, targets = args[1], args[2:]
+            calls.append((flag[:3], list(targets)))
+            if flag == "-PR":
+                yield NmapHost(ip="10.0.0.1", status="up")
+                return
+            for ip in targets:
+                if ip in answers.get(flag[:3], ()):
+                    yield NmapHost(ip=ip, status="up")
+
+        monkeypatch.setattr(NmapRunner, "stream_hosts", fake_stream)
+
+        found = HostDiscovery.discover("10.0.0.0/29")
+        hosts = {h.ip: h.technique for h in found}
+
+        assert hosts == {
+            "10.0.0.1": "arp",
+            "10.0.0.2": "icmp",
+            "10.0.0.5": "tcp-syn",
+        }
+        assert calls == [
+            ("-PR", ["10.0.0.0/29"]),
+            ("-PE", [f"10.0.0.{n}" for n in range(2, 7)]),
+            ("-PS", [f"10.0.0.{n}" for n in range(3, 7)]),
+            ("-PA", ["10.0.0.3", "10.0.0.4", "10.0.0.6"]),
+        ]
+
+    def test_assume_up_is_opt_in(self, monkeypatch):
+        """assume_up=True일 때만 끝까지 응답 없는 주소에 -Pn을 적용하는지 테스트."""
+        calls = []
+
+        def fake_stream(self, args, timeout=None):
+            calls.append(args[1])
+            if args[1] == "-Pn":
+                for ip in args[2:]:
+                    yield NmapHost(ip=ip, status="up")
+
+        monkeypatch.setattr(NmapRunner, "stream_hosts", fake_stream)
+
+        assert list(HostDiscovery.host_discovery("10.0.0.0/30")) == []
+        assert "-Pn" not in calls
+        hosts = {
+            h.ip: h.technique
+            for h in HostDiscovery.discover("10.0.0.0/30", assume_up=True)
+        }
+        assert hosts == {"10.0.0.1": "pn", "10.0.0.2": "pn"}
+        assert calls[-1] == "-Pn"
+
+    def test_residual_stops_when_all_answered(self, monkeypatch):
+        """모든 주소가 응답하면 다음 기법을 실행하지 않는지 테스트."""
+        calls = []
+
+        def fake_stream(self, args, timeout=None):
+            calls.append(args[1])
+            yield NmapHost(ip="10.0.0.1", status="up")
+            yield NmapHost(ip="10.0.0.2", status="up")
+
+        monkeypatch.setattr(NmapRunner, "stream_hosts", fake_stream)
+
+        assert sorted(HostDiscovery.host_discovery("10.0.0.0/30")) == [
+            "10.0.0.1",
+            "10.0.0.2",
+        ]
+        assert calls == ["-PR"]
+
+    def test_block_timeout_keeps_other_results(self, monkeypatch):
+        """한 블록이 시간 초과되어도 다른 블록과 이미 보고된 호스트는 유지되는지 테스트."""
+
+        def fake_stream(self, args, timeout=None):
+            if args[2].startswith("10.0.0."):
+                yield NmapHost(ip="10.0.0.1", status="up")
+                raise ScanTimeout("timeout")
+            yield NmapHost(ip="10.0.1.1", status="up")
+
+        monkeypatch.setattr(NmapRunner, "stream_hosts", fake_stream)
+
+        assert sorted(HostDiscovery.host_discovery("10.0.0.0/23")) == [
+            "10.0.0.1",
+            "10.0.1.1",
+        ]
+
+    def test_missing_nmap_yields_nothing(self, monkeypatch):
+        """nmap 실행 실패(OSError) 시 예외 없이 빈 결과 테스트."""
+
+        def fake_stream(self, args, timeout=None):
+            raise FileNotFoundError("nmap")
+            yield  # pragma: no cover
+
+        monkeypatch.setattr(NmapRunner, "stream_hosts", fake_stream)
+
+        assert list(HostDiscovery.host_discovery("10.0.0.0/24")) == []
+
+    def test_early_stop_does_not_wait_for_running_sweeps(self, monkeypatch):
+        """소비자가 중간에 멈추면 실행 중인 블록 스윕을 기다리지 않고 종료를 알리는지 테스트."""
+        release = threading.Event()
+        closed = threading.Event()
+
+        def fake_stream(self, args, timeout=None):
+            if args[2].startswith("10.0.0."):
+                yield NmapHost(ip="10.0.0.1", status="up")
+                return
+            try:
+                release.wait(5)  # 오래 걸리는 스윕
+                yield NmapHost(ip="10.0.1.1", status="up")
+                yield NmapHost(ip="10.0.1.2", status="up")
+            finally:
+                closed.set()
+
+        monkeypatch.setattr(NmapRunner, "stream_hosts", fake_stream)
+
+        started = time.monotonic()
+        hosts = HostDiscovery.host_discovery("10.0.0.0/23", max_parallel=2)
+        assert next(hosts) == "10.0.0.1"
+        hosts.close()
+        elapsed = time.monotonic() - started
+
+        release.set()
+        assert elapsed < 2
+        assert closed.wait(5)
+
+    def test_unexpected_error_is_raised(self, monkeypatch):
+        """OSError가 아닌 블록 스윕 오류는 조용히 버려지지 않고 호출자에게 전달되는지 테스트."""
+
+        def fake_stream(self, args, timeout=None):
+            if args[2].startswith("10.0.1."):
+                raise RuntimeError("parser bug")
+            yield NmapHost(ip="10.0.0.1", status="up")
+
+        monkeypatch.setattr(NmapRunner, "stream_hosts", fake_stream)
+
+        with pytest.raises(RuntimeError, match="parser bug"):
+            list(HostDiscovery.host_discovery("10.0.0.0/23", residual=False))
@@ -0,0 +1,220 @@
+"""NmapRunner 실행 계층 테스트 모듈."""
+
+import os
+import stat
+import sys
+import threading
+import time
+
+import pytest
+from src.scanner.nmap_runner import NmapRunner
+from src.scanner.port_scanner import ScanTimeout
+
+FAKE_NMAP = """#!{python}
+import sys, time
+out = sys.stdout
+head = '<?xml version="1.0"?>\\n<nmaprun scanner="nmap" args="%s">\\n'
+out.write(head % " ".join(sys.argv[1:]))
+out.write('<taskprogress task="Ping Scan" time="1" percent="50.00" '
+          'remaining="2" etc="3"/>\\n')
+for n in range(1, 4):
+    out.write('<host><status state="up"/>'
+              '<address addr="10.0.0.%d" addrtype="ipv4"/></host>\\n' % n)
+    out.flush()
+    time.sleep({delay})
+out.write('</nmaprun>\\n')
+"""
+
+
+# 손자 프로세스를 띄우고 그 PID를 출력한 뒤 기다리는 가짜 nmap (프로세스 그룹 종료 확인용)
+FORKING_NMAP = """#!{python}
+import subprocess, sys, time
+child = subprocess.Popen(["sleep", "30"])
+sys.stdout.write('<nmaprun><!-- %d -->\\n' % child.pid)
+sys.stdout.flush()
+time.sleep(30)
+"""
+
+
+@pytest.fixture(autouse=True)
+def _clean_runner():
+    """실행 기록과 자식 프로세스 상한을 테스트마다 초기화한다."""
+    limit = NmapRunner.MAX_CHILDREN
+    NmapRunner.reset_accounting()
+    yield
+    NmapRunner.set_max_children(limit)
+    NmapRunner.reset_accounting()
+
+
+@pytest.fixture
+def fake_nmap(tmp_path, monkeypatch):
+    """PATH 앞쪽에 호스트를 천천히 출력하는 가짜 nmap을 둔다."""
+
+    def install(delay, template=FAKE_NMAP):
+        script = tmp_path / "nmap"
+        script.write_text(template.format(python=sys.executable, delay=delay))
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        monkeypatch.setenv(
+            "PATH",
+            f"{tmp_path}{os.pathsep}{os.environ['PATH']}",
+        )
+
+    return install
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX shebang script")
+class TestNmapRunnerStreaming:
+    """NmapRunner.stream_hosts 테스트 클래스."""
+
+    def test_hosts_arrive_before_exit(self, fake_nmap):
+        """프로세스 종료 전에 첫 호스트가 전달되는지 테스트."""
+        fake_nmap(delay=0.5)
+        runner = NmapRunner()
+
+        started = time.monotonic()
+        stream = runner.stream_hosts(["-sn", "10.0.0.0/30"], timeout=10)
+        first = next(stream)
+        first_latency = time.monotonic() - started
+        rest = list(stream)
+
+        assert first.ip == "10.0.0.1"
+        assert [h.ip for h in rest] == ["10.0.0.2", "10.0.0.3"]
+        assert first_latency < 1.0
+
+    def test_progress_callback(self, fake_nmap):
+        """--stats-every 진행 상황이 콜백으로 전달되는지 테스트."""
+        fake_nmap(delay=0)
+        progress = []
+
+        hosts = list(
+            NmapRunner().stream_hosts(
+                ["-sn", "10.0.0.0/30"], on_progress=progress.append
+            )
+        )
+
+        assert len(hosts) == 3
+        assert progress[0].task == "Ping Scan"
+        assert progress[0].percent == 50.0
+
+    def test_timeout_keeps_partial_hosts(self, fake_nmap):
+        """시간 초과 시 이미 받은 호스트는 유지되고 ScanTimeout이 발생하는지 테스트."""
+        fake_nmap(delay=1.0)
+        received = []
+
+        with pytest.raises(ScanTimeout):
+            for host in NmapRunner().stream_hosts(
+                ["-sn", "10.0.0.0/30"],
+                timeout=1.5,
+            ):
+                received.append(host.ip)
+
+        assert received[:1] == ["10.0.0.1"]
+        assert len(received) < 3
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX shebang script")
+class TestNmapRunnerExecute:
+    """NmapRunner.execute 테스트 클래스."""
+
+    def test_invocation_is_accounted(self, fake_nmap):
+        """실행마다 경과 시간, CPU 시간, RSS, 종료 코드, 출력 크기가 기록되는지 테스트."""
+        fake_nmap(delay=0)
+
+        result = NmapRunner.execute(
+            ["nmap", "-sV", "10.0.0.1"],
+            "services",
+            timeout=10,
+        )
+
+        assert result.returncode == 0 and not result.timed_out
+        assert "10.0.0.3" in result.stdout
+        assert 'args="-sV 10.0.0.1"' in result.stdout
+        [invocation] = NmapRunner.invocations()
+        assert invocation.kind == "services"
+        assert invocation.returncode == 0
+        assert invocation.output_bytes == len(result.stdout.encode())
+        assert invocation.wall_seconds > 0
+        assert invocation.cpu_seconds > 0
+        assert invocation.peak_rss > 0
+        summary = NmapRunner.summary()["services"]
+        assert (
+            summary["runs"] == 1
+            and summary["timeouts"] == 0
+            and summary["failures"] == 0
+        )
+
+    def test_hosts_are_parsed_while_running(self, fake_nmap):
+        """stdout을 읽는 동안 호스트가 파싱되고 시간 초과 시 부분 결과가 남는지 테스트."""
+        fake_nmap(delay=0)
+        result = NmapRunner.execute(["nmap", "10.0.0.0/30"], timeout=10)
+        assert [host.ip for host in result.hosts] == [
+            "10.0.0.1",
+            "10.0.0.2",
+            "10.0.0.3",
+        ]
+        assert list(result.iter_hosts()) == result.hosts
+
+        fake_nmap(delay=1.0)
+        result = NmapRunner.execute(["nmap", "10.0.0.0/30"], timeout=1.5)
+        partial = [host.ip for host in result.iter_hosts()]
+        assert result.timed_out
+        assert partial[:1] == ["10.0.0.1"] and len(partial) < 3
+
+    def test_timeout_kills_process_group(self, fake_nmap):
+        """시간 초과 시 nmap이 띄운 하위 프로세스까지 종료하고 부분 출력을 반환하는지 테스트."""
+        fake_nmap(delay=0, template=FORKING_NMAP)
+
+        started = time.monotonic()
+        result = NmapRunner.execute(["nmap", "10.0.0.1"], "os", timeout=0.5)
+        elapsed = time.monotonic() - started
+
+        assert result.timed_out and result.timeout == 0.5
+        assert result.stdout.startswith("<nmaprun>")
+        # 손자 프로세스가 살아 있으면 stdout 파이프가 닫히지 않아 읽기가 끝나지 않는다
+        assert elapsed < 3
+        grandchild = int(result.stdout.split("<!--")[1].split("-->")[0])
+        stat_file = f"/proc/{grandchild}/stat"
+        if os.path.exists(stat_file):  # 고아 프로세스가 아직 회수되지 않은 경우
+            time.sleep(0.2)
+            if os.path.exists(stat_file):
+                with open(stat_file) as f:
+                    assert f.read().rsplit(")", 1)[1].split()[0] == "Z"
+        assert NmapRunner.summary()["os"]["timeouts"] == 1
+
+    def test_child_pool_is_bounded(self, fake_nmap):
+        """동시 실행 수가 자식 프로세스 상한을 넘지 않는지 테스트."""
+        fake_nmap(delay=0.2)
+        NmapRunner.set_max_children(1)
+
+        threads = [
+            threading.Thread(
+                target=NmapRunner.execute,
+                args=(["nmap"], "ports"),
+                kwargs={"timeout": 10},
+            )
+            for _ in range(2)
+        ]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 한 번에 약 0.6초 — 겹쳐 실행됐다면 전체가 1.2초보다 짧다
+        assert time.monotonic() - started >= 1.2
+        assert NmapRunner.summary()["ports"]["runs"] == 2
+
+    def test_invalid_child_limit(self):
+        """1 미만의 자식 프로세스 상한은 ValueError 발생 테스트."""
+        with pytest.raises(ValueError):
+            NmapRunner.set_max_children(0)
+
+    def test_streaming_is_accounted(self, fake_nmap):
+        """스트리밍 실행도 discovery 종류로 기록되는지 테스트."""
+        fake_nmap(delay=0)
+
+        list(NmapRunner().stream_hosts(["-sn", "10.0.0.0/30"], timeout=10))
+
+        [invocation] = NmapRunner.invocations()
+        assert invocation.kind == "discovery" and invocation.returncode == 0
+        assert invocation.output_bytes > 0
@@ -0,0 +1,111 @@
+"""Nmap XML 스트리밍 파서 테스트 모듈."""
+
+import io
+from src.scanner.nmap_xml import iter_hosts, parse_hosts
+
+HOST_TEMPLATE = """<host><status state="up"/>
+<address addr="10.0.{n}.1" addrtype="ipv4"/>
+<address addr="00:11:22:33:44:55" addrtype="mac" vendor="Test"/>
+<hostnames><hostname name="host{n}.local" type="PTR"/></hostnames>
+<ports>
+<port protocol="tcp" portid="445"><state state="open"/>
+<service name="microsoft-ds" product="Samba smbd" version="4.6.2"/></port>
+<port protocol="tcp" portid="443"><state state="open"/>
+<service name="http" product="nginx" tunnel="ssl"/>
+<script id="ssl-enum-ciphers" output="TLSv1.0 supported"/></port>
+</ports>
+<hostscript>
+<script id="smb-protocols" output="dialects: NT LM 0.12 (SMBv1)"/>
+</hostscript>
+</host>
+"""
+
+
+def build_xml(count):
+    hosts = "".join(HOST_TEMPLATE.format(n=n) for n in range(count))
+    header = '<?xml version="1.0"?>\n<nmaprun scanner="nmap">\n'
+    return f"{header}{hosts}</nmaprun>\n"
+
+
+class TestNmapXml:
+    """Nmap XML 파서 테스트 클래스."""
+
+    def test_parse_host_records(self):
+        """호스트/포트/서비스/스크립트 레코드 변환 테스트."""
+        host = parse_hosts(build_xml(1))[0]
+
+        assert host.ip == "10.0.0.1"
+        assert host.is_up
+        assert host.mac == "00:11:22:33:44:55"
+        assert host.hostnames == ["host0.local"]
+        assert host.open_ports() == [443, 445]
+        assert host.ports[0].service.describe() == "Samba smbd 4.6.2"
+        assert host.ports[1].service.tunnel == "ssl"
+        assert [s.id for s in host.script_outputs()] == [
+            "smb-protocols",
+            "ssl-enum-ciphers",
+        ]
+        assert host.os_guess() is None
+
+    def test_srtt_parsed_in_seconds(self):
+        """`<times srtt>`(마이크로초)가 초 단위로 변환되는지 테스트."""
+        xml = (
+            '<nmaprun><host><status state="up"/><address addr="10.0.0.1" '
+            'addrtype="ipv4"/>'
+            '<times srtt="2500" rttvar="1000" to="100000"/></host></nmaprun>'
+        )
+        assert parse_hosts(xml)[0].srtt == 0.0025
+        assert parse_hosts(build_xml(1))[0].srtt is None
+
+    def test_extraports_and_answered(self):
+        """`<extraports>` 상태별 개수와, 닫힌 포트는 응답/필터링만 있으면 무응답인지 테스트."""
+
+        def host(ports, status="up"):
+            return parse_hosts(
+                f'<nmaprun><host><status state="{status}"/>'
+                f'<address addr="10.0.0.1" addrtype="ipv4"/>'
+                f"<ports>{ports}</ports></host></nmaprun>"
+            )[0]
+
+        closed = host(
+            '<extraports state="closed" count="60"/>'
+            '<extraports state="closed" count="40"/>'
+        )
+        assert closed.extraports == {"closed": 100}
+        assert closed.answered and not closed.open_ports()
+        assert not host(
+            '<extraports state="filtered" count="99"/>'
+            '<port protocol="tcp" portid="22"><state state="filtered"/></port>'
+        ).answered
+        assert not host(
+            '<extraports state="closed" count="100"/>', status="down"
+        ).answered
+        assert parse_hosts(build_xml(1))[0].answered
+
+    def test_multi_host_stream(self):
+        """여러 호스트가 담긴 바이너리 스트림을 순서대로 파싱하는지 테스트."""
+        hosts = list(iter_hosts(io.BytesIO(build_xml(50).encode())))
+
+        assert [h.ip for h in hosts] == [f"10.0.{n}.1" for n in range(50)]
+
+    def test_yields_before_stream_ends(self):
+        """문서 전체를 읽기 전에 첫 호스트를 생성하는지(스트리밍) 테스트."""
+        source = io.BytesIO(build_xml(2000).encode())
+        first = next(iter_hosts(source))
+
+        assert first.ip == "10.0.0.1"
+        assert source.tell() < len(source.getvalue())
+
+    def test_truncated_output_keeps_complete_hosts(self):
+        """중간에 끊긴 XML에서도 완성된 호스트는 반환하는지 테스트."""
+        xml = build_xml(3)
+        truncated = xml[: xml.rindex("<host>") + 20]
+
+        assert [h.ip for h in iter_hosts(truncated)] == [
+            "10.0.0.1",
+            "10.0.1.1",
+        ]
+
+    def test_non_xml_returns_empty(self):
+        """XML이 아닌 출력은 빈 결과 반환 테스트."""
+        assert parse_hosts("Nmap done: 0 IP addresses") == []
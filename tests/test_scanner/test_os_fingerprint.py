@@ -1,33 +1,51 @@
 """OS 핑거프린팅 테스트 모듈."""
 
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import pytest
+from src.scanner.nmap_runner import NmapResult, NmapRunner
 from src.scanner.os_fingerprint import OSFingerprint
+from src.utils.exceptions import ScanTimeout
 
 __all__ = ['TestOSFingerprint']
 
+OS_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<nmaprun scanner="nmap" args="nmap -O -T1 192.168.1.1 -oX -">
+<host><status state="up" reason="arp-response"/>
+<address addr="192.168.1.1" addrtype="ipv4"/>
+<ports><port protocol="tcp" portid="22"><state state="open"/></port></ports>
+<os>
+<osmatch name="Linux 4.15 - 5.6" accuracy="95"/>
+<osmatch name="Linux 5.4 - 5.10" accuracy="100">
+<osclass type="general purpose" vendor="Linux" osfamily="Linux"
+ osgen="5.X" accuracy="100"/>
+</osmatch>
+</os>
+</host>
+<runstats><finished time="0"/></runstats>
+</nmaprun>
+"""
+
+
 class TestOSFingerprint(unittest.TestCase):
     """OS 핑거프린팅 테스트 클래스."""
-    
+
     def setUp(self):
         self.fingerprinter = OSFingerprint()
-    
-    @patch('subprocess.run')
+
+    @patch.object(NmapRunner, "execute")
     def test_valid_os_string(self, mock_run):
         """유효한 OS 정보가 있는 경우 테스트."""
-        # Mock subprocess.run
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "# OS details: Linux 5.4 - 5.10\n"
+        mock_result = NmapResult(["nmap"], 0)
+        mock_result.stdout = OS_XML
         mock_run.return_value = mock_result
-        
+
         # Run test
         result = self.fingerprinter.fingerprint("192.168.1.1")
-        
+
         # Verify result
         self.assertEqual(result, "Linux 5.4 - 5.10")
-        
+
         # Verify command
         mock_run.assert_called_once()
         cmd = mock_run.call_args[0][0]
@@ -35,23 +53,54 @@ class TestOSFingerprint(unittest.TestCase):
         self.assertIn("-O", cmd)
         self.assertIn("-T1", cmd)
         self.assertIn("192.168.1.1", cmd)
-    
-    @patch('subprocess.run')
+
+    @patch.object(NmapRunner, "execute")
     def test_no_match_returns_none(self, mock_run):
         """OS 정보가 없는 경우 None 반환 테스트."""
-        # Mock subprocess.run
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "No OS information available\n"
+        mock_result = NmapResult(["nmap"], 0)
+        mock_result.stdout = OS_XML.split("<os>")[0] + "</host></nmaprun>"
         mock_run.return_value = mock_result
-        
+
         # Run test
         result = self.fingerprinter.fingerprint("192.168.1.1")
-        
+
         # Verify result
         self.assertIsNone(result)
-    
-    def test_invalid_ip_raises(self):
-        """잘못된 IP 주소로 핑거프린팅 시 ValueError 발생 테스트."""
+
+    @patch.object(NmapRunner, "execute")
+    def test_osclass_fallback(self, mock_run):
+        """osmatch가 없으면 osclass(Running) 정보를 사용하는지 테스트."""
+        mock_result = NmapResult(["nmap"], 0)
+        mock_result.stdout = (
+            OS_XML.replace(
+                '<osmatch name="Linux 4.15 - 5.6" accuracy="95"/>',
+                "",
+            )
+            .replace('<osmatch name="Linux 5.4 - 5.10" accuracy="100">', "")
+            .replace("</osmatch>", "")
+        )
+        mock_run.return_value = mock_result
+
+        result = self.fingerprinter.fingerprint("192.168.1.1")
+
+        self.assertEqual(result, "Linux Linux 5.X")
+
+    @patch.object(NmapRunner, "execute")
+    def test_timeout_raises_with_partial_os(self, mock_run):
+        """시간 초과 시 그때까지 얻은 OS 정보를 담아 ScanTimeout을 발생시키는지 테스트."""
+        mock_run.return_value = NmapResult(
+            ["nmap"], -9, OS_XML, timed_out=True, timeout=30
+        )
+
+        with pytest.raises(ScanTimeout) as ctx:
+            self.fingerprinter.fingerprint("192.168.1.1")
+
+        self.assertEqual(ctx.value.partial, "Linux 5.4 - 5.10")
+        self.assertEqual(ctx.value.hosts, ["192.168.1.1"])
+
+    @patch.object(NmapRunner, "execute")
+    def test_option_like_target_raises(self, mock_run):
+        """nmap 옵션으로 해석될 수 있는 대상으로 핑거프린팅 시 ValueError 발생 테스트."""
         with pytest.raises(ValueError):
-            self.fingerprinter.fingerprint("invalid_ip") 
\ No newline at end of file
+            self.fingerprinter.fingerprint("--script=evil")
+        mock_run.assert_not_called()
@@ -0,0 +1,103 @@
+"""StagedPipeline 테스트 모듈."""
+
+import threading
+import time
+
+import pytest
+from src.scanner.pipeline import Stage, StagedPipeline, parse_stage_workers
+
+
+class TestStagedPipeline:
+    """StagedPipeline 테스트 클래스."""
+
+    def test_results_keep_input_order(self):
+        """단계별 처리 시간이 달라도 결과가 입력 순서를 유지하는지 테스트."""
+
+        def slow_first(n):
+            time.sleep(0.002 * (10 - n))
+            return n
+
+        pipeline = StagedPipeline(
+            [
+                Stage("a", slow_first, workers=4),
+                Stage("b", lambda n: n * 10, workers=2),
+            ]
+        )
+
+        assert pipeline.run(range(10)) == [n * 10 for n in range(10)]
+
+    def test_none_drops_item(self):
+        """단계 함수가 None을 반환한 항목은 다음 단계로 가지 않는지 테스트."""
+        seen = []
+        pipeline = StagedPipeline(
+            [
+                Stage("filter", lambda n: n if n % 2 else None, workers=2),
+                Stage("collect", lambda n: seen.append(n) or n),
+            ]
+        )
+
+        assert pipeline.run(range(6)) == [1, 3, 5]
+        assert sorted(seen) == [1, 3, 5]
+        stats = {s.name: s for s in pipeline.stats()}
+        assert stats["filter"].processed == 6
+        assert stats["filter"].dropped == 3
+
+    def test_backpressure_bounds_queue(self):
+        """느린 뒤 단계가 앞 단계를 막아 큐 길이가 제한되는지 테스트."""
+        produced = []
+
+        def source():
+            for n in range(40):
+                produced.append(n)
+                yield n
+
+        gate = threading.Event()
+        pipeline = StagedPipeline(
+            [
+                Stage("fast", lambda n: n, workers=1),
+                Stage("slow", lambda n: gate.wait() and n, workers=1),
+            ],
+            queue_size=2,
+        )
+
+        runner = threading.Thread(target=lambda: pipeline.run(source()))
+        runner.start()
+        time.sleep(0.2)
+        in_flight = len(produced)
+        gate.set()
+        runner.join()
+
+        # 큐 2개(각 2) + 각 단계 처리 중 1개 + 생성 대기 1개를 넘지 않아야 한다
+        assert in_flight <= 7
+        assert all(s.peak_queue_depth <= 2 for s in pipeline.stats())
+
+    def test_stage_error_is_raised(self):
+        """단계 함수 예외가 실행 종료 후 다시 발생하는지 테스트."""
+
+        def boom(n):
+            if n == 3:
+                raise RuntimeError("stage failed")
+            return n
+
+        with pytest.raises(RuntimeError):
+            StagedPipeline([Stage("boom", boom, workers=2)]).run(range(6))
+
+    def test_stats_utilisation(self):
+        """사용률이 0~1 범위로 계산되는지 테스트."""
+        pipeline = StagedPipeline(
+            [Stage("sleep", lambda n: time.sleep(0.01) or n)],
+        )
+        pipeline.run(range(5))
+
+        stats = pipeline.stats()[0]
+        assert stats.processed == 5
+        assert 0.0 < stats.utilisation <= 1.0
+        assert stats.queue_depth == 0
+
+    def test_parse_stage_workers(self):
+        """단계별 작업 수 문자열 파싱 테스트."""
+        assert parse_stage_workers("ports=4, os=1") == {"ports": 4, "os": 1}
+        with pytest.raises(ValueError):
+            parse_stage_workers("ports")
+        with pytest.raises(ValueError):
+            parse_stage_workers("ports=0")
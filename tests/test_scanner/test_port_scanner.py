@@ -0,0 +1,149 @@
+"""포트 스캐너 테스트 모듈."""
+
+import unittest
+from unittest.mock import patch
+from src.scanner.nmap_runner import NmapResult, NmapRunner
+from src.scanner.port_scanner import PortScanner, ScanTimeout
+
+__all__ = ["TestPortScanner"]
+
+XML_TWO_HOSTS = """<?xml version="1.0" encoding="UTF-8"?>
+<nmaprun scanner="nmap"
+ args="nmap -T1 --top-ports 100 -oX - 10.0.0.1 10.0.0.2 10.0.0.3">
+<host><status state="up"/><address addr="10.0.0.1" addrtype="ipv4"/>
+<ports><extraports state="closed" count="97"/>
+<port protocol="tcp" portid="443"><state state="open"/></port>
+<port protocol="tcp" portid="22"><state state="open"/></port>
+<port protocol="tcp" portid="80"><state state="closed"/></port>
+</ports></host>
+<host><status state="up"/><address addr="10.0.0.2" addrtype="ipv4"/>
+<ports><port protocol="tcp" portid="3389"><state state="open"/></port></ports>
+</host>
+<runstats><finished time="0"/><hosts up="2" down="1" total="3"/></runstats>
+</nmaprun>
+"""
+
+
+class TestPortScanner(unittest.TestCase):
+    """포트 스캐너 테스트 클래스."""
+
+    def setUp(self):
+        self.scanner = PortScanner()
+
+    @patch.object(NmapRunner, "execute")
+    def test_scan_single_host(self, mock_run):
+        """단일 호스트 스캔 시 정렬된 열린 포트 반환 테스트."""
+        mock_run.return_value = NmapResult(["nmap"], 0, XML_TWO_HOSTS)
+
+        self.assertEqual(self.scanner.scan("10.0.0.1"), [22, 443])
+
+    @patch.object(NmapRunner, "execute")
+    def test_answered_distinguishes_closed_from_filtered(self, mock_run):
+        """닫힌 포트로 응답한 호스트와 출력에 없거나 모두 필터링된 호스트를 구분하는지 테스트."""
+        filtered = XML_TWO_HOSTS.replace(
+            '<port protocol="tcp" portid="3389"><state state="open"/></port>',
+            '<extraports state="filtered" count="100"/>',
+        )
+        mock_run.return_value = NmapResult(["nmap"], 0, filtered)
+
+        result = self.scanner.scan_many(["10.0.0.1", "10.0.0.2", "10.0.0.3"])
+
+        self.assertTrue(result["10.0.0.1"].answered)
+        self.assertEqual(result["10.0.0.2"], [])
+        self.assertFalse(result["10.0.0.2"].answered)
+        self.assertFalse(result["10.0.0.3"].answered)
+
+        mock_run.return_value = NmapResult(["nmap"], 1, "", "nmap error")
+        self.assertTrue(self.scanner.scan("10.0.0.3").answered)  # 실패는 무응답이 아님
+
+    @patch.object(NmapRunner, "execute")
+    def test_timeout_keeps_partial_ports(self, mock_run):
+        """시간 초과 시 그때까지의 열린 포트가 ScanTimeout.partial에 담기는지 테스트."""
+        truncated = XML_TWO_HOSTS.split(
+            '<host><status state="up"/><address addr="10.0.0.2"'
+        )[0]
+        mock_run.return_value = NmapResult(
+            ["nmap"], -9, truncated, timed_out=True, timeout=30
+        )
+
+        with self.assertRaises(ScanTimeout) as ctx:
+            self.scanner.scan("10.0.0.1")
+
+        self.assertEqual(ctx.exception.partial, [22, 443])
+        self.assertEqual(
+            mock_run.call_args[0][1:],
+            ("ports", ["10.0.0.1"], 100),
+        )
+
+    @patch.object(NmapRunner, "execute")
+    def test_scan_many_continues_after_chunk_timeout(self, mock_run):
+        """청크 하나가 시간 초과돼도 나머지 청크를 스캔하고 부분 결과를 넘기는지 테스트."""
+        mock_run.side_effect = [
+            NmapResult(["nmap"], -9, timed_out=True, timeout=30),
+            NmapResult(["nmap"], 0, XML_TWO_HOSTS),
+        ]
+
+        with self.assertRaises(ScanTimeout) as ctx:
+            self.scanner.scan_many(["10.0.0.9", "10.0.0.1"], chunk_size=1)
+
+        self.assertEqual(ctx.exception.hosts, ["10.0.0.9"])
+        self.assertEqual(
+            ctx.exception.partial,
+            {"10.0.0.9": [], "10.0.0.1": [22, 443]},
+        )
+
+    @patch.object(NmapRunner, "execute")
+    def test_scan_many_splits_hosts(self, mock_run):
+        """한 번의 nmap 출력이 IP별 열린 포트로 분리되는지 테스트."""
+        mock_run.return_value = NmapResult(["nmap"], 0, XML_TWO_HOSTS)
+
+        result = self.scanner.scan_many(
+            ["10.0.0.1", "10.0.0.2", "10.0.0.3"], top_ports=100
+        )
+
+        self.assertEqual(
+            result,
+            {
+                "10.0.0.1": [22, 443],
+                "10.0.0.2": [3389],
+                "10.0.0.3": [],
+            },
+        )
+        mock_run.assert_called_once()
+        cmd = mock_run.call_args[0][0]
+        self.assertEqual(cmd[-3:], ["10.0.0.1", "10.0.0.2", "10.0.0.3"])
+        self.assertIn("-oX", cmd)
+
+    @patch.object(NmapRunner, "execute")
+    def test_scan_many_called_on_class(self, mock_run):
+        """워크플로우처럼 클래스에서 바로 호출해도 대상 목록이 IP로 전달되는지 테스트."""
+        mock_run.return_value = NmapResult(["nmap"], 0, XML_TWO_HOSTS)
+
+        result = PortScanner.scan_many(["10.0.0.1", "10.0.0.2"], 100, 64)
+
+        self.assertEqual(result, {"10.0.0.1": [22, 443], "10.0.0.2": [3389]})
+        self.assertEqual(
+            mock_run.call_args[0][0][-2:],
+            ["10.0.0.1", "10.0.0.2"],
+        )
+
+    @patch.object(NmapRunner, "execute")
+    def test_scan_many_chunks(self, mock_run):
+        """chunk_size 단위로 nmap 실행 횟수가 나뉘는지 테스트."""
+        mock_run.return_value = NmapResult(["nmap"], 0, "")
+
+        ips = [f"10.0.0.{i}" for i in range(1, 11)]
+        result = self.scanner.scan_many(ips, chunk_size=4)
+
+        self.assertEqual(mock_run.call_count, 3)
+        self.assertEqual(list(result), ips)
+
+    @patch.object(NmapRunner, "execute")
+    def test_option_like_target_raises(self, mock_run):
+        """nmap 옵션으로 해석될 수 있는 대상은 실행 전에 ValueError 발생 테스트."""
+        for target in ("-iL/etc/passwd", "10.0.0.1 -oN out", ""):
+            with self.assertRaises(ValueError):
+                self.scanner.scan(target)
+        with self.assertRaises(ValueError):
+            self.scanner.scan_many(["10.0.0.1", "--script=evil"])
+        mock_run.assert_not_called()
@@ -0,0 +1,157 @@
+"""ProbeCache 테스트 모듈."""
+
+import unittest
+from unittest.mock import patch
+import pytest
+from src.scanner.nmap_runner import NmapResult, NmapRunner
+from src.scanner.probe_cache import MISS, ProbeCache
+from src.scanner.service_detector import ServiceDetector
+from src.scanner.os_fingerprint import OSFingerprint
+
+__all__ = ["TestProbeCache"]
+
+SERVICE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<nmaprun scanner="nmap">
+<host><status state="up"/><address addr="192.168.1.1" addrtype="ipv4"/>
+<ports><port protocol="tcp" portid="22"><state state="open"/>
+<service name="ssh" product="OpenSSH" version="8.2"/></port></ports>
+<os><osmatch name="Linux 5.4" accuracy="98"/></os>
+</host>
+</nmaprun>
+"""
+
+
+class TestProbeCache:
+    """ProbeCache 테스트 클래스."""
+
+    def setup_method(self):
+        """테스트 메서드 실행 전 초기화."""
+        self.cache = ProbeCache(":memory:", ttl=60, max_entries=3)
+
+    def teardown_method(self):
+        """테스트 메서드 실행 후 정리."""
+        self.cache.close()
+
+    def test_hit_and_miss_counters(self):
+        """저장 전 miss, 저장 후 hit 및 종류별 카운터 테스트."""
+        assert self.cache.get("os", "10.0.0.1") is MISS
+        self.cache.put("os", "10.0.0.1", None)
+        assert self.cache.get("os", "10.0.0.1") is None
+        assert self.cache.stats() == {"os": {"hits": 1, "misses": 1}}
+
+    def test_key_uses_port_set_and_mac(self):
+        """포트 순서와 무관하고, 포트 집합/MAC이 다르면 다른 키인지 테스트."""
+        self.cache.put("services", "10.0.0.1", {"22": "SSH"}, ports=[80, 22])
+        assert self.cache.get("services", "10.0.0.1", ports=[22, 80]) == {
+            "22": "SSH",
+        }
+        assert self.cache.get("services", "10.0.0.1", ports=[22]) is MISS
+        assert (
+            self.cache.get(
+                "services", "10.0.0.1", ports=[22, 80], mac="AA:BB:CC:DD:EE:FF"
+            )
+            is MISS
+        )
+
+    def test_remembered_mac_keys_entries(self):
+        """탐색에서 본 MAC이 키에 들어가 IP가 다른 장비로 바뀌면 miss인지 테스트."""
+        self.cache.remember_mac("10.0.0.1", "aa:bb:cc:dd:ee:01")
+        self.cache.put("os", "10.0.0.1", "Linux")
+        assert self.cache.get("os", "10.0.0.1") == "Linux"
+        upper = "AA:BB:CC:DD:EE:01"
+        assert self.cache.get("os", "10.0.0.1", mac=upper) == "Linux"
+
+        self.cache.remember_mac("10.0.0.1", "aa:bb:cc:dd:ee:02")
+        assert self.cache.get("os", "10.0.0.1") is MISS
+
+    def test_ttl_expiry(self, monkeypatch):
+        """TTL이 지난 항목은 miss로 처리되는지 테스트."""
+        now = [1000.0]
+        monkeypatch.setattr(
+            "src.scanner.probe_cache.time.time",
+            lambda: now[0],
+        )
+        self.cache.put("os", "10.0.0.1", "Linux")
+        now[0] += 61
+        assert self.cache.get("os", "10.0.0.1") is MISS
+
+    def test_lru_eviction(self, monkeypatch):
+        """최대 크기를 넘으면 가장 오래 쓰이지 않은 항목이 제거되는지 테스트."""
+        now = [1000.0]
+        monkeypatch.setattr(
+            "src.scanner.probe_cache.time.time",
+            lambda: now[0],
+        )
+        for i in range(3):
+            now[0] += 1
+            self.cache.put("os", f"10.0.0.{i}", "Linux")
+        now[0] += 1
+        self.cache.get("os", "10.0.0.0")  # 최근 사용으로 갱신
+        now[0] += 1
+        self.cache.put("os", "10.0.0.9", "Linux")
+
+        assert self.cache.get("os", "10.0.0.1") is MISS
+        assert self.cache.get("os", "10.0.0.0") == "Linux"
+
+    def test_shared_file_between_instances(self, tmp_path):
+        """같은 파일을 여는 다른 인스턴스(재실행/다른 작업자)와 공유되는지 테스트."""
+        path = tmp_path / "cache.db"
+        with ProbeCache(path) as first:
+            first.put("os", "10.0.0.1", "Windows")
+        with ProbeCache(path) as second:
+            assert second.get("os", "10.0.0.1") == "Windows"
+
+    def test_invalid_limits(self):
+        """잘못된 TTL/크기 값은 ValueError 발생 테스트."""
+        with pytest.raises(ValueError):
+            ProbeCache(":memory:", ttl=0)
+
+
+class TestDetectorCaching(unittest.TestCase):
+    """탐지 클래스의 캐시 연동 테스트."""
+
+    def setUp(self):
+        self.cache = ProbeCache(":memory:")
+        ServiceDetector.cache = OSFingerprint.cache = self.cache
+
+    def tearDown(self):
+        ServiceDetector.cache = OSFingerprint.cache = None
+        self.cache.close()
+
+    @patch.object(NmapRunner, "execute")
+    def test_repeated_probes_skip_subprocess(self, mock_run):
+        """캐시된 서비스/OS 탐지는 nmap을 다시 실행하지 않는지 테스트."""
+        mock_result = NmapResult(["nmap"], 0)
+        mock_result.stdout = SERVICE_XML
+        mock_run.return_value = mock_result
+
+        for _ in range(2):
+            self.assertEqual(
+                ServiceDetector.detect("192.168.1.1", [22]),
+                {22: "OpenSSH 8.2"},
+            )
+            self.assertEqual(
+                OSFingerprint.fingerprint("192.168.1.1"),
+                "Linux 5.4",
+            )
+
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual(
+            self.cache.stats(),
+            {
+                "services": {"hits": 1, "misses": 1},
+                "os": {"hits": 1, "misses": 1},
+            },
+        )
+
+    @patch.object(NmapRunner, "execute")
+    def test_failures_are_not_cached(self, mock_run):
+        """nmap 실패 결과는 캐시하지 않는지 테스트."""
+        mock_result = NmapResult(["nmap"], 1)
+        mock_result.stderr = "error"
+        mock_run.return_value = mock_result
+
+        OSFingerprint.fingerprint("192.168.1.1")
+        OSFingerprint.fingerprint("192.168.1.1")
+
+        self.assertEqual(mock_run.call_count, 2)
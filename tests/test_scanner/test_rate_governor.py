@@ -0,0 +1,120 @@
+"""RateGovernor 테스트 모듈."""
+
+import threading
+import time
+from unittest.mock import patch
+import pytest
+from src.scanner.nmap_runner import NmapResult, NmapRunner
+from src.scanner.port_scanner import PortScanner
+from src.scanner.rate_governor import RateGovernor, template_of
+
+
+class TestRateGovernor:
+    """RateGovernor 테스트 클래스."""
+
+    def test_bandwidth_converted_to_packet_rate(self):
+        """대역폭 예산이 패킷/초로 바뀌고, 둘 다 주면 작은 쪽을 쓰는지 테스트."""
+        assert RateGovernor(max_bandwidth=512_000).max_rate == 1000
+        governor = RateGovernor(max_rate=300, max_bandwidth=512_000)
+        assert governor.max_rate == 300
+
+    def test_budget_split_across_slots(self):
+        """예상 동시 실행 수만큼 몫을 나누고 합계가 상한과 같은지 테스트."""
+        governor = RateGovernor(max_rate=1000, slots=4)
+        with governor.lease() as first, governor.lease() as second:
+            with governor.lease() as third, governor.lease() as fourth:
+                assert [first, second, third, fourth] == [250, 250, 250, 250]
+                assert governor.allocated() == 1000
+        assert governor.allocated() == 0
+
+    def test_freed_share_goes_to_next_process(self):
+        """예상 실행 수가 줄면 끝난 프로세스의 몫이 다음 프로세스로 가는지 테스트."""
+        governor = RateGovernor(max_rate=1000, slots=4)
+        with governor.lease() as first:
+            governor.expect(2)
+            with governor.lease() as second:
+                assert (first, second) == (250, 750)
+        with governor.lease() as third:
+            assert third == 500
+
+    def test_waits_until_budget_is_released(self):
+        """여유분이 없으면 다른 프로세스가 끝날 때까지 기다리는지 테스트."""
+        governor = RateGovernor(max_rate=100)
+        granted = []
+
+        def second():
+            with governor.lease() as rate:
+                granted.append(rate)
+
+        with governor.lease():
+            thread = threading.Thread(target=second)
+            thread.start()
+            time.sleep(0.05)
+            assert granted == []
+        thread.join(timeout=1)
+
+        assert granted == [100]
+        assert governor.stats()["waits"] == 1
+
+    def test_concurrent_leases_never_exceed_ceiling(self):
+        """동시 실행 수가 예상보다 많아도 할당 합계가 상한을 넘지 않는지 테스트."""
+        governor = RateGovernor(max_rate=90, slots=3)
+        observed = []
+
+        def run():
+            with governor.lease():
+                observed.append(governor.allocated())
+                time.sleep(0.01)
+
+        threads = [threading.Thread(target=run) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=2)
+
+        assert len(observed) == 8
+        assert max(observed) <= 90
+        assert governor.stats()["peak_rate"] <= 90
+
+    def test_rewrite_sets_max_rate_and_lifts_slow_template(self):
+        """--max-rate가 추가되고 -T0/-T1만 기본 템플릿으로 바뀌는지 테스트."""
+        governor = RateGovernor(max_rate=1000)
+        cmd = governor.rewrite(["nmap", "-T1", "-p", "22", "10.0.0.1"], 333.33)
+        assert cmd == [
+            "nmap",
+            "--max-rate",
+            "333.33",
+            "-T3",
+            "-p",
+            "22",
+            "10.0.0.1",
+        ]
+        assert governor.rewrite(["nmap", "-T4", "10.0.0.1"], 10)[3] == "-T4"
+        assert template_of(["nmap", "-sV"]) == 3
+
+    @pytest.mark.parametrize(
+        "kwargs", [{}, {"max_rate": 0}, {"max_rate": 10, "slots": 0}]
+    )
+    def test_invalid_settings_raise(self, kwargs):
+        """상한이 없거나 잘못된 설정이면 ValueError 발생 테스트."""
+        with pytest.raises(ValueError):
+            RateGovernor(**kwargs)
+
+    @patch.object(NmapRunner, "_spawn")
+    def test_scanner_runs_under_installed_governor(
+        self,
+        mock_run,
+        monkeypatch,
+    ):
+        """설치된 조절기가 있으면 스캐너 명령에 할당 속도가 반영되는지 테스트."""
+        mock_run.return_value = NmapResult(["nmap"], 0, "<nmaprun/>")
+        PortScanner.scan("10.0.0.1", 10)
+        assert mock_run.call_args[0][0][:2] == ["nmap", "-T1"]
+
+        governor = RateGovernor(max_rate=500)
+        monkeypatch.setattr(RateGovernor, "active", governor)
+        PortScanner.scan("10.0.0.1", 10)
+
+        cmd = mock_run.call_args[0][0]
+        assert cmd[:4] == ["nmap", "--max-rate", "500.00", "-T3"]
+        assert governor.allocated() == 0 and governor.stats()["processes"] == 1
@@ -0,0 +1,158 @@
+"""ResourceGovernor 테스트 모듈."""
+
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+import pytest
+from src.scanner import resource_governor
+from src.scanner.resource_governor import ResourceGovernor, ResourceSample
+
+
+@pytest.fixture
+def governor():
+    governor = ResourceGovernor(cpu_limit=5, mem_limit=5, interval=60)
+    governor.start(6)
+    yield governor
+    governor.stop()
+
+
+class TestResourceGovernor:
+    """ResourceGovernor 테스트 클래스."""
+
+    def test_shrinks_in_proportion_to_overrun(self, governor):
+        """상한 초과 비율만큼 동시 실행 수를 줄이고 결정을 기록하는지 테스트."""
+        decision = governor.adjust(
+            ResourceSample(cpu_percent=15.0, mem_percent=1.0),
+        )
+
+        assert governor.limit == 2
+        assert decision.action == "shrink"
+        assert (decision.workers_from, decision.workers_to) == (6, 2)
+        assert "cpu 15.0%/5%" in decision.reason
+        assert governor.decisions() == [decision]
+
+    def test_never_below_min_workers(self, governor):
+        """최소 동시 실행 수 아래로는 줄이지 않는지 테스트."""
+        governor.adjust(ResourceSample(cpu_percent=1.0, mem_percent=90.0))
+        assert governor.limit == 1
+        sample = ResourceSample(cpu_percent=1.0, mem_percent=90.0)
+        assert governor.adjust(sample) is None
+
+    def test_grows_only_when_scans_are_waiting(self, governor):
+        """여유가 있고 대기 중인 스캔이 있을 때만 하나씩 늘리는지 테스트."""
+        governor.adjust(ResourceSample(cpu_percent=30.0, mem_percent=1.0))
+        assert governor.limit == 1
+        sample = ResourceSample(cpu_percent=1.0, mem_percent=1.0)
+        assert governor.adjust(sample) is None
+
+        started = threading.Event()
+
+        def waiter():
+            with governor.slot():
+                started.set()
+
+        with governor.slot():
+            thread = threading.Thread(target=waiter)
+            thread.start()
+            time.sleep(0.05)
+            assert not started.is_set()
+            decision = governor.adjust(
+                ResourceSample(cpu_percent=1.0, mem_percent=1.0),
+            )
+            assert started.wait(1)
+        thread.join(timeout=1)
+
+        assert (decision.action, decision.workers_to) == ("grow", 2)
+        sample = ResourceSample(cpu_percent=4.5, mem_percent=1.0)
+        assert governor.adjust(sample) is None
+
+    def test_slot_limits_concurrency(self, governor):
+        """허용된 수보다 많은 스캔이 동시에 실행되지 않는지 테스트."""
+        # 6 -> 3
+        governor.adjust(ResourceSample(cpu_percent=10.0, mem_percent=1.0))
+        running, peak = [0], [0]
+        lock = threading.Lock()
+
+        def scan():
+            with governor.slot():
+                with lock:
+                    running[0] += 1
+                    peak[0] = max(peak[0], running[0])
+                time.sleep(0.02)
+                with lock:
+                    running[0] -= 1
+
+        threads = [threading.Thread(target=scan) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=2)
+
+        assert peak[0] == 3
+
+    def test_sample_reads_child_processes_from_procfs(self, tmp_path):
+        """procfs에서 자식 프로세스의 CPU 시간과 RSS를 읽는지 테스트."""
+        ticks, page = os.sysconf("SC_CLK_TCK"), os.sysconf("SC_PAGE_SIZE")
+        (tmp_path / "meminfo").write_text(
+            f"MemTotal: {100 * page // 1024} kB\n",
+        )
+        fields = ["0"] * 40
+        fields[0], fields[1] = "S", str(os.getpid())
+        fields[11], fields[12], fields[21] = str(2 * ticks), str(ticks), "10"
+        for pid, parent in (("4242", os.getpid()), ("4343", 1)):
+            fields[1] = str(parent)
+            (tmp_path / pid).mkdir()
+            (tmp_path / pid / "stat").write_text(
+                f"{pid} (nmap (x)) {' '.join(fields)}\n"
+            )
+
+        sampler = ResourceGovernor(proc_root=str(tmp_path))
+        assert sampler._children() == [(3.0, 10 * page)]
+        sample = sampler.sample()
+        assert sample.children == 1
+        assert sample.mem_percent >= 10.0
+        assert sample.cpu_percent == 0.0  # 첫 측정은 기준점
+
+    def test_sample_without_procfs_or_getrusage(self, monkeypatch, tmp_path):
+        """resource 모듈과 procfs, sysconf가 없는 플랫폼(Windows)에서도 측정되는지 테스트."""
+        monkeypatch.setattr(resource_governor, "resource", None)
+        monkeypatch.delattr(os, "sysconf")
+        sampler = ResourceGovernor(proc_root=str(tmp_path / "missing"))
+
+        sampler.start(2)
+        try:
+            sample = sampler.sample()
+        finally:
+            sampler.stop()
+
+        assert sample == ResourceSample(sample.cpu_percent, 0.0, 0)
+        assert sample.cpu_percent >= 0.0
+
+    @pytest.mark.skipif(
+        not Path("/proc/self/stat").exists(),
+        reason="procfs required",
+    )
+    def test_sample_counts_running_nmap_children(self):
+        """실제 procfs에서 실행 중인 자식 프로세스가 측정되는지 테스트."""
+        sampler = ResourceGovernor()
+        with subprocess.Popen(["sleep", "1"]) as child:
+            sample = sampler.sample()
+            child.kill()
+        assert sample.children >= 1
+        assert 0 < sample.mem_percent < 100
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"cpu_limit": 0},
+            {"interval": 0},
+            {"min_workers": 0},
+            {"headroom": 1.5},
+        ],
+    )
+    def test_invalid_settings_raise(self, kwargs):
+        """잘못된 설정이면 ValueError 발생 테스트."""
+        with pytest.raises(ValueError):
+            ResourceGovernor(**kwargs)
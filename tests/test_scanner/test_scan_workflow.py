@@ -1,58 +1,83 @@
 """ScanWorkflow 테스트 모듈."""
 
+import time
 import pytest
+from openpyxl import load_workbook
 from src.scanner.scan_workflow import ScanWorkflow
-from src.scanner.host_discovery import HostDiscovery
-from src.scanner.port_scanner import PortScanner
+from src.scanner.host_discovery import AliveHost, HostDiscovery
+from src.scanner.port_scanner import OpenPorts, PortScanner, ScanTimeout
 from src.scanner.service_detector import ServiceDetector
 from src.scanner.os_fingerprint import OSFingerprint
 from src.scanner.detailed_checks import DetailedChecks
+from src.scanner.combined_scan import CombinedScanner
+from src.scanner.rate_governor import RateGovernor
+from src.scanner.resource_governor import ResourceGovernor
+from src.scanner.probe_cache import MISS, ProbeCache
 from src.core.resume import ResumeManager
 from src.core.state import StateManager
+from src.output.excel_writer import ExcelWriter
+from src.output.exporters import ResultExporter
+from src.output.result_store import ResultStore
+from src.utils.exceptions import OutputError
+
+
+def discovered(host_discovery):
+    """IP 목록을 내는 모의 탐색 함수를 `HostDiscovery.discover` 형식으로 감싼다."""
+
+    def discover(cidr):
+        for ip in host_discovery(cidr):
+            yield AliveHost(ip=ip, technique="icmp")
+
+    return discover
+
 
 class TestScanWorkflow:
     """ScanWorkflow 테스트 클래스."""
-    
+
     def setup_method(self):
         """테스트 메서드 실행 전 초기화."""
         self.workflow = ScanWorkflow("192.168.1.0/24")
-    
+
     def test_scan_workflow(self, monkeypatch):
         """스캔 워크플로우 테스트."""
         # 모의(mock) 메서드 설정
         def mock_host_discovery(cidr):
             return ["192.168.1.10"]
-        
+
         def mock_port_scan(ip, top_ports):
             return [22]
-        
+
         def mock_service_detect(ip, ports):
             return {22: "SSH"}
-        
+
         def mock_fingerprint(ip):
             return "Linux"
-        
-        def mock_checks(ip):
+
+        def mock_checks(ip, open_ports=None, services=None):
             return {"smbv1": False}
-        
-        def mock_should_resume():
+
+        def mock_should_resume(state):
             return False
-        
+
         def mock_save_state(state):
             pass
-        
+
         # 메서드 패치
-        monkeypatch.setattr(HostDiscovery, 'host_discovery', mock_host_discovery)
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(mock_host_discovery),
+        )
         monkeypatch.setattr(PortScanner, 'scan', mock_port_scan)
         monkeypatch.setattr(ServiceDetector, 'detect', mock_service_detect)
         monkeypatch.setattr(OSFingerprint, 'fingerprint', mock_fingerprint)
         monkeypatch.setattr(DetailedChecks, 'run', mock_checks)
         monkeypatch.setattr(ResumeManager, 'should_resume', mock_should_resume)
         monkeypatch.setattr(StateManager, 'save_state', mock_save_state)
-        
+
         # 워크플로우 실행
         results = self.workflow.run()
-        
+
         # 결과 검증
         assert len(results) == 1
         result = results[0]
@@ -61,31 +86,31 @@ class TestScanWorkflow:
         assert result["services"] == {22: "SSH"}
         assert result["os"] == "Linux"
         assert result["checks"] == {"smbv1": False}
-    
+
     def test_resume_workflow(self, monkeypatch):
         """재개된 스캔 워크플로우 테스트."""
         # 모의(mock) 메서드 설정
-        def mock_should_resume():
+        def mock_should_resume(state):
             return True
-        
-        def mock_get_pending_ips():
+
+        def mock_get_pending_ips(state):
             return ["192.168.1.10"]
-        
+
         def mock_port_scan(ip, top_ports):
             return [22]
-        
+
         def mock_service_detect(ip, ports):
             return {22: "SSH"}
-        
+
         def mock_fingerprint(ip):
             return "Linux"
-        
-        def mock_checks(ip):
+
+        def mock_checks(ip, open_ports=None, services=None):
             return {"smbv1": False}
-        
+
         def mock_save_state(state):
             pass
-        
+
         # 메서드 패치
         monkeypatch.setattr(ResumeManager, 'should_resume', mock_should_resume)
         monkeypatch.setattr(ResumeManager, 'get_pending_ips', mock_get_pending_ips)
@@ -94,10 +119,10 @@ class TestScanWorkflow:
         monkeypatch.setattr(OSFingerprint, 'fingerprint', mock_fingerprint)
         monkeypatch.setattr(DetailedChecks, 'run', mock_checks)
         monkeypatch.setattr(StateManager, 'save_state', mock_save_state)
-        
+
         # 워크플로우 실행
         results = self.workflow.run()
-        
+
         # 결과 검증
         assert len(results) == 1
         result = results[0]
@@ -105,4 +130,1392 @@ class TestScanWorkflow:
         assert result["open_ports"] == [22]
         assert result["services"] == {22: "SSH"}
         assert result["os"] == "Linux"
-        assert result["checks"] == {"smbv1": False} 
\ No newline at end of file
+        assert result["checks"] == {"smbv1": False} 
+
+    def test_concurrent_matches_sequential(self, monkeypatch):
+        """병렬 모드 결과가 순차 모드와 동일한지(순서 포함) 테스트."""
+        import time
+
+        targets = [f"192.168.1.{i}" for i in range(1, 9)]
+
+        def mock_port_scan(ip, top_ports):
+            # 뒤쪽 호스트가 먼저 끝나도록 지연을 준다
+            time.sleep(0.01 * (9 - int(ip.rsplit(".", 1)[1])))
+            return [] if ip.endswith(".3") else [22, 80]
+
+        saved_states = []
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: targets),
+        )
+        monkeypatch.setattr(PortScanner, "scan", mock_port_scan)
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {p: f"svc-{ip}" for p in ports},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(
+            DetailedChecks,
+            "run",
+            lambda ip, open_ports=None, services=None: {"smbv1": False},
+        )
+        monkeypatch.setattr(StateManager, "save_state", saved_states.append)
+
+        sequential = ScanWorkflow("192.168.1.0/24", workers=1).run()
+        concurrent = ScanWorkflow("192.168.1.0/24", workers=4).run()
+
+        assert concurrent == sequential
+        assert [r["ip"] for r in concurrent] == [
+            ip for ip in targets if not ip.endswith(".3")
+        ]
+        assert saved_states[0] == saved_states[1]
+
+    @pytest.mark.parametrize("with_store", [False, True])
+    def test_concurrent_output_in_target_order(self, monkeypatch, with_store):
+        """병렬 모드에서 늦게 시작한 호스트가 먼저 끝나도 리포트·저장소·출력기의
+        행 순서가 대상 순서와 같은지 테스트."""
+        targets = [f"192.168.1.{i}" for i in range(1, 9)]
+
+        class RecordingExporter(ResultExporter):
+            def __init__(self):
+                self.rows = []
+
+            def write_host(self, result):
+                self.rows.append(result["ip"])
+
+            def close(self):
+                pass
+
+        def mock_port_scan(ip, top_ports):
+            # 뒤쪽 호스트가 먼저 끝나도록 지연을 준다
+            time.sleep(0.01 * (9 - int(ip.rsplit(".", 1)[1])))
+            return [] if ip.endswith(".3") else [22]
+
+        finished = []
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: iter(targets)),
+        )
+        monkeypatch.setattr(PortScanner, "scan", mock_port_scan)
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {22: "SSH"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+
+        def mock_checks(ip, open_ports=None, services=None):
+            finished.append(ip)
+            return {"smbv1": False}
+
+        monkeypatch.setattr(DetailedChecks, "run", mock_checks)
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+        store = ResultStore(":memory:") if with_store else None
+        exporter = RecordingExporter()
+
+        workflow = ScanWorkflow(
+            "192.168.1.0/24", workers=4, store=store, exporters=[exporter]
+        )
+        workflow.run()
+
+        expected = [ip for ip in targets if not ip.endswith(".3")]
+        assert finished != expected  # 완료 순서는 대상 순서와 다르다
+        assert exporter.rows == expected
+        wb = load_workbook(ScanWorkflow.REPORT_PATH)
+        hosts = wb["Hosts"].iter_rows(min_row=2, values_only=True)
+        assert [row[0] for row in hosts] == expected
+        if store is not None:
+            stored = store.results(workflow.scan_id)
+            assert [r["ip"] for r in stored] == expected
+            matrix = store.port_matrix(workflow.scan_id)
+            assert matrix.hosts == expected
+
+    def test_results_record_discovery_technique(self, monkeypatch):
+        """탐색 기법이 결과, 저장소, Excel Hosts 시트에 남는지 테스트."""
+        found = [
+            AliveHost(ip="192.168.1.10", technique="arp"),
+            AliveHost(ip="192.168.1.11", technique="tcp-syn"),
+        ]
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            lambda cidr: iter(found),
+        )
+        monkeypatch.setattr(PortScanner, "scan", lambda ip, top_ports: [22])
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {22: "SSH"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(
+            DetailedChecks,
+            "run",
+            lambda ip, open_ports=None, services=None: {"smbv1": False},
+        )
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+        store = ResultStore(":memory:")
+
+        workflow = ScanWorkflow("192.168.1.0/24", store=store)
+        results = workflow.run()
+
+        expected = ["arp", "tcp-syn"]
+        assert [r["technique"] for r in results] == expected
+        stored = store.results(workflow.scan_id)
+        assert [r["technique"] for r in stored] == expected
+        sheet = load_workbook(ScanWorkflow.REPORT_PATH)["Hosts"]
+        column = [cell.value for cell in sheet[1]].index("Discovery")
+        rows = sheet.iter_rows(min_row=2, values_only=True)
+        assert [row[column] for row in rows] == expected
+
+    def test_discovered_mac_keys_probe_cache(self, monkeypatch):
+        """탐색에서 본 MAC이 프로브 캐시 키에 들어가는지 테스트."""
+        mac = "aa:bb:cc:dd:ee:ff"
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            lambda cidr: iter([AliveHost("192.168.1.10", "arp", mac)]),
+        )
+        monkeypatch.setattr(PortScanner, "scan", lambda ip, top_ports: [])
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        with ProbeCache(":memory:") as cache:
+            ScanWorkflow("192.168.1.0/24", probe_cache=cache).run()
+            cache.put("os", "192.168.1.10", "Linux")
+
+            other = "00:11:22:33:44:55"
+            assert cache.get("os", "192.168.1.10", mac=mac) == "Linux"
+            assert cache.get("os", "192.168.1.10", mac=other) is MISS
+
+    def test_invalid_workers_raises(self):
+        """workers가 1 미만이면 ValueError 발생 테스트."""
+        with pytest.raises(ValueError):
+            ScanWorkflow("192.168.1.0/24", workers=0)
+
+    def test_batched_port_scan(self, monkeypatch):
+        """port_chunk_size > 1 이면 scan_many 결과로 호스트별 스캔을 이어가는지 테스트."""
+        calls = []
+
+        def mock_scan_many(ips, top_ports, chunk_size):
+            calls.append((list(ips), chunk_size))
+            return {"192.168.1.10": [22], "192.168.1.11": []}
+
+        def fail_scan(ip, top_ports):
+            raise AssertionError("per-host scan must not run in batch mode")
+
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: iter(["192.168.1.10", "192.168.1.11"])),
+        )
+        monkeypatch.setattr(PortScanner, "scan_many", mock_scan_many)
+        monkeypatch.setattr(PortScanner, "scan", fail_scan)
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {22: "SSH"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(
+            DetailedChecks,
+            "run",
+            lambda ip, open_ports=None, services=None: {"smbv1": False},
+        )
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        results = ScanWorkflow("192.168.1.0/24", port_chunk_size=32).run()
+
+        assert calls == [(["192.168.1.10", "192.168.1.11"], 32)]
+        assert [r["ip"] for r in results] == ["192.168.1.10"]
+        assert results[0]["open_ports"] == [22]
+
+    @pytest.mark.parametrize(
+        "port_chunk_size, stage_workers",
+        [(1, None), (8, None), (1, {"ports": 2})],
+    )
+    def test_combined_mode_skips_separate_stages(
+        self, monkeypatch, port_chunk_size, stage_workers
+    ):
+        """단일 패스 모드에서 서비스/OS 단계가 별도로 실행되지 않는지 테스트."""
+        combined = {
+            "192.168.1.10": {
+                "open_ports": [22],
+                "services": {22: "SSH"},
+                "os": "Linux",
+            },
+            "192.168.1.11": {"open_ports": [], "services": {}, "os": None},
+        }
+
+        def fail(*args):
+            raise AssertionError("separate scan must not run in combined mode")
+
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery, "discover", discovered(lambda cidr: iter(combined))
+        )
+        monkeypatch.setattr(
+            CombinedScanner, "scan", lambda ip, top_ports: dict(combined[ip])
+        )
+
+        def scan_many(ips, top_ports, chunk_size):
+            return {ip: dict(combined[ip]) for ip in ips}
+
+        monkeypatch.setattr(CombinedScanner, "scan_many", scan_many)
+        monkeypatch.setattr(PortScanner, "scan", fail)
+        monkeypatch.setattr(ServiceDetector, "detect", fail)
+        monkeypatch.setattr(OSFingerprint, "fingerprint", fail)
+        monkeypatch.setattr(
+            DetailedChecks,
+            "run",
+            lambda ip, open_ports=None, services=None: {"smbv1": False},
+        )
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        results = ScanWorkflow(
+            "192.168.1.0/24",
+            port_chunk_size=port_chunk_size,
+            stage_workers=stage_workers,
+            combined=True,
+        ).run()
+
+        assert results == [
+            {
+                "ip": "192.168.1.10",
+                "open_ports": [22],
+                "services": {22: "SSH"},
+                "os": "Linux",
+                "checks": {"smbv1": False},
+                "technique": "icmp",
+            }
+        ]
+        assert list(results[0]) == [
+            "ip",
+            "open_ports",
+            "services",
+            "os",
+            "checks",
+            "technique",
+        ]
+
+    def test_checkpoint_journal_per_host_stage(self, monkeypatch):
+        """호스트·단계가 끝날 때마다 저널에 기록되어 중단 시점의 pending이 정확한지 테스트."""
+
+        def mock_checks(ip, open_ports=None, services=None):
+            if ip == "192.168.1.12":
+                raise RuntimeError("crash")
+            return {"smbv1": False}
+
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(
+                lambda cidr: iter(
+                    ["192.168.1.10", "192.168.1.11", "192.168.1.12"],
+                )
+            ),
+        )
+        monkeypatch.setattr(
+            PortScanner,
+            "scan",
+            lambda ip, top_ports: [] if ip.endswith(".11") else [22],
+        )
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {22: "SSH"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(DetailedChecks, "run", mock_checks)
+
+        with pytest.raises(RuntimeError):
+            ScanWorkflow("192.168.1.0/24").run()
+
+        state = StateManager.load_state()
+        assert state["pending_ips"] == ["192.168.1.12"]
+        assert state["hosts"]["192.168.1.10"]["checks"] == {"smbv1": False}
+        assert state["hosts"]["192.168.1.11"] == {
+            "technique": "icmp",
+            "ports": [],
+        }
+        assert state["hosts"]["192.168.1.12"] == {
+            "technique": "icmp",
+            "ports": [22],
+            "services": {"22": "SSH"},
+            "os": "Linux",
+        }
+
+    @pytest.mark.parametrize(
+        "options", [{}, {"port_chunk_size": 8}, {"stage_workers": {}}]
+    )
+    def test_resume_continues_at_first_incomplete_stage(
+        self,
+        monkeypatch,
+        options,
+    ):
+        """중단된 호스트는 남은 단계만 실행하고, 완료된 호스트 결과는 합쳐지는지 테스트."""
+        targets = ["192.168.1.10", "192.168.1.11", "192.168.1.12"]
+        calls = []
+
+        def mock_port_scan(ip, top_ports):
+            calls.append(("ports", ip))
+            return [22]
+
+        def mock_port_scan_many(ips, top_ports, chunk_size):
+            return {ip: mock_port_scan(ip, top_ports) for ip in ips}
+
+        def mock_fingerprint(ip):
+            calls.append(("os", ip))
+            if ip == "192.168.1.12":
+                raise RuntimeError("crash")
+            return "Linux"
+
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: iter(targets)),
+        )
+        monkeypatch.setattr(PortScanner, "scan", mock_port_scan)
+        monkeypatch.setattr(PortScanner, "scan_many", mock_port_scan_many)
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {22: "SSH"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", mock_fingerprint)
+        monkeypatch.setattr(
+            DetailedChecks,
+            "run",
+            lambda ip, open_ports=None, services=None: {"smbv1": False},
+        )
+
+        # 1차 실행: .10, .11 완료 후 .12가 OS 단계에서 중단 (순차 실행)
+        with pytest.raises(RuntimeError):
+            ScanWorkflow("192.168.1.0/24").run()
+        assert ResumeManager.should_resume(ResumeManager.load())
+
+        calls.clear()
+        monkeypatch.setattr(
+            OSFingerprint,
+            "fingerprint",
+            lambda ip: calls.append(("os", ip)) or "Linux",
+        )
+        monkeypatch.setattr(
+            DetailedChecks,
+            "run",
+            lambda ip, open_ports=None, services=None: calls.append(
+                ("checks", ip),
+            )
+            or {"smbv1": False},
+        )
+
+        results = ScanWorkflow("192.168.1.0/24", **options).run()
+
+        assert calls == [("os", "192.168.1.12"), ("checks", "192.168.1.12")]
+        assert [r["ip"] for r in results] == targets
+        assert all(
+            r["services"] == {22: "SSH"} and r["checks"] == {"smbv1": False}
+            for r in results
+        )
+        assert not ResumeManager.should_resume(ResumeManager.load())
+
+    def test_resume_after_crash_mid_discovery(self, monkeypatch):
+        """탐색 도중 중단되면 재개 시 탐색을 다시 돌려 나머지 호스트까지 스캔하는지 테스트."""
+        found = ["192.168.1.10", "192.168.1.11"]
+        scanned = []
+
+        def interrupted_discovery(cidr):
+            yield from found
+            raise RuntimeError("crash")
+
+        def mock_port_scan(ip, top_ports):
+            scanned.append(ip)
+            return [22]
+
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(interrupted_discovery),
+        )
+        monkeypatch.setattr(PortScanner, "scan", mock_port_scan)
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {22: "SSH"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(
+            DetailedChecks,
+            "run",
+            lambda ip, open_ports=None, services=None: {"smbv1": False},
+        )
+
+        with pytest.raises(RuntimeError):
+            ScanWorkflow("192.168.1.0/24").run()
+        state = StateManager.load_state()
+        assert state["pending_ips"] == []
+        assert state["discovery_complete"] is False
+
+        loads = []
+        load_state = StateManager.load_state
+        monkeypatch.setattr(
+            StateManager,
+            "load_state",
+            lambda path=None: loads.append(path) or load_state(path),
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(
+                lambda cidr: iter(found + ["192.168.1.12", "192.168.1.13"]),
+            ),
+        )
+        scanned.clear()
+
+        results = ScanWorkflow("192.168.1.0/24").run()
+
+        assert scanned == ["192.168.1.12", "192.168.1.13"]
+        assert [r["ip"] for r in results] == found + [
+            "192.168.1.12",
+            "192.168.1.13",
+        ]
+        assert len(loads) == 1  # 재개 상태는 한 번만 읽는다
+        assert not ResumeManager.should_resume(ResumeManager.load())
+
+    def test_results_written_to_store(self, monkeypatch):
+        """호스트가 끝날 때마다 저장소에 기록되고 리포트가 저장소에서 생성되는지 테스트."""
+        store = ResultStore(":memory:")
+        written = []
+
+        def mock_checks(ip, open_ports=None, services=None):
+            # 다음 호스트 점검 시점에는 이전 호스트가 이미 저장되어 있어야 한다
+            written.append(store.hosts_with_port(22))
+            return {"smbv1": False}
+
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: iter(["192.168.1.10", "192.168.1.11"])),
+        )
+        monkeypatch.setattr(PortScanner, "scan", lambda ip, top_ports: [22])
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {22: "SSH"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(DetailedChecks, "run", mock_checks)
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+        reports = []
+        monkeypatch.setattr(
+            ExcelWriter,
+            "write_host",
+            lambda self, row: reports.append(
+                (row["ip"], store.results(workflow.scan_id))
+            ),
+        )
+
+        workflow = ScanWorkflow("192.168.1.0/24", store=store)
+        results = workflow.run()
+
+        assert written == [[], ["192.168.1.10"]]
+        assert store.results(workflow.scan_id) == results
+        # 리포트는 스캔이 끝난 뒤 저장소에 기록된 결과로 만든다
+        assert [ip for ip, _ in reports] == ["192.168.1.10", "192.168.1.11"]
+        assert [len(stored) for _, stored in reports] == [2, 2]
+        assert store.latest_scan_id("192.168.1.0/24") == workflow.scan_id
+
+    def test_report_lists_port_changes_since_previous_scan(self, monkeypatch):
+        """같은 대역의 이전 스캔이 저장소에 있으면 Summary 시트에 열린 포트 변화가
+        나오는지 테스트."""
+        store = ResultStore(":memory:")
+        old = store.start_scan("192.168.1.0/24")
+        store.add_host(
+            old,
+            {
+                "ip": "192.168.1.10",
+                "open_ports": [22, 445],
+                "services": {},
+                "os": None,
+                "checks": {},
+            },
+        )
+        store.finish_scan(old)
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: iter(["192.168.1.10", "192.168.1.11"])),
+        )
+        monkeypatch.setattr(PortScanner, "scan", lambda ip, top_ports: [22])
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {22: "SSH"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(
+            DetailedChecks,
+            "run",
+            lambda ip, open_ports=None, services=None: {"smbv1": False},
+        )
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        ScanWorkflow("192.168.1.0/24", store=store).run()
+
+        sheet = load_workbook(ScanWorkflow.REPORT_PATH)["Summary"]
+        summary = [list(row) for row in sheet.values]
+        start = summary.index(["Port changes", None, None, None]) + 1
+        assert summary[start:][:3] == [
+            ["IP", "Host", "Opened", "Closed"],
+            ["192.168.1.11", "New", "22", None],
+            ["192.168.1.10", None, None, "445"],
+        ]
+
+    def test_report_keeps_completed_hosts_on_failure(self, monkeypatch):
+        """리포트 행이 호스트마다 덧붙어, 스캔이 중간에 실패해도 끝난 호스트는 저장되는지 테스트."""
+
+        def mock_port_scan(ip, top_ports):
+            if ip == "192.168.1.12":
+                raise RuntimeError("nmap crashed")
+            return [22]
+
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(
+                lambda cidr: iter(
+                    ["192.168.1.10", "192.168.1.11", "192.168.1.12"],
+                )
+            ),
+        )
+        monkeypatch.setattr(PortScanner, "scan", mock_port_scan)
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {22: "SSH"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(
+            DetailedChecks,
+            "run",
+            lambda ip, open_ports=None, services=None: {"smbv1": False},
+        )
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        with pytest.raises(RuntimeError):
+            ScanWorkflow("192.168.1.0/24").run()
+
+        wb = load_workbook(ScanWorkflow.REPORT_PATH)
+        assert [
+            row[0]
+            for row in wb["Hosts"].iter_rows(
+                min_row=2,
+                values_only=True,
+            )
+        ] == ["192.168.1.10", "192.168.1.11"]
+        assert wb["Ports"].max_row == 3
+
+    def test_exporters_receive_hosts_as_they_finish(self, monkeypatch):
+        """등록한 출력기마다 호스트가 끝나는 즉시 결과가 전달되고 실행 후 닫히는지 테스트."""
+
+        class RecordingExporter(ResultExporter):
+            def __init__(self):
+                self.rows, self.closed = [], False
+
+            def write_host(self, result):
+                self.rows.append(result["ip"])
+
+            def close(self):
+                self.closed = True
+
+        exporters = [RecordingExporter(), RecordingExporter()]
+        seen_before_checks = []
+
+        def mock_checks(ip, open_ports=None, services=None):
+            seen_before_checks.append(list(exporters[0].rows))
+            return {"smbv1": False}
+
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: iter(["192.168.1.10", "192.168.1.11"])),
+        )
+        monkeypatch.setattr(PortScanner, "scan", lambda ip, top_ports: [22])
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {22: "SSH"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(DetailedChecks, "run", mock_checks)
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        ScanWorkflow("192.168.1.0/24", exporters=exporters).run()
+
+        assert seen_before_checks == [[], ["192.168.1.10"]]
+        for exporter in exporters:
+            assert exporter.rows == ["192.168.1.10", "192.168.1.11"]
+            assert exporter.closed
+
+    def test_exporters_closed_when_report_save_fails(
+        self,
+        monkeypatch,
+        tmp_path,
+    ):
+        """Excel 리포트 저장이 실패해도 등록한 출력기는 모두 닫히는지 테스트."""
+
+        class ClosingExporter(ResultExporter):
+            closed = False
+
+            def write_host(self, result):
+                pass
+
+            def close(self):
+                self.closed = True
+
+        exporters = [ClosingExporter(), ClosingExporter()]
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: ["192.168.1.10"]),
+        )
+        monkeypatch.setattr(PortScanner, "scan", lambda ip, top_ports: [22])
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {22: "SSH"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(
+            DetailedChecks,
+            "run",
+            lambda ip, open_ports=None, services=None: {"smbv1": False},
+        )
+        monkeypatch.setattr(
+            ScanWorkflow, "REPORT_PATH", tmp_path / "missing" / "report.xlsx"
+        )
+
+        with pytest.raises(OutputError):
+            ScanWorkflow("192.168.1.0/24", exporters=exporters).run()
+
+        assert all(exporter.closed for exporter in exporters)
+
+    def test_invalid_targets_skipped_once(self, monkeypatch):
+        """IP 주소가 아닌 대상은 워크플로우 입구에서 한 번 걸러지고 스캔되지 않는지 테스트."""
+        scanned = []
+
+        def mock_port_scan(ip, top_ports):
+            scanned.append(ip)
+            return [22]
+
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(
+                lambda cidr: iter(
+                    ["192.168.1.10", "bogus-host", "192.168.1.11"],
+                ),
+            ),
+        )
+        monkeypatch.setattr(PortScanner, "scan", mock_port_scan)
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {22: "SSH"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(
+            DetailedChecks,
+            "run",
+            lambda ip, open_ports=None, services=None: {"smbv1": False},
+        )
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        results = self.workflow.run()
+
+        assert scanned == ["192.168.1.10", "192.168.1.11"]
+        assert [r["ip"] for r in results] == scanned
+        assert results[0] == {
+            "ip": "192.168.1.10",
+            "open_ports": [22],
+            "services": {22: "SSH"},
+            "os": "Linux",
+            "checks": {"smbv1": False},
+            "technique": "icmp",
+        }
+
+    @pytest.mark.parametrize("check_chunk_size", [1, 8])
+    def test_incremental_rescans_only_changed_hosts(
+        self, monkeypatch, check_chunk_size
+    ):
+        """포트 구성이 같은 호스트는 이전 결과를 이어받고, 바뀐/새 호스트만 상세 스캔하는지 테스트."""
+        store = ResultStore(":memory:")
+        old = store.start_scan("192.168.1.0/24")
+        for ip, ports, when in [
+            ("192.168.1.10", [22], "2099-01-01T00:00:00+00:00"),
+            ("192.168.1.11", [22], "2099-01-01T00:00:00+00:00"),
+            ("192.168.1.12", [22], "2000-01-01T00:00:00+00:00"),
+        ]:
+            store.add_host(
+                old,
+                {
+                    "ip": ip,
+                    "open_ports": ports,
+                    "services": {22: "old"},
+                    "os": "old",
+                    "checks": {"smbv1": True},
+                },
+                when,
+            )
+        store.finish_scan(old)
+
+        ports = {
+            "192.168.1.10": [22],
+            "192.168.1.11": [22, 80],
+            "192.168.1.12": [22],
+            "192.168.1.13": [22],
+        }
+        deep = []
+
+        def mock_checks_many(hosts, chunk_size):
+            deep.extend(("checks", ip) for ip in hosts)
+            return {ip: {"smbv1": False} for ip in hosts}
+
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: iter(ports)),
+        )
+        monkeypatch.setattr(
+            PortScanner,
+            "scan",
+            lambda ip, top_ports: ports[ip],
+        )
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, p: deep.append(("services", ip)) or {22: "new"},
+        )
+        monkeypatch.setattr(
+            OSFingerprint,
+            "fingerprint",
+            lambda ip: deep.append(("os", ip)) or "new",
+        )
+
+        def run_checks(ip, open_ports=None, services=None):
+            return mock_checks_many([ip], 1)[ip]
+
+        monkeypatch.setattr(DetailedChecks, "run", run_checks)
+        monkeypatch.setattr(DetailedChecks, "run_many", mock_checks_many)
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        results = ScanWorkflow(
+            "192.168.1.0/24",
+            store=store,
+            incremental=True,
+            check_chunk_size=check_chunk_size,
+        ).run()
+
+        # .10 변경 없음 → 이어받음, .11 포트 변경, .12 오래됨, .13 신규 → 상세 스캔
+        assert {ip for _, ip in deep} == {
+            "192.168.1.11",
+            "192.168.1.12",
+            "192.168.1.13",
+        }
+        assert results[0] == {
+            "ip": "192.168.1.10",
+            "open_ports": [22],
+            "services": {22: "old"},
+            "os": "old",
+            "checks": {"smbv1": True},
+            "technique": "icmp",
+        }
+        assert all(r["os"] == "new" for r in results[1:])
+        # 이어받은 결과는 원래 상세 스캔 시각을 유지
+        assert (
+            store.latest_hosts("192.168.1.0/24")["192.168.1.10"][1]
+            == "2099-01-01T00:00:00+00:00"
+        )
+
+    def test_incremental_requires_store(self):
+        """저장소 없이 증분 모드를 쓰면 ValueError 발생 테스트."""
+        with pytest.raises(ValueError):
+            ScanWorkflow("192.168.1.0/24", incremental=True)
+
+    def test_pipeline_matches_sequential(self, monkeypatch):
+        """단계 파이프라인 모드 결과가 순차 모드와 동일한지 테스트."""
+        targets = [f"192.168.1.{i}" for i in range(1, 7)]
+
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: iter(targets)),
+        )
+        monkeypatch.setattr(
+            PortScanner,
+            "scan",
+            lambda ip, top_ports: [] if ip.endswith(".2") else [22],
+        )
+        monkeypatch.setattr(
+            ServiceDetector, "detect", lambda ip, ports: {22: f"SSH {ip}"}
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(
+            DetailedChecks,
+            "run",
+            lambda ip, open_ports=None, services=None: {"smbv1": False},
+        )
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        sequential = ScanWorkflow("192.168.1.0/24").run()
+        workflow = ScanWorkflow(
+            "192.168.1.0/24",
+            stage_workers={"ports": 3, "os": 2},
+        )
+        pipelined = workflow.run()
+
+        assert pipelined == sequential
+        stats = {s.name: s for s in workflow.stage_stats()}
+        assert list(stats) == ["ports", "services", "os", "checks"]
+        assert stats["ports"].workers == 3
+        assert stats["ports"].processed == 6
+        assert stats["ports"].dropped == 1
+        assert stats["checks"].processed == 5
+
+    def test_unknown_stage_raises(self):
+        """알 수 없는 단계 이름이면 ValueError 발생 테스트."""
+        with pytest.raises(ValueError):
+            ScanWorkflow("192.168.1.0/24", stage_workers={"bogus": 1})
+
+    def test_checks_receive_port_service_map(self, monkeypatch):
+        """상세 점검에 열린 포트/서비스 정보가 전달되는지 테스트."""
+        received = {}
+
+        def mock_checks(ip, open_ports=None, services=None):
+            received.update(ip=ip, open_ports=open_ports, services=services)
+            return {"smbv1": False}
+
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: ["192.168.1.10"]),
+        )
+        monkeypatch.setattr(
+            PortScanner,
+            "scan",
+            lambda ip, top_ports: [22, 8443],
+        )
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {22: "SSH", 8443: "nginx"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(DetailedChecks, "run", mock_checks)
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        self.workflow.run()
+
+        assert received == {
+            "ip": "192.168.1.10",
+            "open_ports": [22, 8443],
+            "services": {22: "SSH", 8443: "nginx"},
+        }
+
+    def test_batched_checks(self, monkeypatch):
+        """check_chunk_size > 1 이면 호스트별 점검 대신 run_many로 일괄 점검하는지 테스트."""
+        batches = []
+
+        def mock_run_many(hosts, chunk_size):
+            batches.append((dict(hosts), chunk_size))
+            return {ip: {"smbv1": ip.endswith(".10")} for ip in hosts}
+
+        def fail_run(ip, open_ports=None, services=None):
+            raise AssertionError("per-host checks must not run in batch mode")
+
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: ["192.168.1.10", "192.168.1.11"]),
+        )
+        monkeypatch.setattr(PortScanner, "scan", lambda ip, top_ports: [445])
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {445: "Samba"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(DetailedChecks, "run", fail_run)
+        monkeypatch.setattr(DetailedChecks, "run_many", mock_run_many)
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        results = ScanWorkflow(
+            "192.168.1.0/24", check_chunk_size=16, stage_workers={"ports": 2}
+        ).run()
+
+        assert batches == [
+            (
+                {
+                    "192.168.1.10": ([445], {445: "Samba"}),
+                    "192.168.1.11": ([445], {445: "Samba"}),
+                },
+                16,
+            )
+        ]
+        assert [r["checks"] for r in results] == [
+            {"smbv1": True},
+            {"smbv1": False},
+        ]
+        assert list(results[0]) == [
+            "ip",
+            "open_ports",
+            "services",
+            "os",
+            "checks",
+            "technique",
+        ]
+
+    def test_batched_checks_timeout_marks_partial(self, monkeypatch):
+        """일괄 점검이 시간 초과되면 부분 결과를 쓰고 해당 호스트만 partial로 표시하는지 테스트."""
+
+        def mock_run_many(hosts, chunk_size):
+            raise ScanTimeout(
+                "timed out",
+                hosts=["192.168.1.11"],
+                partial={ip: {"smbv1": False} for ip in hosts},
+            )
+
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: ["192.168.1.10", "192.168.1.11"]),
+        )
+        monkeypatch.setattr(PortScanner, "scan", lambda ip, top_ports: [445])
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {445: "Samba"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(DetailedChecks, "run_many", mock_run_many)
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        results = ScanWorkflow("192.168.1.0/24", check_chunk_size=16).run()
+
+        assert [r["checks"] for r in results] == [
+            {"smbv1": False},
+            {"smbv1": False},
+        ]
+        assert "partial" not in results[0]
+        assert results[1]["partial"] == ["checks"]
+
+    def test_port_timeout_keeps_partial_result(self, monkeypatch):
+        """포트 스캔 시간 초과 시 부분 결과로 계속 진행하고 partial로 표시하는지 테스트."""
+
+        def mock_port_scan(ip, top_ports):
+            raise ScanTimeout("timed out", partial=[22])
+
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: ["192.168.1.10"]),
+        )
+        monkeypatch.setattr(PortScanner, "scan", mock_port_scan)
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {22: "SSH"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(
+            DetailedChecks,
+            "run",
+            lambda ip, open_ports=None, services=None: {"smbv1": False},
+        )
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        results = self.workflow.run()
+
+        assert results[0]["open_ports"] == [22]
+        assert results[0]["services"] == {22: "SSH"}
+        assert results[0]["partial"] == ["ports"]
+
+    def test_host_budget_skips_remaining_stages(self, monkeypatch):
+        """호스트 예산을 다 쓰면 남은 단계를 건너뛰고 기본값으로 채우는지 테스트."""
+
+        def slow_detect(ip, ports):
+            time.sleep(0.1)
+            return {22: "SSH"}
+
+        def fail(*args, **kwargs):
+            raise AssertionError(
+                "stage must be skipped after the host deadline",
+            )
+
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: ["192.168.1.10"]),
+        )
+        monkeypatch.setattr(PortScanner, "scan", lambda ip, top_ports: [22])
+        monkeypatch.setattr(ServiceDetector, "detect", slow_detect)
+        monkeypatch.setattr(OSFingerprint, "fingerprint", fail)
+        monkeypatch.setattr(DetailedChecks, "run", fail)
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        results = ScanWorkflow("192.168.1.0/24", host_timeout=0.05).run()
+
+        assert results[0]["services"] == {22: "SSH"}
+        assert results[0]["os"] is None and results[0]["checks"] == {}
+        assert results[0]["partial"] == ["os", "checks"]
+
+    def test_invalid_host_timeout_raises(self):
+        """host_timeout이 0 이하이면 ValueError 발생 테스트."""
+        with pytest.raises(ValueError):
+            ScanWorkflow("192.168.1.0/24", host_timeout=0)
+
+    def test_breaker_skips_remaining_stages_for_timed_out_host(
+        self,
+        monkeypatch,
+    ):
+        """서비스/OS 단계가 모두 시간 초과된 호스트는 점검을 건너뛰고 결과에 표시하는지 테스트."""
+        checked = []
+
+        def mock_service_detect(ip, ports):
+            if ip.endswith(".10"):
+                raise ScanTimeout("timeout", partial={}, hosts=[ip])
+            return {22: "SSH"}
+
+        def mock_fingerprint(ip):
+            if ip.endswith(".10"):
+                raise ScanTimeout("timeout", partial=None, hosts=[ip])
+            return "Linux"
+
+        def mock_checks(ip, open_ports=None, services=None):
+            checked.append(ip)
+            return {"smbv1": False}
+
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: ["192.168.1.10", "192.168.1.11"]),
+        )
+        monkeypatch.setattr(PortScanner, "scan", lambda ip, top_ports: [22])
+        monkeypatch.setattr(ServiceDetector, "detect", mock_service_detect)
+        monkeypatch.setattr(OSFingerprint, "fingerprint", mock_fingerprint)
+        monkeypatch.setattr(DetailedChecks, "run", mock_checks)
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        store = ResultStore(":memory:")
+        workflow = ScanWorkflow("192.168.1.0/24", store=store)
+        results = workflow.run()
+
+        assert checked == ["192.168.1.11"]
+        assert results[0]["checks"] == {}
+        assert results[0]["skipped"]["stages"] == ["checks"]
+        assert "host unresponsive" in results[0]["skipped"]["reason"]
+        assert "skipped" not in results[1]
+        assert store.results(workflow.scan_id) == results
+
+    def test_unidentified_host_still_checked(self, monkeypatch):
+        """열린 포트는 있지만 서비스/OS를 식별하지 못한 호스트도 점검 단계까지 가는지 테스트."""
+        checked = []
+
+        def mock_checks(ip, open_ports=None, services=None):
+            checked.append(ip)
+            return {"smbv1": False}
+
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: ["192.168.1.10", "192.168.1.11"]),
+        )
+        monkeypatch.setattr(
+            PortScanner,
+            "scan",
+            lambda ip, top_ports: OpenPorts([445]),
+        )
+        monkeypatch.setattr(ServiceDetector, "detect", lambda ip, ports: {})
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: None)
+        monkeypatch.setattr(DetailedChecks, "run", mock_checks)
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        workflow = ScanWorkflow(
+            "192.168.1.0/24", breaker_threshold=1, subnet_breaker_threshold=1
+        )
+        results = workflow.run()
+
+        assert checked == ["192.168.1.10", "192.168.1.11"]
+        assert all("skipped" not in r for r in results)
+        assert all(r["checks"] == {"smbv1": False} for r in results)
+        assert workflow.breaker.open_scopes() == {}
+
+    @pytest.mark.parametrize("stage_workers", [None, {"ports": 1}])
+    def test_subnet_breaker_skips_rest_of_subnet(
+        self,
+        monkeypatch,
+        stage_workers,
+    ):
+        """한 /24에서 연속으로 시간 초과되면 남은 호스트를 스캔하지 않고 표시하고,
+        모든 포트가 필터링된 호스트는 서브넷 차단에 세지 않는지 테스트."""
+        scanned = []
+
+        def mock_port_scan(ip, top_ports):
+            scanned.append(ip)
+            if ip.startswith("10.0.0."):
+                raise ScanTimeout("nmap timed out")
+            if ip.startswith("10.0.1.") and ip != "10.0.1.9":
+                return OpenPorts(answered=False)
+            return [22]
+
+        targets = [
+            "10.0.0.1",
+            "10.0.0.2",
+            "10.0.0.3",
+            "10.0.1.1",
+            "10.0.1.2",
+            "10.0.1.3",
+            "10.0.1.9",
+        ]
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: iter(targets)),
+        )
+        monkeypatch.setattr(PortScanner, "scan", mock_port_scan)
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {22: "SSH"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(
+            DetailedChecks,
+            "run",
+            lambda ip, open_ports=None, services=None: {"smbv1": False},
+        )
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        workflow = ScanWorkflow(
+            "10.0.0.0/23",
+            subnet_breaker_threshold=2,
+            stage_workers=stage_workers,
+        )
+        results = workflow.run()
+
+        assert scanned == [ip for ip in targets if ip != "10.0.0.3"]
+        assert [r["ip"] for r in results] == ["10.0.0.3", "10.0.1.9"]
+        assert results[0]["skipped"]["stages"] == [
+            "ports",
+            "services",
+            "os",
+            "checks",
+        ]
+        assert results[0]["open_ports"] == [] and results[0]["os"] is None
+        assert "skipped" not in results[1]
+        assert list(workflow.breaker.open_scopes()) == ["10.0.0.0/24"]
+
+    def test_rate_governor_installed_during_run(self, monkeypatch):
+        """실행 동안만 속도 조절기가 설치되고, 탐색 후 예상 실행 수가 줄어드는지 테스트."""
+        governor = RateGovernor(max_rate=1000)
+        seen = []
+
+        def mock_port_scan(ip, top_ports):
+            seen.append(RateGovernor.active)
+            return [22]
+
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: ["192.168.1.10"]),
+        )
+        monkeypatch.setattr(PortScanner, "scan", mock_port_scan)
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {22: "SSH"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(
+            DetailedChecks,
+            "run",
+            lambda ip, open_ports=None, services=None: {"smbv1": False},
+        )
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        ScanWorkflow(
+            "192.168.1.0/24",
+            stage_workers={"ports": 2},
+            rate_governor=governor,
+        ).run()
+
+        assert seen == [governor]
+        assert RateGovernor.active is None
+        assert governor.slots == 6  # ports=2, services=2, os=1, checks=1
+
+    def test_resource_governor_gates_stages(self, monkeypatch):
+        """자원 조절기가 실행 동안 동작하고 모든 호스트 단계가 자리를 얻어 실행되는지 테스트."""
+        governor = ResourceGovernor(interval=60)
+        slots = []
+        original_slot = governor.slot
+
+        def counting_slot():
+            slots.append(governor.limit)
+            return original_slot()
+
+        monkeypatch.setattr(governor, "slot", counting_slot)
+        monkeypatch.setattr(
+            ResumeManager,
+            "should_resume",
+            lambda state: False,
+        )
+        monkeypatch.setattr(
+            HostDiscovery,
+            "discover",
+            discovered(lambda cidr: ["192.168.1.10"]),
+        )
+        monkeypatch.setattr(PortScanner, "scan", lambda ip, top_ports: [22])
+        monkeypatch.setattr(
+            ServiceDetector,
+            "detect",
+            lambda ip, ports: {22: "SSH"},
+        )
+        monkeypatch.setattr(OSFingerprint, "fingerprint", lambda ip: "Linux")
+        monkeypatch.setattr(
+            DetailedChecks,
+            "run",
+            lambda ip, open_ports=None, services=None: {"smbv1": False},
+        )
+        monkeypatch.setattr(StateManager, "save_state", lambda state: None)
+
+        workflow = ScanWorkflow(
+            "192.168.1.0/24",
+            workers=3,
+            resource_governor=governor,
+        )
+        workflow.run()
+
+        assert slots == [3, 3, 3, 3]  # ports, services, os, checks
+        assert governor.max_workers == 3
+        assert governor._thread is None
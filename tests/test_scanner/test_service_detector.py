@@ -1,47 +1,117 @@
 """서비스 탐지 테스트 모듈."""
 
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import pytest
+from src.scanner.nmap_runner import NmapResult, NmapRunner
 from src.scanner.service_detector import ServiceDetector
+from src.utils.exceptions import ScanTimeout
 
 __all__ = ['TestServiceDetector']
 
+SERVICE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<nmaprun scanner="nmap">
+<host><status state="up"/>
+<address addr="192.168.1.1" addrtype="ipv4"/>
+<ports>
+<port protocol="tcp" portid="22"><state state="open"/>
+<service name="ssh" product="OpenSSH" version="8.2"
+ method="probed" conf="10"/></port>
+</ports>
+</host>
+</nmaprun>
+"""
+
+
 class TestServiceDetector(unittest.TestCase):
     """서비스 탐지 테스트 클래스."""
-    
+
     def setUp(self):
         self.detector = ServiceDetector()
-    
+
     def test_detect_empty_ports(self):
         """빈 포트 리스트로 탐지 시 빈 딕셔너리 반환 테스트."""
         result = self.detector.detect("192.168.1.1", [])
         self.assertEqual(result, {})
-    
-    def test_invalid_ip(self):
-        """잘못된 IP 주소로 탐지 시 ValueError 발생 테스트."""
-        with pytest.raises(ValueError):
-            self.detector.detect("invalid_ip", [22])
-    
-    @patch('subprocess.run')
+
+    @patch.object(NmapRunner, "execute")
     def test_detect_single_service(self, mock_run):
         """단일 서비스 탐지 테스트."""
-        # Mock subprocess.run
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = "22/tcp open  ssh  OpenSSH 8.2\n"
+        mock_result = NmapResult(["nmap"], 0)
+        mock_result.stdout = SERVICE_XML
         mock_run.return_value = mock_result
-        
+
         # Run test
         result = self.detector.detect("192.168.1.1", [22])
-        
+
         # Verify result
         self.assertEqual(result, {22: "OpenSSH 8.2"})
-        
+
         # Verify command
         mock_run.assert_called_once()
         cmd = mock_run.call_args[0][0]
         self.assertIn("nmap", cmd)
         self.assertIn("-sV", cmd)
         self.assertIn("--version-intensity", cmd)
-        self.assertIn("192.168.1.1:22", cmd) 
\ No newline at end of file
+        self.assertIn("192.168.1.1:22", cmd)
+        self.assertIn("-oX", cmd)
+
+    @patch.object(NmapRunner, "execute")
+    def test_detect_extrainfo_and_name_fallback(self, mock_run):
+        """extrainfo 포함 및 product가 없을 때 서비스 이름 사용 테스트."""
+        mock_result = NmapResult(["nmap"], 0)
+        mock_result.stdout = SERVICE_XML.replace(
+            'version="8.2"', 'version="8.2p1" extrainfo="protocol 2.0"'
+        ).replace(
+            "</ports>",
+            """<port protocol="tcp" portid="80"><state state="open"/>
+<service name="http" method="table" conf="3"/></port>
+<port protocol="tcp" portid="81"><state state="closed"/>
+<service name="hosts2-ns" method="table" conf="3"/></port>
+</ports>""",
+        )
+        mock_run.return_value = mock_result
+
+        result = self.detector.detect("192.168.1.1", [22, 80, 81])
+
+        self.assertEqual(
+            result,
+            {22: "OpenSSH 8.2p1 (protocol 2.0)", 80: "http"},
+        )
+        self.assertEqual((result[22].name, result[22].tunnel), ("ssh", ""))
+
+    @patch.object(NmapRunner, "execute")
+    def test_detect_keeps_service_name_and_tunnel(self, mock_run):
+        """TLS 위에서 식별한 서비스는 이름과 터널로 TLS 여부를 알 수 있는지 테스트."""
+        mock_result = NmapResult(["nmap"], 0)
+        mock_result.stdout = SERVICE_XML.replace(
+            'name="ssh" product="OpenSSH"',
+            'name="http" product="nginx" tunnel="ssl"',
+        )
+        mock_run.return_value = mock_result
+
+        result = self.detector.detect("192.168.1.1", [22])
+
+        self.assertEqual(result, {22: "nginx 8.2"})
+        self.assertEqual(result[22].tunnel, "ssl")
+        self.assertTrue(result[22].tls)
+
+    @patch.object(NmapRunner, "execute")
+    def test_timeout_raises_with_partial_services(self, mock_run):
+        """시간 초과 시 그때까지 식별한 서비스를 담아 ScanTimeout을 발생시키는지 테스트."""
+        mock_run.return_value = NmapResult(
+            ["nmap"], -9, SERVICE_XML, timed_out=True, timeout=30
+        )
+
+        with pytest.raises(ScanTimeout) as ctx:
+            self.detector.detect("192.168.1.1", [22, 80])
+
+        self.assertEqual(ctx.value.partial, {22: "OpenSSH 8.2"})
+        self.assertEqual(ctx.value.hosts, ["192.168.1.1"])
+
+    @patch.object(NmapRunner, "execute")
+    def test_option_like_target_raises(self, mock_run):
+        """nmap 옵션으로 해석될 수 있는 대상으로 탐지 시 ValueError 발생 테스트."""
+        with pytest.raises(ValueError):
+            self.detector.detect("-iL/etc/passwd", [22])
+        mock_run.assert_not_called()
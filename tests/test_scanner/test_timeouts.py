@@ -0,0 +1,94 @@
+"""AdaptiveTimeout / HostBudget 테스트 모듈."""
+
+import time
+import pytest
+from src.scanner.timeouts import AdaptiveTimeout, HostBudget, current_budget
+from src.utils.exceptions import DeadlineExceeded
+
+
+@pytest.fixture(autouse=True)
+def _clean_rtts(monkeypatch):
+    monkeypatch.setattr(AdaptiveTimeout, "_rtts", {})
+
+
+class TestAdaptiveTimeout:
+    """AdaptiveTimeout 테스트 클래스."""
+
+    def test_estimate_scales_with_ports_rtt_and_template(self):
+        """포트 수, RTT, 타이밍 템플릿에 따라 추정치가 커지는지 테스트."""
+        base = AdaptiveTimeout.estimate("services", ["10.0.0.1"], ports=2)
+        longer = AdaptiveTimeout.estimate("services", ["10.0.0.1"], ports=20)
+        assert longer > base
+
+        AdaptiveTimeout.observe_rtt("10.0.0.2", 0.001)
+        fast = AdaptiveTimeout.estimate("services", ["10.0.0.2"], ports=2)
+        assert fast < base
+
+        assert AdaptiveTimeout.estimate(
+            "ports", ["10.0.0.2"], ports=10, template=1
+        ) > AdaptiveTimeout.estimate(
+            "ports",
+            ["10.0.0.2"],
+            ports=10,
+            template=4,
+        )
+
+    def test_timeout_is_clamped(self):
+        """제한 시간이 [MIN_TIMEOUT, MAX_TIMEOUT] 범위로 잘리는지 테스트."""
+        AdaptiveTimeout.observe_rtt("10.0.0.1", 0.0001)
+        assert (
+            AdaptiveTimeout.timeout("services", ["10.0.0.1"], 1)
+            == AdaptiveTimeout.MIN_TIMEOUT
+        )
+        assert (
+            AdaptiveTimeout.timeout("ports", ["10.0.0.2"], 65535, template=4)
+            == AdaptiveTimeout.MAX_TIMEOUT
+        )
+
+    def test_cap_below_estimate_warns(self, caplog):
+        """상한이 예상 시간보다 짧게 자를 때 경고를 남기는지 테스트."""
+        with caplog.at_level("WARNING", logger="src.scanner.timeouts"):
+            AdaptiveTimeout.timeout("services", ["10.0.0.1"], 100)
+        assert not caplog.records
+
+        with caplog.at_level("WARNING", logger="src.scanner.timeouts"):
+            AdaptiveTimeout.timeout("ports", ["10.0.0.1"], 65535, template=4)
+        assert "exceeds the 3600s cap" in caplog.text
+
+    def test_serial_template_is_not_capped(self):
+        """-T0/-T1은 MAX_TIMEOUT으로 자르지 않고 예상 시간을 보장하는지 테스트."""
+        estimate = AdaptiveTimeout.estimate("ports", ["10.0.0.1"], 1000, 1)
+        limit = AdaptiveTimeout.timeout("ports", ["10.0.0.1"], 1000, 1)
+
+        assert estimate > AdaptiveTimeout.MAX_TIMEOUT
+        assert limit == estimate * AdaptiveTimeout.SAFETY
+
+    def test_budget_caps_timeout(self):
+        """호스트 예산 안에서는 남은 예산을 넘지 않는지 테스트."""
+        budget = HostBudget("10.0.0.1", 40)
+        with budget.spend("ports"):
+            assert current_budget() is budget
+            ips = ["10.0.0.1"]
+            assert AdaptiveTimeout.timeout("ports", ips, 100, template=1) <= 40
+        assert current_budget() is None
+
+    def test_exhausted_budget_raises(self):
+        """예산을 다 쓴 뒤 단계를 시작하면 DeadlineExceeded와 함께 기록되는지 테스트."""
+        budget = HostBudget("10.0.0.1", 0.01)
+        with budget.spend("ports"):
+            time.sleep(0.02)
+            with pytest.raises(DeadlineExceeded):
+                AdaptiveTimeout.timeout("services", ["10.0.0.1"], 1)
+        with pytest.raises(DeadlineExceeded):
+            with budget.spend("os"):
+                pass
+        assert budget.overruns == ["services", "os"]
+
+    def test_budget_counts_only_stage_time(self):
+        """단계 사이 대기 시간은 예산에서 빠지지 않는지 테스트."""
+        budget = HostBudget("10.0.0.1", 10)
+        with budget.spend("ports"):
+            time.sleep(0.01)
+        time.sleep(0.05)
+        assert budget.spent < 0.05
+        assert budget.remaining() > 9.9
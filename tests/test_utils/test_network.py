@@ -0,0 +1,56 @@
+"""NetworkUtils 테스트 모듈."""
+
+import pytest
+from src.utils.network import NetworkUtils
+
+
+class TestNetworkUtils:
+    """NetworkUtils 테스트 클래스."""
+
+    @pytest.mark.parametrize(
+        "ip, valid",
+        [
+            ("192.168.1.10", True),
+            ("::1", True),
+            ("fe80::1", True),
+            ("192.168.1.256", False),
+            ("192.168.1.0/24", False),
+            ("example.com", False),
+            ("", False),
+        ],
+    )
+    def test_is_valid_ip(self, ip, valid):
+        """IPv4/IPv6 주소만 유효한지 테스트."""
+        assert NetworkUtils.is_valid_ip(ip) is valid
+
+    @pytest.mark.parametrize(
+        "cidr, valid",
+        [
+            ("192.168.1.0/24", True),
+            ("192.168.1.5/24", True),  # 호스트 비트 허용
+            ("10.0.0.1", True),
+            ("2001:db8::/32", True),
+            ("192.168.1.0/33", False),
+            ("not-a-network", False),
+        ],
+    )
+    def test_is_valid_cidr(self, cidr, valid):
+        """CIDR 표기법 유효성 검사 테스트."""
+        assert NetworkUtils.is_valid_cidr(cidr) is valid
+
+    @pytest.mark.parametrize(
+        "target, safe",
+        [
+            ("192.168.1.10", True),
+            ("fe80::1%eth0", True),
+            ("scanme.example", True),
+            ("-iL/etc/passwd", False),
+            ("--script=evil", False),
+            ("10.0.0.1 -oN out", False),
+            ("10.0.0.1\n-oN", False),
+            ("", False),
+        ],
+    )
+    def test_is_safe_target(self, target, safe):
+        """nmap 옵션으로 해석될 수 있는 대상만 거르는지 테스트."""
+        assert NetworkUtils.is_safe_target(target) is safe